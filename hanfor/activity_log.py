@@ -0,0 +1,143 @@
+""" Activity log of a session shown in the log tab of the frontend.
+
+Entries are appended as json lines `{"id": .., "timestamp": .., "action": .., "rids": [..]}` to
+`<session folder>/activity_log.jsonl`. Ids are consecutive, so the entries after a cursor (the id of the last entry a
+client has seen) are exactly the last `last_id - cursor` lines and are read from the end of the file.
+
+The file keeps at least `retention` entries. Once it holds twice as many, it is rewritten to the last `retention`
+entries, so appending stays O(1) amortized and reading never scans more than 2 * `retention` lines.
+
+Use `get_activity_log(path)` to get the log of a file, it is shared by all requests.
+"""
+import datetime
+import json
+import logging
+import os
+import re
+import threading
+import uuid
+from typing import Iterable, List, Optional
+
+import generations
+
+ACTIVITY_LOG_FILE = 'activity_log.jsonl'
+DEFAULT_RETENTION = 50
+# Block size used to read the file backwards.
+TAIL_BLOCK_SIZE = 1 << 13
+
+
+class ActivityLog:
+    def __init__(self, path: str, retention: int = DEFAULT_RETENTION):
+        self.path = path
+        self.retention = retention
+        self._lock = threading.Lock()
+        self._last_id = 0
+        self._lines = 0
+        if os.path.exists(path):
+            with open(path, mode='r', encoding='utf-8') as log_file:
+                for line in log_file:
+                    self._lines += 1
+            last = self._tail(1)
+            if last:
+                self._last_id = last[0]['id']
+
+    @property
+    def last_id(self) -> int:
+        """ Id of the newest entry, 0 for an empty log. Used as cursor by the clients. """
+        return self._last_id
+
+    def append(self, action: str, rids: Iterable[str] = (), timestamp: datetime.datetime = None) -> dict:
+        """ Append an entry to the log.
+
+        :param action: What was done, e.g. `Updated requirement formalization`.
+        :param rids: The affected requirements.
+        :param timestamp: Time of the action, now by default.
+        :return: The new entry.
+        """
+        with self._lock:
+            entry = {
+                'id': self._last_id + 1,
+                'timestamp': (timestamp or datetime.datetime.now()).isoformat(sep=' ', timespec='seconds'),
+                'action': action,
+                'rids': list(rids)
+            }
+            with open(self.path, mode='a', encoding='utf-8') as log_file:
+                log_file.write(json.dumps(entry) + '\n')
+            self._last_id += 1
+            self._lines += 1
+            generations.bump(generations.ACTIVITY_LOG, self.path)
+            if self._lines >= 2 * self.retention:
+                self._compact()
+            return entry
+
+    def entries(self, since: Optional[int] = None) -> List[dict]:
+        """ The retained entries, oldest first.
+
+        :param since: Only return entries newer than this cursor. A cursor not from this log (e.g. of a log that was
+                      reset) returns all retained entries.
+        """
+        with self._lock:
+            count = self.retention
+            if since is not None and 0 <= since <= self._last_id:
+                count = min(count, self._last_id - since)
+            return self._tail(count)
+
+    def _tail(self, count: int) -> List[dict]:
+        """ Read the last `count` entries from the end of the file. """
+        if count <= 0 or not os.path.exists(self.path):
+            return []
+        with open(self.path, mode='rb') as log_file:
+            log_file.seek(0, os.SEEK_END)
+            position = log_file.tell()
+            data = b''
+            # One more newline than entries, the file ends with one.
+            while position > 0 and data.count(b'\n') <= count:
+                step = min(TAIL_BLOCK_SIZE, position)
+                position -= step
+                log_file.seek(position)
+                data = log_file.read(step) + data
+        lines = [line for line in data.split(b'\n') if line.strip()][-count:]
+        return [json.loads(line) for line in lines]
+
+    def _compact(self):
+        """ Rewrite the file keeping the last `retention` entries. """
+        entries = self._tail(self.retention)
+        tmp_path = f'{self.path}.{uuid.uuid4().hex}.tmp'
+        with open(tmp_path, mode='w', encoding='utf-8') as log_file:
+            for entry in entries:
+                log_file.write(json.dumps(entry) + '\n')
+        os.replace(tmp_path, self.path)
+        self._lines = len(entries)
+
+
+_logs = dict()
+_logs_lock = threading.Lock()
+
+
+def get_activity_log(path: str, retention: int = DEFAULT_RETENTION) -> ActivityLog:
+    """ The activity log stored in `path`, shared by all requests. """
+    with _logs_lock:
+        log = _logs.get(path)
+        if log is None or not os.path.exists(path):
+            log = ActivityLog(path, retention)
+            _logs[path] = log
+        log.retention = retention
+        return log
+
+
+def migrate_frontend_logs(messages: List[str], log: ActivityLog):
+    """ Append the html messages of the former `frontend_logs.pickle` to `log`.
+
+    :param messages: Messages like `[<timestamp>] <action> <a class="req_direct_link" .. data-rid="<rid>">..</a>`.
+    :param log: The log to append to.
+    """
+    for message in messages:
+        match = re.match(r'\[(?P<timestamp>[^\]]*)] (?P<action>.*?)(?= <a |$)', message)
+        if match is None:
+            logging.warning(f'Skipping malformed frontend log message `{message}`.')
+            continue
+        try:
+            timestamp = datetime.datetime.fromisoformat(match['timestamp'])
+        except ValueError:
+            timestamp = None
+        log.append(match['action'], re.findall(r'data-rid="([^"]*)"', message), timestamp)
@@ -10,20 +10,34 @@ import re
 import subprocess
 import sys
 from functools import wraps, update_wrapper
+from typing import Dict, List, Optional, Set
 
 import flask
 from flask import Flask, render_template, request, jsonify, make_response, json
 from flask_debugtoolbar import DebugToolbarExtension
 from werkzeug.exceptions import HTTPException
 
+import activity_log
+import boogie_parsing
+import generations
 import reqtransformer
+import requirement_store
+import requirements_table
+import revision_catalog
+import script_evaluations
 import utils
+import variables_table
 from guesser.Guess import Guess
 from guesser.guesser_registerer import REGISTERED_GUESSERS
-from reqtransformer import Requirement, VariableCollection, Variable, VarImportSessions, Formalization, Scope
+from reqtransformer import Requirement, VariableCollection, Variable, VarImportSessions, Formalization, Scope, \
+    VariableCollectionUnitOfWork, run_in_unit_of_work
 from ressources import Report, QueryAPI
 from ressources.simulator_ressource import SimulatorRessource
-from static_utils import get_filenames_from_dir, pickle_dump_obj_to_file, choice, pickle_load_from_dump, hash_file_sha1
+from startup import RequirementsScan, StartupManifest, StartupTimer, scan_requirements, track_manifest
+from req_simulator.pea_cache import pea_cache, DEFAULT_PEA_CACHE_FILES, DEFAULT_PEA_CACHE_MAX_AGE_DAYS, \
+    collect_garbage as collect_pea_cache_garbage
+from static_utils import get_filenames_from_dir, pickle_dump_obj_to_file, choice, pickle_load_from_dump, hash_file_sha1, \
+    replace_prefix
 from patterns import PATTERNS, VARIABLE_AUTOCOMPLETE_EXTENSION
 from tags.tags import TagsApi
 
@@ -79,6 +93,9 @@ def nocache(view):
     @wraps(view)
     def no_cache(*args, **kwargs):
         response = make_response(view(*args, **kwargs))
+        if response.get_etag()[0] is not None:
+            # Conditional responses are revalidated on every use instead (see `generations`).
+            return response
         response.headers['Last-Modified'] = datetime.datetime.now()
         response.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, post-check=0, pre-check=0, max-age=0'
         response.headers['Pragma'] = 'no-cache'
@@ -88,13 +105,45 @@ def nocache(view):
     return update_wrapper(no_cache, view)
 
 
+def unit_of_work(view):
+    """ Decorator for a flask view. Runs the view in a unit of work on the session variable collection, so it is
+    loaded at most once and stored at most once, together with the requirements stored by the view. A view failing
+    with an exception writes nothing (see `VariableCollectionUnitOfWork`). Views only reading run concurrently, a view
+    whose writes conflict with a concurrent view is run again.
+
+    """
+
+    @wraps(view)
+    def in_unit_of_work(*args, **kwargs):
+        if 'SESSION_VARIABLE_COLLECTION' not in app.config:
+            return view(*args, **kwargs)
+        return run_in_unit_of_work(app.config['SESSION_VARIABLE_COLLECTION'], view, *args, defer_requirements=True,
+                                   **kwargs)
+
+    return in_unit_of_work
+
+
+@app.teardown_request
+def flush_meta_settings(exception=None):
+    """ Store the meta settings sections changed by the request (see `utils.MetaSettingsStore`). """
+    utils.flush_meta_settings()
+
+
+@app.teardown_request
+def flush_revision_catalog(exception=None):
+    """ Update the catalog records of the revisions written by the request (see `revision_catalog`). """
+    revision_catalog.flush()
+
+
 @app.route('/simulator', methods=['GET', 'POST', 'DELETE'])
 @nocache
+@unit_of_work
 def simulator():
     return SimulatorRessource(app, request).apply_request()
 
 @app.route('/api/tools/<command>', methods=['GET', 'POST'])
 @nocache
+@unit_of_work
 def tools_api(command):
     filter_list = request.form.get('selected_requirement_ids', '')
     if len(filter_list) > 0:
@@ -105,13 +154,13 @@ def tools_api(command):
     file_name = f"{app.config['CSV_INPUT_FILE'][:-4]}"
 
     if command == 'req_file':
-        content = utils.generate_req_file_content(app, filter_list=filter_list)
-        return utils.generate_file_response(content, file_name + ".req")
+        content = utils.chunked(utils.iter_req_file_content(app, filter_list=filter_list))
+        return utils.generate_file_response(flask.stream_with_context(content), file_name + ".req")
 
     if command == 'csv_file':
-        file = utils.generate_csv_file_content(app, filter_list=filter_list)
+        content = utils.chunked(utils.iter_csv_file_content(app, filter_list=filter_list))
         name = f"{app.config['SESSION_TAG']}_{app.config['USING_REVISION']}_out.csv"
-        return utils.generate_file_response(file, name, mimetype='text/csv')
+        return utils.generate_file_response(flask.stream_with_context(content), name, mimetype='text/csv')
 
     if command == 'xls_file':
         file = utils.generate_xls_file_content(app, filter_list=filter_list)
@@ -121,6 +170,7 @@ def tools_api(command):
 
 @app.route('/api/table/colum_defs', methods=['GET'])
 @nocache
+@unit_of_work
 def table_api():
     result = utils.get_datatable_additional_cols(app)
     return jsonify(result)
@@ -128,12 +178,54 @@ def table_api():
 
 @app.route('/api/query', methods=['GET', 'POST', 'DELETE'])
 @nocache
+@unit_of_work
 def api_query():
     return QueryAPI(app, request).apply_request()
 
 
+def get_requirements():
+    """ All requirements, or the page of the requirements table requested by a DataTables server side request. """
+    if 'draw' in request.args or 'ids_only' in request.args:
+        session_dict = pickle_load_from_dump(app.config['SESSION_STATUS_PATH'])  # type: dict
+        try:
+            return jsonify(requirements_table.query_table(
+                app.config['REVISION_FOLDER'], session_dict.get('csv_fieldnames', []), request.args))
+        except (SyntaxError, ValueError) as e:
+            return jsonify({'success': False, 'errormsg': f'Could not apply the search: {e}'}), 400
+
+    result = dict()
+    result['data'] = list()
+    for req in Requirement.requirements(read_only=True):
+        try:
+            result['data'].append(req.to_dict())
+        except Exception as e:
+            logging.debug(e)
+    return jsonify(result)
+
+
+def get_variables():
+    """ All rows of the variables table, or the page requested by a DataTables server side request. """
+    try:
+        return jsonify(variables_table.query_table(
+            app.config['REVISION_FOLDER'], app.config['SCRIPT_EVAL_RESULTS_PATH'], request.args))
+    except (SyntaxError, ValueError) as e:
+        return jsonify({'success': False, 'errormsg': f'Could not apply the search: {e}'}), 400
+
+
+def get_activity_log_entries():
+    log = utils.get_session_activity_log(app)
+    since = request.args.get('since', None, type=int)
+    return jsonify({
+        'success': True,
+        'entries': log.entries(since),
+        'cursor': log.last_id,
+        'retention': log.retention
+    })
+
+
 @app.route('/api/<resource>/<command>', methods=['GET', 'POST', 'DELETE'])
 @nocache
+@unit_of_work
 def api(resource, command):
     resources = [
         'req',
@@ -156,6 +248,7 @@ def api(resource, command):
         'del_tag',
         'del_var',
         'multi_update',
+        'rename',
         'var_import_info',
         'get_available_guesses',
         'add_formalization_from_guess',
@@ -164,6 +257,7 @@ def api(resource, command):
         'del_constraint',
         'add_new_variable',
         'get_enumerators',
+        'script_evals',
         'start_import_session',
         'gen_req',
         'add_standard',
@@ -180,7 +274,7 @@ def api(resource, command):
         if command == 'get' and request.method == 'GET':
             id = request.args.get('id', '')
             requirement = Requirement.load_requirement_by_id(id, app)
-            var_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+            var_collection = VariableCollection.load_session(app)
 
             result = requirement.to_dict(include_used_vars=True)
             result['formalizations_html'] = utils.formalizations_to_html(app, requirement.formalizations)
@@ -196,16 +290,9 @@ def api(resource, command):
 
         # Get all requirements
         if command == 'gets':
-            filenames = get_filenames_from_dir(app.config['REVISION_FOLDER'])
-            result = dict()
-            result['data'] = list()
-            for filename in filenames:
-                try:
-                    req = Requirement.load(filename)
-                    result['data'].append(req.to_dict())
-                except Exception as e:
-                    logging.debug(e)
-            return jsonify(result)
+            return generations.conditional(
+                [(generations.REQUIREMENTS, app.config['REVISION_FOLDER'])], get_requirements,
+                extra=request.query_string.decode())
 
         # Update a requirement
         if command == 'update' and request.method == 'POST':
@@ -254,12 +341,15 @@ def api(resource, command):
 
                 if error:
                     logging.error(f'We got an error parsing the expressions: {error_msg}. Omitting requirement update.')
+                    VariableCollectionUnitOfWork.current().rollback()
                     return jsonify({
                         'success': False,
                         'errormsg': error_msg
                     })
                 else:
                     requirement.store()
+                    if request.form.get('update_formalization') == 'true':
+                        SimulatorRessource.prewarm_in_background(requirement, app)
                     return jsonify(requirement.to_dict()), 200
 
         # Multi Update Tags or Status.
@@ -356,7 +446,7 @@ def api(resource, command):
             else:
                 result['available_guesses'] = list()
                 tmp_guesses = list()
-                var_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+                var_collection = VariableCollection.load_session(app)
 
                 for guesser in REGISTERED_GUESSERS:
                     try:
@@ -427,7 +517,7 @@ def api(resource, command):
                 result['success'] = False
                 result['errormsg'] = 'No requirements selected.'
 
-            var_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+            var_collection = VariableCollection.load_session(app)
             for req_id in requirement_ids:
                 requirement = Requirement.load_requirement_by_id(req_id, app)
                 if requirement is not None:
@@ -476,7 +566,13 @@ def api(resource, command):
             'errormsg': 'sorry, request not supported.'
         }
         if command == 'gets':
-            result = {'data': utils.get_available_vars(app, full=True, fetch_evals=True)}
+            return generations.conditional(
+                [(generations.VARIABLES, app.config['REVISION_FOLDER']),
+                 (generations.SCRIPT_EVALS, app.config['SCRIPT_EVAL_RESULTS_PATH'])],
+                get_variables, extra=request.query_string.decode())
+        elif command == 'script_evals':
+            # Queue depth and progress of the variable script evaluations.
+            result = {'success': True, **script_evaluations.get_session_scheduler(app).progress()}
         elif command == 'update':
             result = utils.update_variable_in_collection(app, request)
         elif command == 'var_import_info':
@@ -500,7 +596,7 @@ def api(resource, command):
             if result['success']:
                 if len(change_type) > 0:  # Change the var type.
                     logging.debug('Change type to `{}`.\nAffected Vars:\n{}'.format(change_type, '\n'.join(var_list)))
-                    var_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+                    var_collection = VariableCollection.load_session(app)
                     for var_name in var_list:
                         try:
                             logging.debug('Set type for `{}` to `{}`. Formerly was `{}`'.format(
@@ -515,7 +611,7 @@ def api(resource, command):
 
                 if delete == 'true':
                     logging.info('Deleting variables.\nAffected Vars:\n{}'.format('\n'.join(var_list)))
-                    var_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+                    var_collection = VariableCollection.load_session(app)
                     for var_name in var_list:
                         try:
                             logging.debug('Deleting `{}`'.format(var_name))
@@ -525,11 +621,38 @@ def api(resource, command):
                     var_collection.store()
 
             return jsonify(result)
+        elif command == 'rename':
+            # Rename many variables at once given by a mapping {old name: new name} and/or a prefix to replace.
+            result = {'success': True, 'errormsg': ''}
+            mapping = json.loads(request.form.get('mapping', '') or '{}')
+            prefix_old = request.form.get('prefix_old', '').strip()
+            prefix_new = request.form.get('prefix_new', '').strip()
+
+            var_collection = VariableCollection.load_session(app)
+            if len(prefix_old) > 0:
+                for var_name in var_collection.collection.keys():
+                    if var_name.startswith(prefix_old) and var_name not in mapping:
+                        mapping[var_name] = replace_prefix(var_name, prefix_old, prefix_new)
+            for new_name in mapping.values():
+                try:
+                    valid = boogie_parsing.get_expression_variables(new_name) == {new_name}
+                except Exception:
+                    valid = False
+                if not valid:
+                    result['success'] = False
+                    result['errormsg'] = 'Variable name `{}` not valid.'.format(new_name)
+                    return jsonify(result)
+            try:
+                result['mapping'] = utils.rename_variables(app, var_collection, mapping)
+            except KeyError as e:
+                result['success'] = False
+                result['errormsg'] = 'Could not rename variables: {}'.format(e)
+            return jsonify(result)
         elif command == 'new_constraint':
             result = {'success': True, 'errormsg': ''}
             var_name = request.form.get('name', '').strip()
 
-            var_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+            var_collection = VariableCollection.load_session(app)
             cid = var_collection.add_new_constraint(var_name=var_name)
             var_collection.store()
             result['html'] = utils.formalizations_to_html(app,
@@ -543,7 +666,7 @@ def api(resource, command):
                 'type_inference_errors': dict()
             }
             var_name = request.form.get('name', '').strip()
-            var_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+            var_collection = VariableCollection.load_session(app)
             try:
                 var = var_collection.collection[var_name]
                 var_dict = var.to_dict(var_collection.var_req_mapping)
@@ -559,7 +682,7 @@ def api(resource, command):
             var_name = request.form.get('name', '').strip()
             constraint_id = int(request.form.get('constraint_id', '').strip())
 
-            var_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+            var_collection = VariableCollection.load_session(app)
             var_collection.del_constraint(var_name=var_name, constraint_id=constraint_id)
             var_collection.collection[var_name].reload_constraints_type_inference_errors(var_collection)
             var_collection.store()
@@ -570,7 +693,7 @@ def api(resource, command):
             result = {'success': True, 'errormsg': ''}
             var_name = request.form.get('name', '').strip()
 
-            var_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+            var_collection = VariableCollection.load_session(app)
             try:
                 logging.debug('Deleting `{}`'.format(var_name))
                 success = var_collection.del_var(var_name)
@@ -586,7 +709,7 @@ def api(resource, command):
             variable_name = request.form.get('name', '').strip()
             variable_type = request.form.get('type', '').strip()
             variable_value = request.form.get('value', '').strip()
-            var_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+            var_collection = VariableCollection.load_session(app)
 
             # Apply some tests if the new Variable is legal.
             if len(variable_name) == 0 or not re.match('^[a-zA-Z0-9_]+$', variable_name):
@@ -625,7 +748,7 @@ def api(resource, command):
         elif command == 'get_enumerators':
             result = {'success': True, 'errormsg': ''}
             enum_name = request.form.get('name', '').strip()
-            var_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+            var_collection = VariableCollection.load_session(app)
             enumerators = var_collection.get_enumerators(enum_name)
             enum_results = [(enumerator.name, enumerator.value) for enumerator in enumerators]
             try:
@@ -663,7 +786,7 @@ def api(resource, command):
             result = {'success': True, 'errormsg': ''}
 
             variables_csv_str = request.form.get('variables_csv_str', '')
-            var_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+            var_collection = VariableCollection.load_session(app)
 
             dict_reader = csv.DictReader(variables_csv_str.splitlines())
             variables = list(dict_reader)
@@ -680,7 +803,7 @@ def api(resource, command):
                     continue
 
                 var_collection.add_var(variable['name'])
-                var_collection.collection[variable['name']].belongs_to_enum = variable['enum_name']
+                var_collection.set_enum(variable['name'], variable['enum_name'])
                 var_collection.set_type(variable['name'], variable['type'])
                 var_collection.collection[variable['name']].value = variable['value']
                 var_collection.collection[variable['name']].description = variable['description']
@@ -695,13 +818,25 @@ def api(resource, command):
 
         return jsonify(result)
 
+    if resource == 'stats':
+        if command == 'get':
+            return jsonify({
+                'requirement_cache': requirement_store.requirement_cache.info(),
+                'expression_caches': boogie_parsing.expression_cache_info(),
+                'pea_cache': pea_cache.info()
+            })
+
     if resource == 'meta':
         if command == 'get':
-            return jsonify(utils.MetaSettings(app.config['META_SETTINGS_PATH']).__dict__)
+            return generations.conditional(
+                [(generations.META_SETTINGS, app.config['META_SETTINGS_PATH'])],
+                lambda: jsonify(utils.MetaSettings(app.config['META_SETTINGS_PATH']).to_dict()))
 
     if resource == 'logs':
         if command == 'get':
-            return utils.get_flask_session_log(app, html=True)
+            return generations.conditional(
+                [(generations.ACTIVITY_LOG, app.config['ACTIVITY_LOG_PATH'])], get_activity_log_entries,
+                extra=request.query_string.decode())
 
     if resource == 'report':
         return Report(app, request).apply_request()
@@ -714,12 +849,14 @@ def api(resource, command):
 
 @app.route('/variable_import/<id>', methods=['GET'])
 @nocache
+@unit_of_work
 def variable_import(id):
     return render_template('variables/variable-import-session.html', id=id, query=request.args, patterns=PATTERNS)
 
 
 @app.route('/variable_import/api/<session_id>/<command>', methods=['GET', 'POST'])
 @nocache
+@unit_of_work
 def var_import_session(session_id, command):
     result = {
         'success': False,
@@ -732,14 +869,16 @@ def var_import_session(session_id, command):
         which_collection = request.form.get('which_collection', '')
 
         try:
-            var_collection = var_import_sessions.import_sessions[int(session_id)]
+            import_session = var_import_sessions.get(int(session_id))
+            var_collection = import_session.target_var_collection
             if which_collection == 'source_link':
-                var_collection = var_collection.source_var_collection
-            if which_collection == 'target_link':
-                var_collection = var_collection.target_var_collection
-            if which_collection == 'result_link':
-                var_collection = var_collection.result_var_collection
-            result = var_collection.collection[name].to_dict(var_collection.var_req_mapping)
+                variable = import_session.source_var_collection.collection[name]
+                var_collection = import_session.source_var_collection
+            elif which_collection == 'target_link':
+                variable = var_collection.collection[name]
+            else:
+                variable = import_session.result_variable(name)
+            result = variable.to_dict(var_collection.var_req_mapping)
             return jsonify(result), 200
         except Exception:
             logging.info('Could not load var: {} from import session: {}'.format(name, session_id))
@@ -747,8 +886,10 @@ def var_import_session(session_id, command):
     if command == 'get_table_data':
         result = dict()
         try:
-            result = {'data': var_import_sessions.import_sessions[int(session_id)].to_datatables_data()}
+            result = variables_table.query_import_table(var_import_sessions.get(int(session_id)), request.values)
             return jsonify(result), 200
+        except (SyntaxError, ValueError) as e:
+            return jsonify({'success': False, 'errormsg': f'Could not apply the search: {e}'}), 400
         except Exception as e:
             logging.info('Could not load session with id: {} ({})'.format(session_id, e))
             raise e
@@ -757,8 +898,9 @@ def var_import_session(session_id, command):
         rows = json.loads(request.form.get('rows', ''))
         try:
             logging.info('Store changes for variable import session: {}'.format(session_id))
-            var_import_sessions.import_sessions[int(session_id)].store_changes(rows)
-            var_import_sessions.store()
+            import_session = var_import_sessions.get(int(session_id))
+            import_session.store_changes(rows)
+            import_session.store()
             result['success'] = True
             return jsonify(result), 200
         except Exception as e:
@@ -770,8 +912,9 @@ def var_import_session(session_id, command):
         row = json.loads(request.form.get('row', ''))
         try:
             logging.info('Store changes for variable "{}" of import session: {}'.format(row['name'], session_id))
-            var_import_sessions.import_sessions[int(session_id)].store_variable(row)
-            var_import_sessions.store()
+            import_session = var_import_sessions.get(int(session_id))
+            import_session.store_variable(row)
+            import_session.store()
             result['success'] = True
             return jsonify(result), 200
         except Exception as e:
@@ -782,13 +925,13 @@ def var_import_session(session_id, command):
     if command == 'apply_import':
         try:
             logging.info('Apply import for variable import session: {}'.format(session_id))
-            var_import_sessions.import_sessions[int(session_id)].apply_constraint_selection()
-            var_import_sessions.store()
-            var_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
-            import_collection = var_import_sessions.import_sessions[int(session_id)].result_var_collection
-            var_collection.import_session(import_collection)
+            import_session = var_import_sessions.get(int(session_id))
+            var_collection = VariableCollection.load_session(app)
+            import_collection = import_session.result_collection(exclude=var_collection.collection.keys())
+            import_session.store()
+            imported_var_names = var_collection.import_session(import_collection)
+            var_collection.reload_script_results(app, imported_var_names)
             var_collection.store()
-            varcollection_consistency_check(app)
             result['success'] = True
             return jsonify(result), 200
         except Exception as e:
@@ -799,8 +942,7 @@ def var_import_session(session_id, command):
     if command == 'delete_me':
         try:
             logging.info(f'Deleting variable import session id: {session_id}')
-            var_import_sessions.import_sessions.pop(int(session_id))
-            var_import_sessions.store()
+            var_import_sessions.delete(int(session_id))
             result['success'] = True
             return jsonify(result), 200
         except Exception as e:
@@ -904,10 +1046,10 @@ def unhandled_exception(e):
     }), 500
 
 
-def update_var_usage(var_collection):
-    var_collection.refresh_var_usage(app)
-    var_collection.req_var_mapping = var_collection.invert_mapping(var_collection.var_req_mapping)
-    var_collection.refresh_var_constraint_mapping()
+def update_var_usage(var_collection, requirement_usage: Dict[str, Set[str]] = None):
+    """ Rebuild the variable usage index from scratch. It is maintained incrementally otherwise. """
+    if not var_collection.refresh_var_usage(app, requirement_usage):
+        logging.warning('Variable usage index was out of sync with requirements and constraints.')
     var_collection.store()
 
 
@@ -934,115 +1076,82 @@ def varcollection_version_migrations(app, args):
         logging.info('Migrated old collection.')
 
 
-def varcollection_consistency_check(app, args=None):
+def varcollection_consistency_check(app, args=None, requirement_usage: Dict[str, Set[str]] = None):
+    """ Check the variable collection for consistency.
+
+    :param requirement_usage: The variables used by each requirement if known already, e.g. from the requirements
+                              migration. The usage index is always verified against it, as this is cheap then.
+    """
     logging.info('Check Variables for consistency.')
     # Update usages and constraint type check.
-    var_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+    var_collection = VariableCollection.load_session(app)
     if args is not None and args.reload_type_inference:
         var_collection.reload_type_inference_errors_in_constraints()
 
-    update_var_usage(var_collection)
+    if (requirement_usage is not None or (args is not None and args.verify_index)
+            or not var_collection.usage_index_verified):
+        update_var_usage(var_collection, requirement_usage)
+    var_collection.refresh_enum_index()
     var_collection.reload_script_results(app)
     var_collection.store()
 
 
-def metasettings_version_migration(app, args):
+def metasettings_version_migration(app, args, tag_usage: Dict[str, List[str]] = None):
+    """ Make sure every used tag has a color, description and internal flag.
+
+    :param tag_usage: The used tags if known already, e.g. from the requirements migration.
+    """
     logging.info('Running metaconfig version migration...')
     meta_settings = utils.MetaSettings(app.config['META_SETTINGS_PATH'])
+    if tag_usage is None:
+        tag_usage = requirement_store.get_requirement_store(app.config['REVISION_FOLDER']).tag_usage()
 
     meta_settings_keys = ["tag_colors", "tag_descriptions", "tag_internal"]
     for key in meta_settings_keys:
         if key not in meta_settings:
             logging.info(f'Upgrading metaconfig with empty `{key}` store.')
             meta_settings[key] = dict()
-    for filename in get_filenames_from_dir(app.config['REVISION_FOLDER']):
-        try:
-            req = Requirement.load(filename)
-        except TypeError:
-            continue
-        for tag in req.tags:
-            if tag not in meta_settings["tag_colors"]:
-                meta_settings["tag_colors"][tag] = "#5bc0de"
-            if tag not in meta_settings["tag_descriptions"]:
-                meta_settings["tag_descriptions"][tag] = ""
-            if tag not in meta_settings["tag_internal"]:
-                meta_settings["tag_internal"][tag] = False
+    for tag in tag_usage:
+        if tag not in meta_settings["tag_colors"]:
+            meta_settings["tag_colors"][tag] = "#5bc0de"
+        if tag not in meta_settings["tag_descriptions"]:
+            meta_settings["tag_descriptions"][tag] = ""
+        if tag not in meta_settings["tag_internal"]:
+            meta_settings["tag_internal"][tag] = False
 
     # TODO: Hacky. @Vincent pls fix
     for tag in meta_settings['tag_colors'].keys():
         if tag not in meta_settings["tag_internal"]:
             meta_settings["tag_internal"][tag] = False
 
+    meta_settings.mark(*meta_settings_keys)
     meta_settings.update_storage()
 
 
-def requirements_version_migrations(app, args):
-    logging.info('Running requirements version migration...')
-    filenames = get_filenames_from_dir(app.config['REVISION_FOLDER'])
-    var_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+def requirements_version_migrations(app, args, manifest: StartupManifest = None) -> Optional[RequirementsScan]:
+    """ Migrate all requirements of the revision in one pass, unless `manifest` shows they are migrated already.
 
-    for filename in filenames:
-        try:
-            req = Requirement.load(filename)
-        except TypeError:
-            continue
-        changes = False
-        if req.formalizations is None:
-            req.formalizations = dict()
-            changes = True
-        if isinstance(req.tags, set):
-            sanitize = lambda t: t.replace("<", "leq").replace(">", "geq")
-            req.tags = {sanitize(tag): "" for tag in req.tags}
-            changes = True
-        if isinstance(req.tags, dict):
-            # clean up old data sets  with empty tags that mess up exporting (if necessary)
-            new_tags = {tag: comment for tag, comment in req.tags.items() if tag != ""}
-            if new_tags != req.tags:
-                req.tags = new_tags
-                changes = True
-        if type(req.type_in_csv) is tuple:
-            changes = True
-            req.type_in_csv = req.type_in_csv[0]
-        if type(req.csv_row) is tuple:
-            changes = True
-            req.csv_row = req.csv_row[0]
-        if type(req.description) is tuple:
-            changes = True
-            req.description = req.description[0]
-        # Derive type inference errors if not set.
-        try:
-            for i, f in req.formalizations.items():
-                if not hasattr(f, "id") or not f.id:
-                    changes = True
-                    setattr(f, "id", i)
-        except Exception as e:
-            logging.info(f'Something when updating formalisations went terribly wrong `{req.rid}:\n {e}`')
-        # ensure some well-formedness of requirements objects
-        for k, f in req.formalizations.items():
-            if not isinstance(f, Formalization):
-                del req.formalizations[k]
-                changes = True
-            else:
-                if not f.scoped_pattern:
-                    f.scoped_pattern = reqtransformer.ScopedPattern()
-                    changes = True
-                if not f.scoped_pattern.scope or not f.scoped_pattern.pattern:
-                    f.scoped_pattern = reqtransformer.ScopedPattern()
-                    changes = True
-            # Add tags for requirements with (incomplete) formalizations.
-            if f.scoped_pattern.scope != reqtransformer.Scope.NONE and \
-                    f.scoped_pattern.pattern.name != "NotFormalizable":
-                req.tags['has_formalization'] = ""
-                changes = True
-            else:
-                req.tags['incomplete_formalization'] = req.format_incomplete_formalization_tag(f.id)
-                changes = True
-        if args.reload_type_inference:
-            req.reload_type_inference(var_collection, app)
-        if changes:
-            req.store()
-
-    update_var_usage(var_collection)
+    :return: The tag and variable usage collected by the pass, None if it was skipped.
+    """
+    store = requirement_store.get_requirement_store(app.config['REVISION_FOLDER'])
+    scan = None
+    if manifest is not None and manifest.requirements_migrated(store.content_version()) \
+            and not args.reload_type_inference:
+        logging.info('Requirements are migrated already. Skipping requirements version migration.')
+    else:
+        logging.info('Running requirements version migration...')
+        scan = scan_requirements(
+            app.config['REVISION_FOLDER'],
+            processes=app.config.get('STARTUP_MIGRATION_PROCESSES') or os.cpu_count() or 1
+        )
+        logging.info(f'Migrated {scan.migrated} of {scan.requirements} requirements.')
+    if args.reload_type_inference:
+        var_collection = VariableCollection.load_session(app)
+        for req in Requirement.requirements(app.config['REVISION_FOLDER']):
+            req.run_type_checks(var_collection)
+    if manifest is not None:
+        manifest.record(store.content_version())
+    return scan
 
 
 def create_revision(args, base_revision_name):
@@ -1079,6 +1188,8 @@ def load_revision(revision_id):
         app.config['REVISION_FOLDER'],
         'session_status.pickle'
     )
+    if requirement_store.default_backend == requirement_store.SQLITE_BACKEND:
+        requirement_store.migrate_pickle_folder(app.config['REVISION_FOLDER'])
 
 
 def user_request_new_revision(args):
@@ -1129,23 +1240,31 @@ def init_import_sessions():
 
 
 def init_meta_settings():
-    """Create meta setting file"""
-    app.config['META_SETTINGS_PATH'] = os.path.join(app.config['SESSION_FOLDER'], 'meta_settings.pickle')
-    if not os.path.exists(app.config['META_SETTINGS_PATH']):
-        meta_settings = dict()
-        meta_settings['tag_colors'] = dict()
-        pickle_dump_obj_to_file(meta_settings, app.config['META_SETTINGS_PATH'])
+    """Create meta setting files (`meta_settings.<section>.pickle`), migrates a former meta_settings.pickle. """
+    app.config['META_SETTINGS_PATH'] = os.path.join(app.config['SESSION_FOLDER'], 'meta_settings')
+    legacy_path = os.path.join(app.config['SESSION_FOLDER'], 'meta_settings.pickle')
+    meta_settings = utils.MetaSettings(app.config['META_SETTINGS_PATH'])
+    if 'tag_colors' not in meta_settings:
+        if os.path.exists(legacy_path):
+            logging.info(f'Migrating `{legacy_path}` to `{app.config["META_SETTINGS_PATH"]}`.')
+            utils.migrate_meta_settings_pickle(legacy_path, app.config['META_SETTINGS_PATH'])
+        else:
+            meta_settings['tag_colors'] = dict()
+            meta_settings.update_storage()
+            utils.flush_meta_settings()
 
 
-def init_frontend_logs():
-    """ Initializes FRONTEND_LOGS_PATH and creates a new frontend_logs dict, if none is existent.
+def init_activity_log():
+    """ Initializes ACTIVITY_LOG_PATH. Migrates the messages of a former frontend_logs.pickle into a new log.
 
         """
-    app.config['FRONTEND_LOGS_PATH'] = os.path.join(app.config['SESSION_FOLDER'], 'frontend_logs.pickle')
-    if not os.path.exists(app.config['FRONTEND_LOGS_PATH']):
-        frontend_logs = dict()
-        frontend_logs['hanfor_log'] = list()
-        pickle_dump_obj_to_file(frontend_logs, app.config['FRONTEND_LOGS_PATH'])
+    app.config['ACTIVITY_LOG_PATH'] = os.path.join(app.config['SESSION_FOLDER'], activity_log.ACTIVITY_LOG_FILE)
+    legacy_path = os.path.join(app.config['SESSION_FOLDER'], 'frontend_logs.pickle')
+    if not os.path.exists(app.config['ACTIVITY_LOG_PATH']) and os.path.exists(legacy_path):
+        logging.info(f'Migrating `{legacy_path}` to `{app.config["ACTIVITY_LOG_PATH"]}`.')
+        activity_log.migrate_frontend_logs(
+            pickle_load_from_dump(legacy_path).get('hanfor_log', []), utils.get_session_activity_log(app)
+        )
 
 
 def init_script_eval_results():
@@ -1200,6 +1319,10 @@ def user_choose_start_revision():
 def set_app_config_paths(args, HERE):
     app.config['SCRIPT_UTILS_PATH'] = os.path.join(HERE, 'script_utils')
     app.config['TEMPLATES_FOLDER'] = os.path.join(HERE, 'templates')
+    requirement_store.set_default_backend(app.config.get('REQUIREMENT_STORAGE', requirement_store.SQLITE_BACKEND))
+    requirement_store.configure_cache(app.config.get('REQUIREMENT_CACHE_SIZE', requirement_store.DEFAULT_CACHE_SIZE))
+    boogie_parsing.configure_expression_caches(
+        app.config.get('EXPRESSION_CACHE_SIZE', boogie_parsing.DEFAULT_EXPRESSION_CACHE_SIZE))
 
 
 def startup_hanfor(args, HERE) -> bool:
@@ -1256,16 +1379,36 @@ def startup_hanfor(args, HERE) -> bool:
     utils.init_var_collection(app)
     init_import_sessions()
     init_meta_settings()
-    init_frontend_logs()
+    init_activity_log()
     utils.config_check(app.config)
 
     # Run version migrations
-    varcollection_version_migrations(app, args)
-    requirements_version_migrations(app, args)
-    metasettings_version_migration(app, args)
-
-    # Run consistency checks.
-    varcollection_consistency_check(app, args)
+    timer = StartupTimer()
+    with timer.step('variable collection migration'):
+        varcollection_version_migrations(app, args)
+    manifest = StartupManifest.load(app.config['REVISION_FOLDER'])
+    # The remaining migrations and checks share one variable collection, which is stored once.
+    with VariableCollectionUnitOfWork(app.config['SESSION_VARIABLE_COLLECTION'], exclusive=True):
+        with timer.step('requirements migration'):
+            scan = requirements_version_migrations(app, args, manifest)
+        with timer.step('meta settings migration'):
+            metasettings_version_migration(app, args, scan.tag_usage if scan is not None else None)
+            utils.flush_meta_settings()
+
+        # Run consistency checks.
+        with timer.step('consistency check'):
+            varcollection_consistency_check(app, args, scan.var_usage if scan is not None else None)
+    track_manifest(manifest)
+    with timer.step('requirement object cleanup'):
+        requirement_store.collect_garbage(app.config['SESSION_FOLDER'])
+    with timer.step('phase event automata cleanup'):
+        collect_pea_cache_garbage(
+            app.config['SESSION_FOLDER'],
+            app.config.get('PEA_CACHE_FILES', DEFAULT_PEA_CACHE_FILES),
+            app.config.get('PEA_CACHE_MAX_AGE_DAYS', DEFAULT_PEA_CACHE_MAX_AGE_DAYS)
+        )
+    revision_catalog.flush()
+    timer.log()
     return True
 
 
@@ -1,6 +1,7 @@
-from collections import defaultdict
+import threading
+from collections import defaultdict, OrderedDict
 from enum import Enum
-from typing import List
+from typing import FrozenSet, List, Tuple
 from copy import deepcopy
 
 from lark import Lark, Tree, Transformer
@@ -38,6 +39,134 @@ def get_parser_instance():
     return lark
 
 
+DEFAULT_EXPRESSION_CACHE_SIZE = 10000
+
+
+class MemoCache:
+    """ Bounded, thread safe LRU memo cache counting its hits and misses. """
+
+    def __init__(self, max_size: int = DEFAULT_EXPRESSION_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def get_or_compute(self, key, compute):
+        """ Return the value cached for `key`. Compute and cache it by `compute()` if missing. """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        value = compute()
+        with self._lock:
+            self._entries[key] = value
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return value
+
+    def put(self, key, value):
+        """ Cache `value` for `key`, replacing a cached value. """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def resize(self, max_size: int):
+        with self._lock:
+            self.max_size = max_size
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups > 0 else 0.0
+            }
+
+
+# Expression string -> (parse tree, variables used in it). The tree is None if seeded by `seed_expression_variables`.
+parse_cache = MemoCache()
+# (expression string, types of its variables, expected types) -> TypeCheckResult.
+typecheck_cache = MemoCache()
+
+
+def configure_expression_caches(max_size: int):
+    parse_cache.resize(max_size)
+    typecheck_cache.resize(max_size)
+
+
+def expression_cache_info() -> dict:
+    return {'parse': parse_cache.info(), 'typecheck': typecheck_cache.info()}
+
+
+def _parse(expression: str) -> Tuple[Tree, FrozenSet[str]]:
+    tree = get_parser_instance().parse(expression)
+    return tree, frozenset(get_variables_list(tree))
+
+
+def parse_expression(expression: str) -> Tree:
+    """ Parse an expression using the memo cache. The returned tree is shared and must not be modified.
+
+    :param expression: An expression in the boogie grammar.
+    :raises LarkError: If the expression can not be parsed (failures are not cached).
+    """
+    tree, variables = parse_cache.get_or_compute(expression, lambda: _parse(expression))
+    if tree is None:
+        tree, variables = _parse(expression)
+        parse_cache.put(expression, (tree, variables))
+    return tree
+
+
+def get_expression_variables(expression: str) -> FrozenSet[str]:
+    """ Returns the variables used in an expression using the memo cache.
+
+    :param expression: An expression in the boogie grammar.
+    :raises LarkError: If the expression can not be parsed.
+    """
+    return parse_cache.get_or_compute(expression, lambda: _parse(expression))[1]
+
+
+def seed_expression_variables(expression: str, variables: FrozenSet[str]):
+    """ Cache the variables of an expression determined elsewhere (e.g. by a worker process), without its tree.
+    The tree is parsed on demand by `parse_expression`.
+
+    :param expression: An expression in the boogie grammar that could be parsed.
+    :param variables: The variables used in the expression.
+    """
+    if expression not in parse_cache:
+        parse_cache.put(expression, (None, frozenset(variables)))
+
+
+reconstructor = None
+
+
+def get_reconstructor_instance():
+    """ Returns the shared Reconstructor of the default parser. """
+    global reconstructor
+    if reconstructor is None:
+        reconstructor = Reconstructor(get_parser_instance())
+    return reconstructor
+
+
 def replace_var_in_expression(expression, old_var, new_var, parser=None, matching_terminal_names='ID'):
     """ Replaces all occurrences of old_var in expression with new_var.
 
@@ -54,25 +183,37 @@ def replace_var_in_expression(expression, old_var, new_var, parser=None, matchin
     :return: Expression with replaced variable.
     :rtype: str
     """
+    return replace_vars_in_expression(expression, {old_var: new_var}, parser, matching_terminal_names)
+
+
+def replace_vars_in_expression(expression, mapping, parser=None, matching_terminal_names='ID'):
+    """ Replaces all occurrences of the variables in mapping simultaneously (in one pass over the parse tree).
+    Swapping variables ({'a': 'b', 'b': 'a'}) is supported.
+
+    :param expression: An expression in the grammar used by parser.
+    :type expression: str
+    :param mapping: Old variable name -> new variable name.
+    :type mapping: dict
+    :param parser: Lark parser (if not set the default parser and its shared Reconstructor will be used.)
+    :type parser: Lark
+    :param matching_terminal_names: Token names according to the grammar taken into account for replacement.
+    :type matching_terminal_names: tuple (of strings)
+    :return: Expression with replaced variables.
+    :rtype: str
+    """
     if parser is None:
         parser = get_parser_instance()
+        recons = get_reconstructor_instance()
+    else:
+        recons = Reconstructor(parser)
+    # Parse a fresh tree, the tree is changed in place (cached trees are shared).
     tree = parser.parse(expression)
-    recons = Reconstructor(parser)
 
     for node in tree.iter_subtrees():  # type: Tree
-        # children = []
-        # for child in node.children:
-        #    if isinstance(child, Token) and child.type in matching_terminal_names and child.value == old_var:
-        #        children.append(child.update(value=new_var))
-        #    else:
-        #        children.append(child)
-
-        # node.set(data=node.data, children=children)
-
         for child in node.children:
             if isinstance(child, Token) and child.type in matching_terminal_names:
-                if child.value == old_var:
-                    node.set(data=node.data, children=[Token(child.type, new_var)])
+                if child.value in mapping:
+                    node.set(data=node.data, children=[Token(child.type, mapping[child.value])])
 
     return recons.reconstruct(tree)
 
@@ -163,6 +304,49 @@ def run_typecheck_fixpoint(tree: Tree, type_env: dict[str, BoogieType],
         tn = stn
 
 
+@dataclass(frozen=True)
+class TypeCheckResult:
+    t: BoogieType
+    type_env: dict[str, BoogieType]
+    type_errors: Tuple[str, ...]
+
+
+def typecheck_key(expression: str, type_env: dict[str, BoogieType], expected_types: List[BoogieType] = None) -> tuple:
+    """ The key of `typecheck_cache` for typechecking `expression` in `type_env`.
+
+    :raises LarkError: If the expression can not be parsed.
+    """
+    env_slice = tuple((name, type_env.get(name)) for name in sorted(get_expression_variables(expression)))
+    return expression, env_slice, tuple(expected_types) if expected_types else ()
+
+
+def typecheck_expression(expression: str, type_env: dict[str, BoogieType],
+                         expected_types: List[BoogieType] = None) -> TypeCheckResult:
+    """ Run the type inference fixpoint for an expression using the memo cache.
+    The inference only depends on the types of the variables used in the expression, so results are cached by
+    the expression, that slice of `type_env` and the expected types.
+
+    :param expression: An expression in the boogie grammar.
+    :param type_env: The variable types. Like `run_typecheck_fixpoint`, derived types are written to it.
+    :param expected_types: The types allowed for the whole expression.
+    :return: The expression type, the derived types of the used variables and the type errors.
+    :raises LarkError: If the expression can not be parsed.
+    """
+    key = typecheck_key(expression, type_env, expected_types)
+    env_slice = key[1]
+    used_variables = [name for name, _ in env_slice]
+
+    def compute():
+        ti = run_typecheck_fixpoint(parse_expression(expression),
+                                    {name: t for name, t in env_slice if t is not None}, expected_types)
+        return TypeCheckResult(ti.type_root.t, {name: ti.type_env[name] for name in used_variables},
+                               tuple(ti.type_errors))
+
+    result = typecheck_cache.get_or_compute(key, compute)
+    type_env.update(result.type_env)
+    return TypeCheckResult(result.t, dict(result.type_env), result.type_errors)
+
+
 @v_args(inline=True)
 class TypeInference(Transformer):
 
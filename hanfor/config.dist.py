@@ -13,6 +13,38 @@ import os
 # If set to None, hanfor will store its sessions in ./data
 SESSION_BASE_FOLDER = None
 
+# Set REQUIREMENT_STORAGE to the layout hanfor stores the requirements of a revision in:
+# * 'sqlite' -> One `requirements.sqlite` database per revision (indexed by id, status, type and tag).
+#               Revisions in the old layout are migrated when loaded.
+# * 'pickle' -> One `<id>.pickle` file per requirement (old layout).
+REQUIREMENT_STORAGE = 'sqlite'
+
+# Max number of requirements kept in memory by the requirement cache (shared by all requests).
+REQUIREMENT_CACHE_SIZE = 25000
+
+# Max number of distinct expressions whose parse trees and type inference results are kept in memory.
+EXPRESSION_CACHE_SIZE = 10000
+
+# Build the phase event automata of a requirement for the simulator in the background after its formalization was saved
+# (in the processes of PEA_BUILD_PROCESSES).
+PEA_CACHE_PREWARM = True
+
+# Cached phase event automata kept on disk per revision: at most this many, used within this many days.
+PEA_CACHE_FILES = 10000
+PEA_CACHE_MAX_AGE_DAYS = 30
+
+# Number of processes building the phase event automata for the simulator and prewarming (None: one per cpu).
+PEA_BUILD_PROCESSES = None
+
+# Number of processes parsing and typechecking the formalizations imported from a csv (None: one per cpu).
+FORMALIZATION_IMPORT_PROCESSES = None
+
+# Number of processes migrating the requirements of a revision on startup (None: one per cpu).
+STARTUP_MIGRATION_PROCESSES = None
+
+# Number of entries kept in the activity log shown in the log tab.
+ACTIVITY_LOG_RETENTION = 50
+
 ################################################################################
 #                         Script results for variables                         #
 ################################################################################
@@ -27,7 +59,8 @@ SESSION_BASE_FOLDER = None
 #     }
 #   Will evaluate search_sysrt.sh once for each variable VAR_NAME
 #   using `foo $VAR_NAME` as input.
-# * The script will be evaluated once at startup and on request (refresh script results)
+# * The script will be evaluated at startup and for new variables. Results are kept until the script or its
+#   parameters change.
 #
 # Available placeholders are:
 # * $VAR_NAME -> The variable name.
@@ -38,6 +71,9 @@ SESSION_BASE_FOLDER = None
 # }
 SCRIPT_EVALUATIONS = {}
 
+# Number of script evaluations run at the same time.
+SCRIPT_EVALUATION_WORKERS = 4
+
 ################################################################################
 #                                DEBUG and logging                             #
 ################################################################################
@@ -0,0 +1,133 @@
+""" Configuration for the reqtransformer flask App.
+
+@copyright: 2017 Samuel Roth <samuel@smel.de>
+@licence: GPLv3
+"""
+
+import os
+
+################################################################################
+#                               Storage and folders                            #
+################################################################################
+# Set the SESSION_BASE_FOLDER to a path hanfor will store/load sessions.
+# If set to None, hanfor will store its sessions in ./data
+SESSION_BASE_FOLDER = None
+
+# Set REQUIREMENT_STORAGE to the layout hanfor stores the requirements of a revision in:
+# * 'sqlite' -> One `requirements.sqlite` database per revision (indexed by id, status, type and tag).
+#               Revisions in the old layout are migrated when loaded.
+# * 'pickle' -> One `<id>.pickle` file per requirement (old layout).
+REQUIREMENT_STORAGE = 'sqlite'
+
+# Max number of requirements kept in memory by the requirement cache (shared by all requests).
+REQUIREMENT_CACHE_SIZE = 25000
+
+# Max number of distinct expressions whose parse trees and type inference results are kept in memory.
+EXPRESSION_CACHE_SIZE = 10000
+
+# Build the phase event automata of a requirement for the simulator in the background after its formalization was saved.
+PEA_CACHE_PREWARM = True
+
+# Number of processes building the phase event automata when a simulator is created (None: one per cpu).
+PEA_BUILD_PROCESSES = None
+
+# Number of processes parsing and typechecking the formalizations imported from a csv (None: one per cpu).
+FORMALIZATION_IMPORT_PROCESSES = None
+
+# Number of processes migrating the requirements of a revision on startup (None: one per cpu).
+STARTUP_MIGRATION_PROCESSES = None
+
+# Number of entries kept in the activity log shown in the log tab.
+ACTIVITY_LOG_RETENTION = 50
+
+################################################################################
+#                         Script results for variables                         #
+################################################################################
+# Settings in this section determine the results in the "Script results" column
+# in the variables table.
+#
+# To add a script evaluation:
+# * The script must be available in the ./script_utils folder.
+# * Add a entry to SCRIPT_EVALUATIONS e.g.
+#     SCRIPT_EVALUATIONS = {
+#         'search_sysrt.sh': ['foo', '$VAR_NAME']
+#     }
+#   Will evaluate search_sysrt.sh once for each variable VAR_NAME
+#   using `foo $VAR_NAME` as input.
+# * The script will be evaluated at startup and for new variables. Results are kept until the script or its
+#   parameters change.
+#
+# Available placeholders are:
+# * $VAR_NAME -> The variable name.
+#
+# Example:
+# SCRIPT_EVALUATIONS = {
+#     'search_sysrt.sh': ['', '/abs/path/to/sysrt.csv', '$VAR_NAME']
+# }
+SCRIPT_EVALUATIONS = {}
+
+# Number of script evaluations run at the same time.
+SCRIPT_EVALUATION_WORKERS = 4
+
+################################################################################
+#                                DEBUG and logging                             #
+################################################################################
+
+# Sentry error tracking setup
+USE_SENTRY = False
+SENTRY_DSN = '<add_your_sentry_dsn>'
+
+# Set DEBUG_MODE to true if you want to run the flask app in debug mode.
+DEBUG_MODE = False
+
+# If ASSETS_DEBUG True, Bundles will output their individual source files.
+# This will significantly slow down performance.
+ASSETS_DEBUG = False
+
+# Set this to false if you want to use DEBUG toolbar with a URL_PREFIX
+DEBUG_TB_INTERCEPT_REDIRECTS = False
+
+# Set the log level to increase or decrease the logging sensitivity.
+# You can set LOG_LEVEL (in decreasing sensitivity to):
+# 'DEBUG', 'INFO', 'WARNING', 'ERROR'
+LOG_LEVEL = 'DEBUG'
+
+# Set LOG_TO_FILE to True if vou want to log to the file
+# you specified in LOG_FILE
+LOG_TO_FILE = False
+LOG_FILE = 'hanfor.log'
+
+# Set PYCHARM_DEBUG to True to suppresss the flask debugging so it
+# won't interfere with the pycharm debugger.
+PYCHARM_DEBUG = False
+
+################################################################################
+#                         App and web server section                           #
+################################################################################
+
+# If you are running the app with a url prefix set URL_PREFIX like
+# URL_PREFIX = '/hanfor'
+URL_PREFIX = ''
+
+# set a 'SECRET_KEY' to enable the Flask session cookies
+# generate one for production with, for example, openssl rand -base64 64
+SECRET_KEY = os.environ.get('HANFOR_SECRET_KEY',
+                            default='tRKGzHAD3NHfk0u6jV7rMb42RBo/ldFIePPG2tgXrEZhAyOwQ/3aN0Uekt+mXmV2JGzMtiKSZBDhYKiO1fgu7A==')
+
+# Specify the PORT the app should be running at
+PORT = os.environ.get('HANFOR_PORT', default=5000)
+
+# Set the host
+HOST = os.environ.get('HANFOR_HOST', default='127.0.0.1')
+
+################################################################################
+#                               Miscellaneous                                  #
+################################################################################
+# Define the ordering for pattern grouping in the pattern selection of hanfors frontent.
+# All groups used in PATTERNS must be covered.
+PATTERNS_GROUP_ORDER = [
+    'Occurence',
+    'Order',
+    'Real-time',
+    'not_formalizable'
+]
@@ -0,0 +1,181 @@
+""" Bulk import of the formalizations stored in a csv column (e.g. `Hanfor_Formalization`) into a new revision.
+
+Importing formalization by formalization loaded and stored the session variable collection for every formalization.
+`FormalizationImport` instead
+
+* decodes the json formalization cell of each row while the rows are read,
+* parses and typechecks all distinct expressions in a pool of worker processes and seeds the expression caches of
+  `boogie_parsing` with the results,
+* applies the formalizations in csv order to one in memory variable collection, which is stored once at the end.
+
+Type inference derives variable types in csv order, so the workers only typecheck against the variable types known
+before the import. Expressions whose variable types changed during the import are typechecked again in process.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+
+from lark import LarkError
+
+import boogie_parsing
+from boogie_parsing import BoogieType, TypeCheckResult
+from reqtransformer import Formalization, Requirement, ScopedPattern, Scope, Pattern, VariableCollection, \
+    VariableCollectionUnitOfWork
+
+# Number of expressions sent to a worker at once.
+EXPRESSION_CHUNK_SIZE = 64
+
+
+@dataclass
+class ImportReport:
+    """ Throughput and errors of a formalization import. """
+    rows: int = 0
+    formalizations: int = 0
+    expressions: int = 0
+    seconds: float = 0.0
+    errors: list[tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    def log(self):
+        logging.info(f'Imported {self.formalizations} formalizations ({self.expressions} distinct expressions) of '
+                     f'{self.rows} requirements in {self.seconds:.2f}s ({self.rows_per_second:.1f} rows/s).')
+        for rid, error in self.errors:
+            logging.error(f'Could not import formalization of `{rid}`: {error}')
+
+
+# Variable types known before the import, set in each worker by `_init_worker`.
+_worker_type_env: dict[str, BoogieType] = dict()
+
+
+def _init_worker(type_env: dict[str, BoogieType]):
+    global _worker_type_env
+    _worker_type_env = type_env
+
+
+def check_expression(expression: str, expected_types: tuple[BoogieType, ...] | None) \
+        -> tuple[frozenset[str], tuple, TypeCheckResult] | None:
+    """ Parse and typecheck an expression in a worker. Variables not in the collection yet have type unknown, just
+    as when the formalization is applied.
+
+    :param expression: An expression in the boogie grammar.
+    :param expected_types: The types allowed for the expression or None if it is not typechecked.
+    :return: The used variables, the typecheck cache key and result (or None, None) or None if it can not be parsed.
+    """
+    try:
+        variables = boogie_parsing.get_expression_variables(expression)
+        if expected_types is None:
+            return variables, None, None
+        type_env = {name: _worker_type_env.get(name, BoogieType.unknown) for name in variables}
+        key = boogie_parsing.typecheck_key(expression, type_env, list(expected_types))
+        return variables, key, boogie_parsing.typecheck_expression(expression, type_env, list(expected_types))
+    except LarkError:
+        return None
+
+
+class FormalizationImport:
+    """ Collects the formalizations of csv rows by `add` and applies them to their requirements by `run`. """
+
+    def __init__(self, app, processes: int = 1):
+        """
+        :param app: Hanfor flask app, the formalizations are imported into its session variable collection.
+        :param processes: Parse and typecheck the expressions in a pool of this many processes if greater than 1.
+        """
+        self.app = app
+        self.processes = processes
+        self.report = ImportReport()
+        self._pending: list[tuple[Requirement, dict]] = list()
+        # (expression, expected types) -> None, an ordered set of the expressions to check.
+        self._expressions: dict[tuple[str, tuple[BoogieType, ...] | None], None] = dict()
+
+    def add(self, requirement: Requirement, formalizations_json: str):
+        """ Decode the json formalizations of a requirement, e.g. {"0": {"scope": .., "pattern": .., "expressions":
+        {"P": .., ..}}, ..}, for import by `run`.
+
+        :param requirement: The requirement the formalizations belong to.
+        :param formalizations_json: Content of the formalization cell of the requirement's csv row.
+        """
+        self.report.rows += 1
+        if formalizations_json is None or not formalizations_json.strip():
+            return
+        try:
+            formalizations = dict(json.loads(formalizations_json))
+        except (ValueError, TypeError) as e:
+            self.report.errors.append((requirement.rid, f'Invalid formalizations `{formalizations_json}`: {e!r}'))
+            return
+        for formalization_dict in formalizations.values():
+            try:
+                allowed_types = ScopedPattern(
+                    Scope[formalization_dict['scope']], Pattern(name=formalization_dict['pattern'])
+                ).get_allowed_types()
+                for key, expression in formalization_dict['expressions'].items():
+                    expected_types = tuple(allowed_types[key]) if key in allowed_types else None
+                    self._expressions[(expression, expected_types)] = None
+            except (KeyError, TypeError, AttributeError):
+                continue  # Reported when the formalization is applied.
+        self._pending.append((requirement, formalizations))
+
+    def run(self) -> ImportReport:
+        """ Apply the collected formalizations and store the session variable collection once.
+
+        :return: The report of the import, also logged.
+        """
+        start = time.perf_counter()
+        with VariableCollectionUnitOfWork(self.app.config['SESSION_VARIABLE_COLLECTION'], exclusive=True) as unit:
+            var_collection = unit.var_collection
+            if self.processes > 1 and len(self._expressions) > 1:
+                self._check_expressions(var_collection)
+            for requirement, formalizations in self._pending:
+                self._apply(requirement, formalizations, var_collection)
+            var_collection.store()
+        self.report.expressions = len(self._expressions)
+        self.report.seconds = time.perf_counter() - start
+        self.report.log()
+        return self.report
+
+    def _check_expressions(self, var_collection: VariableCollection):
+        """ Parse and typecheck the collected expressions in worker processes and seed the expression caches. """
+        logging.debug(f'Checking {len(self._expressions)} expressions in {self.processes} processes.')
+        expressions = list(self._expressions.keys())
+        try:
+            with ProcessPoolExecutor(max_workers=self.processes, initializer=_init_worker,
+                                     initargs=(var_collection.get_boogie_type_env(),)) as executor:
+                results = executor.map(check_expression, *zip(*expressions), chunksize=EXPRESSION_CHUNK_SIZE)
+                for (expression, _), result in zip(expressions, results):
+                    if result is None:
+                        continue
+                    variables, key, type_check_result = result
+                    boogie_parsing.seed_expression_variables(expression, variables)
+                    if key is not None:
+                        boogie_parsing.typecheck_cache.put(key, type_check_result)
+        except BrokenProcessPool as e:
+            logging.warning(f'Process pool for checking expressions broke, checking them in process: {e}')
+
+    def _apply(self, requirement: Requirement, formalizations: dict, var_collection: VariableCollection):
+        for key, formalization_dict in formalizations.items():
+            formalization_id = None
+            try:
+                formalization_id = int(key)
+                requirement.formalizations[formalization_id] = Formalization(formalization_id)
+                requirement.update_formalization(
+                    formalization_id=formalization_id,
+                    scope_name=formalization_dict['scope'],
+                    pattern_name=formalization_dict['pattern'],
+                    mapping=formalization_dict['expressions'],
+                    app=self.app,
+                    variable_collection=var_collection
+                )
+                self.report.formalizations += 1
+            except (ValueError, KeyError, TypeError, AttributeError, LarkError) as e:
+                if formalization_id is not None:
+                    requirement.formalizations.pop(formalization_id, None)
+                self.report.errors.append((requirement.rid, f'Formalization {key}: {e!r}'))
+        # Drop usages of expressions that could not be imported.
+        var_collection.set_usage(requirement.rid, requirement.used_variables)
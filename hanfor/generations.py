@@ -0,0 +1,113 @@
+""" Generation counters of the stored session data, used as ETags of the read heavy API endpoints.
+
+Every store of requirements, the variable collection, the meta settings (tags, queries, reports), the script
+evaluation results or the activity log bumps the counter of the written data. Counters are kept in memory, keyed by
+the kind of data and its path (revision folder, meta settings path, ...). The ETag of an endpoint combines the counters
+of the data it is computed from with a token of this process, so a request with a matching `If-None-Match` is answered
+with 304 without loading anything. A restart starts over with a new token.
+
+Only writes of this process are counted. Data changed on disk by another process is served from the browser cache until
+this process writes it or restarts.
+"""
+import hashlib
+import os
+import threading
+import uuid
+from collections import defaultdict
+from functools import wraps
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from flask import Response, make_response, request
+
+from requirement_store import add_store_listener
+
+REQUIREMENTS = 'requirements'
+VARIABLES = 'variables'
+META_SETTINGS = 'meta_settings'
+SCRIPT_EVALS = 'script_evals'
+ACTIVITY_LOG = 'activity_log'
+
+# Identifies the counters of this process.
+_token = uuid.uuid4().hex[:12]
+_generations: Dict[Tuple[str, str], int] = defaultdict(int)
+_lock = threading.Lock()
+
+
+def bump(kind: str, path: str):
+    """ Record a store of the data `kind` at `path`. """
+    with _lock:
+        _generations[(kind, os.path.abspath(path))] += 1
+
+
+def get(kind: str, path: str) -> int:
+    with _lock:
+        return _generations.get((kind, os.path.abspath(path)), 0)
+
+
+def _on_stored(folder: str, rids):
+    bump(REQUIREMENTS, folder)
+
+
+add_store_listener(_on_stored)
+
+
+def etag(*sources: Tuple[str, str], extra: str = '') -> str:
+    """ ETag of a response computed from the given data.
+
+    :param sources: (kind, path) of all data the response is computed from.
+    :param extra: Anything else the response depends on, e.g. the query string.
+    """
+    value = '-'.join([_token] + [str(get(kind, path)) for kind, path in sources])
+    if len(extra) > 0:
+        value += '-' + hashlib.sha1(extra.encode()).hexdigest()[:12]
+    return value
+
+
+def not_modified(tag: str) -> Optional[Response]:
+    """ The 304 response if the client already has the response with ETag `tag`, else None. """
+    if request.if_none_match.contains(tag):
+        response = Response(status=304)
+        response.set_etag(tag)
+        return response
+    return None
+
+
+def with_etag(response: Response, tag: str) -> Response:
+    """ Set the ETag and let clients store the response, but revalidate it on every use. """
+    response.set_etag(tag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def conditional(sources: Iterable[Tuple[str, str]], compute: Callable, extra: str = '') -> Response:
+    """ Answer with 304 if the client has the current response, else compute the response and tag it.
+
+    :param sources: (kind, path) of all data the response is computed from.
+    :param compute: Returns the response (anything a flask view may return).
+    :param extra: Anything else the response depends on, see `etag`.
+    """
+    tag = etag(*sources, extra=extra)
+    response = not_modified(tag)
+    if response is None:
+        response = make_response(compute())
+        if response.status_code == 200:
+            with_etag(response, tag)
+    return response
+
+
+def conditional_get(sources: Callable[[], Iterable[Tuple[str, str]]]):
+    """ Decorator for a flask view answering GET requests by `conditional`, e.g. in `MethodView.decorators`.
+
+    :param sources: Returns (kind, path) of all data the GET responses are computed from.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def conditional_view(*args, **kwargs):
+            if request.method != 'GET':
+                return view(*args, **kwargs)
+            return conditional(sources(), lambda: view(*args, **kwargs), extra=request.full_path)
+
+        return conditional_view
+
+    return decorator
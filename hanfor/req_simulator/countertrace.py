@@ -95,10 +95,13 @@ class Countertrace(Pickleable):
 
         def normalize(self, formula_manager: FormulaManager) -> None:
             if self.entry_events is not None and self.entry_events not in formula_manager:
-                formula_manager.normalize(self.entry_events)
+                self.entry_events = formula_manager.normalize(self.entry_events)
 
             if self.invariant is not None and self.invariant not in formula_manager:
-                formula_manager.normalize(self.invariant)
+                self.invariant = formula_manager.normalize(self.invariant)
+
+            if isinstance(self.bound, FNode) and self.bound not in formula_manager:
+                self.bound = formula_manager.normalize(self.bound)
 
         def is_upper_bound(self) -> bool:
             return self.bound_type == Countertrace.BoundTypes.LESS or \
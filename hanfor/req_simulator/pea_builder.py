@@ -0,0 +1,196 @@
+""" Builds the phase event automata (PEAs) of formalizations, one `PeaTask` per countertrace.
+
+Tasks missing in the PEA cache can be built in a pool of worker processes. Workers return the PEA pickled, i.e. with
+formulas of their own pysmt formula manager, so the results are normalized into the formula manager of this process
+before they are cached and used. Prewarming submits tasks to the same pool, the workers then write the PEAs to the disk
+cache themselves.
+
+The workers are started by a fork server, so they do not inherit the threads and locks of the (multithreaded) server.
+"""
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Callable
+
+from pysmt.shortcuts import get_env
+
+import boogie_parsing
+from req_simulator.boogie_pysmt_transformer import BoogiePysmtTransformer
+from req_simulator.countertrace import CountertraceTransformer
+from req_simulator.pea_cache import pea_cache
+from req_simulator.phase_event_automaton import PhaseEventAutomaton, build_automaton
+from req_simulator.utils import get_countertrace_parser
+from reqtransformer import Requirement, Formalization, Variable
+
+
+@dataclass
+class PeaTask:
+    """ The PEA of one countertrace of a formalization. """
+    requirement: Requirement
+    formalization: Formalization
+    countertrace_id: int
+    countertrace: str
+    expressions: dict[str, str]
+    variables: dict[str, Variable]
+    clock_prefix: str
+    key: str
+
+    def build(self) -> PhaseEventAutomaton:
+        return build_phase_event_automaton(self.countertrace, self.expressions, self.variables, self.clock_prefix)
+
+    def attach(self, pea: PhaseEventAutomaton) -> PhaseEventAutomaton:
+        pea.requirement = self.requirement
+        pea.formalization = self.formalization
+        pea.countertrace_id = self.countertrace_id
+        return pea
+
+
+def build_phase_event_automaton(countertrace: str, expressions: dict[str, str], variables: dict[str, Variable],
+                                clock_prefix: str) -> PhaseEventAutomaton:
+    """ Build the PEA of a countertrace. Module level, so it can be run by the worker processes.
+
+    :param countertrace: The countertrace formula of the pattern.
+    :param expressions: Boogie expressions by their pattern placeholder (P, Q, ...).
+    :param variables: The variables used in the expressions.
+    :param clock_prefix: Prefix of the clock names.
+    """
+    transformed = {
+        k: BoogiePysmtTransformer(variables).transform(boogie_parsing.get_parser_instance().parse(v))
+        for k, v in expressions.items()
+    }
+    ct = CountertraceTransformer(transformed).transform(get_countertrace_parser().parse(countertrace))
+    return build_automaton(ct, clock_prefix)
+
+
+def build_and_cache_phase_event_automaton(folder: str, key: str, countertrace: str, expressions: dict[str, str],
+                                          variables: dict[str, Variable], clock_prefix: str) -> None:
+    """ Build the PEA of a countertrace into the PEA cache of `folder`. Run by the worker processes for prewarming.
+
+    :param folder: The revision folder holding the PEA cache.
+    :param key: The cache key of the PEA.
+    """
+    pea_cache.put(folder, key, build_phase_event_automaton(countertrace, expressions, variables, clock_prefix))
+
+
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+# Prewarm builds not done yet by (revision folder, name of the prewarm).
+_prewarms: dict[tuple[str, str], list[Future]] = {}
+# Reentrant: cancelling a build runs its done callback right away.
+_prewarms_lock = threading.RLock()
+
+
+def get_executor(processes: int) -> ProcessPoolExecutor:
+    """ The process pool shared by all requests, created on first use. """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            context = multiprocessing.get_context('forkserver') \
+                if 'forkserver' in multiprocessing.get_all_start_methods() else None
+            _executor = ProcessPoolExecutor(max_workers=processes, mp_context=context)
+        return _executor
+
+
+def discard_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def resolve_pea_tasks(tasks: list[PeaTask], folder: str, processes: int = 1,
+                      on_progress: Callable[[int, int], None] = None) -> list[PhaseEventAutomaton]:
+    """ Get the PEAs of `tasks` from the PEA cache of `folder` and build the missing ones.
+
+    :param tasks: The PEAs to get.
+    :param folder: The revision folder holding the PEA cache.
+    :param processes: Build missing PEAs in a pool of this many processes if greater than 1.
+    :param on_progress: Called with (#done, #tasks) whenever a PEA is done.
+    :return: The PEAs in the order of `tasks`, attached to their requirement and formalization.
+    """
+    peas = [pea_cache.get(folder, task.key) for task in tasks]
+    missing = [i for i, pea in enumerate(peas) if pea is None]
+    done = len(tasks) - len(missing)
+
+    def finish(i: int, pea: PhaseEventAutomaton):
+        nonlocal done
+        pea_cache.put(folder, tasks[i].key, pea)
+        peas[i] = pea
+        done += 1
+        if on_progress is not None:
+            on_progress(done, len(tasks))
+
+    if on_progress is not None:
+        on_progress(done, len(tasks))
+
+    if processes > 1 and len(missing) > 1:
+        logging.debug(f'Building {len(missing)} phase event automata in {processes} processes.')
+        try:
+            executor = get_executor(processes)
+            futures = {
+                executor.submit(build_phase_event_automaton, tasks[i].countertrace, tasks[i].expressions,
+                                tasks[i].variables, tasks[i].clock_prefix): i
+                for i in missing
+            }
+            for future in as_completed(futures):
+                pea = future.result()
+                pea.normalize(get_env().formula_manager)
+                finish(futures[future], pea)
+        except BrokenProcessPool as e:
+            logging.warning(f'Process pool for building phase event automata broke, building in process: {e}')
+            discard_executor()
+
+    for i in missing:
+        if peas[i] is None:
+            finish(i, tasks[i].build())
+
+    return [task.attach(pea) for task, pea in zip(tasks, peas)]
+
+
+def prewarm_pea_tasks(name: str, tasks: list[PeaTask], folder: str, processes: int = 1) -> list[Future]:
+    """ Build the PEAs of `tasks` missing in the PEA cache of `folder` in the process pool, without waiting for them.
+    Builds of a previous prewarm with the same name that were not started yet are dropped.
+
+    :param name: Identifies the prewarm, e.g. the id of the requirement the tasks belong to.
+    :param tasks: The PEAs to build.
+    :param folder: The revision folder holding the PEA cache.
+    :param processes: Size of the process pool, if it is created by this call.
+    :return: The submitted builds.
+    """
+    missing = [task for task in tasks if not pea_cache.contains(folder, task.key)]
+    with _prewarms_lock:
+        for future in _prewarms.pop((folder, name), []):
+            future.cancel()
+        if len(missing) == 0:
+            return []
+        try:
+            executor = get_executor(processes)
+            futures = [
+                executor.submit(build_and_cache_phase_event_automaton, folder, task.key, task.countertrace,
+                                task.expressions, task.variables, task.clock_prefix)
+                for task in missing
+            ]
+        except BrokenProcessPool as e:
+            logging.warning(f'Process pool for building phase event automata broke, skipping prewarm: {e}')
+            discard_executor()
+            return []
+        _prewarms[(folder, name)] = futures
+    logging.debug(f'Prewarming {len(futures)} phase event automata for {name}.')
+    for future in futures:
+        future.add_done_callback(lambda f: _prewarm_done(folder, name, f))
+    return futures
+
+
+def _prewarm_done(folder: str, name: str, future: Future):
+    if not future.cancelled() and future.exception() is not None:
+        logging.debug(f'Could not prewarm phase event automaton for {name}: {future.exception()}')
+    with _prewarms_lock:
+        futures = _prewarms.get((folder, name))
+        if futures is not None and all(f.done() for f in futures):
+            del _prewarms[(folder, name)]
@@ -0,0 +1,207 @@
+""" Content addressed cache for the phase event automata (PEAs) of formalizations.
+
+A PEA only depends on the countertrace it is built from, the expressions substituted into it, the types (and values
+of constants/enumerators) of the used variables and the clock prefix. The cache key is a hash over exactly these, so
+a changed formalization or variable type maps to a new key and stale automata are never returned.
+
+Entries are kept in a bounded in memory LRU and pickled to `<revision folder>/pea_cache/<key>.pickle`, so they survive
+restarts and can be written by other processes (see `pea_builder.prewarm_pea_tasks`). The files are pruned
+on startup (see `collect_garbage`), loading a file marks it as recently used.
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from lark import Token
+
+import boogie_parsing
+from req_simulator.phase_event_automaton import PhaseEventAutomaton
+
+PEA_CACHE_FOLDER = 'pea_cache'
+# Bump to invalidate all cached automata when build_automaton or the pickled classes change.
+PEA_CACHE_FORMAT = 1
+DEFAULT_PEA_CACHE_SIZE = 1000
+# Bounds of the cached automata on disk per revision folder.
+DEFAULT_PEA_CACHE_FILES = 10000
+DEFAULT_PEA_CACHE_MAX_AGE_DAYS = 30
+
+
+def normalize_expression(expression: str) -> str:
+    """ Normalize an expression to its token sequence, so that mere whitespace changes keep the cache key.
+
+    :param expression: A boogie expression.
+    :return: The tokens of the expression separated by single spaces.
+    """
+    tree = boogie_parsing.parse_expression(expression)
+    return ' '.join(token.value for token in tree.scan_values(lambda v: isinstance(v, Token)))
+
+
+def pea_cache_key(pattern: str, scope: str, countertrace_id: int, countertrace: str, expressions: dict[str, str],
+                  variables: dict[str, tuple[str, str]], clock_prefix: str) -> str:
+    """ Compute the content hash a PEA is cached by.
+
+    :param pattern: Name of the pattern.
+    :param scope: Name of the scope.
+    :param countertrace_id: Index of the countertrace in the pattern.
+    :param countertrace: The countertrace formula the PEA is built from.
+    :param expressions: Normalized expressions by their pattern placeholder (P, Q, ...).
+    :param variables: (type, value) of every variable used in the expressions.
+    :param clock_prefix: Prefix of the clock names in the PEA.
+    :return: Hex digest identifying the PEA.
+    """
+    content = json.dumps([PEA_CACHE_FORMAT, pattern, scope, countertrace_id, countertrace, expressions,
+                          {name: list(v) for name, v in variables.items()}, clock_prefix], sort_keys=True)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+class PeaCache:
+    """ Maps cache keys to PEAs. The cached PEAs are detached from their requirement and formalization, `get` returns
+    a shallow copy the caller may attach them to. """
+
+    def __init__(self, max_size: int = DEFAULT_PEA_CACHE_SIZE):
+        self.max_size = max_size
+        self._peas: OrderedDict[str, PhaseEventAutomaton] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def path_for(folder: str, key: str) -> str:
+        return os.path.join(folder, PEA_CACHE_FOLDER, f'{key}.pickle')
+
+    def get(self, folder: str, key: str) -> PhaseEventAutomaton | None:
+        with self._lock:
+            pea = self._peas.get(key)
+            if pea is not None:
+                self._peas.move_to_end(key)
+                self.hits += 1
+                return copy.copy(pea)
+
+        path = self.path_for(folder, key)
+        pea = None
+        if os.path.exists(path):
+            try:
+                pea = PhaseEventAutomaton.load(path)
+                os.utime(path)
+            except Exception as e:
+                logging.warning(f'Could not load cached phase event automaton `{path}`: {e}')
+
+        with self._lock:
+            if pea is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, pea)
+        return copy.copy(pea)
+
+    def contains(self, folder: str, key: str) -> bool:
+        """ True if the PEA is cached, without loading it. """
+        with self._lock:
+            if key in self._peas:
+                return True
+        return os.path.exists(self.path_for(folder, key))
+
+    def put(self, folder: str, key: str, pea: PhaseEventAutomaton):
+        """ Cache a detached copy of `pea` in memory and on disk. """
+        pea = copy.copy(pea)
+        pea.requirement, pea.formalization, pea.countertrace_id = None, None, None
+        with self._lock:
+            self._remember(key, pea)
+
+        cache_folder = os.path.join(folder, PEA_CACHE_FOLDER)
+        tmp_path = os.path.join(cache_folder, f'.{uuid.uuid4().hex}.tmp')
+        try:
+            # Do not use makedirs: a removed revision folder must not be recreated.
+            if not os.path.isdir(cache_folder):
+                os.mkdir(cache_folder)
+            with open(tmp_path, mode='wb') as out_file:
+                pickle.dump(pea, out_file)
+            os.replace(tmp_path, self.path_for(folder, key))
+        except OSError as e:
+            logging.warning(f'Could not store phase event automaton in `{cache_folder}`: {e}')
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @staticmethod
+    def prune(folder: str, max_files: int = DEFAULT_PEA_CACHE_FILES,
+              max_age_days: float = DEFAULT_PEA_CACHE_MAX_AGE_DAYS) -> int:
+        """ Delete the cached automata of a revision folder not used for `max_age_days` and all but the `max_files`
+        most recently used ones, as well as temporary files left by interrupted writes.
+
+        :param folder: The revision folder.
+        :param max_files: Max number of cached automata kept.
+        :param max_age_days: Max days since the last use of a kept automaton.
+        :return: Number of deleted files.
+        """
+        cache_folder = os.path.join(folder, PEA_CACHE_FOLDER)
+        if not os.path.isdir(cache_folder):
+            return 0
+        entries = []
+        for entry in os.scandir(cache_folder):
+            try:
+                entries.append((entry.stat().st_mtime, entry.name, entry.path))
+            except OSError:
+                continue
+        expired = time.time() - max_age_days * 24 * 3600
+        # Temporary files of writes still in progress are at most a few seconds old.
+        temporary = [e for e in entries if e[1].endswith('.tmp') and e[0] < time.time() - 3600]
+        cached = sorted((e for e in entries if e[1].endswith('.pickle')), reverse=True)
+        deleted = 0
+        for i, (mtime, _, path) in enumerate(cached):
+            if i < max_files and mtime >= expired:
+                continue
+            try:
+                os.remove(path)
+                deleted += 1
+            except OSError as e:
+                logging.warning(f'Could not delete cached phase event automaton `{path}`: {e}')
+        for _, _, path in temporary:
+            try:
+                os.remove(path)
+                deleted += 1
+            except OSError:
+                pass
+        return deleted
+
+    def _remember(self, key: str, pea: PhaseEventAutomaton):
+        self._peas[key] = pea
+        self._peas.move_to_end(key)
+        while len(self._peas) > self.max_size:
+            self._peas.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._peas.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> dict:
+        with self._lock:
+            return {'size': len(self._peas), 'max_size': self.max_size, 'hits': self.hits, 'misses': self.misses}
+
+
+pea_cache = PeaCache()
+
+
+def collect_garbage(session_folder: str, max_files: int = DEFAULT_PEA_CACHE_FILES,
+                    max_age_days: float = DEFAULT_PEA_CACHE_MAX_AGE_DAYS) -> int:
+    """ Prune the cached automata of all revisions of a session (see `PeaCache.prune`).
+
+    :param session_folder: The session folder holding the revision folders.
+    :return: Number of deleted files.
+    """
+    deleted = 0
+    for name in sorted(os.listdir(session_folder)):
+        deleted += PeaCache.prune(os.path.join(session_folder, name), max_files, max_age_days)
+    if deleted > 0:
+        logging.info(f'Deleted {deleted} cached phase event automata in `{session_folder}`.')
+    return deleted
@@ -1,13 +1,13 @@
 from __future__ import annotations
 
 import math
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 from dataclasses import dataclass
 from typing import Tuple
 
 from pysmt.fnode import FNode
 from pysmt.rewritings import conjunctive_partition
-from pysmt.shortcuts import And, Equals, Symbol, Real, EqualsOrIff, get_model, is_sat, FALSE, get_unsat_core
+from pysmt.shortcuts import And, Equals, Symbol, Real, EqualsOrIff, get_model, is_sat, FALSE, get_unsat_core, Solver
 from pysmt.typing import REAL
 
 from req_simulator.phase_event_automaton import PhaseEventAutomaton, Phase, Transition, complete
@@ -16,6 +16,87 @@ from req_simulator.utils import SOLVER_NAME, LOGIC, num_zeros
 from reqtransformer import Requirement, Formalization
 
 
+class SatCache:
+    """ Bounded LRU cache of satisfiability results keyed by (formula, assertion). """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self.results: OrderedDict[Tuple[FNode, FNode], bool] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[FNode, FNode]) -> bool | None:
+        result = self.results.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.results.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, key: Tuple[FNode, FNode], result: bool) -> None:
+        self.results[key] = result
+        while len(self.results) > self.max_size:
+            self.results.popitem(last=False)
+
+
+class StepSolver:
+    """ Solver session for the checks of one simulation step.
+    The variable and clock assertions of the step are asserted once, each formula is checked in its own push/pop
+    scope. Results are cached in the (cross step) sat cache. With incremental=False every check runs on a fresh
+    solver (the former behaviour).
+    """
+
+    def __init__(self, var_asserts: FNode, clock_asserts: FNode, sat_cache: SatCache, incremental: bool = True):
+        self.assertion = And(var_asserts, clock_asserts)
+        self.sat_cache = sat_cache
+        self.incremental = incremental
+        self._solver = None
+
+    @property
+    def solver(self) -> Solver:
+        if self._solver is None:
+            self._solver = Solver(name=SOLVER_NAME, logic=LOGIC)
+            self._solver.add_assertion(self.assertion)
+        return self._solver
+
+    def is_sat(self, formula: FNode) -> bool:
+        """ Check formula under the step assertions. """
+        if not self.incremental:
+            return is_sat(And(formula, self.assertion), solver_name=SOLVER_NAME, logic=LOGIC)
+
+        result = self.sat_cache.get((formula, self.assertion))
+        if result is None:
+            self.solver.push()
+            try:
+                self.solver.add_assertion(formula)
+                result = self.solver.solve()
+            finally:
+                self.solver.pop()
+            self.sat_cache.put((formula, self.assertion), result)
+        return result
+
+    def get_values(self, formula: FNode, variables) -> dict[FNode, FNode] | None:
+        """ Values of variables in a model of formula under the step assertions, None if unsatisfiable. """
+        if not self.incremental:
+            model = get_model(And(formula, self.assertion), solver_name=SOLVER_NAME, logic=LOGIC)
+            return None if model is None else model.get_values(variables)
+
+        self.solver.push()
+        try:
+            self.solver.add_assertion(formula)
+            if not self.solver.solve():
+                return None
+            return self.solver.get_values(variables)
+        finally:
+            self.solver.pop()
+
+    def exit(self) -> None:
+        if self._solver is not None:
+            self._solver.exit()
+            self._solver = None
+
+
 class Simulator:
     @dataclass
     class SatResult:
@@ -24,9 +105,11 @@ class Simulator:
         guard: FNode
 
     def __init__(self, peas: list[PhaseEventAutomaton], scenario: Scenario = None, name: str = 'unnamed',
-                 test: bool = False) -> None:
+                 test: bool = False, incremental: bool = True) -> None:
         self.name: str = name
         self.scenario: Scenario = scenario
+        self.incremental: bool = incremental
+        self.sat_cache: SatCache = SatCache()
 
         self.times: list[float] = [0.0]  # history
         self.time_steps: list[float] = [1.0]  # history
@@ -203,7 +286,10 @@ class Simulator:
 
         return min(result_, result)
 
-    def pre_check(self, phases: list[Phase], var_asserts: FNode, clock_asserts: FNode) -> list[list[Transition]]:
+    def pre_check(self, phases: list[Phase], var_asserts: FNode, clock_asserts: FNode,
+                  step_solver: StepSolver = None) -> list[list[Transition]]:
+        if step_solver is None:
+            step_solver = StepSolver(var_asserts, clock_asserts, self.sat_cache, self.incremental)
         result = []
 
         for i, transitions in enumerate(phases):
@@ -212,7 +298,7 @@ class Simulator:
 
             for e in transitions:
                 # Check the guard with var and clock asserts.
-                if not is_sat(And(e.guard, var_asserts, clock_asserts), solver_name=SOLVER_NAME, logic=LOGIC):
+                if not step_solver.is_sat(e.guard):
                     last_fail = And(e.guard, var_asserts, clock_asserts)
                     continue
 
@@ -222,7 +308,7 @@ class Simulator:
                 updated_clocks_assert = self.build_clocks_assertion(updated_clocks)
 
                 # Check the clock invariant of p'. (special case: last non-true phase has bound type '<=')
-                if not is_sat(And(e.dst.clock_invariant, updated_clocks_assert), solver_name=SOLVER_NAME, logic=LOGIC):
+                if not self.is_sat(And(e.dst.clock_invariant, updated_clocks_assert)):
                     continue
 
                 result_.append(e)
@@ -272,13 +358,17 @@ class Simulator:
         var_asserts = self.build_variables_assertion({k: v[-1] for k, v in self.variables.items()})
         clock_asserts = self.build_clocks_assertion(self.clocks[-1])
 
-        inputs = self.pre_check([v.phases[self.current_phases[-1][i]] for i, v in enumerate(self.peas)],
-                                var_asserts, clock_asserts)
+        step_solver = StepSolver(var_asserts, clock_asserts, self.sat_cache, self.incremental)
+        try:
+            inputs = self.pre_check([v.phases[self.current_phases[-1][i]] for i, v in enumerate(self.peas)],
+                                    var_asserts, clock_asserts, step_solver)
 
-        if self.sat_error is not None:
-            return False
+            if self.sat_error is not None:
+                return False
 
-        self.sat_results = self.cartesian_check(inputs, var_asserts, clock_asserts)
+            self.sat_results = self.cartesian_check(inputs, var_asserts, clock_asserts, step_solver=step_solver)
+        finally:
+            step_solver.exit()
         return len(self.sat_results) != 0
 
         # Compute cartesian product with intermediate checks
@@ -341,15 +431,27 @@ class Simulator:
 
         return True
 
+    def is_sat(self, formula: FNode) -> bool:
+        """ Check a formula independent of the step assertions (cached if incremental). """
+        if not self.incremental:
+            return is_sat(formula, solver_name=SOLVER_NAME, logic=LOGIC)
+
+        result = self.sat_cache.get((formula, None))
+        if result is None:
+            result = is_sat(formula, solver_name=SOLVER_NAME, logic=LOGIC)
+            self.sat_cache.put((formula, None), result)
+        return result
+
     def cartesian_check(self, phases: list[list[Transition]], var_asserts, clock_asserts, i: int = 0, guard=None,
                         trs=(),
-                        max_results=20, num_transitions=1) -> list[SatResult]:
+                        max_results=20, num_transitions=1, step_solver: StepSolver = None) -> list[SatResult]:
+        if step_solver is None:
+            step_solver = StepSolver(var_asserts, clock_asserts, self.sat_cache, self.incremental)
 
         # Terminate if tuple of transitions is complete.
         if i >= len(phases):
             #model = get_model(guard, solver_name=SOLVER_NAME, logic=LOGIC)
-            model = get_model(And(guard, var_asserts, clock_asserts), solver_name=SOLVER_NAME, logic=LOGIC)
-            values = model.get_values(self.variables.keys())
+            values = step_solver.get_values(guard, self.variables.keys())
             values.update({k: v[-1] for k, v in self.variables.items() if v[-1] is not None})
 
             return [Simulator.SatResult(trs, values, None)]
@@ -361,13 +463,13 @@ class Simulator:
             # Check conjunction of guards including the one of this transition with var and clock asserts.
             guard_ = And(guard, transition.guard) if guard is not None else And(transition.guard)
 
-            if not is_sat(And(guard_, var_asserts, clock_asserts), solver_name=SOLVER_NAME, logic=LOGIC):
+            if not step_solver.is_sat(guard_):
                 self.last_fail = guard_
                 continue
 
             # Call again to check transitions of next location.
             result.extend(self.cartesian_check(phases, var_asserts, clock_asserts, i + 1, guard_, trs + (transition,),
-                                               max_results, num_transitions))
+                                               max_results, num_transitions, step_solver))
 
             if self.max_results > 0 and num_transitions >= self.max_results and len(result) >= 1:
                 break
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import time
+
+from req_simulator.countertrace import CountertraceTransformer
+from req_simulator.phase_event_automaton import build_automaton
+from req_simulator.scenario import Scenario
+from req_simulator.simulator import Simulator
+from req_simulator.utils import get_countertrace_parser
+from reqtransformer import Requirement, Formalization
+from tests.test_req_simulator import test_counter_trace
+from tests.test_req_simulator.test_simulator import testcases
+
+ROUNDS = 10
+
+
+def build_simulator(pattern_name: str, expressions: dict, scenario_str: str, incremental: bool) -> Simulator:
+    _, ct_str, _ = test_counter_trace.testcases[pattern_name]
+    ct = CountertraceTransformer(expressions).transform(get_countertrace_parser().parse(ct_str))
+    pea = build_automaton(ct)
+    pea.requirement = Requirement(id='0', description='', type_in_csv='', csv_row={}, pos_in_csv=0)
+    pea.formalization = Formalization(id=0)
+    pea.countertrace_id = 0
+    return Simulator([pea], Scenario.from_json_string(scenario_str), test=True, incremental=incremental)
+
+
+def run_scenario(simulator: Simulator) -> tuple[list[float], bool]:
+    """ Run check_sat/step_next through the scenario. Returns the check_sat durations and whether it completed. """
+    durations = []
+    for i in range(len(simulator.scenario.times)):
+        duration = time.perf_counter()
+        sat = simulator.check_sat()
+        durations.append(time.perf_counter() - duration)
+        if not sat:
+            return durations, False
+        if i == len(simulator.scenario.times) - 1:
+            return durations, True
+        simulator.step_next(0)
+    return durations, False
+
+
+def benchmark(incremental: bool) -> dict[str, dict]:
+    stats = {}
+    for pattern_name, expressions, scenario_str in testcases:
+        simulator = build_simulator(pattern_name, expressions, scenario_str, incremental)
+        durations = []
+        completed = True
+        for _ in range(ROUNDS):
+            # Replay the scenario on the same simulator (as the simulator ui does when stepping back and forth).
+            while simulator.step_back():
+                pass
+            simulator.time_steps[-1] = simulator.scenario.times[1] - simulator.scenario.times[0]
+            durations_, completed_ = run_scenario(simulator)
+            durations += durations_
+            completed &= completed_
+        stats[pattern_name] = {
+            'completed': completed,
+            'steps': len(durations),
+            'avg_ms': sum(durations) / len(durations) * 1000,
+            'cache_hits': simulator.sat_cache.hits,
+            'cache_misses': simulator.sat_cache.misses
+        }
+    return stats
+
+
+def main():
+    one_shot = benchmark(incremental=False)
+    incremental = benchmark(incremental=True)
+
+    print(f'{"pattern":<40} {"one-shot ms":>12} {"incremental ms":>15} {"speedup":>8} {"cache hits":>11}')
+    for pattern_name in one_shot.keys():
+        a, b = one_shot[pattern_name], incremental[pattern_name]
+        assert a['completed'] == b['completed'], f'Results differ for {pattern_name}'
+        print(f'{pattern_name:<40} {a["avg_ms"]:>12.2f} {b["avg_ms"]:>15.2f} '
+              f'{a["avg_ms"] / b["avg_ms"]:>7.1f}x {b["cache_hits"]:>11}')
+
+    total_a = sum(s['avg_ms'] * s['steps'] for s in one_shot.values())
+    total_b = sum(s['avg_ms'] * s['steps'] for s in incremental.values())
+    print(f'\ntotal step latency: one-shot {total_a:.1f} ms, incremental {total_b:.1f} ms '
+          f'({total_a / total_b:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -3,6 +3,7 @@
 @copyright: 2018 Samuel Roth <samuel@smel.de>
 @licence: GPLv3
 """
+import bisect
 import csv
 import difflib
 import json
@@ -11,21 +12,26 @@ import os
 import pickle
 import re
 import string
-import subprocess
+import uuid
 from collections import defaultdict, OrderedDict
-from copy import deepcopy
-from dataclasses import dataclass, field
+from copy import copy, deepcopy
+from dataclasses import dataclass, field, replace
 from distutils.version import StrictVersion
 from enum import Enum
 from flask import current_app
 from lark import LarkError
 
 import boogie_parsing
-from boogie_parsing import run_typecheck_fixpoint, BoogieType
+import generations
+import revision_catalog
+import script_evaluations
+import variables_table
+from boogie_parsing import typecheck_expression, BoogieType
 from patterns import PATTERNS
-from static_utils import choice, get_filenames_from_dir, replace_prefix, try_cast_string
-from threading import Thread
-from typing import Dict, Tuple
+from requirement_store import get_requirement_store
+from static_utils import choice, replace_prefix, try_cast_string
+from threading import Lock, RLock, local
+from typing import Callable, Dict, FrozenSet, List, Optional, Set, Tuple
 
 __version__ = '1.0.4'
 
@@ -82,8 +88,11 @@ class Pickleable:
         if path is not None:
             self.my_path = path
 
-        with open(self.my_path, mode='wb') as out_file:
+        # Written to a temporary file first, so a concurrent load never reads a partially written object.
+        tmp_path = f'{self.my_path}.{uuid.uuid4().hex}.tmp'
+        with open(tmp_path, mode='wb') as out_file:
             pickle.dump(self, out_file)
+        os.replace(tmp_path, self.my_path)
 
 
 @dataclass
@@ -239,11 +248,19 @@ class RequirementCollection(HanforVersioned, Pickleable):
 
     def parse_csv_rows_into_requirements(self, app):
         """ Parse each row in csv_all_rows into one Requirement.
+        Formalizations are imported in bulk, see `formalization_import.FormalizationImport`.
 
         Args:
             app (Flask): Hanfor Flask app..
 
+        Returns:
+            ImportReport: Throughput and errors of the formalization import, None if no formalizations are imported.
         """
+        from formalization_import import FormalizationImport
+
+        formalization_import = FormalizationImport(
+            app, processes=app.config.get('FORMALIZATION_IMPORT_PROCESSES') or os.cpu_count() or 1
+        )
         for index, row in enumerate(self.csv_all_rows):
             # Todo: Use utils.slugify to make the rid save for a filename.
             requirement = Requirement(
@@ -265,21 +282,14 @@ class RequirementCollection(HanforVersioned, Pickleable):
                         logging.debug('Status {} not supported. Set to `Todo`'.format(status))
                         status = 'Todo'
                     requirement.status = status
-                # Parse and set the requirements.
-                formalizations = json.loads(row[self.csv_meta.formal_header])
-                for key, formalization_dict in formalizations.items():
-                    formalization = Formalization(int(key))
-                    requirement.formalizations[int(key)] = formalization
-                    requirement.update_formalization(
-                        formalization_id=int(key),
-                        scope_name=formalization_dict['scope'],
-                        pattern_name=formalization_dict['pattern'],
-                        mapping=formalization_dict['expressions'],
-                        app=app
-                    )
+                formalization_import.add(requirement, row[self.csv_meta.formal_header])
 
             self.requirements.append(requirement)
 
+        if self.csv_meta.import_formalizations:
+            return formalization_import.run()
+        return None
+
 
 class Requirement(HanforVersioned, Pickleable):
     def __init__(self, id: str, description: str, type_in_csv: str, csv_row: dict[str, str], pos_in_csv: int):
@@ -333,16 +343,30 @@ class Requirement(HanforVersioned, Pickleable):
         :param app: The flask app.
         :rtype: Requirement
         """
-        path = os.path.join(app.config['REVISION_FOLDER'], f'{id}.pickle')
-        if os.path.exists(path) and os.path.isfile(path):
-            return Requirement.load(path)
+        unit = VariableCollectionUnitOfWork.current()
+        if unit is not None and unit.pending(app.config['REVISION_FOLDER'], id) is not None:
+            return unit.pending(app.config['REVISION_FOLDER'], id)
+        requirement = get_requirement_store(app.config['REVISION_FOLDER']).load(id)
+        if requirement is not None:
+            return cls._upgrade(requirement)
 
     @classmethod
     def load(cls, path):
-        me = Pickleable.load(path)
+        unit = VariableCollectionUnitOfWork.current()
+        me = None
+        if unit is not None:
+            me = unit.pending(os.path.dirname(path), os.path.splitext(os.path.basename(path))[0])
+        if me is None:
+            me = get_requirement_store(os.path.dirname(path)).load_path(path)
+        if me is None:
+            raise FileNotFoundError(f'No requirement stored at `{path}`.')
         if not isinstance(me, cls):
             raise TypeError
 
+        return cls._upgrade(me)
+
+    @classmethod
+    def _upgrade(cls, me: 'Requirement') -> 'Requirement':
         if me.outdated:
             logging.info(f'`{me}` needs upgrade `{me.hanfor_version}` -> `{__version__}`')
             me.run_version_migrations()
@@ -351,17 +375,41 @@ class Requirement(HanforVersioned, Pickleable):
         return me
 
     @classmethod
-    def requirements(cls):
-        """ Iterator for all requirements."""
-        filenames = get_filenames_from_dir(current_app.config['REVISION_FOLDER'])
-        for filename in filenames:
+    def requirements(cls, folder: str = None, read_only: bool = False, rids: List[str] = None):
+        """ Iterator for all requirements (ordered by rid).
+
+        :param folder: The revision folder. Defaults to the REVISION_FOLDER of the current app.
+        :param read_only: Yield the shared cached requirements instead of private copies. They must not be modified.
+        :param rids: Only yield these requirements, in this order.
+        """
+        if folder is None:
+            folder = current_app.config['REVISION_FOLDER']
+        store = get_requirement_store(folder)
+        if rids is not None:
+            requirements = store.in_order(rids, read_only=read_only)
+        else:
+            requirements = store.snapshots() if read_only else store.requirements()
+        unit = VariableCollectionUnitOfWork.current()
+        for requirement in requirements:
             try:
-                yield cls.load(filename)
+                if unit is not None and unit.pending(folder, requirement.rid) is not None:
+                    yield unit.pending(folder, requirement.rid)
+                    continue
+                if read_only and requirement.outdated:
+                    requirement = store.load(requirement.rid)
+                yield cls._upgrade(requirement)
             except Exception:
-                logging.error(f'Loading {filename} failed spectacularly!')
+                logging.error(f'Loading {requirement.rid} failed spectacularly!')
 
     def store(self, path=None):
-        super().store(path)
+        if path is not None:
+            self.my_path = path
+        unit = VariableCollectionUnitOfWork.current()
+        if unit is not None and unit.defers(os.path.dirname(self.my_path)):
+            # Written when the unit of work is committed.
+            unit.defer_store(self)
+            return
+        get_requirement_store(os.path.dirname(self.my_path)).store(self)
 
     @property
     def revision_diff(self) -> Dict[str, str]:
@@ -388,6 +436,14 @@ class Requirement(HanforVersioned, Pickleable):
             if len(diff) > 0:
                 self._revision_diff[csv_key] = diff
 
+    @property
+    def used_variables(self) -> Set[str]:
+        """ The variables used by any formalization of this requirement. """
+        result = set()
+        for formalization in self.formalizations.values():
+            result.update(formalization.used_variables)
+        return result
+
     def _next_free_formalization_id(self):
         i = 0
         while i in self.formalizations.keys():
@@ -402,7 +458,7 @@ class Requirement(HanforVersioned, Pickleable):
 
     def delete_formalization(self, formalization_id, app):
         formalization_id = int(formalization_id)
-        variable_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+        variable_collection = VariableCollection.load_session(app)
 
         # Remove formalization
         del self.formalizations[formalization_id]
@@ -414,13 +470,12 @@ class Requirement(HanforVersioned, Pickleable):
                     remaining_vars = remaining_vars.union(expression.used_variables)
 
         # Update the mappings.
-        variable_collection.req_var_mapping[self.rid] = remaining_vars
-        variable_collection.var_req_mapping = variable_collection.invert_mapping(variable_collection.req_var_mapping)
+        variable_collection.set_usage(self.rid, remaining_vars)
         variable_collection.store(app.config['SESSION_VARIABLE_COLLECTION'])
 
     def update_formalization(self, formalization_id, scope_name, pattern_name, mapping, app, variable_collection=None):
         if variable_collection is None:
-            variable_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+            variable_collection = VariableCollection.load_session(app)
 
         # set scoped pattern
         self.formalizations[formalization_id].scoped_pattern = ScopedPattern(
@@ -484,9 +539,7 @@ class Requirement(HanforVersioned, Pickleable):
         if 'has_formalization' in self.tags:
             self.tags.pop('has_formalization')
         logging.debug(f'Updating formalisations of requirement {self.rid}.')
-        variable_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
-        # Reset the var mapping.
-        variable_collection.req_var_mapping[self.rid] = set()
+        variable_collection = VariableCollection.load_session(app)
 
         for formalization in formalizations.values():
             logging.debug(f"Updating formalization No. {formalization['id']}.")
@@ -503,6 +556,9 @@ class Requirement(HanforVersioned, Pickleable):
             except Exception as e:
                 logging.error(f'Could not update Formalization: {e.__str__()}')
                 raise e
+        # Drop usages of variables no longer used by any formalization.
+        variable_collection.set_usage(self.rid, self.used_variables)
+        variable_collection.store()
 
     def run_type_checks(self, var_collection):
         logging.info(f'Run type inference and unknown check for `{self.rid}`')
@@ -574,6 +630,8 @@ class Formalization(HanforVersioned):
     @property
     def used_variables(self):
         result = []
+        if self.expressions_mapping is None:
+            return result
         for exp in self.expressions_mapping.values():  # type: Expression
             result += exp.used_variables
         return list(set(result))
@@ -622,7 +680,7 @@ class Formalization(HanforVersioned):
             # Check if the given expression can be parsed by lark.
             # Else there is a syntax error in the expression.
             try:
-                tree = boogie_parsing.get_parser_instance().parse(expression.raw_expression)
+                boogie_parsing.get_expression_variables(expression.raw_expression)
             except LarkError as e:
                 logging.error(
                     f'Lark could not parse expression `{expression.raw_expression}`: \n {e}. Skipping type inference')
@@ -630,8 +688,8 @@ class Formalization(HanforVersioned):
             expression.set_expression(expression.raw_expression, variable_collection, expression.parent_rid)
 
             # Derive type for variables in expression and update missing or changed types.
-            ti = run_typecheck_fixpoint(tree, var_env, expected_types=allowed_types[key])
-            expression_type, type_env, type_errors = ti.type_root.t, ti.type_env, ti.type_errors
+            ti = typecheck_expression(expression.raw_expression, var_env, expected_types=allowed_types[key])
+            expression_type, type_env, type_errors = ti.t, ti.type_env, list(ti.type_errors)
 
             # Add type error if a variable is used in a timing expression
             if allowed_types[key] != [BoogieType.bool]:
@@ -674,6 +732,26 @@ class Formalization(HanforVersioned):
         return self.scoped_pattern.get_string(self.expressions_mapping)
 
 
+def rename_vars_in_expressions(formalization: Formalization, mapping: Dict[str, str]) -> bool:
+    """ Replace the variables in all expressions of a formalization according to mapping (old name -> new name).
+
+    :return: True if any expression changed.
+    """
+    changed = False
+    if formalization.expressions_mapping is None:
+        return changed
+    for expression in formalization.expressions_mapping.values():
+        if expression.raw_expression is None:
+            continue
+        used_variables = boogie_parsing.get_expression_variables(expression.raw_expression)
+        if used_variables.isdisjoint(mapping.keys()):
+            continue
+        expression.raw_expression = boogie_parsing.replace_vars_in_expression(expression.raw_expression, mapping)
+        expression.used_variables = {mapping.get(name, name) for name in used_variables}
+        changed = True
+    return changed
+
+
 class Expression(HanforVersioned):
     """ Representing an Expression in a ScopedPattern.
     For example: Let
@@ -700,10 +778,7 @@ class Expression(HanforVersioned):
         self.parent_rid = parent_rid
         logging.debug(f'Setting expression: `{expression}`')
         # Get the vars occurring in the expression.
-        parser = boogie_parsing.get_parser_instance()
-        tree = parser.parse(expression)
-
-        self.used_variables = set(boogie_parsing.get_variables_list(tree))
+        self.used_variables = set(boogie_parsing.get_expression_variables(expression))
 
         new_vars = []
         for var_name in self.used_variables:
@@ -867,8 +942,15 @@ class VariableCollection(HanforVersioned, Pickleable):
         HanforVersioned.__init__(self)
         Pickleable.__init__(self, path)
         self.collection: Dict[str, Variable] = dict()
-        self.req_var_mapping = dict()
-        self.var_req_mapping = dict()
+        # Usage index in both directions: requirement id or constraint name -> used variables and its inverse.
+        # Maintained incrementally by `set_usage`. `refresh_var_usage` rebuilds it from scratch.
+        self.req_var_mapping: Dict[str, Set[str]] = dict()
+        self.var_req_mapping: Dict[str, Set[str]] = dict()
+        self.usage_index_verified = True
+        # Enum index: enum name -> names of its enumerators, the inverse of `Variable.belongs_to_enum`.
+        # Maintained by `set_enum` and everything adding, deleting or renaming variables. `refresh_enum_index`
+        # rebuilds it from scratch.
+        self._enum_index: Dict[str, Set[str]] = dict()
 
     def __contains__(self, item):
         return item in self.collection.keys()
@@ -886,6 +968,18 @@ class VariableCollection(HanforVersioned, Pickleable):
 
         return me
 
+    @classmethod
+    def load_session(cls, app) -> 'VariableCollection':
+        """ The variable collection of the current session. Within a unit of work this is the collection shared by
+        all code of the unit (see `VariableCollectionUnitOfWork`), otherwise it is loaded from disk.
+
+        :param app: Hanfor flask app for context.
+        """
+        unit = VariableCollectionUnitOfWork.current()
+        if unit is not None and unit.path == app.config['SESSION_VARIABLE_COLLECTION']:
+            return unit.var_collection
+        return cls.load(app.config['SESSION_VARIABLE_COLLECTION'])
+
     def get_available_vars_list(self, sort_by=None, used_only=False, exclude_types=frozenset()):
         """ Returns a list of all available var names."""
 
@@ -923,10 +1017,77 @@ class VariableCollection(HanforVersioned, Pickleable):
                 variable = Variable(var_name, None, None)
             logging.debug(f'Adding variable `{var_name}` to collection.')
             self.collection[variable.name] = variable
+            self._index_enumerator(variable.name)
 
     def store(self, path=None):
-        self.var_req_mapping = self.invert_mapping(self.req_var_mapping)
+        unit = VariableCollectionUnitOfWork.current()
+        if unit is not None and unit.owns(self) and path in (None, unit.path):
+            # Written once when the unit of work is committed.
+            unit.mark_dirty()
+            return
         super().store(path)
+        revision_catalog.mark_dirty(os.path.dirname(self.my_path), len(self.collection))
+        generations.bump(generations.VARIABLES, os.path.dirname(self.my_path))
+        variables_table.stored(os.path.dirname(self.my_path), self)
+
+    @property
+    def usage_index_verified(self) -> bool:
+        """ False if the usage index might not match the requirements and constraints (e.g. legacy collections). """
+        if not hasattr(self, '_usage_index_verified'):
+            self._usage_index_verified = False
+        return self._usage_index_verified
+
+    @usage_index_verified.setter
+    def usage_index_verified(self, val: bool):
+        self._usage_index_verified = val
+
+    @property
+    def enum_index(self) -> Dict[str, Set[str]]:
+        """ Enum name -> names of its enumerators. Built on first use for collections stored without it. """
+        if not hasattr(self, '_enum_index'):
+            self._enum_index = self.compute_enum_index()
+        return self._enum_index
+
+    def _index_enumerator(self, name: str):
+        enum_name = self.collection[name].belongs_to_enum
+        if enum_name:
+            self.enum_index.setdefault(enum_name, set()).add(name)
+
+    def _unindex_enumerator(self, name: str):
+        enum_name = self.collection[name].belongs_to_enum
+        enumerators = self.enum_index.get(enum_name)
+        if enumerators is not None:
+            enumerators.discard(name)
+            if len(enumerators) == 0:
+                del self.enum_index[enum_name]
+
+    def set_enum(self, enumerator_name: str, enum_name: str):
+        """ Let the variable `enumerator_name` belong to the enum `enum_name` ('' for none). """
+        self._unindex_enumerator(enumerator_name)
+        self.collection[enumerator_name].belongs_to_enum = enum_name
+        self._index_enumerator(enumerator_name)
+
+    def compute_enum_index(self) -> Dict[str, Set[str]]:
+        """ Derive the enum index from scratch by scanning all variables. """
+        index = dict()
+        for name, var in self.collection.items():
+            if var.belongs_to_enum:
+                index.setdefault(var.belongs_to_enum, set()).add(name)
+        return index
+
+    def refresh_enum_index(self) -> bool:
+        """ Rebuild the enum index from all variables.
+
+        :return: True if the maintained index was consistent with the rebuilt one.
+        """
+        index = self.compute_enum_index()
+        consistent = index == self.enum_index
+        if not consistent:
+            differing = {enum for enum in index.keys() | self.enum_index.keys()
+                         if index.get(enum) != self.enum_index.get(enum)}
+            logging.info(f'Enum index differs for {len(differing)} enums. Rebuilt it.')
+        self._enum_index = index
+        return consistent
 
     def invert_mapping(self, mapping):
         newdict = {}
@@ -936,12 +1097,39 @@ class VariableCollection(HanforVersioned, Pickleable):
         return newdict
 
     def map_req_to_vars(self, rid, used_variables):
-        """ Map a requirement by rid to used vars."""
+        """ Map a requirement by rid to used vars (in addition to the vars it already uses)."""
+        self.set_usage(rid, self.req_var_mapping.get(rid, set()).union(used_variables))
 
-        if rid not in self.req_var_mapping.keys():
-            self.req_var_mapping[rid] = set()
-        for var in used_variables:
-            self.req_var_mapping[rid].add(var)
+    def set_usage(self, user: str, used_variables):
+        """ Set the variables used by a requirement or constraint, replacing its former usage.
+        Only the difference to the former usage is applied to both directions of the usage index.
+
+        :param user: A requirement id or constraint name `Constraint_<var name>_<constraint id>`.
+        :param used_variables: The variable names used by `user`.
+        """
+        old_usage = self.req_var_mapping.get(user, set())
+        new_usage = set(used_variables)
+        for var_name in old_usage - new_usage:
+            users = self.var_req_mapping.get(var_name)
+            if users is not None:
+                users.discard(user)
+                if len(users) == 0:
+                    del self.var_req_mapping[var_name]
+        for var_name in new_usage - old_usage:
+            self.var_req_mapping.setdefault(var_name, set()).add(user)
+        if len(new_usage) > 0:
+            self.req_var_mapping[user] = new_usage
+        else:
+            self.req_var_mapping.pop(user, None)
+
+    def rename_usage(self, old_name: str, new_name: str):
+        """ Let all users of variable `old_name` use `new_name` instead. """
+        users = self.var_req_mapping.pop(old_name, set())
+        for user in users:
+            self.req_var_mapping[user].discard(old_name)
+            self.req_var_mapping[user].add(new_name)
+        if len(users) > 0:
+            self.var_req_mapping.setdefault(new_name, set()).update(users)
 
     def rename(self, old_name: str, new_name: str, app):
         """ Rename a var in the collection. Merges the variables if new_name variable exists.
@@ -951,66 +1139,92 @@ class VariableCollection(HanforVersioned, Pickleable):
         :returns affected_enumerators List [(old_enumerator_name, new_enumerator_name)] of potentially affected
         enumerators.
         """
-        logging.info(f'Rename `{old_name}` -> `{new_name}`')
-        # Store constraints to restore later on.
-        tmp_constraints = []
-        if old_name in self.collection:
-            tmp_constraints += self.collection[old_name].get_constraints().values()
-        if new_name in self.collection:
-            tmp_constraints += self.collection[new_name].get_constraints().values()
-        tmp_constraints = dict(enumerate(tmp_constraints))
-
-        # Copy to new location.
-        self.collection[new_name] = self.collection.pop(old_name)
-        # Update name to new name (rename also triggers to update constraint names.)
-        self.collection[new_name].rename(new_name)
-        # Copy back back Constraints
-        self.collection[new_name].constraints = tmp_constraints
+        mapping = self.rename_vars({old_name: new_name}, app)
+        return [(old, new) for old, new in mapping.items() if old != old_name]
 
-        # Update the mappings.
-        # Copy old to new mapping
-        self.var_req_mapping[new_name] = self.var_req_mapping \
-            .pop(old_name, set()) \
-            .union(self.var_req_mapping.pop(new_name, set()))
-
-        # Rename
-        # Todo: this is inefficient. Parse the var name from constraint name to limit only for affected vars.
-        for affected_var_name in self.collection.keys():
-            try:
-                self.collection[affected_var_name].rename_var_in_constraints(old_name, new_name)
-            except Exception as e:
-                logging.debug(f'`{affected_var_name}` constraints not updatable: {e}')
+    def expand_rename_mapping(self, mapping: Dict[str, str]) -> Dict[str, str]:
+        """ Add the enumerators of renamed enums to a rename mapping (old name -> new name).
+        Enumerators are renamed by replacing the enum name prefix, unless they are renamed explicitly.
+        """
+        result = dict(mapping)
+        for old_name, new_name in mapping.items():
+            if old_name not in self.collection or self.collection[old_name].type not in ['ENUM_INT', 'ENUM_REAL']:
+                continue
+            for name in sorted(self.enum_index.get(old_name, ())):
+                if name not in result:
+                    result[name] = replace_prefix(name, old_name, new_name)
+        return result
 
-        # Update the constraint names if any
-        def rename_constraint(name: str, old_name: str, new_name: str):
-            match = re.match(Variable.CONSTRAINT_REGEX, name)
-            if match is not None and match.group(2) == old_name:
-                return name.replace(old_name, new_name)
-            return name
+    def rename_vars(self, mapping: Dict[str, str], app) -> Dict[str, str]:
+        """ Rename many variables at once. Each affected constraint is rewritten once.
+        Merges a variable into an existing variable of the new name (not renamed itself).
+        Only changes this collection in memory, requirements are updated by `utils.rename_variables`.
 
-        # Todo: this is even more inefficient :-(
-        for key in self.var_req_mapping.keys():
-            self.var_req_mapping[key] = {rename_constraint(name, old_name, new_name) for name in
-                                         self.var_req_mapping[key]}
+        :param mapping: Old var name -> new var name. Enumerators of renamed enums are added.
+        :param app: Hanfor flask app for context.
+        :return: The applied mapping including the enumerators.
+        """
+        mapping = {old: new for old, new in self.expand_rename_mapping(mapping).items() if old != new}
+        for old_name in mapping.keys():
+            if old_name not in self.collection:
+                raise KeyError(f'Variable `{old_name}` does not exist.')
+        logging.info(f'Rename {len(mapping)} variables: {mapping}')
+
+        # Variables owning constraints that use renamed variables (as given by the usage index).
+        affected_owners = set()
+        affected_users = set()
+        for old_name in mapping.keys():
+            for user in self.var_req_mapping.get(old_name, set()):
+                affected_users.add(user)
+                match = re.match(Variable.CONSTRAINT_REGEX, user)
+                if match is not None and match.group(2) in self.collection:
+                    affected_owners.add(match.group(2))
+
+        # Drop the usages of the constraints of renamed and merged variables, they are renumbered below.
+        moved_names = set(mapping.keys()) | set(mapping.values())
+        for name in moved_names:
+            if name in self.collection:
+                for constraint_id in self.collection[name].get_constraints().keys():
+                    self.set_usage('Constraint_{}_{}'.format(name, constraint_id), ())
+
+        # Move the variables, merge constraints if the new name already exists.
+        for name in moved_names:
+            if name in self.collection:
+                self._unindex_enumerator(name)
+        moved_vars = {old_name: self.collection.pop(old_name) for old_name in mapping.keys()}
+        for old_name, var in moved_vars.items():
+            new_name = mapping[old_name]
+            constraints = list(var.get_constraints().values())
+            if new_name in self.collection:
+                constraints = list(self.collection[new_name].get_constraints().values()) + constraints
+            var.name = new_name
+            var.constraints = dict(enumerate(constraints))
+            if var.belongs_to_enum in mapping:
+                var.belongs_to_enum = mapping[var.belongs_to_enum]
+            self.collection[new_name] = var
+        for new_name in set(mapping.values()):
+            self._index_enumerator(new_name)
+
+        # Rewrite every affected constraint once.
+        rewritten_owners = {mapping.get(name, name) for name in affected_owners} | set(mapping.values())
+        for owner in rewritten_owners:
+            if owner in self.collection:
+                try:
+                    self.collection[owner].rename_vars_in_constraints(mapping)
+                except Exception as e:
+                    logging.debug(f'`{owner}` constraints not updatable: {e}')
 
-        # Update the req -> var mapping.
-        self.req_var_mapping = self.invert_mapping(self.var_req_mapping)
+        # Update the mappings.
+        for user in affected_users:
+            if user in self.req_var_mapping:
+                self.set_usage(user, {mapping.get(name, name) for name in self.req_var_mapping[user]})
+        for new_name in set(mapping.values()):
+            for constraint_id, constraint in self.collection[new_name].get_constraints().items():
+                self.set_usage('Constraint_{}_{}'.format(new_name, constraint_id), constraint.used_variables)
 
         # Update the variable script results.
-        self.reload_script_results(app, [new_name])
-
-        # Rename the enumerators in case this renaming affects an enum.
-        affected_enumerators = []
-        if self.collection[new_name].type in ['ENUM_INT', 'ENUM_REAL']:
-            for var in self.collection.values():
-                if var.belongs_to_enum == old_name:
-                    var.belongs_to_enum = new_name
-                    old_enumerator_name = var.name
-                    new_enumerator_name = replace_prefix(var.name, old_name, new_name)
-                    affected_enumerators.append((old_enumerator_name, new_enumerator_name))
-        for old_enumerator_name, new_enumerator_name in affected_enumerators:
-            self.rename(old_enumerator_name, new_enumerator_name, app)
-        return affected_enumerators
+        self.reload_script_results(app, list(set(mapping.values())))
+        return mapping
 
     def get_boogie_type_env(self):
         mapping = {
@@ -1073,84 +1287,53 @@ class VariableCollection(HanforVersioned, Pickleable):
         return self.collection[var_name].add_constraint()
 
     def del_constraint(self, var_name, constraint_id):
-        self.req_var_mapping.pop('Constraint_{}_{}'.format(var_name, constraint_id), None)
+        self.set_usage('Constraint_{}_{}'.format(var_name, constraint_id), ())
         return self.collection[var_name].del_constraint(constraint_id)
 
-    def refresh_var_constraint_mapping(self):
-        def not_in_constraint(var_name, constraint_name):
-            """ Checks if var_name is used in constraint_name (if constraint_name is existing).
-
-            :param var_name:
-            :param constraint_name:
-            :return:
-            """
-            match = re.match(Variable.CONSTRAINT_REGEX, constraint_name)
-            if match:
-                constraint_variable_name = match.group(2)
-                if constraint_variable_name not in self.collection.keys():
-                    # The referenced variable is no longer existing.
-                    try:
-                        self.req_var_mapping[constraint_name].discard(var_name)
-                    except Exception:
-                        pass
-                    return True
-                else:
-                    # The variable exists. Now check if var_name occurs in one of its constraints.
-                    for constraint in self.collection[constraint_variable_name].get_constraints().values():
-                        if var_name in constraint.get_string():
-                            return False
-                    try:
-                        self.req_var_mapping[constraint_name].discard(var_name)
-                    except Exception:
-                        pass
-                    return True
-
-            return False
-
-        for name, variable in self.collection.items():
-            if name in self.var_req_mapping:
-                self.var_req_mapping[name] = {
-                    c_name for c_name in self.var_req_mapping[name] if not not_in_constraint(name, c_name)
-                }
-
     def reload_type_inference_errors_in_constraints(self):
         for name, var in self.collection.items():
             if len(var.get_constraints()) > 0:
                 var.reload_constraints_type_inference_errors(self)
                 self.collection[name] = var
+        logging.info(f'Expression caches after constraint type inference: {boogie_parsing.expression_cache_info()}')
 
-    def refresh_var_usage(self, app):
-        filenames = get_filenames_from_dir(app.config['REVISION_FOLDER'])
-        mapping = dict()
-
-        # Add the requirements using this variable.
-        for filename in filenames:
-            try:
-                req = Requirement.load(filename)
-            except TypeError:
-                continue
-            for formalization in req.formalizations.values():
-                try:
-                    for var_name in formalization.used_variables:
-                        if var_name not in mapping.keys():
-                            mapping[var_name] = set()
-                        mapping[var_name].add(req.rid)
-                except TypeError:
-                    pass
-                except Exception as e:
-                    logging.info('Could not read formalizations for `{}`: {}'.format(req.rid, e))
-                    raise e
+    def compute_var_usage(self, app, requirement_usage: Dict[str, Set[str]] = None) -> Dict[str, Set[str]]:
+        """ Derive the usage (requirement id or constraint name -> used variables) from scratch by scanning all
+        requirements and constraints.
 
-        # Add the constraints using this variable.
+        :param requirement_usage: The usage of the requirements if scanned already, only constraints are scanned then.
+        """
+        if requirement_usage is not None:
+            usage = dict(requirement_usage)
+        else:
+            usage = dict()
+            for req in Requirement.requirements(app.config['REVISION_FOLDER'], read_only=True):
+                used_variables = req.used_variables
+                if len(used_variables) > 0:
+                    usage[req.rid] = used_variables
         for var in self.collection.values():
-            for constraint in var.get_constraints().values():
-                for constraint_id, expression in enumerate(constraint.expressions_mapping.values()):
-                    for var_name in expression.used_variables:
-                        if var_name not in mapping.keys():
-                            mapping[var_name] = set()
-                        mapping[var_name].add('Constraint_{}_{}'.format(var.name, constraint_id))
+            for constraint_id, constraint in var.get_constraints().items():
+                used_variables = set(constraint.used_variables)
+                if len(used_variables) > 0:
+                    usage['Constraint_{}_{}'.format(var.name, constraint_id)] = used_variables
+        return usage
 
-        self.var_req_mapping = mapping
+    def refresh_var_usage(self, app, requirement_usage: Dict[str, Set[str]] = None) -> bool:
+        """ Rebuild the usage index from all requirements and constraints.
+
+        :param requirement_usage: The usage of the requirements if scanned already, see `compute_var_usage`.
+        :return: True if the maintained index was consistent with the rebuilt one.
+        """
+        usage = self.compute_var_usage(app, requirement_usage)
+        maintained = {user: set(used) for user, used in self.req_var_mapping.items() if len(used) > 0}
+        consistent = usage == maintained and self.var_req_mapping == self.invert_mapping(usage)
+        if not consistent:
+            differing = {user for user in usage.keys() | maintained.keys() if usage.get(user) != maintained.get(user)}
+            logging.info(f'Variable usage index differs for {len(differing)} requirements/constraints. Rebuilt it.')
+        self.req_var_mapping = usage
+        self.var_req_mapping = self.invert_mapping(usage)
+        self.usage_index_verified = True
+        return consistent
 
     def del_var(self, var_name) -> bool:
         """ Delete a variable if it is not used, or only used by its own constraints.
@@ -1169,17 +1352,17 @@ class VariableCollection(HanforVersioned, Pickleable):
                 deletable = True
 
         if deletable:
+            if var_name in self.collection:
+                for constraint_id in self.collection[var_name].get_constraints().keys():
+                    self.set_usage('Constraint_{}_{}'.format(var_name, constraint_id), ())
+                self._unindex_enumerator(var_name)
             self.collection.pop(var_name, None)
             self.var_req_mapping.pop(var_name, None)
             return True
         return False
 
     def get_enumerators(self, enum_name: str) -> list['Variable']:
-        enumerators = []
-        for other_var in self.collection.values():
-            if other_var.belongs_to_enum == enum_name:
-                enumerators.append(other_var)
-        return enumerators
+        return [self.collection[name] for name in sorted(self.enum_index.get(enum_name, ()))]
 
     def run_version_migrations(self):
         logging.info(
@@ -1215,48 +1398,15 @@ class VariableCollection(HanforVersioned, Pickleable):
                             enumerator_name,
                             self.collection[enumerator_name].type
                         ))
+        self.refresh_enum_index()
         super().run_version_migrations()
 
-    def script_eval(self, env, script_filename, script, params_config, var_names, app):
-        with app.app_context():
-            results = dict()
-            for name in var_names:
-                params = [param.replace('$VAR_NAME', name) for param in params_config]
-                logging.debug('Eval script: `{}` using params `{}` for var `{}`'.format(
-                    script_filename,
-                    params,
-                    name
-                ))
-                try:
-                    result = subprocess.check_output(
-                        [script] + params,
-                        shell=True,
-                        env=env,
-                        stderr=subprocess.DEVNULL
-                    ).decode()
-                except subprocess.CalledProcessError as e:
-                    result = 'Output: {}'.format(e.output.decode())
-                results[name] = 'Results for `{}` <br> {} <br>'.format(
-                    script_filename, result
-                )
-            logging.info('Store script eval for script: {}'.format(script_filename))
-
-            # Update script_results.
-            script_results = ScriptEvals.load(path=app.config['SCRIPT_EVAL_RESULTS_PATH'])
-            script_results.update_evals(results, script_filename)
-            script_results.store()
-
-    def start_script_eval_thread(self, env, script_filename, script, params_config, var_names, app):
-        Thread(
-            target=self.script_eval,
-            args=(env, script_filename, script, params_config, var_names, app)
-        ).start()
-
-    def reload_script_results(self, app, var_names=None):
+    def reload_script_results(self, app, var_names=None, force=False):
         """ Run the script evaluations for the variables in this collection as set in the config.py
 
         :param var_names: Iterable object of variable names the script should be reevaluated. Uses all if None
         :param app: Hanfor flask app for context.
+        :param force: Also evaluate variables with a result of the current script (see `script_evaluations`).
         """
         logging.info('Start variable script evaluations.')
         if var_names is None:
@@ -1271,6 +1421,7 @@ class VariableCollection(HanforVersioned, Pickleable):
         env["PATH"] = "/usr/sbin:/sbin:" + env["PATH"]
 
         # Eval each script given by the config
+        scripts = list()
         for script_filename, params_config in app.config['SCRIPT_EVALUATIONS'].items():
             # First load the script to prevent permission issues.
             try:
@@ -1280,25 +1431,190 @@ class VariableCollection(HanforVersioned, Pickleable):
             except Exception as e:
                 logging.error('Could not load `{}` to eval variable scrypt results: `{}`'.format(script_filename, e))
                 continue
-            self.start_script_eval_thread(
-                env=env,
-                script_filename=script_filename,
-                script=script,
-                params_config=params_config,
-                var_names=var_names,
-                app=app
-            )
+            scripts.append(script_evaluations.Script(script_filename, script, list(params_config)))
+        if len(scripts) > 0:
+            script_evaluations.get_session_scheduler(app).schedule(scripts, list(var_names), env, force=force)
 
     def import_session(self, import_collection):
         """ Import another VariableCollection into this.
 
         :param import_collection: The other VariableCollection
+        :return: Names of the variables added to this collection.
         """
+        imported_var_names = []
         for var_name, variable in import_collection.collection.items():
             if var_name in self.collection:
                 pass
             else:
                 self.collection[var_name] = variable
+                self._index_enumerator(var_name)
+                imported_var_names.append(var_name)
+                for constraint_id, constraint in variable.get_constraints().items():
+                    self.set_usage('Constraint_{}_{}'.format(var_name, constraint_id), constraint.used_variables)
+        return imported_var_names
+
+
+# Session variable collection path -> lock held by the unit of work that loaded the collection.
+_session_locks: Dict[str, RLock] = dict()
+_session_locks_lock = Lock()
+
+
+def _session_lock(path: str) -> RLock:
+    with _session_locks_lock:
+        return _session_locks.setdefault(os.path.abspath(path), RLock())
+
+
+class VariableCollectionConflict(RuntimeError):
+    """ The session variable collection was stored by someone else since a unit of work loaded it. """
+
+
+class VariableCollectionUnitOfWork:
+    """ Shares one loaded session VariableCollection between everything done in an API request or CLI batch.
+
+    Use `VariableCollection.load_session(app)` to get the shared collection. `store()` on it only marks the unit
+    dirty, the collection is written once on `commit`. With `defer_requirements`, storing a requirement of the
+    revision only queues it for `commit` as well (loading it again in the unit returns the queued requirement).
+    Leaving the unit with an exception drops the queued changes, so nothing of the unit is written.
+
+    Units only reading the collection run concurrently. A unit takes the session lock on its first write (storing the
+    collection or a requirement) and holds it until it is left, so writes of concurrent units are serialized. If the
+    collection was stored by another unit between loading it and the first write, the changes are based on an outdated
+    collection: the unit writes nothing and `commit` raises `VariableCollectionConflict` (see `run_in_unit_of_work`).
+    An `exclusive` unit takes the lock when entered and never conflicts.
+    """
+    _active = local()
+
+    def __init__(self, path: str, defer_requirements: bool = False, exclusive: bool = False):
+        self.path = path
+        self.defer_requirements = defer_requirements
+        self.exclusive = exclusive
+        self._var_collection = None
+        self._version = None
+        self._requirements: Dict[str, 'Requirement'] = dict()
+        self._lock = None
+        self.conflict = False
+        self.dirty = False
+
+    @classmethod
+    def current(cls) -> 'VariableCollectionUnitOfWork':
+        """ The unit of work active in this thread or None. """
+        return getattr(cls._active, 'unit', None)
+
+    @property
+    def var_collection(self) -> VariableCollection:
+        if self._var_collection is None:
+            # Taken before loading: a store in between is reported as conflict instead of being missed.
+            self._version = self.stored_version()
+            self._var_collection = VariableCollection.load(self.path)
+        return self._var_collection
+
+    def stored_version(self) -> tuple:
+        """ Changes with every store of the collection, by this process (generation) or another one (file stat). """
+        try:
+            stat = os.stat(self.path)
+            file_version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            file_version = None
+        return generations.get(generations.VARIABLES, os.path.dirname(self.path)), file_version
+
+    def _lock_for_write(self):
+        """ Take the session lock on the first write and check that the loaded collection is still current. """
+        if self._lock is not None:
+            return
+        self._lock = _session_lock(self.path)
+        self._lock.acquire()
+        if self._var_collection is not None and self._version != self.stored_version():
+            logging.info(f'Variable collection `{self.path}` was stored since this unit of work loaded it.')
+            self.conflict = True
+
+    def owns(self, var_collection: VariableCollection) -> bool:
+        return self._var_collection is not None and var_collection is self._var_collection
+
+    def mark_dirty(self):
+        self._lock_for_write()
+        self.dirty = True
+
+    def defers(self, folder: str) -> bool:
+        """ True if requirements stored to the revision folder are written on commit. """
+        return self.defer_requirements and os.path.abspath(folder) == os.path.abspath(os.path.dirname(self.path))
+
+    def defer_store(self, requirement: 'Requirement'):
+        self._lock_for_write()
+        self._requirements[requirement.rid] = requirement
+
+    def pending(self, folder: str, rid: str) -> Optional['Requirement']:
+        """ The requirement queued for storing to the revision folder by this unit or None. """
+        if not self.defers(folder):
+            return None
+        return self._requirements.get(rid)
+
+    def commit(self):
+        """ Store the queued requirements and the shared collection if it was changed.
+
+        :raises VariableCollectionConflict: If the changes are based on an outdated collection. Nothing is stored.
+        """
+        if self.conflict:
+            self.rollback()
+            raise VariableCollectionConflict(f'Variable collection `{self.path}` was changed concurrently.')
+        if self._requirements:
+            logging.debug(f'Storing {len(self._requirements)} requirements of unit of work.')
+            get_requirement_store(os.path.dirname(self.path)).store_many(self._requirements.values())
+            self._requirements = dict()
+        if self.dirty:
+            logging.debug(f'Storing variable collection of unit of work to `{self.path}`.')
+            Pickleable.store(self._var_collection, self.path)
+            revision_catalog.mark_dirty(os.path.dirname(self.path), len(self._var_collection.collection))
+            generations.bump(generations.VARIABLES, os.path.dirname(self.path))
+            variables_table.stored(os.path.dirname(self.path), self._var_collection)
+            self._version = self.stored_version()
+            self.dirty = False
+
+    def rollback(self):
+        """ Drop the shared collection, the queued requirements and all unstored changes to them. """
+        self._var_collection = None
+        self._requirements = dict()
+        self.conflict = False
+        self.dirty = False
+
+    def __enter__(self) -> 'VariableCollectionUnitOfWork':
+        if self.current() is not None:
+            raise RuntimeError('There is already an active unit of work in this thread.')
+        if self.exclusive:
+            self._lock_for_write()
+        self._active.unit = self
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            if exc_type is None:
+                self.commit()
+            else:
+                self.rollback()
+        finally:
+            self._active.unit = None
+            if self._lock is not None:
+                self._lock.release()
+                self._lock = None
+
+
+def run_in_unit_of_work(path: str, func: Callable, *args, defer_requirements: bool = False, attempts: int = 3,
+                        **kwargs):
+    """ Run `func(*args, **kwargs)` in a unit of work on the variable collection at `path` and return its result.
+
+    A run conflicting with a concurrent unit (see `VariableCollectionUnitOfWork`) is repeated. The last attempt runs
+    in an exclusive unit, so it cannot conflict.
+
+    :param path: Path of the session variable collection.
+    :param func: Run in the unit of work, possibly more than once.
+    :param defer_requirements: Store requirements on commit of the unit.
+    :param attempts: Number of runs before giving up on concurrent units.
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            with VariableCollectionUnitOfWork(path, defer_requirements, exclusive=attempt == attempts):
+                return func(*args, **kwargs)
+        except VariableCollectionConflict:
+            logging.info(f'Repeating unit of work on `{path}` ({attempt} of {attempts} attempts conflicted).')
 
 
 class Variable(HanforVersioned):
@@ -1425,6 +1741,8 @@ class Variable(HanforVersioned):
             self.constraints[constraint_id].expressions_mapping[key] = expression
         self.constraints[constraint_id].get_string()
         self.constraints[constraint_id].type_inference_check(variable_collection)
+        variable_collection.set_usage('Constraint_{}_{}'.format(self.name, constraint_id),
+                                      self.constraints[constraint_id].used_variables)
 
         if len(self.constraints[constraint_id].type_inference_errors) > 0:
             logging.debug('Type inference Error in variable `{}` constraint `{}` at {}.'.format(
@@ -1446,7 +1764,7 @@ class Variable(HanforVersioned):
         logging.debug(f"Updating constraints for variable `{self.name}`.")
         self.remove_tag('Type_inference_error')
         if variable_collection is None:
-            variable_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+            variable_collection = VariableCollection.load_session(app)
 
         for constraint in constraints.values():
             logging.debug(f"Updating formalization No. {constraint['id']}.")
@@ -1464,19 +1782,12 @@ class Variable(HanforVersioned):
         return variable_collection
 
     def rename_var_in_constraints(self, old_name, new_name):
-        # replace in every formalization
-        for index, constraint in self.get_constraints().items():
-            for key, expression in constraint.expressions_mapping.items():
-                if old_name not in expression.raw_expression:
-                    continue
-                new_expression = boogie_parsing.replace_var_in_expression(
-                    expression=expression.raw_expression,
-                    old_var=old_name,
-                    new_var=new_name
-                )
-                self.constraints[index].expressions_mapping[key].raw_expression = new_expression
-                self.constraints[index].expressions_mapping[key].used_variables.discard(old_name)
-                self.constraints[index].expressions_mapping[key].used_variables.add(new_name)
+        self.rename_vars_in_constraints({old_name: new_name})
+
+    def rename_vars_in_constraints(self, mapping: Dict[str, str]):
+        """ Replace the variables in every constraint expression according to mapping (old name -> new name). """
+        for constraint in self.get_constraints().values():
+            rename_vars_in_expressions(constraint, mapping)
 
     def rename(self, new_name):
         old_name = self.name
@@ -1489,15 +1800,9 @@ class Variable(HanforVersioned):
         :return: The parent enum name
         :param variable_collection:
         """
-        result = ''
-        if self.type == 'ENUMERATOR':
-            for other_var_name in variable_collection.collection.keys():
-                if (len(self.name) > len(other_var_name)
-                        and variable_collection.collection[other_var_name].type == 'ENUM'
-                        and self.name.startswith(other_var_name)):
-                    result = other_var_name
-                    break
-        return result
+        if self.belongs_to_enum in variable_collection:
+            return self.belongs_to_enum
+        return ''
 
     def get_enumerators(self, variable_collection):
         """ Returns a list of enumerator names, in case this variable is an enum.
@@ -1505,15 +1810,7 @@ class Variable(HanforVersioned):
         :param variable_collection:
         :return: List of enumerator names.
         """
-        result = []
-        if self.type == 'ENUM':
-            for other_var_name in variable_collection.collection.keys():
-                if (len(self.name) < len(other_var_name)
-                        and variable_collection.collection[other_var_name].type == 'ENUMERATOR'
-                        and other_var_name.startswith(self.name)):
-                    result.append(other_var_name)
-                    break
-        return result
+        return sorted(variable_collection.enum_index.get(self.name, ()))
 
     def run_version_migrations(self):
         if StrictVersion(self.hanfor_version) <= StrictVersion('0.0.0'):
@@ -1537,137 +1834,291 @@ class Variable(HanforVersioned):
         super().run_version_migrations()
 
 
-class VarImportSession(HanforVersioned):
-    def __init__(self, source_var_collection, target_var_collection):
-        """
+VAR_IMPORT_SESSIONS_FOLDER = 'variable_import_sessions'
 
-        :type source_var_collection: VariableCollection
-        :type target_var_collection: VariableCollection
-        """
+_import_collections: Dict[str, Tuple[tuple, VariableCollection]] = dict()
+_import_collections_lock = Lock()
+
+
+def load_import_collection(path: str) -> VariableCollection:
+    """ The variable collection at `path` as read by import sessions. It is shared by all requests and must not be
+    changed, it is loaded again only if it was stored since.
+    """
+    path = os.path.abspath(path)
+    version = (generations.get(generations.VARIABLES, os.path.dirname(path)), os.stat(path).st_mtime_ns)
+    with _import_collections_lock:
+        cached = _import_collections.get(path)
+        if cached is None or cached[0] != version:
+            cached = (version, VariableCollection.load(path))
+            _import_collections[path] = cached
+        return cached[1]
+
+
+@dataclass
+class VarImportDecision:
+    """ What a variable import session makes of one variable. """
+    # One of 'skipped', 'source', 'target' or 'custom'.
+    action: str
+    # The collection the result variable is taken from ('source' or 'target'), None if it is not in the result.
+    base: Optional[str]
+    # Custom type and value of the result variable, None keeps the one of the base.
+    type: Optional[str] = None
+    const_val: Optional[int] = None
+    # The constraints of the result as (origin, constraint id in origin), None keeps the constraints of the base.
+    constraints: Optional[FrozenSet[Tuple[str, int]]] = None
+
+
+class VarImportSession(HanforVersioned, Pickleable):
+    """ Import of the variables of a source collection into a target collection.
+
+    The session refers to the stored source and target collections and keeps a decision only for the variables the
+    user changed, all others keep the target variable if there is one. Result variables are taken from source or target
+    and only copied if a decision changes them. Table rows are computed on request.
+    """
+    def __init__(self, path, source_path: str, target_path: str):
         HanforVersioned.__init__(self)
-        self.source_var_collection = source_var_collection
-        self.target_var_collection = target_var_collection
-        self.result_var_collection = deepcopy(target_var_collection)
-
-        self.actions = dict()
-        self.init_actions()
-
-        self.available_constraints = dict()
-        for name, vars in self.to_dict().items():
-            av_dict = dict()
-            i = 0
-            if 'source' in vars:
-                for j, c in self.source_var_collection.collection[name].get_constraints().items():
-                    i += 1
-                    av_dict[i] = {
-                        'id': i,
-                        'origin_id': j,
-                        'constraint': c.get_string(),
-                        'origin': 'source',
-                        'to_result': False
-                    }
-            if 'target' in vars:
-                for j, c in self.target_var_collection.collection[name].get_constraints().items():
-                    i += 1
-                    av_dict[i] = {
-                        'id': i,
-                        'origin_id': j,
-                        'constraint': c.get_string(),
-                        'origin': 'target',
-                        'to_result': True
-                    }
-            self.available_constraints[name] = av_dict
-
-    def init_actions(self):
-        dict_data = self.to_dict()
-        for name, data in dict_data.items():
-            self.actions[name] = 'target' if 'target' in data else 'skipped'
+        Pickleable.__init__(self, path)
+        self.source_path = source_path
+        self.target_path = target_path
+        self.decisions: Dict[str, VarImportDecision] = dict()
 
-    def to_dict(self):
-        result = defaultdict(defaultdict)
-        for name, variable in self.source_var_collection.collection.items():
-            result[name]['source'] = variable.to_dict(self.source_var_collection.var_req_mapping)
-        for name, variable in self.target_var_collection.collection.items():
-            result[name]['target'] = variable.to_dict(self.target_var_collection.var_req_mapping)
-        for name, variable in self.result_var_collection.collection.items():
-            result[name]['result'] = variable.to_dict(self.result_var_collection.var_req_mapping)
+    @classmethod
+    def load(cls, path) -> 'VarImportSession':
+        me = Pickleable.load(path)
+        if not isinstance(me, cls):
+            raise TypeError
+
+        if me.outdated:
+            logging.info(f'`{me}` needs upgrade `{me.hanfor_version}` -> `{__version__}`')
+            me.run_version_migrations()
+            me.store()
+
+        return me
+
+    @classmethod
+    def from_legacy(cls, legacy: 'VarImportSession', path: str) -> 'VarImportSession':
+        """ Convert a session stored with deep copies of the collections (as part of `VarImportSessions`).
+
+        :param legacy: The unpickled session holding `source_var_collection`, `target_var_collection`,
+                       `result_var_collection`, `actions` and `available_constraints`.
+        :param path: The file of the converted session.
+        """
+        legacy = vars(legacy)
+        collection_paths = dict()
+        for origin in ('source', 'target'):
+            var_collection = legacy[f'{origin}_var_collection']
+            if var_collection.my_path is None or not os.path.exists(var_collection.my_path):
+                # The collection is gone, keep the copy of the legacy session.
+                var_collection.store(f'{os.path.splitext(path)[0]}_{origin}.pickle')
+            collection_paths[origin] = var_collection.my_path
+
+        me = cls(path, collection_paths['source'], collection_paths['target'])
+        source, target = legacy['source_var_collection'], legacy['target_var_collection']
+        for name, action in legacy['actions'].items():
+            if action in ('source', 'target'):
+                base = action
+            elif action == 'custom':
+                base = 'target' if name in target else 'source' if name in source else None
+            else:
+                base = None
+            decision = VarImportDecision(action, base, constraints=frozenset(
+                (constraint['origin'], constraint['origin_id'])
+                for constraint in legacy['available_constraints'].get(name, dict()).values() if constraint['to_result']
+            ))
+            result = legacy['result_var_collection'].collection.get(name)
+            if action == 'custom' and result is not None:
+                decision.type, decision.const_val = result.type, result.value
+            me.decisions[name] = decision
+        return me
+
+    @property
+    def source_var_collection(self) -> VariableCollection:
+        return load_import_collection(self.source_path)
+
+    @property
+    def target_var_collection(self) -> VariableCollection:
+        return load_import_collection(self.target_path)
+
+    def _collection(self, origin: str) -> VariableCollection:
+        return self.source_var_collection if origin == 'source' else self.target_var_collection
+
+    def names(self) -> List[str]:
+        """ The sorted names of all variables in source or target. """
+        return sorted(self.source_var_collection.collection.keys() | self.target_var_collection.collection.keys())
+
+    def decision(self, name: str) -> VarImportDecision:
+        if name in self.decisions:
+            return self.decisions[name]
+        return self.default_decision(name)
+
+    def default_decision(self, name: str) -> VarImportDecision:
+        if name in self.target_var_collection:
+            return VarImportDecision('target', 'target')
+        return VarImportDecision('skipped', None)
+
+    def _set_decision(self, name: str, decision: VarImportDecision):
+        if decision == self.default_decision(name):
+            self.decisions.pop(name, None)
+        else:
+            self.decisions[name] = decision
+
+    def available_constraints(self, name: str, decision: VarImportDecision = None) -> Dict[int, dict]:
+        """ The constraints of the variable in source and target, numbered from 1 in this order. """
+        if decision is None:
+            decision = self.decision(name)
+        result = dict()
+        for origin in ('source', 'target'):
+            variable = self._collection(origin).collection.get(name)
+            if variable is None:
+                continue
+            for origin_id, constraint in variable.get_constraints().items():
+                i = len(result) + 1
+                result[i] = {
+                    'id': i,
+                    'origin_id': origin_id,
+                    'constraint': constraint.get_string(),
+                    'origin': origin,
+                    'to_result': (origin == decision.base if decision.constraints is None
+                                  else (origin, origin_id) in decision.constraints)
+                }
         return result
 
-    def to_datatables_data(self):
-        dict_data = self.to_dict()
+    def result_variable(self, name: str):
+        """ The variable `name` as it would be imported, None if it is skipped.
+        The variable of source or target is returned as is if the decision does not change it, do not modify it.
+
+        :rtype: Variable
+        """
+        decision = self.decision(name)
+        if decision.base is None:
+            return None
+        variable = self._collection(decision.base).collection.get(name)
+        if variable is None or (decision.type is None and decision.const_val is None and decision.constraints is None):
+            return variable
+
+        variable = copy(variable)
+        if decision.type is not None:
+            variable.type = decision.type
+        if decision.const_val is not None:
+            variable.value = decision.const_val
+        if decision.constraints is not None:
+            constraints = list()
+            for origin in ('source', 'target'):
+                origin_variable = self._collection(origin).collection.get(name)
+                if origin_variable is None:
+                    continue
+                for origin_id, constraint in origin_variable.get_constraints().items():
+                    if (origin, origin_id) in decision.constraints:
+                        constraints.append(constraint)
+            variable.constraints = dict(enumerate(constraints))
+        return variable
+
+    def rows(self, names: List[str], all_names: List[str] = None) -> List[dict]:
+        """ The table rows of the variables `names`.
+
+        :param all_names: The sorted names of the session, if already at hand (to list the enumerators of enums).
+        """
+        source, target = self.source_var_collection, self.target_var_collection
+        if all_names is None:
+            all_names = self.names()
         result = list()
-        for name, data in dict_data.items():
-            result.append({
+        for name in names:
+            decision = self.decision(name)
+            row = {
                 'name': name,
-                'available_constraints': self.available_constraints[name],
-                'action': self.actions[name],
-                'source': data['source'] if 'source' in data else {},
-                'target': data['target'] if 'target' in data else {},
-                'result': data['result'] if 'result' in data else {}
-            })
+                'available_constraints': self.available_constraints(name, decision),
+                'action': decision.action,
+                'source': source.collection[name].to_dict(source.var_req_mapping) if name in source else {},
+                'target': target.collection[name].to_dict(target.var_req_mapping) if name in target else {},
+                'result': {}
+            }
+            result_variable = self.result_variable(name)
+            if result_variable is not None:
+                row['result'] = result_variable.to_dict(target.var_req_mapping)
+                if str(result_variable.type).startswith('ENUM') and not \
+                        str(result_variable.type).startswith('ENUMERATOR'):
+                    row['enumerators'] = self.enumerators(name, all_names)
+            result.append(row)
         return result
 
+    def enumerators(self, name: str, all_names: List[str]) -> List[dict]:
+        """ Name and value of the result variables prefixed by the enum `name`. """
+        result = list()
+        for other in all_names[bisect.bisect_right(all_names, name):]:
+            if not other.startswith(name):
+                break
+            variable = self.result_variable(other)
+            if variable is not None:
+                result.append({'name': other, 'const_val': variable.value})
+        return result
+
+    def to_datatables_data(self) -> List[dict]:
+        names = self.names()
+        return self.rows(names, names)
+
     def store_changes(self, rows):
+        """ Set the actions of the variables in rows {name: {'action': ...}}. This drops custom changes. """
         for name, data in rows.items():
-            self.actions[name] = data['action']
-            if data['action'] == 'source':
-                self.result_var_collection.collection[name] = deepcopy(self.source_var_collection.collection[name])
-            if data['action'] == 'target':
-                self.result_var_collection.collection[name] = deepcopy(self.target_var_collection.collection[name])
-            for key in self.available_constraints[name].keys():
-                self.available_constraints[name][key]['to_result'] = (
-                        self.available_constraints[name][key]['origin'] == data['action']
-                )
+            action = data['action']
+            if action in ('source', 'target'):
+                if name not in self._collection(action):
+                    raise KeyError(f'Variable `{name}` is not in the {action} collection.')
+                decision = VarImportDecision(action, action)
+            elif action == 'custom':
+                decision = replace(self.decision(name), action=action)
+            else:
+                decision = VarImportDecision('skipped', None)
+            self._set_decision(name, decision)
 
     def store_variable(self, row):
-        self.actions[row['name']] = row['action']
-        self.result_var_collection.collection[row['name']].set_type(row['result']['type'])
-        self.available_constraints[row['name']] = row['available_constraints']
+        """ Store the custom result of a variable from its table row. """
+        name = row['name']
+        previous = self.decision(name)
+        base = previous.base
+        if base is None:
+            base = 'target' if name in self.target_var_collection else 'source'
+        if name not in self._collection(base):
+            raise KeyError(f'Variable `{name}` is not in the source nor the target collection.')
+        # Raises for illegal types.
+        Variable(name, None, None).set_type(row['result']['type'])
+
+        const_val = previous.const_val
         try:
             const_val = int(row['result']['const_val'])
-            self.result_var_collection.collection[row['name']].value = const_val
         except Exception:
             pass
+        constraints = frozenset(
+            (constraint['origin'], int(constraint['origin_id']))
+            for constraint in row['available_constraints'].values() if constraint['to_result']
+        )
+        self._set_decision(name, VarImportDecision(row['action'], base, row['result']['type'], const_val, constraints))
 
-    def apply_constraint_selection(self):
+    def result_collection(self, exclude=frozenset()) -> VariableCollection:
+        """ Copies of the result variables not in `exclude`. Variables used in the constraints of the result but
+        skipped are included from target (or source) and recorded as such.
+        """
+        result = VariableCollection(path=None)
         used_variables = set()
-        for var_name, available_constraints in self.available_constraints.items():
-            if len(available_constraints) > 0 and var_name in self.result_var_collection.collection.keys():
-                constraints = []
-                for id, constraint in available_constraints.items():
-                    if constraint['to_result']:
-                        if constraint['origin'] == 'source':
-                            constraints.append(deepcopy(
-                                self.source_var_collection.collection[var_name].constraints[constraint['origin_id']]
-                            ))
-                        else:
-                            constraints.append(deepcopy(
-                                self.target_var_collection.collection[var_name].constraints[constraint['origin_id']]
-                            ))
-                self.result_var_collection.collection[var_name].constraints = dict(enumerate(constraints))
-                # Collect used variables to auto include missing ones into the target.
-                vars_in_constraint = set()
-                for constraint in self.result_var_collection.collection[var_name].constraints.values():
-                    for var in constraint.used_variables:
-                        vars_in_constraint.add(var)
-                used_variables |= vars_in_constraint
+        for name in self.names():
+            variable = self.result_variable(name)
+            if variable is None:
+                continue
+            for constraint in variable.get_constraints().values():
+                used_variables |= set(constraint.used_variables)
+            if name not in exclude:
+                result.collection[name] = deepcopy(variable)
 
         # Include missing vars used by constraints.
-        for var_name in used_variables:
-            if var_name not in self.result_var_collection.collection:
-                logging.debug('Var: `{}` not marked to be in result but used in a constraint -> auto include.'.format(
-                    var_name
-                ))
-                if var_name in self.source_var_collection:
-                    self.actions[var_name] = 'source'
-                    self.result_var_collection.collection[var_name] = deepcopy(
-                        self.source_var_collection.collection[var_name]
-                    )
-                if var_name in self.target_var_collection:
-                    self.actions[var_name] = 'target'
-                    self.result_var_collection.collection[var_name] = deepcopy(
-                        self.target_var_collection.collection[var_name]
-                    )
+        for name in sorted(used_variables):
+            if self.decision(name).base is not None:
+                continue
+            logging.debug(f'Var: `{name}` not marked to be in result but used in a constraint -> auto include.')
+            for origin in ('source', 'target'):
+                if name in self._collection(origin):
+                    self._set_decision(name, VarImportDecision(origin, origin))
+            if name not in exclude and self.decision(name).base is not None:
+                result.collection[name] = deepcopy(self.result_variable(name))
+        return result
 
     def info(self):
         def get_path_info(path):
@@ -1679,32 +2130,21 @@ class VarImportSession(HanforVersioned):
 
         info = dict()
 
-        info['source'] = get_path_info(self.source_var_collection.my_path)
-        info['target'] = get_path_info(self.target_var_collection.my_path)
+        info['source'] = get_path_info(self.source_path)
+        info['target'] = get_path_info(self.target_path)
 
         return info
 
-    def run_version_migrations(self):
-        logging.info(
-            'Migrating `{}`:`{}` -> `{}`, from {} -> {}'.format(
-                self.__class__.__name__,
-                self.source_var_collection.my_path,
-                self.target_var_collection.my_path,
-                self.hanfor_version,
-                __version__
-            )
-        )
-        self.source_var_collection.run_version_migrations()
-        self.target_var_collection.run_version_migrations()
-        self.result_var_collection.run_version_migrations()
-        super().run_version_migrations()
-
 
 class VarImportSessions(HanforVersioned, Pickleable):
+    """ Index of the variable import sessions. Each session is stored in its own file in the
+    `variable_import_sessions` folder next to the index.
+    """
     def __init__(self, path=None):
         HanforVersioned.__init__(self)
         Pickleable.__init__(self, path)
-        self.import_sessions: list[VarImportSession] = list()
+        self.session_ids: List[int] = list()
+        self.next_id = 0
 
     @classmethod
     def load(cls, path) -> 'VarImportSessions':
@@ -1712,6 +2152,10 @@ class VarImportSessions(HanforVersioned, Pickleable):
         if not isinstance(me, cls):
             raise TypeError
 
+        if 'import_sessions' in me.__dict__:
+            me.split_legacy_sessions()
+            me.store()
+
         if me.outdated:
             logging.info(f'`{me}` needs upgrade `{me.hanfor_version}` -> `{__version__}`')
             me.run_version_migrations()
@@ -1727,44 +2171,95 @@ class VarImportSessions(HanforVersioned, Pickleable):
         )
         return VarImportSessions.load(var_import_sessions_path)
 
+    def split_legacy_sessions(self):
+        """ Move the sessions of an index holding all of them (`import_sessions`) to their own files. """
+        legacy_sessions = self.__dict__.pop('import_sessions')
+        logging.info(f'Moving {len(legacy_sessions)} variable import sessions of `{self.my_path}` to own files.')
+        self.session_ids, self.next_id = list(), 0
+        os.makedirs(self.folder, exist_ok=True)
+        for legacy_session in legacy_sessions:
+            session = VarImportSession.from_legacy(legacy_session, self.session_path(self.next_id))
+            session.store()
+            self.session_ids.append(self.next_id)
+            self.next_id += 1
+
+    @property
+    def folder(self) -> str:
+        return os.path.join(os.path.dirname(self.my_path), VAR_IMPORT_SESSIONS_FOLDER)
+
+    def session_path(self, session_id: int) -> str:
+        return os.path.join(self.folder, f'{session_id}.pickle')
+
+    def get(self, session_id: int) -> VarImportSession:
+        if session_id not in self.session_ids:
+            raise KeyError(f'There is no variable import session `{session_id}`.')
+        return VarImportSession.load(self.session_path(session_id))
+
     def create_new_session(self, source_collection, target_collection):
+        os.makedirs(self.folder, exist_ok=True)
+        session_id = self.next_id
         new_session = VarImportSession(
-            source_var_collection=source_collection,
-            target_var_collection=target_collection
+            self.session_path(session_id),
+            source_path=source_collection.my_path,
+            target_path=target_collection.my_path
         )
-        self.import_sessions.append(new_session)
+        new_session.store()
+        self.session_ids.append(session_id)
+        self.next_id += 1
+        self.store()
+        return session_id
+
+    def delete(self, session_id: int):
+        if session_id not in self.session_ids:
+            raise KeyError(f'There is no variable import session `{session_id}`.')
+        self.session_ids.remove(session_id)
         self.store()
-        return len(self.import_sessions) - 1
+        try:
+            os.remove(self.session_path(session_id))
+        except FileNotFoundError:
+            pass
 
     def info(self):
         info = dict()
 
-        for i, import_session in enumerate(self.import_sessions):
-            session_info = import_session.info()
-            info[i] = {
-                'id': i,
+        for session_id in self.session_ids:
+            session_info = self.get(session_id).info()
+            info[session_id] = {
+                'id': session_id,
                 'source': session_info['source'],
                 'target': session_info['target']
             }
 
         return info
 
-    def run_version_migrations(self):
-        logging.info(
-            f'Migrating `{self.__class__.__name__}`:`{self.my_path}`, from {self.hanfor_version} -> {__version__}')
-        for import_session in self.import_sessions:
-            import_session.run_version_migrations()
-        super().run_version_migrations()
-
 
 class ScriptEvals(Pickleable):
     def __init__(self, path=None):
         self.evals = defaultdict(defaultdict)
+        # Variable name -> script name -> key of the script the result is from (see `script_evaluations.Script`).
+        self.keys = defaultdict(dict)
         Pickleable.__init__(self, path)
 
-    def update_evals(self, results: dict, script_name):
+    @classmethod
+    def load(cls, path):
+        me = super().load(path)
+        if not hasattr(me, 'keys'):
+            # Stored before results were keyed, evaluate everything again.
+            me.keys = defaultdict(dict)
+        return me
+
+    def update_evals(self, results: dict, script_name, key: str = None):
         for name, eval in results.items():
             self.evals[name].update({script_name: eval})
+            self.keys[name][script_name] = key
+
+    def has_result(self, name: str, script_name: str, key: str) -> bool:
+        """ True if there is a result of the script with `key` for the variable `name`. """
+        return name in self.evals and script_name in self.evals[name] and self.keys[name].get(script_name) == key
+
+    def store(self, path=None):
+        super().store(path)
+        generations.bump(generations.SCRIPT_EVALS, self.my_path)
 
     def get_concatenated_evals(self):
         result = dict()
@@ -0,0 +1,770 @@
+""" Storage backends for the requirements of a revision.
+
+A revision folder holds its requirements either
+ * in one `<rid>.pickle` file per requirement (legacy layout, `PickleRequirementStore`) or
+ * in a single `requirements.sqlite` database with one row per requirement (`SqliteRequirementStore`).
+
+The requirements database of a revision is a manifest mapping each rid to the content hash of the serialized
+requirement. The serialized requirements themselves are stored once per session in `requirement_objects.sqlite`
+next to the revision folders, so revisions share all requirements that did not change between them.
+
+Use `get_requirement_store(folder)` to get the backend in charge of a folder. Requirements keep a `my_path` of the
+form `<folder>/<rid>.pickle` in both layouts, so existing code can derive the revision folder and rid from it.
+
+All stores share the process wide `requirement_cache`.
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import uuid
+from collections import defaultdict, OrderedDict
+from contextlib import closing
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+PICKLE_BACKEND = 'pickle'
+SQLITE_BACKEND = 'sqlite'
+AVAILABLE_BACKENDS = (PICKLE_BACKEND, SQLITE_BACKEND)
+
+REQUIREMENTS_DB = 'requirements.sqlite'
+# Content addressed requirements of all revisions of a session, stored in the session folder.
+OBJECTS_DB = 'requirement_objects.sqlite'
+# Files in a revision folder that are pickled, but are not requirements.
+NON_REQUIREMENT_PICKLES = ('session_variable_collection.pickle', 'session_status.pickle')
+NON_REQUIREMENT_PICKLE_SUFFIXES = ('_PEA.pickle',)
+
+# Backend used for revision folders that do not contain any requirements yet. Set from `REQUIREMENT_STORAGE`.
+default_backend = SQLITE_BACKEND
+# Max number of requirements kept in the requirement_cache. Set from `REQUIREMENT_CACHE_SIZE`.
+DEFAULT_CACHE_SIZE = 25000
+
+
+def set_default_backend(backend: str):
+    """ Set the backend used to create new revisions.
+
+    :param backend: One of AVAILABLE_BACKENDS.
+    """
+    global default_backend
+    if backend not in AVAILABLE_BACKENDS:
+        raise ValueError(f'Unknown requirement storage `{backend}`. Use one of {AVAILABLE_BACKENDS}.')
+    default_backend = backend
+
+
+# Callables `listener(folder, rids)` notified after this process stored requirements of a revision folder.
+store_listeners = []
+
+
+def add_store_listener(listener):
+    if listener not in store_listeners:
+        store_listeners.append(listener)
+
+
+def _notify_stored(folder: str, rids: List[str]):
+    for listener in store_listeners:
+        listener(folder, rids)
+
+
+def is_requirement_pickle(filename: str) -> bool:
+    return (filename.endswith('.pickle')
+            and filename not in NON_REQUIREMENT_PICKLES
+            and not filename.endswith(NON_REQUIREMENT_PICKLE_SUFFIXES))
+
+
+def has_requirement_pickles(folder: str) -> bool:
+    if not os.path.isdir(folder):
+        return False
+    return any(is_requirement_pickle(f) for f in os.listdir(folder))
+
+
+def _is_requirement(obj) -> bool:
+    return hasattr(obj, 'rid') and hasattr(obj, 'formalizations')
+
+
+def _type_of(requirement) -> str:
+    # Legacy requirements may hold the csv type wrapped in a tuple.
+    type_in_csv = requirement.type_in_csv
+    if isinstance(type_in_csv, tuple) and len(type_in_csv) > 0:
+        type_in_csv = type_in_csv[0]
+    return type_in_csv if isinstance(type_in_csv, str) else None
+
+
+class CacheEntry:
+    """ A cached requirement: Its serialized form and, once requested, a shared deserialized snapshot. """
+    __slots__ = ('folder', 'token', 'data', '_snapshot')
+
+    def __init__(self, folder: str, token, data: bytes):
+        self.folder = folder
+        self.token = token
+        self.data = data
+        self._snapshot = None
+
+    def copy(self):
+        """ A private deserialized copy, safe to be modified. """
+        return pickle.loads(self.data)
+
+    def snapshot(self):
+        """ The shared deserialized requirement. Must not be modified. """
+        if self._snapshot is None:
+            self._snapshot = pickle.loads(self.data)
+        return self._snapshot
+
+
+class RequirementCache:
+    """ Process wide, thread safe LRU cache of stored requirements keyed by (revision folder, rid).
+
+    Entries are validated against a backend specific token (file stat for pickles, the database generation for
+    SQLite) and written through on store. Requirements handed out for editing are always private copies, so
+    flask worker threads editing the same requirement never share state.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: OrderedDict[Tuple[str, str], CacheEntry] = OrderedDict()
+        self._folder_versions = dict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, folder: str, rid: str, token=None) -> Optional[CacheEntry]:
+        key = (folder, rid)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.token != token:
+                del self._entries[key]
+                self.invalidations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, folder: str, rid: str, data: bytes, token=None, version=None) -> CacheEntry:
+        """ Cache a stored requirement.
+
+        :param version: Version of the folder the data was read at. If given, the entry is only cached if this is still
+            the version of the folder: data read before a concurrent write must not replace the written requirement.
+        """
+        entry = CacheEntry(folder, token, data)
+        with self._lock:
+            if version is not None and self._folder_versions.get(folder) != version:
+                return entry
+            self._entries[(folder, rid)] = entry
+            self._entries.move_to_end((folder, rid))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return entry
+
+    def discard(self, folder: str, rid: str):
+        with self._lock:
+            self._entries.pop((folder, rid), None)
+
+    def validate_folder(self, folder: str, version):
+        """ Drop all entries of a folder, if it was changed by someone else than this process.
+
+        :param folder: The revision folder.
+        :param version: The current version of the folder as reported by its store.
+        """
+        with self._lock:
+            if self._folder_versions.get(folder, version) != version:
+                logging.debug(f'`{folder}` changed outside of this process. Invalidating cached requirements.')
+                stale_keys = [key for key, entry in self._entries.items() if entry.folder == folder]
+                for key in stale_keys:
+                    del self._entries[key]
+                self.invalidations += len(stale_keys)
+            self._folder_versions[folder] = version
+
+    def set_folder_version(self, folder: str, version):
+        """ Record the version of a folder after a write of this process (keeps the cached entries). """
+        with self._lock:
+            self._folder_versions[folder] = version
+
+    def resize(self, max_size: int):
+        with self._lock:
+            self.max_size = max_size
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._folder_versions.clear()
+
+    def info(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'hit_rate': self.hits / lookups if lookups > 0 else 0.0
+            }
+
+
+requirement_cache = RequirementCache()
+
+
+def configure_cache(max_size: int):
+    requirement_cache.resize(max_size)
+
+
+def _serialize(requirement) -> bytes:
+    return pickle.dumps(requirement, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def content_hash(data: bytes) -> str:
+    """ Address of a serialized requirement in the object store. """
+    return hashlib.sha256(data).hexdigest()
+
+
+def source_hash(requirement) -> str:
+    """ Hash of what a requirement takes from the csv: Its row (including formalizations imported from the csv),
+    description and type. Equal for the requirement of an unchanged row in all revisions. """
+    source = json.dumps([requirement.csv_row, requirement.description, _type_of(requirement)],
+                        sort_keys=True, default=str)
+    return hashlib.sha256(source.encode()).hexdigest()
+
+
+def _has_revision_diff(requirement) -> bool:
+    return len(getattr(requirement, '_revision_diff', None) or ()) > 0
+
+
+class RequirementStore:
+    """ Holds the requirements of one revision folder.
+
+    `load` and `requirements` return private copies that may be modified and stored. `snapshots` returns the shared
+    cached requirements for read only use (tables, queries, exports).
+    The generic index queries below scan all requirements. Backends with a real index override them.
+    """
+
+    # Number of requirements loaded at a time by the chunked iterations.
+    CHUNK_SIZE = 500
+
+    def __init__(self, folder: str):
+        self.folder = os.path.abspath(folder)
+
+    def path_for(self, rid: str) -> str:
+        return os.path.join(self.folder, f'{rid}.pickle')
+
+    def _entries(self, rids: Iterable[str] = None) -> Iterator[Tuple[str, CacheEntry]]:
+        """ Yield (rid, cache entry) for all (or the given) requirements ordered by rid. """
+        raise NotImplementedError
+
+    def _entry(self, rid: str) -> Optional[CacheEntry]:
+        for _, entry in self._entries((rid,)):
+            return entry
+        return None
+
+    def _with_path(self, rid: str, requirement):
+        requirement.my_path = self.path_for(rid)
+        return requirement
+
+    def load(self, rid: str):
+        """ Load the requirement with the given rid. Returns None if there is no such requirement. """
+        entry = self._entry(rid)
+        return self._with_path(rid, entry.copy()) if entry is not None else None
+
+    def load_path(self, path: str):
+        """ Load the requirement stored at `<folder>/<rid>.pickle`. Returns None if there is no such requirement. """
+        return self.load(os.path.basename(path)[:-len('.pickle')])
+
+    def store(self, requirement):
+        self.store_many((requirement,))
+
+    def store_many(self, requirements: Iterable):
+        raise NotImplementedError
+
+    def rids(self) -> List[str]:
+        """ All requirement ids (sorted). """
+        return [rid for rid, _ in self._entries()]
+
+    def content_version(self) -> Optional[Tuple[str, int]]:
+        """ Identifies the stored content, changes with every write. None if the backend can not tell. """
+        return None
+
+    def sources(self) -> Iterator[Tuple[str, Optional[str], Optional[int], bool]]:
+        """ Iterate (rid, source hash, position in csv, has revision diff) of all requirements ordered by rid, without
+        loading them. The source hash is None if unknown. """
+        for rid in self.rids():
+            yield rid, None, None, True
+
+    def requirements(self, rids: Iterable[str] = None) -> Iterator:
+        """ Iterate private copies of the requirements (all or the given rids) ordered by rid. """
+        for rid, entry in self._entries(rids):
+            yield self._with_path(rid, entry.copy())
+
+    def snapshots(self, rids: Iterable[str] = None) -> Iterator:
+        """ Iterate the shared cached requirements (all or the given rids) ordered by rid. Do not modify them. """
+        for rid, entry in self._entries(rids):
+            yield self._with_path(rid, entry.snapshot())
+
+    def in_order(self, rids: List[str], read_only: bool = False) -> Iterator:
+        """ Iterate the requirements of `rids` in the given order (missing ones are skipped), loading `CHUNK_SIZE`
+        requirements at a time. Yields shared cached requirements if `read_only`, private copies otherwise. """
+        for start in range(0, len(rids), self.CHUNK_SIZE):
+            chunk = rids[start:start + self.CHUNK_SIZE]
+            loaded = {r.rid: r for r in (self.snapshots(chunk) if read_only else self.requirements(chunk))}
+            for rid in chunk:
+                if rid in loaded:
+                    yield loaded[rid]
+
+    def rids_by_position(self) -> List[str]:
+        """ All requirement ids ordered by the position of the requirement in the csv of the session (then by rid). """
+        return [rid for _, rid in sorted((r.pos_in_csv, r.rid) for r in self.snapshots())]
+
+    def __contains__(self, rid: str) -> bool:
+        return self._entry(rid) is not None
+
+    def __len__(self):
+        return len(self.rids())
+
+    def rids_with_status(self, status: str) -> List[str]:
+        return [r.rid for r in self.snapshots() if r.status == status]
+
+    def rids_with_type(self, type_in_csv: str) -> List[str]:
+        return [r.rid for r in self.snapshots() if _type_of(r) == type_in_csv]
+
+    def rids_with_tag(self, tag: str) -> List[str]:
+        return [r.rid for r in self.snapshots() if tag in r.tags]
+
+    def tag_usage(self) -> Dict[str, List[str]]:
+        """ Map each used tag to the (sorted) ids of the requirements using it. """
+        usage = defaultdict(list)
+        for requirement in self.snapshots():
+            for tag in requirement.tags:
+                usage[tag].append(requirement.rid)
+        return {tag: sorted(rids) for tag, rids in usage.items()}
+
+    def status_counts_by_type(self) -> Dict[Tuple[str, str], int]:
+        counts = defaultdict(int)
+        for requirement in self.snapshots():
+            counts[(_type_of(requirement), requirement.status)] += 1
+        return dict(counts)
+
+    def tag_counts_by_type(self) -> Dict[Tuple[str, str], int]:
+        counts = defaultdict(int)
+        for requirement in self.snapshots():
+            for tag in requirement.tags:
+                counts[(_type_of(requirement), tag)] += 1
+        return dict(counts)
+
+
+class PickleRequirementStore(RequirementStore):
+    """ Legacy layout: one `<rid>.pickle` per requirement. Cache entries are validated by the file stat. """
+
+    @staticmethod
+    def _stat_token(path: str):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _entries(self, rids: Iterable[str] = None) -> Iterator[Tuple[str, CacheEntry]]:
+        if rids is None:
+            rids = [f[:-len('.pickle')] for f in os.listdir(self.folder) if is_requirement_pickle(f)]
+        for rid in sorted(rids):
+            path = self.path_for(rid)
+            token = self._stat_token(path)
+            if token is None:
+                continue
+            entry = requirement_cache.get(self.folder, rid, token)
+            if entry is None:
+                try:
+                    with open(path, mode='rb') as f:
+                        data = f.read()
+                    if not _is_requirement(pickle.loads(data)):
+                        continue
+                except Exception as e:
+                    logging.error(f'Loading {path} failed spectacularly: {e}')
+                    continue
+                entry = requirement_cache.put(self.folder, rid, data, token)
+            yield rid, entry
+
+    def store_many(self, requirements: Iterable):
+        rids = list()
+        for requirement in requirements:
+            requirement.my_path = self.path_for(requirement.rid)
+            data = _serialize(requirement)
+            with open(requirement.my_path, mode='wb') as out_file:
+                out_file.write(data)
+            requirement_cache.put(self.folder, requirement.rid, data, self._stat_token(requirement.my_path))
+            rids.append(requirement.rid)
+        _notify_stored(self.folder, rids)
+
+    def __contains__(self, rid: str) -> bool:
+        return os.path.isfile(self.path_for(rid))
+
+
+class SqliteRequirementStore(RequirementStore):
+    """ All requirements of a revision in one SQLite database.
+
+    Table `requirements` holds one row per requirement (primary key `rid`) with the content hash of the pickled
+    requirement and the indexed columns `status`, `type` and `pos_in_csv`. The pickled requirements are stored by
+    hash in table `objects` of the session wide `requirement_objects.sqlite`, attached as `session`.
+    The columns `source_hash` and `has_revision_diff` let revision merges skip unchanged requirements.
+    Table `requirement_tags` indexes the tags.
+    Table `store_meta` holds a random identity of the database and a generation counter bumped by every write.
+    Cached requirements stay valid as long as no other process changed the generation.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS requirements (
+            rid TEXT PRIMARY KEY,
+            pos_in_csv INTEGER,
+            status TEXT,
+            type TEXT,
+            hash TEXT NOT NULL,
+            source_hash TEXT,
+            has_revision_diff INTEGER
+        );
+        CREATE INDEX IF NOT EXISTS requirements_pos_in_csv ON requirements (pos_in_csv);
+        CREATE INDEX IF NOT EXISTS requirements_status ON requirements (status);
+        CREATE INDEX IF NOT EXISTS requirements_type ON requirements (type);
+        CREATE INDEX IF NOT EXISTS requirements_hash ON requirements (hash);
+        CREATE TABLE IF NOT EXISTS requirement_tags (
+            rid TEXT NOT NULL,
+            tag TEXT NOT NULL,
+            PRIMARY KEY (rid, tag)
+        );
+        CREATE INDEX IF NOT EXISTS requirement_tags_tag ON requirement_tags (tag);
+        CREATE TABLE IF NOT EXISTS store_meta (
+            key TEXT PRIMARY KEY,
+            value
+        );
+        INSERT OR IGNORE INTO store_meta (key, value) VALUES ('generation', 0);
+    """
+    OBJECTS_SCHEMA = """
+        CREATE TABLE IF NOT EXISTS session.objects (
+            hash TEXT PRIMARY KEY,
+            data BLOB NOT NULL
+        );
+    """
+    # db path -> (file change counter of the db header, version). Avoids a query per cache lookup.
+    _header_versions = dict()
+    # Databases known to use the current layout.
+    _checked_layouts = set()
+
+    def __init__(self, folder: str):
+        super().__init__(folder)
+        self.db_path = os.path.join(self.folder, REQUIREMENTS_DB)
+        self.objects_path = os.path.join(os.path.dirname(self.folder), OBJECTS_DB)
+        if not os.path.isfile(self.db_path):
+            with closing(self._connect()) as connection:
+                connection.executescript(self.SCHEMA)
+                connection.execute(
+                    "INSERT OR IGNORE INTO store_meta (key, value) VALUES ('identity', ?)", (uuid.uuid4().hex,))
+                connection.commit()
+            self._checked_layouts.add(self.db_path)
+        elif self.db_path not in self._checked_layouts:
+            self._migrate_layout()
+            self._checked_layouts.add(self.db_path)
+
+    def _connect(self, isolation_level='') -> sqlite3.Connection:
+        # One short-lived connection per operation. This keeps the store usable from all flask worker threads.
+        connection = sqlite3.connect(self.db_path, timeout=60, isolation_level=isolation_level)
+        connection.execute('ATTACH DATABASE ? AS session', (self.objects_path,))
+        connection.executescript(self.OBJECTS_SCHEMA)
+        return connection
+
+    def _migrate_layout(self):
+        """ Bring a database of an older layout up to date.
+
+        Pickled requirements held inline (`data` column) are moved to the object store. Missing source hashes stay
+        unknown until the requirement is stored again.
+        """
+        with closing(self._connect(isolation_level=None)) as connection:
+            columns = [row[1] for row in connection.execute('PRAGMA main.table_info(requirements)')]
+            if 'data' not in columns:
+                for column, column_type in (('source_hash', 'TEXT'), ('has_revision_diff', 'INTEGER')):
+                    if column not in columns:
+                        connection.execute(f'ALTER TABLE requirements ADD COLUMN {column} {column_type}')
+                return
+            logging.info(f'Moving the requirements of `{self.db_path}` to `{self.objects_path}`.')
+            connection.create_function('content_hash', 1, content_hash, deterministic=True)
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                connection.execute(
+                    'INSERT OR IGNORE INTO session.objects (hash, data) SELECT content_hash(data), data FROM requirements')
+                connection.execute('ALTER TABLE requirements RENAME TO inline_requirements')
+                for index in ('pos_in_csv', 'status', 'type'):
+                    connection.execute(f'DROP INDEX IF EXISTS requirements_{index}')
+                # Statement by statement, `executescript` would commit the transaction.
+                for statement in self.SCHEMA.split(';'):
+                    connection.execute(statement)
+                connection.execute(
+                    'INSERT INTO requirements (rid, pos_in_csv, status, type, hash) '
+                    'SELECT rid, pos_in_csv, status, type, content_hash(data) FROM inline_requirements')
+                connection.execute('DROP TABLE inline_requirements')
+                connection.execute('COMMIT')
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+
+    @staticmethod
+    def _query_version(connection: sqlite3.Connection) -> Tuple[str, int]:
+        values = dict(connection.execute("SELECT key, value FROM store_meta WHERE key IN ('identity', 'generation')"))
+        return values.get('identity'), values.get('generation')
+
+    def _header_counter(self):
+        # The SQLite file change counter (header bytes 24-27) changes with every committed write.
+        with open(self.db_path, mode='rb') as f:
+            f.seek(24)
+            return os.fstat(f.fileno()).st_ino, f.read(4)
+
+    def _validate_cache(self):
+        """ Invalidate the cached requirements of this revision if another process wrote to the database. """
+        header = self._header_counter()
+        known = self._header_versions.get(self.db_path)
+        if known is not None and known[0] == header:
+            version = known[1]
+        else:
+            with closing(self._connect()) as connection:
+                version = self._query_version(connection)
+            self._header_versions[self.db_path] = (header, version)
+        requirement_cache.validate_folder(self.folder, version)
+
+    def _entries(self, rids: Iterable[str] = None) -> Iterator[Tuple[str, CacheEntry]]:
+        self._validate_cache()
+        rids = self.rids() if rids is None else sorted(rids)
+        # Fetch misses in chunks instead of keeping a cursor open, so callers may store while iterating.
+        for start in range(0, len(rids), self.CHUNK_SIZE):
+            chunk = rids[start:start + self.CHUNK_SIZE]
+            entries = {rid: requirement_cache.get(self.folder, rid) for rid in chunk}
+            misses = [rid for rid, entry in entries.items() if entry is None]
+            if len(misses) > 0:
+                with closing(self._connect()) as connection:
+                    # One read transaction, so the rows are of the generation read along.
+                    connection.execute('BEGIN')
+                    version = self._query_version(connection)
+                    rows = connection.execute(
+                        'SELECT r.rid, o.data FROM requirements r JOIN session.objects o ON o.hash = r.hash '
+                        f'WHERE r.rid IN ({",".join("?" * len(misses))})',
+                        misses
+                    ).fetchall()
+                    connection.rollback()
+                for rid, data in rows:
+                    entries[rid] = requirement_cache.put(self.folder, rid, data, version=version)
+            for rid in chunk:
+                if entries[rid] is not None:
+                    yield rid, entries[rid]
+
+    def store_many(self, requirements: Iterable):
+        written = list()
+        with closing(self._connect(isolation_level=None)) as connection:
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                identity, generation = self._query_version(connection)
+                # Detect writes of other processes since we last looked at the database.
+                requirement_cache.validate_folder(self.folder, (identity, generation))
+                for requirement in requirements:
+                    # Without the path, the same requirement has the same content in all revisions.
+                    requirement.my_path = None
+                    data = _serialize(requirement)
+                    requirement.my_path = self.path_for(requirement.rid)
+                    self._write(connection, requirement, data)
+                    written.append((requirement.rid, data))
+                connection.execute("UPDATE store_meta SET value = value + 1 WHERE key = 'generation'")
+                connection.execute('COMMIT')
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+        # The new version first: from now on, concurrent loads do not cache what they read before the commit. What
+        # they cached before is replaced below.
+        requirement_cache.set_folder_version(self.folder, (identity, generation + 1))
+        for rid, data in written:
+            requirement_cache.put(self.folder, rid, data)
+        _notify_stored(self.folder, [rid for rid, _ in written])
+
+    @staticmethod
+    def _write(connection: sqlite3.Connection, requirement, data: bytes):
+        data_hash = content_hash(data)
+        connection.execute('INSERT OR IGNORE INTO session.objects (hash, data) VALUES (?, ?)', (data_hash, data))
+        connection.execute(
+            'INSERT OR REPLACE INTO requirements (rid, pos_in_csv, status, type, hash, source_hash, has_revision_diff) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (requirement.rid, requirement.pos_in_csv, requirement.status, _type_of(requirement), data_hash,
+             source_hash(requirement), _has_revision_diff(requirement))
+        )
+        connection.execute('DELETE FROM requirement_tags WHERE rid = ?', (requirement.rid,))
+        connection.executemany(
+            'INSERT OR IGNORE INTO requirement_tags (rid, tag) VALUES (?, ?)',
+            [(requirement.rid, tag) for tag in requirement.tags]
+        )
+
+    def link_from(self, base: 'SqliteRequirementStore', rids: List[str]):
+        """ Add the requirements `rids` of another revision of the same session as they are, without loading them.
+
+        :param base: Store of the other revision.
+        :param rids: The requirements to add.
+        """
+        if base.objects_path != self.objects_path:
+            raise ValueError(f'`{base.folder}` and `{self.folder}` do not share an object store.')
+        with closing(self._connect(isolation_level=None)) as connection:
+            connection.execute('ATTACH DATABASE ? AS base', (base.db_path,))
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                identity, generation = self._query_version(connection)
+                requirement_cache.validate_folder(self.folder, (identity, generation))
+                for start in range(0, len(rids), self.CHUNK_SIZE):
+                    chunk = rids[start:start + self.CHUNK_SIZE]
+                    selection = f'rid IN ({",".join("?" * len(chunk))})'
+                    connection.execute(
+                        'INSERT OR REPLACE INTO requirements '
+                        '(rid, pos_in_csv, status, type, hash, source_hash, has_revision_diff) '
+                        'SELECT rid, pos_in_csv, status, type, hash, source_hash, has_revision_diff '
+                        f'FROM base.requirements WHERE {selection}', chunk)
+                    connection.execute(f'DELETE FROM requirement_tags WHERE {selection}', chunk)
+                    connection.execute(
+                        f'INSERT INTO requirement_tags (rid, tag) SELECT rid, tag FROM base.requirement_tags '
+                        f'WHERE {selection}', chunk)
+                connection.execute("UPDATE store_meta SET value = value + 1 WHERE key = 'generation'")
+                connection.execute('COMMIT')
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+        requirement_cache.set_folder_version(self.folder, (identity, generation + 1))
+        for rid in rids:
+            requirement_cache.discard(self.folder, rid)
+        _notify_stored(self.folder, rids)
+
+    def content_version(self) -> Optional[Tuple[str, int]]:
+        with closing(self._connect()) as connection:
+            return self._query_version(connection)
+
+    def sources(self) -> Iterator[Tuple[str, Optional[str], Optional[int], bool]]:
+        with closing(self._connect()) as connection:
+            for rid, rid_source_hash, pos_in_csv, has_revision_diff in connection.execute(
+                    'SELECT rid, source_hash, pos_in_csv, has_revision_diff FROM requirements ORDER BY rid'):
+                yield rid, rid_source_hash, pos_in_csv, has_revision_diff is None or bool(has_revision_diff)
+
+    def rids(self) -> List[str]:
+        with closing(self._connect()) as connection:
+            return [row[0] for row in connection.execute('SELECT rid FROM requirements ORDER BY rid')]
+
+    def rids_by_position(self) -> List[str]:
+        return self._select_rids('SELECT rid FROM requirements ORDER BY pos_in_csv, rid', ())
+
+    def __contains__(self, rid: str) -> bool:
+        with closing(self._connect()) as connection:
+            return connection.execute('SELECT 1 FROM requirements WHERE rid = ?', (rid,)).fetchone() is not None
+
+    def __len__(self):
+        with closing(self._connect()) as connection:
+            return connection.execute('SELECT COUNT(*) FROM requirements').fetchone()[0]
+
+    def _select_rids(self, query: str, parameters: tuple) -> List[str]:
+        with closing(self._connect()) as connection:
+            return [row[0] for row in connection.execute(query, parameters)]
+
+    def rids_with_status(self, status: str) -> List[str]:
+        return self._select_rids('SELECT rid FROM requirements WHERE status = ? ORDER BY rid', (status,))
+
+    def rids_with_type(self, type_in_csv: str) -> List[str]:
+        return self._select_rids('SELECT rid FROM requirements WHERE type = ? ORDER BY rid', (type_in_csv,))
+
+    def rids_with_tag(self, tag: str) -> List[str]:
+        return self._select_rids('SELECT rid FROM requirement_tags WHERE tag = ? ORDER BY rid', (tag,))
+
+    def tag_usage(self) -> Dict[str, List[str]]:
+        usage = defaultdict(list)
+        with closing(self._connect()) as connection:
+            for tag, rid in connection.execute('SELECT tag, rid FROM requirement_tags ORDER BY tag, rid'):
+                usage[tag].append(rid)
+        return dict(usage)
+
+    def status_counts_by_type(self) -> Dict[Tuple[str, str], int]:
+        with closing(self._connect()) as connection:
+            return {(t, s): c for t, s, c in connection.execute(
+                'SELECT type, status, COUNT(*) FROM requirements GROUP BY type, status')}
+
+    def tag_counts_by_type(self) -> Dict[Tuple[str, str], int]:
+        with closing(self._connect()) as connection:
+            return {(t, tag): c for t, tag, c in connection.execute(
+                'SELECT r.type, t.tag, COUNT(*) FROM requirement_tags t JOIN requirements r ON r.rid = t.rid '
+                'GROUP BY r.type, t.tag')}
+
+
+def get_requirement_store(folder: str) -> RequirementStore:
+    """ Returns the store in charge of the given revision folder.
+
+    Folders with a requirements database are served by SQLite, folders with pickled requirements by the legacy
+    pickle store. Empty (new) folders use the configured default backend.
+    """
+    if os.path.isfile(os.path.join(folder, REQUIREMENTS_DB)):
+        return SqliteRequirementStore(folder)
+    if default_backend == PICKLE_BACKEND or has_requirement_pickles(folder):
+        return PickleRequirementStore(folder)
+    return SqliteRequirementStore(folder)
+
+
+def migrate_pickle_folder(folder: str) -> int:
+    """ Move the pickled requirements of a legacy revision folder into the requirements database.
+
+    The pickle files are only removed after all requirements have been committed to the database.
+
+    :param folder: The revision folder.
+    :return: Number of migrated requirements.
+    """
+    paths = [os.path.join(folder, f) for f in sorted(os.listdir(folder)) if is_requirement_pickle(f)]
+    if len(paths) == 0:
+        return 0
+    logging.info(f'Migrating {len(paths)} pickled requirements in `{folder}` to `{REQUIREMENTS_DB}`.')
+    requirements, migrated_paths = list(), list()
+    for path in paths:
+        try:
+            with open(path, mode='rb') as f:
+                requirement = pickle.load(f)
+        except Exception as e:
+            logging.error(f'Could not migrate `{path}`: {e}')
+            continue
+        if _is_requirement(requirement):
+            requirements.append(requirement)
+            migrated_paths.append(path)
+    SqliteRequirementStore(folder).store_many(requirements)
+    for path in migrated_paths:
+        os.remove(path)
+    return len(requirements)
+
+
+def collect_garbage(session_folder: str) -> int:
+    """ Delete the requirements from the object store of a session that no revision refers to anymore.
+
+    :param session_folder: The session folder holding the object store and the revision folders.
+    :return: Number of deleted requirements.
+    """
+    objects_path = os.path.join(session_folder, OBJECTS_DB)
+    if not os.path.isfile(objects_path):
+        return 0
+    with closing(sqlite3.connect(objects_path, timeout=60, isolation_level=None)) as connection:
+        connection.execute('CREATE TEMP TABLE referenced (hash TEXT PRIMARY KEY)')
+        # Writers add objects within their manifest transaction. Holding the write lock of the object store while
+        # collecting the references makes sure every object is either referenced or added again after deletion.
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            for name in sorted(os.listdir(session_folder)):
+                db_path = os.path.join(session_folder, name, REQUIREMENTS_DB)
+                if not os.path.isfile(db_path):
+                    continue
+                with closing(sqlite3.connect(db_path, timeout=60)) as revision:
+                    columns = [row[1] for row in revision.execute('PRAGMA table_info(requirements)')]
+                    if 'hash' in columns:
+                        connection.executemany(
+                            'INSERT OR IGNORE INTO temp.referenced (hash) VALUES (?)',
+                            revision.execute('SELECT hash FROM requirements')
+                        )
+            deleted = connection.execute(
+                'DELETE FROM objects WHERE hash NOT IN (SELECT hash FROM temp.referenced)').rowcount
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+    if deleted > 0:
+        logging.info(f'Deleted {deleted} unreferenced requirements from `{objects_path}`.')
+    return deleted
@@ -0,0 +1,154 @@
+""" Server side processing of the requirements table (DataTables `serverSide` mode of `api/req/gets`).
+
+The table is answered from a search index (`ressources.queryapi.RequirementSearchIndex`) holding the searchable text
+of each table column per requirement. Only the requirements of the requested page are loaded and serialized. The index
+of a revision is built on first use and kept up to date with the writes of this process; writes of other processes
+rebuild it.
+
+Searches use the query language of the requirements table (`static/js/datatables-advanced-search.js`, evaluated by
+`SearchNode.evaluate_row` of the query API): Terms combined by `:AND:`, `:OR:` and parentheses. A term is a case
+insensitive regex, `"` marks word boundaries, `""term""` matches a whole cell, `:NOT:` negates and `:COL_INDEX_<nn>:`
+restricts a term to one column.
+"""
+import json
+import logging
+import threading
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple
+
+from requirement_store import add_store_listener, get_requirement_store
+
+# The fixed columns of the table, the csv columns follow (see `utils.get_datatable_additional_cols`).
+COLUMNS = ('', 'pos', 'id', 'desc', 'type', 'tags', 'status', 'formal')
+
+def table_row(csv_fieldnames: List[str], requirement) -> Dict[int, str]:
+    """ The searchable text of the table columns of a requirement by column index. """
+    type_in_csv = requirement.type_in_csv if isinstance(requirement.type_in_csv, str) else 'None'
+    csv_row = requirement.csv_row or dict()
+    row = [
+        '',
+        str(requirement.pos_in_csv),
+        requirement.rid,
+        str(requirement.description),
+        type_in_csv,
+        ' '.join(requirement.tags),
+        str(requirement.status),
+        '\n'.join(f.get_string() for f in requirement.formalizations.values()),
+    ] + ['' if csv_row.get(name) is None else str(csv_row.get(name)) for name in csv_fieldnames]
+    return dict(enumerate(row))
+
+
+# Revision folder -> (csv columns, index of the table rows).
+_indexes: Dict[str, tuple] = dict()
+_indexes_lock = threading.Lock()
+
+
+def get_index(folder: str, csv_fieldnames: List[str]):
+    """ The synced index of the table rows of the revision in `folder`, shared by all requests.
+
+    :return: A `ressources.queryapi.RequirementSearchIndex` holding the rows as search dicts.
+    """
+    # Imported here, the ressources import the session utils which import this module.
+    from ressources.queryapi import RequirementSearchIndex
+
+    store = get_requirement_store(folder)
+    with _indexes_lock:
+        fieldnames, index = _indexes.get(store.folder, (None, None))
+        if index is None or fieldnames != list(csv_fieldnames):
+            index = RequirementSearchIndex(store.folder, partial(table_row, list(csv_fieldnames)), trigrams=False)
+            _indexes[store.folder] = (list(csv_fieldnames), index)
+    index.sync()
+    return index
+
+
+def _on_stored(folder: str, rids: List[str]):
+    fieldnames, index = _indexes.get(folder, (None, None))
+    if index is not None:
+        index.mark_dirty(rids)
+
+
+add_store_listener(_on_stored)
+
+
+def query_rows(rows: Dict[str, Dict[int, str]], search, visible_columns: List[bool], order: List[tuple]) -> List[str]:
+    """ The rids of all rows matching the `SearchNode` `search`, ordered by `order` [(column index, descending), ...].
+    """
+    rids = sorted(rid for rid, row in rows.items() if search.evaluate_row(row, visible_columns))
+    for column, descending in reversed(order):
+        if column == 1:
+            key = lambda rid: float(rows[rid][1]) if rows[rid][1] not in ('', 'None') else float('-inf')
+        else:
+            key = lambda rid: rows[rid][column].casefold() if column < len(rows[rid]) else ''
+        rids.sort(key=key, reverse=descending)
+    return rids
+
+
+def _column_index(data: str, csv_fieldnames: List[str]) -> Optional[int]:
+    if data in COLUMNS:
+        return COLUMNS.index(data)
+    if data.startswith('csv_data.') and data[len('csv_data.'):] in csv_fieldnames:
+        return len(COLUMNS) + csv_fieldnames.index(data[len('csv_data.'):])
+    return None
+
+
+def table_order(args, column_index: Callable[[str], Optional[int]]) -> List[Tuple[int, bool]]:
+    """ The requested order of a DataTables server side request as [(column index, descending), ...].
+
+    :param column_index: Index of the column with the given `columns[i][data]`, None if unknown.
+    """
+    order, i = list(), 0
+    while f'order[{i}][column]' in args:
+        column = int(args[f'order[{i}][column]'])
+        index = column_index(args.get(f'columns[{column}][data]', ''))
+        order.append((column if index is None else index, args.get(f'order[{i}][dir]', 'asc') == 'desc'))
+        i += 1
+    return order
+
+
+def table_page(args, keys: list) -> list:
+    """ The keys on the requested page of a DataTables server side request (all for a `length` of -1). """
+    start, length = int(args.get('start', 0)), int(args.get('length', -1))
+    return keys[start:] if length < 0 else keys[start:start + length]
+
+
+def query_table(folder: str, csv_fieldnames: List[str], args) -> dict:
+    """ Answer a DataTables server side request.
+
+    :param folder: The revision folder.
+    :param csv_fieldnames: The csv columns shown after the fixed columns.
+    :param args: Request arguments: The DataTables parameters `draw`, `start`, `length`, `order[i][column|dir]` and
+                 `columns[i][data]`, Hanfor searches `search_query` (query string), `filter_query` (json list of query
+                 tokens) and `visible_columns` (json list of booleans). With `ids_only`, only the ids of all matching
+                 requirements are returned.
+    """
+    from ressources.queryapi import SearchNode
+
+    search = SearchNode.from_query(args.get('search_query', ''))
+    filter_tokens = json.loads(args.get('filter_query') or '[]')
+    if len(filter_tokens) > 0:
+        search_filter = SearchNode.search_array_to_tree(filter_tokens)
+        node = SearchNode(':AND:')
+        node.left, node.right = search, search_filter
+        search = node
+    visible_columns = json.loads(args.get('visible_columns') or 'null') or [True] * (len(COLUMNS) + len(csv_fieldnames))
+
+    order = table_order(args, lambda data: _column_index(data, csv_fieldnames))
+    rows = get_index(folder, csv_fieldnames).snapshot()
+    rids = query_rows(rows, search, visible_columns, order)
+    if args.get('ids_only') in ('true', '1'):
+        return {'ids': rids}
+
+    page = table_page(args, rids)
+    data = list()
+    for requirement in get_requirement_store(folder).in_order(page, read_only=True):
+        try:
+            data.append(requirement.to_dict())
+        except Exception as e:
+            logging.debug(e)
+    return {
+        'draw': int(args.get('draw', 0)),
+        'recordsTotal': len(rows),
+        'recordsFiltered': len(rids),
+        'data': data,
+        'types': sorted({row[4] for row in rows.values()})
+    }
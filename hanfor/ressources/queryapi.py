@@ -1,10 +1,19 @@
+import logging
 import re
+import threading
+from collections import defaultdict
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Pattern, Sequence, Set
 
-from reqtransformer import Requirement
+import requirement_store
+from requirement_store import get_requirement_store
 from ressources import Ressource
 
 
 class SearchNode:
+    """ One node of a search expression tree. Used by the query API and, with the search language of the tables in
+    the frontend (`static/js/datatables-advanced-search.js`), by the server side requirements and variables tables.
+    """
     operators = {":AND:": 1, ":OR:": 1}
     leftAssoc = {":AND:": 1, ":OR:": 1}
     rightAssoc = {}
@@ -16,7 +25,9 @@ class SearchNode:
         self.value = value
         self.right = False
         self.data_target = None
+        self.col_target = -1
         self.update_target()
+        self.update_col_target()
 
     def update_target(self):
         """ Updates the data target if it is set in the string:
@@ -31,9 +42,25 @@ class SearchNode:
                 self.data_target = sub_string[match.span()[0] + 1: match.span()[1] - 1]
                 self.value = sub_string[match.span()[1]:]
 
+    def update_col_target(self):
+        """ Updates the targeted table column if it is set in the string:
+             :COL_INDEX_<two digit column index>:
+
+        """
+        col_index = self.value.find(':COL_INDEX_')
+        if col_index >= 0:
+            try:
+                self.col_target = int(self.value[col_index + 11:col_index + 13])
+                self.value = self.value[col_index + 14:]
+            except ValueError:
+                pass
+
     def evaluate(self, data):
         return SearchNode.evaluate_tree(self, data)
 
+    def evaluate_row(self, row: Sequence[str], visible_columns: List[bool]) -> bool:
+        return SearchNode.evaluate_row_tree(self, row, visible_columns)
+
     @staticmethod
     def is_search_string(token):
         return not (token in SearchNode.parantheses or token in SearchNode.operators)
@@ -52,6 +79,14 @@ class SearchNode:
     def peek(array):
         return array[len(array) - 1]
 
+    @staticmethod
+    def pop_operands(output_tree_stack):
+        if len(output_tree_stack) < 2:
+            raise SyntaxError('Search query operator without operands.')
+        right = output_tree_stack.pop()
+        left = output_tree_stack.pop()
+        return left, right
+
     @staticmethod
     def search_array_to_tree(array):
         output_tree_stack = []
@@ -77,8 +112,7 @@ class SearchNode:
                             )
                     ):
                         # Pop last two subtrees and make them children of a new subtree (with prev_op as root).
-                        right = output_tree_stack.pop()
-                        left = output_tree_stack.pop()
+                        left, right = SearchNode.pop_operands(output_tree_stack)
                         sub_tree = SearchNode(op_stack.pop())
                         sub_tree.left = left
                         sub_tree.right = right
@@ -103,8 +137,7 @@ class SearchNode:
                         break
                     else:
                         # Until match pop operators off the op_stack and create a new subtree with operator as root.
-                        right = output_tree_stack.pop()
-                        left = output_tree_stack.pop()
+                        left, right = SearchNode.pop_operands(output_tree_stack)
                         sub_tree = SearchNode(op)
                         sub_tree.left = left
                         sub_tree.right = right
@@ -123,8 +156,7 @@ class SearchNode:
                 raise SyntaxError('Search query parentheses mismatch.')
 
             # Create new subtree with op as root.
-            right = output_tree_stack.pop()
-            left = output_tree_stack.pop()
+            left, right = SearchNode.pop_operands(output_tree_stack)
             sub_tree = SearchNode(op)
             sub_tree.left = left
             sub_tree.right = right
@@ -138,19 +170,23 @@ class SearchNode:
         return output_tree_stack[0]
 
     @staticmethod
-    def query_splitter(query):
+    def query_splitter(query, target_col: int = None):
         # Split by :AND:, :OR:, (, )
         result = re.split(r"(:OR:|:AND:|\(|\))", query)
         # Remove empty elements.
         result = [s for s in result if len(s) > 0]
+        # Restrict the search strings to a table column.
+        if target_col is not None:
+            result = [s if not SearchNode.is_search_string(s) else f':COL_INDEX_{target_col:02d}:{s}' for s in result]
         return result
 
     @staticmethod
-    def from_query(query=''):
-        return SearchNode.search_array_to_tree(SearchNode.query_splitter(query))
+    def from_query(query='', target_col: int = None):
+        return SearchNode.search_array_to_tree(SearchNode.query_splitter(query, target_col))
 
     @staticmethod
-    def check_value_in_string(value: str, string: str):
+    @lru_cache(maxsize=1024)
+    def compile_value(value: str) -> Pattern:
         # We support value to be `
         #  * "<inner>"` for exact match.
         #  * ""<inner>"" for exclusive match.
@@ -161,7 +197,50 @@ class SearchNode:
             value = re.escape(value)
             value = value.replace(r'\"', r'\b')
 
-        return bool(re.search(value, string))
+        return re.compile(value)
+
+    @staticmethod
+    def check_value_in_string(value: str, string: str):
+        return bool(SearchNode.compile_value(value).search(string))
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def compile_table_value(value: str) -> Pattern:
+        # Table searches are case insensitive regexes, with the same `"` and `""` markers as above.
+        if value.startswith('""') and value.endswith('""') and len(value) >= 4:
+            pattern = r'^\s*' + value[2:(len(value) - 2)] + r'\s*$'
+        else:
+            pattern = re.sub(r'([^\\])?"', lambda match: (match.group(1) or '') + r'\b', value)
+        try:
+            return re.compile(pattern, re.IGNORECASE)
+        except re.error:
+            return re.compile(re.escape(value), re.IGNORECASE)
+
+    @staticmethod
+    def evaluate_row_tree(tree, row: Sequence[str], visible_columns: List[bool]) -> bool:
+        """ Evaluate a table search on a table row: Search strings without column target search all visible columns.
+
+        :param tree: The search tree.
+        :param row: The searchable text of the row by column index.
+        :param visible_columns: Visibility by column index.
+        """
+        if not tree:
+            return True
+
+        if tree.left is False and tree.right is False:
+            if tree.col_target >= 0:
+                string = row[tree.col_target] if tree.col_target < len(row) else ''
+            else:
+                string = ' '.join(row[i] for i, visible in enumerate(visible_columns) if visible and i < len(row))
+            invert_index = tree.value.find(':NOT:')
+            if invert_index >= 0:
+                return not SearchNode.compile_table_value(tree.value[invert_index + 5:]).search(string)
+            return bool(SearchNode.compile_table_value(tree.value).search(string))
+
+        left_sub = SearchNode.evaluate_row_tree(tree.left, row, visible_columns)
+        if tree.value == ':AND:':
+            return left_sub and SearchNode.evaluate_row_tree(tree.right, row, visible_columns)
+        return left_sub or SearchNode.evaluate_row_tree(tree.right, row, visible_columns)
 
     @staticmethod
     def evaluate_tree(tree, data: dict):
@@ -202,6 +281,231 @@ class SearchNode:
             return left_sub or right_sub
 
 
+def _trigrams(string: str) -> Set[str]:
+    return {string[i:i + 3] for i in range(len(string) - 2)}
+
+
+class LeafMatcher:
+    """ A prepared search string of a query: the compiled pattern, the searched field (None for all fields) and the
+    trigrams every match has to contain.
+    """
+
+    def __init__(self, node: SearchNode):
+        value = node.value
+        self.data_target = node.data_target
+        invert_index = value.find(':NOT:')
+        self.invert = invert_index >= 0
+        if self.invert:
+            value = value[invert_index + 5:]
+        self.pattern = SearchNode.compile_value(value)
+        if value.startswith('""') and value.endswith('""'):
+            literals = [value[2:(len(value) - 2)]]
+        else:
+            literals = value.split('"')
+        # No trigrams (too short search strings) -> the index can not narrow down the candidates, we scan.
+        self.trigrams = set().union(*(_trigrams(literal) for literal in literals))
+
+    def matches(self, data: dict) -> bool:
+        if self.data_target is not None:
+            string = data[self.data_target]
+        else:
+            string = ''.join(data.values())
+        return bool(self.pattern.search(string)) != self.invert
+
+    def evaluate(self, index: 'RequirementSearchIndex') -> Set[str]:
+        matching = index.matching(self.data_target, self.trigrams, self.pattern)
+        if self.invert:
+            return index.rids() - matching
+        return matching
+
+
+class CompiledQuery:
+    """ A query tree compiled once into prepared leaf matchers.
+    `evaluate` answers :AND: / :OR: by set operations on the candidates found by the search index.
+    """
+
+    def __init__(self, query: str):
+        self.query = query
+        self.root = CompiledQuery._compile(SearchNode.from_query(query))
+
+    @staticmethod
+    def _compile(node: SearchNode):
+        if node.left is False and node.right is False:
+            return LeafMatcher(node)
+        return node.value, CompiledQuery._compile(node.left), CompiledQuery._compile(node.right)
+
+    def evaluate(self, index: 'RequirementSearchIndex') -> Set[str]:
+        return CompiledQuery._evaluate(self.root, index)
+
+    @staticmethod
+    def _evaluate(node, index: 'RequirementSearchIndex') -> Set[str]:
+        if isinstance(node, LeafMatcher):
+            return node.evaluate(index)
+        operator, left, right = node
+        if operator == ':AND:':
+            return CompiledQuery._evaluate(left, index) & CompiledQuery._evaluate(right, index)
+        return CompiledQuery._evaluate(left, index) | CompiledQuery._evaluate(right, index)
+
+    def matches(self, data: dict) -> bool:
+        return CompiledQuery._matches(self.root, data)
+
+    @staticmethod
+    def _matches(node, data: dict) -> bool:
+        if isinstance(node, LeafMatcher):
+            return node.matches(data)
+        operator, left, right = node
+        if operator == ':AND:':
+            return CompiledQuery._matches(left, data) and CompiledQuery._matches(right, data)
+        return CompiledQuery._matches(left, data) or CompiledQuery._matches(right, data)
+
+
+@lru_cache(maxsize=256)
+def compile_query(query: str) -> CompiledQuery:
+    return CompiledQuery(query)
+
+
+class RequirementSearchIndex:
+    """ The search dicts of all requirements in a revision folder with a trigram inverted index per field and over
+    the concatenation of all fields (searched by queries without data target).
+    Requirements stored by this process are re-indexed on the next `sync`, writes of other processes index all
+    requirements again.
+    """
+
+    def __init__(self, folder: str, fields: Callable = None, trigrams: bool = True):
+        """
+        :param folder: The revision folder.
+        :param fields: The searched fields of a requirement, defaults to the fields searched by queries
+                       (see `QueryAPI.req_dict_to_search_dict`).
+        :param trigrams: Build the trigram index, only needed for `matching`.
+        """
+        self.folder = folder
+        self.fields = fields if fields is not None else _query_fields
+        self.trigrams = trigrams
+        self.search_dicts: Dict[str, dict] = dict()
+        self._strings: Dict[str, Dict[Optional[str], str]] = dict()
+        self._postings: Dict[Optional[str], Dict[str, Set[str]]] = defaultdict(lambda: defaultdict(set))
+        self._dirty = set()
+        self._version = None
+        self._stale = False
+        self._lock = threading.Lock()
+
+    def mark_dirty(self, rids):
+        """ Requirements were stored by this process. """
+        version = get_requirement_store(self.folder).content_version()
+        with self._lock:
+            if version is not None and self._version is not None and \
+                    (version[0] != self._version[0] or version[1] != self._version[1] + 1):
+                # Someone else wrote in between.
+                self._stale = True
+            self._version = version
+            self._dirty.update(rids)
+
+    def sync(self):
+        """ Index added and changed requirements, drop removed ones. """
+        store = get_requirement_store(self.folder)
+        with self._lock:
+            version = store.content_version()
+            current = set(store.rids())
+            indexed = set(self.search_dicts.keys())
+            if self._stale or (version is not None and self._version is not None and version != self._version):
+                logging.debug(f'Indexing all requirements of `{self.folder}` again.')
+                dirty = current | indexed
+            else:
+                dirty = (self._dirty | (current ^ indexed)) & (current | indexed)
+            self._dirty = set()
+            self._version = version
+            self._stale = False
+            for rid in dirty:
+                self._remove(rid)
+            for requirement in store.snapshots(current & dirty):
+                self._add(requirement.rid, self.fields(requirement))
+
+    def _add(self, rid: str, search_dict: dict):
+        self.search_dicts[rid] = search_dict
+        if not self.trigrams:
+            return
+        strings = {field: value for field, value in search_dict.items()}
+        strings[None] = ''.join(search_dict.values())
+        self._strings[rid] = strings
+        for field, string in strings.items():
+            for trigram in _trigrams(string):
+                self._postings[field][trigram].add(rid)
+
+    def _remove(self, rid: str):
+        strings = self._strings.pop(rid, None)
+        self.search_dicts.pop(rid, None)
+        if strings is None:
+            return
+        for field, string in strings.items():
+            postings = self._postings[field]
+            for trigram in _trigrams(string):
+                postings[trigram].discard(rid)
+                if len(postings[trigram]) == 0:
+                    del postings[trigram]
+
+    def snapshot(self) -> Dict[str, dict]:
+        """ The search dicts by rid. Updates replace the search dicts of the changed requirements instead of changing
+        them, so they can be read without the lock. """
+        with self._lock:
+            return dict(self.search_dicts)
+
+    def rids(self) -> Set[str]:
+        with self._lock:
+            return set(self.search_dicts.keys())
+
+    def target_names(self) -> List[str]:
+        with self._lock:
+            for search_dict in self.search_dicts.values():
+                return sorted(search_dict.keys())
+            return list()
+
+    def matching(self, field: Optional[str], trigrams: Set[str], pattern: Pattern) -> Set[str]:
+        """ Requirements whose field (all fields if None) matches the pattern, narrowed down to the requirements
+        containing all trigrams. Looked up under the lock, as a concurrent `sync` mutates the postings. """
+        with self._lock:
+            return {rid for rid in self._candidates(field, trigrams) if pattern.search(self._strings[rid][field])}
+
+    def _candidates(self, field: Optional[str], trigrams: Set[str]) -> Set[str]:
+        if len(trigrams) == 0:
+            return set(self.search_dicts.keys())
+        postings = self._postings.get(field, dict())
+        result = None
+        for trigram in sorted(trigrams, key=lambda t: len(postings.get(t, ()))):
+            rids = postings.get(trigram)
+            if not rids:
+                return set()
+            result = set(rids) if result is None else result & rids
+            if len(result) == 0:
+                break
+        return result
+
+
+def _query_fields(requirement) -> dict:
+    return QueryAPI.req_dict_to_search_dict(requirement.to_dict())
+
+
+# Revision folder -> search index.
+search_indexes: Dict[str, RequirementSearchIndex] = dict()
+
+
+def get_search_index(folder: str) -> RequirementSearchIndex:
+    """ Returns the synced search index of the requirements in a revision folder. """
+    folder = get_requirement_store(folder).folder
+    if folder not in search_indexes:
+        search_indexes[folder] = RequirementSearchIndex(folder)
+    index = search_indexes[folder]
+    index.sync()
+    return index
+
+
+def _on_requirements_stored(folder: str, rids):
+    if folder in search_indexes:
+        search_indexes[folder].mark_dirty(rids)
+
+
+requirement_store.add_store_listener(_on_requirements_stored)
+
+
 class Query(dict):
     def __init__(self, name, query='', result=None):
         super().__init__()
@@ -244,21 +548,20 @@ class QueryAPI(Ressource):
         super().__init__(app, request)
         if 'queries' not in self.meta_settings:
             self.truncate_query_storage()
-        self._requirement_data = None
+        self._search_index = None
 
     @property
-    def requirement_data(self):
-        if self._requirement_data is None:
-            self._requirement_data = dict()
-            for req in Requirement.requirements():
-                self._requirement_data[req.rid] = QueryAPI.req_dict_to_search_dict(req.to_dict())
-        return self._requirement_data
+    def search_index(self) -> RequirementSearchIndex:
+        if self._search_index is None:
+            self._search_index = get_search_index(self.app.config['REVISION_FOLDER'])
+        return self._search_index
 
     @property
     def queries(self):
         return self.meta_settings['queries']
 
     def store(self):
+        self.meta_settings.mark('queries')
         self.meta_settings.update_storage()
 
     def get_query(self, name):
@@ -303,14 +606,8 @@ class QueryAPI(Ressource):
 
         return result
 
-    @staticmethod
-    def get_target_names():
-        result = list()
-        for req in Requirement.requirements():
-            result = [key for key in QueryAPI.req_dict_to_search_dict(req.to_dict()).keys()]
-            result = sorted(result)
-            break
-        return result
+    def get_target_names(self):
+        return self.search_index.target_names()
 
     def truncate_query_storage(self):
         self.meta_settings['queries'] = dict()
@@ -318,12 +615,8 @@ class QueryAPI(Ressource):
 
     def eval_query(self, name):
         query = self.get_query(name)
-        query.result = []
         if query is not None:
-            tree = SearchNode.from_query(query.query)
-            for rid, data in self.requirement_data.items():
-                if SearchNode.evaluate_tree(tree, data):
-                    query.result.append(rid)
+            query.result = sorted(compile_query(query.query).evaluate(self.search_index))
 
     def GET(self):
         """ Returns the `name` associated query. Or all stored queries if no name is given.
@@ -333,7 +626,7 @@ class QueryAPI(Ressource):
         reload = self.request.args.get('reload', '').strip()
         if show:
             if show == 'targets':
-                self.response.data = QueryAPI.get_target_names()
+                self.response.data = self.get_target_names()
         elif name:
             if reload:
                 self.eval_query(name)
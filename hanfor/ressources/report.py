@@ -25,6 +25,7 @@ class Report(Ressource):
                 'results': report_results,
                 'name': name
             }
+        self.meta_settings.mark('reports')
         self.meta_settings.update_storage()
 
     def GET(self):
@@ -42,4 +43,5 @@ class Report(Ressource):
     def DELETE(self):
         report_id = int(self.request.form.get('report_id', '').strip())
         self.meta_settings['reports'].pop(report_id)
+        self.meta_settings.mark('reports')
         self.meta_settings.update_storage()
@@ -1,25 +1,22 @@
 from __future__ import annotations
 
-import fnmatch
 import json
 import logging
-import multiprocessing
 import os
 import time
 import uuid
+from concurrent.futures import Future
 from distutils.util import strtobool
 
 from flask import Flask, render_template
 from pysmt.shortcuts import Bool, Int, Real
 from pysmt.typing import BOOL, INT, REAL
 
-import boogie_parsing
-from req_simulator.boogie_pysmt_transformer import BoogiePysmtTransformer
-from req_simulator.countertrace import CountertraceTransformer
-from req_simulator.phase_event_automaton import PhaseEventAutomaton, build_automaton
+from req_simulator.pea_builder import PeaTask, prewarm_pea_tasks, resolve_pea_tasks
+from req_simulator.pea_cache import normalize_expression, pea_cache_key
+from req_simulator.phase_event_automaton import PhaseEventAutomaton
 from req_simulator.scenario import Scenario
 from req_simulator.simulator import Simulator
-from req_simulator.utils import get_countertrace_parser
 from reqtransformer import Requirement, Formalization, VariableCollection
 from ressources import Ressource
 
@@ -33,6 +30,8 @@ validation_patterns = {
 
 class SimulatorRessource(Ressource):
     simulator_cache: dict[str, Simulator] = {}
+    # Progress of building the phase event automata for `create_simulator` by the progress id given by the client.
+    build_progress: dict[str, dict[str, int]] = {}
 
     def __init__(self, app, request):
         super().__init__(app, request)
@@ -52,6 +51,9 @@ class SimulatorRessource(Ressource):
         if command == 'scenario_save':
             self.scenario_save()
 
+        if command == 'get_progress':
+            self.get_progress()
+
     def POST(self):
         command = self.request.form.get('command')
 
@@ -130,24 +132,37 @@ class SimulatorRessource(Ressource):
     def create_simulator(self) -> None:
         requirement_ids = json.loads(self.request.form.get('requirement_ids'))
         simulator_name = self.request.form.get('simulator_name')
+        progress_id = self.request.form.get('progress_id')
 
         if len(requirement_ids) <= 0:
             self.response.success = False
             self.response.errormsg = 'No requirement ids given.'
             return
 
-        peas = []
-        var_collection = VariableCollection.load(self.app.config['SESSION_VARIABLE_COLLECTION'])
+        tasks = []
+        var_collection = VariableCollection.load_session(self.app)
 
         for requirement_id in requirement_ids:
-            peas_tmp = SimulatorRessource.create_phase_event_automata(requirement_id, var_collection, self.app)
+            requirement = Requirement.load_requirement_by_id(requirement_id, self.app)
+            tasks_tmp = SimulatorRessource.pea_tasks(requirement, var_collection) if requirement else None
 
-            if peas_tmp is None:
+            if tasks_tmp is None:
                 self.response.success = False
                 self.response.errormsg = f'Unable to constuct phase event automaton for {requirement_id}.'
                 return
 
-            peas.extend(peas_tmp)
+            tasks.extend(tasks_tmp)
+
+        def on_progress(done: int, total: int) -> None:
+            self.build_progress[progress_id] = {'done': done, 'total': total}
+
+        try:
+            peas = resolve_pea_tasks(
+                tasks, self.app.config['REVISION_FOLDER'],
+                processes=self.build_processes(self.app),
+                on_progress=on_progress if progress_id else None)
+        finally:
+            self.build_progress.pop(progress_id, None)
 
         simulator_id = uuid.uuid4().hex
         self.simulator_cache[simulator_id] = Simulator(peas, name=simulator_name)
@@ -157,6 +172,16 @@ class SimulatorRessource(Ressource):
             'simulator_name': simulator_name
         }
 
+    def get_progress(self) -> None:
+        progress_id = self.request.args.get('progress_id')
+
+        if progress_id not in self.build_progress:
+            self.response.success = False
+            self.response.errormsg = 'No simulator is created for the given progress id.'
+            return
+
+        self.response.data = self.build_progress[progress_id]
+
     def scenario_load(self) -> None:
         simulator_id = self.request.form.get('simulator_id')
         scenario_str = self.request.form.get('scenario_str')
@@ -250,26 +275,33 @@ class SimulatorRessource(Ressource):
         self.get_simulators()
 
     @staticmethod
-    def load_phase_event_automata(requirement_id: str, app: Flask):
-        result = []
-
-        dir = app.config['REVISION_FOLDER']
-        for file in fnmatch.filter(os.listdir(dir), f'{requirement_id}_*_PEA.pickle'):
-            result.append(PhaseEventAutomaton.load(os.path.join(dir, file)))
-
-        return result
+    def build_processes(app: Flask) -> int:
+        """ Number of processes building phase event automata (`PEA_BUILD_PROCESSES`, all cores by default). """
+        return app.config.get('PEA_BUILD_PROCESSES') or os.cpu_count() or 1
 
     @staticmethod
-    def store_phase_event_automata(peas: list[PhaseEventAutomaton], app: Flask) -> None:
-        for pea in peas:
-            file = f'{pea.requirement.rid}_{pea.formalization.id}_{pea.countertrace_id}_PEA.pickle'
-            pea.store(os.path.join(app.config['REVISION_FOLDER'], file))
-
-    @staticmethod
-    def delete_phase_event_automata(requirement_id: str, app: Flask):
-        dir = app.config['REVISION_FOLDER']
-        for file in fnmatch.filter(os.listdir(dir), f'{requirement_id}_*_PEA.pickle'):
-            os.remove(os.path.join(dir, file))
+    def prewarm_in_background(requirement: Requirement, app: Flask) -> list[Future]:
+        """ Build the phase event automata of `requirement` missing in the PEA cache in the background, in the process
+        pool building the automata for the simulator (processes, since the pysmt formula manager is not thread safe).
+        A prewarm of the same requirement still waiting for a process is replaced.
+
+        :param requirement: The requirement whose formalizations were just saved.
+        :param app: Hanfor flask app for context.
+        :return: The submitted builds.
+        """
+        if not app.config.get('PEA_CACHE_PREWARM', True) or not requirement.formalizations:
+            return []
+
+        try:
+            tasks = SimulatorRessource.pea_tasks(requirement, VariableCollection.load_session(app))
+        except Exception as e:
+            logging.debug(f'Could not prewarm phase event automata for {requirement.rid}: {e}')
+            return []
+        if tasks is None:
+            return []
+
+        return prewarm_pea_tasks(requirement.rid, tasks, app.config['REVISION_FOLDER'],
+                                 SimulatorRessource.build_processes(app))
 
     @staticmethod
     def has_variable_with_unknown_type(formalization: Formalization, variables: dict[str, str]) -> bool:
@@ -281,12 +313,32 @@ class SimulatorRessource(Ressource):
 
     @staticmethod
     def create_phase_event_automata(requirement_id: str, var_collection, app: Flask) -> list[PhaseEventAutomaton] | None:
-        result = []
-
         requirement = Requirement.load_requirement_by_id(requirement_id, app)
+        return SimulatorRessource.build_phase_event_automata(requirement, var_collection, app.config['REVISION_FOLDER'])
+
+    @staticmethod
+    def build_phase_event_automata(requirement: Requirement, var_collection: VariableCollection,
+                                   folder: str) -> list[PhaseEventAutomaton] | None:
+        """ Get the phase event automata of all formalizations of `requirement` from the PEA cache of `folder`,
+        building (and caching) the ones missing.
+
+        :return: The automata or None if a formalization can not be instantiated.
+        """
+        tasks = SimulatorRessource.pea_tasks(requirement, var_collection)
+        if tasks is None:
+            return None
+
+        return resolve_pea_tasks(tasks, folder)
+
+    @staticmethod
+    def pea_tasks(requirement: Requirement, var_collection: VariableCollection) -> list[PeaTask] | None:
+        """ One task per countertrace of every formalization of `requirement`.
+
+        :return: The tasks or None if a formalization can not be instantiated.
+        """
+        result = []
 
         variables = {k: v.type for k, v in var_collection.collection.items()}
-        boogie_parser = boogie_parsing.get_parser_instance()
 
         for formalization in requirement.formalizations.values():
             if not formalization.scoped_pattern.is_instantiatable():
@@ -300,21 +352,24 @@ class SimulatorRessource(Ressource):
             if len(PATTERNS[pattern]['countertraces'][scope]) <= 0:
                 raise ValueError(f'No countertrace given: {scope}, {pattern}')
 
-            expressions = {}
-            for k, v in formalization.expressions_mapping.items():
-                #Todo: hack to detect empty expressions (why is this necessary now)?
-                if not v.raw_expression:
-                    continue
-                tree = boogie_parser.parse(v.raw_expression)
-                expressions[k] = BoogiePysmtTransformer(var_collection.collection).transform(tree)
+            #Todo: hack to detect empty expressions (why is this necessary now)?
+            expressions = {k: v.raw_expression for k, v in formalization.expressions_mapping.items()
+                           if v.raw_expression}
+            normalized_expressions = {k: normalize_expression(v) for k, v in expressions.items()}
+            used_variables = {name: var_collection.collection[name] for name in formalization.used_variables}
+            used_types = {name: (v.type, v.value) for name, v in used_variables.items()}
 
             for i, ct_str in enumerate(PATTERNS[pattern]['countertraces'][scope]):
-                ct = CountertraceTransformer(expressions).transform(get_countertrace_parser().parse(ct_str))
-                pea = build_automaton(ct, f'c_{requirement.rid}_{formalization.id}_{i}_')
-
-                pea.requirement = requirement
-                pea.formalization = formalization
-                pea.countertrace_id = i
-                result.append(pea)
+                clock_prefix = f'c_{requirement.rid}_{formalization.id}_{i}_'
+                result.append(PeaTask(
+                    requirement=requirement,
+                    formalization=formalization,
+                    countertrace_id=i,
+                    countertrace=ct_str,
+                    expressions=expressions,
+                    variables=used_variables,
+                    clock_prefix=clock_prefix,
+                    key=pea_cache_key(pattern, scope, i, ct_str, normalized_expressions, used_types, clock_prefix)
+                ))
 
         return result
@@ -0,0 +1,137 @@
+""" Catalog of the stored revisions, shown when choosing a session or revision.
+
+Each revision folder holds a small record `revision_catalog.json` with the number of requirements and variables, the
+number of requirements by status and the time of the last modification. Listing sessions only reads these records
+instead of loading the variable collection of every revision.
+
+Writes to a revision mark its record dirty (requirement writes via the requirement store listener, variable
+collections via `mark_dirty`). `flush` updates the dirty records, once per request. Records missing in folders of
+older Hanfor versions are built on first use, `rebuild` builds all records of a session again.
+"""
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, Optional
+
+from requirement_store import REQUIREMENTS_DB, add_store_listener, get_requirement_store, has_requirement_pickles
+from static_utils import pickle_load_from_dump
+
+CATALOG_FILE = 'revision_catalog.json'
+VARIABLE_COLLECTION_FILE = 'session_variable_collection.pickle'
+
+# Revision folder -> number of variables if known from the write, else None.
+_dirty: Dict[str, Optional[int]] = dict()
+_dirty_lock = threading.Lock()
+
+
+def mark_dirty(revision_folder: str, num_vars: int = None):
+    """ Record that a revision was written. The record is updated on the next `flush`.
+
+    :param revision_folder: The written revision.
+    :param num_vars: The number of variables if the variable collection was written.
+    """
+    revision_folder = os.path.abspath(revision_folder)
+    with _dirty_lock:
+        if num_vars is not None or _dirty.get(revision_folder) is None:
+            _dirty[revision_folder] = num_vars
+
+
+def _on_stored(folder: str, rids):
+    mark_dirty(folder)
+
+
+add_store_listener(_on_stored)
+
+
+def read_record(revision_folder: str) -> Optional[dict]:
+    try:
+        with open(os.path.join(revision_folder, CATALOG_FILE), mode='r') as record_file:
+            return json.load(record_file)
+    except (OSError, ValueError):
+        return None
+
+
+def write_record(revision_folder: str, record: dict):
+    tmp_path = os.path.join(revision_folder, f'.{uuid.uuid4().hex}.tmp')
+    with open(tmp_path, mode='w') as record_file:
+        json.dump(record, record_file)
+    os.replace(tmp_path, os.path.join(revision_folder, CATALOG_FILE))
+
+
+def _count_vars(revision_folder: str) -> int:
+    try:
+        return len(pickle_load_from_dump(os.path.join(revision_folder, VARIABLE_COLLECTION_FILE)).collection)
+    except Exception:
+        return -1
+
+
+def _last_modification(revision_folder: str) -> float:
+    with os.scandir(revision_folder) as entries:
+        return max([os.stat(revision_folder).st_mtime] + [entry.stat().st_mtime for entry in entries])
+
+
+def _update_requirement_counts(revision_folder: str, record: dict):
+    status_counts = defaultdict(int)
+    # Do not create a requirements database for folders without requirements.
+    if os.path.isfile(os.path.join(revision_folder, REQUIREMENTS_DB)) or has_requirement_pickles(revision_folder):
+        for (_, status), count in get_requirement_store(revision_folder).status_counts_by_type().items():
+            status_counts[status] += count
+    record['num_requirements'] = sum(status_counts.values())
+    record['status_counts'] = dict(status_counts)
+
+
+def build_record(revision_folder: str) -> dict:
+    """ Build the record of a revision from its stored requirements and variable collection. """
+    record = {'num_vars': _count_vars(revision_folder)}
+    _update_requirement_counts(revision_folder, record)
+    record['last_mod'] = _last_modification(revision_folder)
+    return record
+
+
+def get_record(revision_folder: str) -> dict:
+    """ The record of a revision, built and stored first for revisions without one. """
+    record = read_record(revision_folder)
+    if record is None:
+        logging.info(f'Building the catalog record of `{revision_folder}`.')
+        record = build_record(revision_folder)
+        write_record(revision_folder, record)
+    return record
+
+
+def flush():
+    """ Update the records of all revisions written since the last flush. """
+    with _dirty_lock:
+        dirty = dict(_dirty)
+        _dirty.clear()
+    for revision_folder, num_vars in dirty.items():
+        if not os.path.isdir(revision_folder):
+            continue
+        record = read_record(revision_folder)
+        if record is None:
+            record = build_record(revision_folder)
+        else:
+            # Counting by status is a query for the requirements database. Legacy pickles are counted from the
+            # requirement cache, which only loads the pickles changed since they were cached.
+            _update_requirement_counts(revision_folder, record)
+            if num_vars is not None:
+                record['num_vars'] = num_vars
+            record['last_mod'] = time.time()
+        write_record(revision_folder, record)
+
+
+def rebuild(session_folder: str) -> int:
+    """ Build the records of all revisions of a session again.
+
+    :return: Number of rebuilt records.
+    """
+    count = 0
+    for name in sorted(os.listdir(session_folder)):
+        revision_folder = os.path.join(session_folder, name)
+        if os.path.isdir(revision_folder):
+            write_record(revision_folder, build_record(revision_folder))
+            count += 1
+    return count
@@ -0,0 +1,183 @@
+""" Scheduler running the variable script evaluations (`SCRIPT_EVALUATIONS` in config.py).
+
+Each (script, variable) evaluation is a task run by a bounded pool of worker threads. Results are keyed by the hash of
+the script and its parameters: A variable with a stored result for the current key is not evaluated again unless
+forced. Finished results are written to the session `ScriptEvals` by a single writer, which stores all results
+finished so far at once. `progress` reports the queue depth and the number of finished evaluations.
+
+Use `get_session_scheduler(app)` to get the scheduler of the session, it is shared by all requests.
+"""
+import hashlib
+import json
+import logging
+import os
+import queue
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import reqtransformer
+
+DEFAULT_WORKERS = 4
+
+
+@dataclass
+class Script:
+    """ A configured script evaluation. """
+    filename: str
+    script: bytes
+    params: List[str]
+
+    @property
+    def key(self) -> str:
+        """ Identifies the results of this script and parameters. """
+        return hashlib.sha1(self.script + json.dumps(self.params).encode()).hexdigest()
+
+
+def evaluate(script: Script, name: str, env: dict) -> str:
+    """ Run `script` for the variable `name`. """
+    params = [param.replace('$VAR_NAME', name) for param in script.params]
+    logging.debug(f'Eval script: `{script.filename}` using params `{params}` for var `{name}`')
+    try:
+        result = subprocess.check_output([script.script] + params, shell=True, env=env,
+                                         stderr=subprocess.DEVNULL).decode()
+    except subprocess.CalledProcessError as e:
+        result = f'Output: {e.output.decode()}'
+    return f'Results for `{script.filename}` <br> {result} <br>'
+
+
+class ScriptEvaluationScheduler:
+    def __init__(self, results_path: str, workers: int = DEFAULT_WORKERS):
+        self.results_path = results_path
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='script-eval')
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='script-eval-writer')
+        self._finished = queue.Queue()
+        # (script filename, variable name) -> key of the queued or running evaluation.
+        self._pending: Dict[Tuple[str, str], str] = dict()
+        self._lock = threading.Condition()
+        self._results: Optional[reqtransformer.ScriptEvals] = None
+        self._mtime = None
+        self.queued = 0
+        self.running = 0
+        self.done = 0
+        self.cached = 0
+        self.failed = 0
+
+    def _load_results(self) -> 'reqtransformer.ScriptEvals':
+        """ The stored results, loaded again if the file was changed by someone else. """
+        mtime = os.stat(self.results_path).st_mtime_ns if os.path.exists(self.results_path) else None
+        if self._results is None or mtime != self._mtime:
+            if mtime is not None:
+                self._results = reqtransformer.ScriptEvals.load(self.results_path)
+            else:
+                self._results = reqtransformer.ScriptEvals(path=self.results_path)
+            self._mtime = mtime
+        return self._results
+
+    def schedule(self, scripts: Iterable[Script], var_names: Iterable[str], env: dict, force: bool = False) -> int:
+        """ Queue the evaluation of `scripts` for the variables `var_names`.
+
+        :param force: Evaluate again even if there is a result for the current script and parameters.
+        :return: The number of queued evaluations.
+        """
+        var_names = list(var_names)
+        count = 0
+        with self._lock:
+            results = self._load_results()
+            for script in scripts:
+                key = script.key
+                for name in var_names:
+                    if self._pending.get((script.filename, name)) == key:
+                        continue
+                    if not force and results.has_result(name, script.filename, key):
+                        self.cached += 1
+                        continue
+                    self._pending[(script.filename, name)] = key
+                    self.queued += 1
+                    count += 1
+                    self._executor.submit(self._run, script, key, name, env)
+        if count > 0:
+            logging.info(f'Queued {count} variable script evaluations.')
+        return count
+
+    def _run(self, script: Script, key: str, name: str, env: dict):
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+        try:
+            result = evaluate(script, name, env)
+        except Exception as e:
+            logging.error(f'Could not eval `{script.filename}` for variable `{name}`: {e}')
+            result = None
+        with self._lock:
+            self.running -= 1
+        self._finished.put((script.filename, key, name, result))
+        self._writer.submit(self._write)
+
+    def _write(self):
+        """ Store all finished results at once. Only run by the writer. """
+        finished = list()
+        while True:
+            try:
+                finished.append(self._finished.get_nowait())
+            except queue.Empty:
+                break
+        if len(finished) == 0:
+            return
+        with self._lock:
+            results = self._load_results()
+            for filename, key, name, result in finished:
+                if result is None:
+                    self.failed += 1
+                else:
+                    results.update_evals({name: result}, filename, key)
+                    self.done += 1
+                if self._pending.get((filename, name)) == key:
+                    del self._pending[(filename, name)]
+            try:
+                results.store()
+                self._mtime = os.stat(self.results_path).st_mtime_ns
+            except OSError as e:
+                logging.error(f'Could not store the variable script results to `{self.results_path}`: {e}')
+            self._lock.notify_all()
+
+    def progress(self) -> dict:
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'queued': self.queued,
+                'running': self.running,
+                'pending': len(self._pending),
+                'done': self.done,
+                'cached': self.cached,
+                'failed': self.failed
+            }
+
+    def wait(self, timeout: float = None) -> bool:
+        """ Wait until all queued evaluations are stored.
+
+        :return: False on timeout.
+        """
+        with self._lock:
+            return self._lock.wait_for(lambda: len(self._pending) == 0, timeout)
+
+
+_schedulers: Dict[str, ScriptEvaluationScheduler] = dict()
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(results_path: str, workers: int = DEFAULT_WORKERS) -> ScriptEvaluationScheduler:
+    """ The scheduler writing to the script results in `results_path`, shared by all requests. """
+    results_path = os.path.abspath(results_path)
+    with _schedulers_lock:
+        if results_path not in _schedulers:
+            _schedulers[results_path] = ScriptEvaluationScheduler(results_path, workers)
+        return _schedulers[results_path]
+
+
+def get_session_scheduler(app) -> ScriptEvaluationScheduler:
+    return get_scheduler(app.config['SCRIPT_EVAL_RESULTS_PATH'],
+                         app.config.get('SCRIPT_EVALUATION_WORKERS') or DEFAULT_WORKERS)
@@ -0,0 +1,235 @@
+""" Requirement migrations run on startup of a session revision.
+
+All requirements are migrated (`migrate_requirement`) in one pass, which also collects the tag usage for the meta
+settings migration and the variable usage for the consistency check of the variable collection. The pass is split
+into chunks handled by a pool of worker processes; changed requirements are stored by the calling process at once.
+
+The `StartupManifest` of a revision records the Hanfor version and the content version of the requirements after the
+last migration. If neither changed, the pass is skipped. Writes of this process keep the recorded content version up
+to date, so only changes by other processes or Hanfor versions trigger a new pass.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+import reqtransformer
+from reqtransformer import Requirement, Formalization, __version__
+from requirement_store import RequirementStore, add_store_listener, get_requirement_store
+
+STARTUP_MANIFEST_FILE = 'startup_manifest.json'
+# Bump when `migrate_requirement` changes, so all revisions are migrated again.
+MIGRATIONS_VERSION = 1
+
+
+class StartupManifest:
+    """ State of a revision after its last requirement migration, stored in `<revision>/startup_manifest.json`. """
+
+    def __init__(self, folder: str, data: dict = None):
+        self.folder = os.path.abspath(folder)
+        self.data = data or dict()
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.folder, STARTUP_MANIFEST_FILE)
+
+    @classmethod
+    def load(cls, folder: str) -> StartupManifest:
+        try:
+            with open(os.path.join(folder, STARTUP_MANIFEST_FILE), mode='r') as manifest_file:
+                return cls(folder, json.load(manifest_file))
+        except (OSError, ValueError):
+            return cls(folder)
+
+    def requirements_migrated(self, content_version) -> bool:
+        """ True if the requirements in `content_version` were migrated by this Hanfor version. """
+        return (content_version is not None
+                and self.data.get('hanfor_version') == __version__
+                and self.data.get('migrations_version') == MIGRATIONS_VERSION
+                and self.data.get('requirements') == list(content_version))
+
+    def record(self, content_version):
+        """ Record that the requirements in `content_version` are migrated. """
+        self.data = {
+            'hanfor_version': __version__,
+            'migrations_version': MIGRATIONS_VERSION,
+            'requirements': list(content_version) if content_version is not None else None
+        }
+        self.store()
+
+    def store(self):
+        tmp_path = os.path.join(self.folder, f'.{uuid.uuid4().hex}.tmp')
+        with open(tmp_path, mode='w') as manifest_file:
+            json.dump(self.data, manifest_file)
+        os.replace(tmp_path, self.path)
+
+
+# Revision folder -> manifest kept up to date with the writes of this process.
+_tracked_manifests: dict[str, StartupManifest] = dict()
+
+
+def track_manifest(manifest: StartupManifest):
+    """ Advance the recorded content version of `manifest` with every write of this process to its revision. """
+    _tracked_manifests[manifest.folder] = manifest
+    add_store_listener(_on_stored)
+
+
+def _on_stored(folder: str, rids: list[str]):
+    manifest = _tracked_manifests.get(folder)
+    if manifest is None or manifest.data.get('requirements') is None:
+        return
+    content_version = get_requirement_store(folder).content_version()
+    identity, generation = manifest.data['requirements']
+    # Requirements stored by this process are migrated. Writes of others in between are unknown.
+    if content_version == (identity, generation + 1):
+        manifest.record(content_version)
+
+
+def migrate_requirement(req: Requirement) -> bool:
+    """ Bring a requirement loaded from an older session into shape.
+
+    :return: True if the requirement was changed.
+    """
+    changes = False
+    if req.formalizations is None:
+        req.formalizations = dict()
+        changes = True
+    if isinstance(req.tags, set):
+        sanitize = lambda t: t.replace("<", "leq").replace(">", "geq")
+        req.tags = {sanitize(tag): "" for tag in req.tags}
+        changes = True
+    if isinstance(req.tags, dict):
+        # clean up old data sets  with empty tags that mess up exporting (if necessary)
+        new_tags = {tag: comment for tag, comment in req.tags.items() if tag != ""}
+        if new_tags != req.tags:
+            req.tags = new_tags
+            changes = True
+    if type(req.type_in_csv) is tuple:
+        changes = True
+        req.type_in_csv = req.type_in_csv[0]
+    if type(req.csv_row) is tuple:
+        changes = True
+        req.csv_row = req.csv_row[0]
+    if type(req.description) is tuple:
+        changes = True
+        req.description = req.description[0]
+    # Derive type inference errors if not set.
+    try:
+        for i, f in req.formalizations.items():
+            fid = getattr(f, "id", None)
+            if not fid and fid != i:
+                changes = True
+                setattr(f, "id", i)
+    except Exception as e:
+        logging.info(f'Something when updating formalisations went terribly wrong `{req.rid}:\n {e}`')
+    # ensure some well-formedness of requirements objects
+    for k, f in list(req.formalizations.items()):
+        if not isinstance(f, Formalization):
+            del req.formalizations[k]
+            changes = True
+            continue
+        if not f.scoped_pattern:
+            f.scoped_pattern = reqtransformer.ScopedPattern()
+            changes = True
+        if not f.scoped_pattern.scope or not f.scoped_pattern.pattern:
+            f.scoped_pattern = reqtransformer.ScopedPattern()
+            changes = True
+        # Add tags for requirements with (incomplete) formalizations.
+        if f.scoped_pattern.scope != reqtransformer.Scope.NONE and \
+                f.scoped_pattern.pattern.name != "NotFormalizable":
+            if 'has_formalization' not in req.tags:
+                req.tags['has_formalization'] = ""
+                changes = True
+        else:
+            incomplete = req.tags.get('incomplete_formalization', '')
+            if f'- {req.rid}_{f.id}' not in incomplete.split('\n'):
+                req.tags['incomplete_formalization'] = req.format_incomplete_formalization_tag(f.id)
+                changes = True
+    return changes
+
+
+@dataclass
+class RequirementsScan:
+    """ Result of the migration pass over all requirements of a revision. """
+    requirements: int = 0
+    migrated: int = 0
+    # Tag -> (sorted) ids of the requirements using it.
+    tag_usage: dict[str, list[str]] = field(default_factory=dict)
+    # Requirement id -> used variables, for requirements using any.
+    var_usage: dict[str, set[str]] = field(default_factory=dict)
+
+
+def _scan_chunk(folder: str, rids: list[str]) -> tuple[list[Requirement], dict[str, list[str]], dict[str, set[str]]]:
+    """ Migrate the requirements `rids`. Module level, so it can be run by the worker processes.
+
+    :return: The changed requirements, the tags and the used variables by requirement id.
+    """
+    changed, tags, var_usage = list(), dict(), dict()
+    for req in Requirement.requirements(folder, rids=rids):
+        if migrate_requirement(req):
+            changed.append(req)
+        tags[req.rid] = list(req.tags)
+        used_variables = req.used_variables
+        if len(used_variables) > 0:
+            var_usage[req.rid] = used_variables
+    return changed, tags, var_usage
+
+
+def scan_requirements(folder: str, processes: int = 1, chunk_size: int = RequirementStore.CHUNK_SIZE) \
+        -> RequirementsScan:
+    """ Migrate all requirements of a revision in one pass and collect their tag and variable usage.
+
+    :param folder: The revision folder.
+    :param processes: Handle the chunks in a pool of this many processes if greater than 1.
+    :param chunk_size: Number of requirements per chunk.
+    """
+    store = get_requirement_store(folder)
+    rids = store.rids()
+    chunks = [rids[start:start + chunk_size] for start in range(0, len(rids), chunk_size)]
+    if processes > 1 and len(chunks) > 1:
+        logging.debug(f'Migrating {len(rids)} requirements in {processes} processes.')
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            results = list(executor.map(_scan_chunk, [folder] * len(chunks), chunks))
+    else:
+        results = [_scan_chunk(folder, chunk) for chunk in chunks]
+
+    scan = RequirementsScan(requirements=len(rids))
+    changed = list()
+    tag_usage = dict()
+    for chunk_changed, tags, var_usage in results:
+        changed += chunk_changed
+        for rid, rid_tags in tags.items():
+            for tag in rid_tags:
+                tag_usage.setdefault(tag, list()).append(rid)
+        scan.var_usage.update(var_usage)
+    if len(changed) > 0:
+        store.store_many(changed)
+    scan.migrated = len(changed)
+    scan.tag_usage = {tag: sorted(tag_rids) for tag, tag_rids in tag_usage.items()}
+    return scan
+
+
+class StartupTimer:
+    """ Measures the steps of the startup for a timing breakdown in the log. """
+
+    def __init__(self):
+        self.timings: list[tuple[str, float]] = list()
+
+    @contextmanager
+    def step(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings.append((name, time.perf_counter() - start))
+
+    def log(self):
+        total = sum(seconds for _, seconds in self.timings)
+        breakdown = ', '.join(f'{name}: {seconds:.2f}s' for name, seconds in self.timings)
+        logging.info(f'Startup took {total:.2f}s ({breakdown}).')
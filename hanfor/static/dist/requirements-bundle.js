@@ -1,2 +1,1743 @@
 /*! For license information please see requirements-bundle.js.LICENSE.txt */
-(()=>{var e,t={9925:(e,t,n)=>{var r=n(9755);n(1388);const{Collapse:i,Modal:o}=n(4712);n(5700),n(4148),n(2993),n(944),n(3889),n(7312),n(2106),n(6824),n(7175);let a=n(5759);const s=n(9367),{SearchNode:l}=n(3024),{init_simulator_tab:c}=n(6714),{init_ultimate_tab:u}=n(4523),{init_ultimate_requirements_table_connection:d}=n(4523),{Textcomplete:h}=n(675),{TextareaEditor:f}=n(8207);let p,m,v=n(4070),g=new v([],{}),_=["","has_formalization"],y=["","Todo","Review","Done"],b=[":AND:",":OR:",":NOT:",":COL_INDEX_01:",":COL_INDEX_02:",":COL_INDEX_03:",":COL_INDEX_04:",":COL_INDEX_05:",":COL_INDEX_06:",":COL_INDEX_07:"],w=[""],x=[""],E=[],C=[!0,!0,!0,!0,!0,!0],O=[],S=JSON.parse(search_query),k={},L=[],T=sessionStorage.getItem("req_search_string"),A=sessionStorage.getItem("filter_status_string"),M=sessionStorage.getItem("filter_tag_string"),N=sessionStorage.getItem("filter_type_string");function q(){T=r("#search_bar").val().trim(),sessionStorage.setItem("req_search_string",T),p=l.fromQuery(T)}function I(){function e(e,t,n){return t.length>0&&(e.length>0&&(e=e.concat([":AND:"])),e=e.concat(function(e){return["("].concat(e,[")"])}(l.awesomeQuerySplitt0r(t,n)))),e}O=[],A=r("#status-filter-input").val(),M=r("#tag-filter-input").val(),N=r("#type-filter-input").val(),sessionStorage.setItem("filter_status_string",A),sessionStorage.setItem("filter_tag_string",M),sessionStorage.setItem("filter_type_string",N),O=e(O,N,4),O=e(O,M,5),O=e(O,A,6),m=l.searchArrayToTree(O)}function D(){let e=r("#requirements_table").DataTable(),t=[];r.each(e.columns().visible(),(function(e,n){!1===n?(r("#col_toggle_button_"+e).removeClass("btn-info").addClass("btn-secondary"),t.push(!1)):(r("#col_toggle_button_"+e).removeClass("btn-secondary").addClass("btn-info"),t.push(!0))})),C=t}function P(e){let t=[];return e.rows({selected:!0}).every((function(){let e=this.data();t.push(e.id)})),t}function j(){r.get("api/logs/get","",(function(e){r("#log_textarea").html(e)})).done((function(){r(".req_direct_link").click((function(){R(function(e){let t=r("#requirements_table").DataTable(),n=-1;return t.column(2).data().filter((function(t,r){return String(t)===String(e)&&(n=r,!0)})),n}(r(this).data("rid")))})),r("#log_textarea").scrollTop(1e5)}))}function R(e){if(-1===e)return void alert("Requirement not found.");$();let t=r("#requirements_table").DataTable().row(e).data(),n=r(".modal-content");o.getOrCreateInstance("#requirement_modal").show(),n.LoadingOverlay("show"),r("#formalization_accordion").html(""),r("#requirement_tag_field").data("bs.tokenfield").$input.autocomplete({source:_}),r.get("api/req/get",{id:t.id,row_idx:e},(function(t){if(!1===t.success)return void alert("Could Not load the Requirement: "+t.errormsg);r("#requirement_id").val(t.id),r("#modal_associated_row_index").val(e),x=t.available_vars,x=x.concat(t.additional_static_available_vars),L=t.type_inference_errors,g=new v(x,{shouldSort:!0,threshold:.6,location:0,distance:100,maxPatternLength:12,minMatchCharLength:1,keys:void 0}),r("#requirement_modal_title").html(t.id+": "+t.type),r("#description_textarea").text(t.desc).change(),r("#add_guess_description").text(t.desc).change(),r("#formalization_accordion").html(t.formalizations_html),r("#requirement_scope").val(t.scope),r("#requirement_pattern").val(t.pattern),r("#tags_comments_table").find("tr:gt(0)").remove(),r("#requirement_tag_field").tokenfield("setTokens",t.tags),r("#tags_comments_table tr:gt(0)").each((function(){let e=r(this).find("td:eq(0)").text();r(this).find("textarea:eq(0)").val(t.tags_comments[e])})),r("#requirement_status").val(t.status);let n=r("#csv_content_accordion");n.html("");let i=t.csv_data;for(const e in i)if(i.hasOwnProperty(e)){const t=i[e];n.append("<p><strong>"+e+":</strong>"+t+"</p>")}let o=r("#show_revision_diff");r.isEmptyObject(t.revision_diff)?o.hide():o.show();let a=r("#revision_diff_accordion");a.html("");let s=t.revision_diff;for(const e in s)if(s.hasOwnProperty(e)){const t=s[e];a.append("<p><strong>"+e+":</strong><pre>"+t+"</pre></p>")}let l=r("#used_variables_accordion");l.html(""),t.vars.forEach((function(e){let t="?command=search&col=1&q=%5C%22"+e+"%5C%22";l.append('<span class="badge bg-info"><a href="./variables'+t+'" target="_blank">'+e+"</a></span>&numsp;")}))})).done((function(){H(),z(),W(),r("#requirement_modal").data({unsaved_changes:!1,updated_formalization:!1}),n.LoadingOverlay("hide",!0)}))}function z(){r(".reqirement-variable").each((function(){F(this)}))}function F(e){const t=new h(new f(e),[{match:/(|\s|[!=&\|>]+)(\w+)$/,index:2,search:function(e,t,n){let r=function(e){return g.search(e)}(e),i=[];for(let e=0;e<Math.min(10,r.length);e++)i.push(x[r[e]]);t(i)},replace:function(e){return"$1"+e+" "}}],{dropdown:{className:"dropdown-menu textcomplete-dropdown",maxCount:10,style:{display:"none",position:"absolute",zIndex:"9999"},item:{className:"dropdown-item",activeClassName:"dropdown-item active"}}});r(document).on("click",(function(e){t!==e.target&&t.hide()}))}function W(){r(".formalization_card").each((function(){const e=r(this).attr("title");let t="",n=r("#current_formalization_textarea"+e);const i=r("#requirement_scope"+e).find("option:selected").text().replace(/\s\s+/g," "),o=r("#requirement_pattern"+e).find("option:selected").text().replace(/\s\s+/g," ");"None"!==i&&"None"!==o&&(t=i+", "+o+".");let a=r("#formalization_var_p"+e).val(),l=r("#formalization_var_q"+e).val(),c=r("#formalization_var_r"+e).val(),u=r("#formalization_var_s"+e).val(),d=r("#formalization_var_t"+e).val(),h=r("#formalization_var_u"+e).val(),f=r("#formalization_var_v"+e).val();a.length>0&&(t=t.replace(/{P}/g,U(a))),l.length>0&&(t=t.replace(/{Q}/g,U(l))),c.length>0&&(t=t.replace(/{R}/g,U(c))),u.length>0&&(t=t.replace(/{S}/g,U(u))),d.length>0&&(t=t.replace(/{T}/g,U(d))),h.length>0&&(t=t.replace(/{U}/g,U(h))),f.length>0&&(t=t.replace(/{V}/g,U(f))),n.html(t),s.update(n)})),r("#requirement_modal").data({unsaved_changes:!0,updated_formalization:!0})}function U(e){let t="";return e.split(/([\s&<>!()=:\[\]{}\-|+*,])/g).forEach((function(e){x.includes(e)?t+='<a href="./variables?command=search&col=1&q=%5C%22'+e+'%5C%22" target="_blank"  title="Go to declaration of '+e+'" class="alert-link">'+e+"</a>":t+=a.escapeHtml(e)})),t}function H(){r(".requirement_var_group").each((function(){r(this).hide(),r(this).removeClass("type-error")})),r(".formalization_card").each((function(){const e=r(this).attr("title"),t=r("#requirement_scope"+e).val(),n=r("#requirement_pattern"+e).val();let i=r("#formalization_heading"+e),o=r("#requirement_var_group_p"+e),a=r("#requirement_var_group_q"+e),s=r("#requirement_var_group_r"+e),l=r("#requirement_var_group_s"+e),c=r("#requirement_var_group_t"+e),u=r("#requirement_var_group_u"+e),d=r("#requirement_var_group_v"+e);if(e in L)for(let t=0;t<L[e].length;t++)r("#formalization_var_"+L[e][t]+e).addClass("type-error"),i.addClass("type-error-head");else i.removeClass("type-error-head");switch(t){case"BEFORE":case"AFTER":o.show();break;case"BETWEEN":case"AFTER_UNTIL":o.show(),a.show()}Object.keys(_PATTERNS[n].env).forEach((function(e){switch(e){case"R":s.show();break;case"S":l.show();break;case"T":c.show();break;case"U":u.show();break;case"V":d.show()}}))}))}function $(){r.ajax({type:"GET",url:"api/tags/"}).done((function(e){_=[];for(let t of e)_.push(t.name),k[t.name]=t.color})).fail((function(e,t,n){alert(n+"\n\n"+e.responseText)}))}function B(e=!1){let t=r("#report_query_textarea"),n=r("#report_results_textarea"),i=r("#report_modal_title"),a=r("#report_name"),s="",l="",c="",u=-1;r("#report_modal"),!1!==e&&(u=e.attr("data-id"),s=E[u].queries,l=E[u].results,c=E[u].name),t.val(s).change(),n.val(l).change(),a.val(c).change(),i.html(c),r("#save_report").attr("data-id",u),o.getOrCreateInstance(document.querySelector("#report_modal")).show()}function Q(){r.get("api/report/get",{},(function(e){if(!1===e.success)alert(e.errormsg);else{let t="";E=e.data,r.each(e.data,(function(e,n){t+=`<div class="card border-primary">\n                              <div class="card-body">\n                                <h5 class="card-title">${n.name}</h5>\n                                <h6 class="card-subtitle mb-2 text-muted">Query</h6>\n                                <p class="card-text report-results">${n.queries}</p>\n                                <h6 class="card-subtitle mb-2 text-muted">Matches for queries</h6>\n                                <p class="card-text report-results">${n.results}</p>\n                                <a href="#" class="card-link open-report" data-id="${e}">\n                                    Edit (reevaluate) Report.\n                                </a>\n                                <a href="#" class="card-link delete-report" data-id="${e}">Delete Report.</a>\n                              </div>\n                            </div>`})),r("#available_reports").html(t)}}))}r(document).ready((function(){$(),function(){let e=r("#search_bar");new Awesomplete(e[0],{filter:function(e,t){let n=!1;return(t.split(":").length-1)%2==1&&(n=Awesomplete.FILTER_CONTAINS(e,t.match(/[^:]*$/)[0])),n},item:function(e,t){return Awesomplete.ITEM(e,t.match(/(:)([\S]*$)/)[2])},replace:function(e){const t=this.input.value.match(/(.*)(:(?!.*:).*$)/)[1];this.input.value=t+e},list:b,minChars:1,autoFirst:!0})}(),function(){let e=[{orderable:!1,className:"select-checkbox",targets:[0],data:null,defaultContent:""},{targets:[1],data:"pos"},{targets:[2],data:"id",render:function(e){return'<a href="#">'+a.escapeHtml(e)+"</a>"}},{targets:[3],data:"desc",render:function(e){return'<div class="white-space-pre">'+a.escapeHtml(e)+"</div>"}},{targets:[4],data:"type",render:function(e){return w.indexOf(e)<=-1&&w.push(e),a.escapeHtml(e)}},{targets:[5],data:"tags",render:function(e,t,n){let i="";return r(e).each((function(e,t){var n;t.length>0&&(i+='<span class="badge" style="background-color: '+(n=t,(k.hasOwnProperty(n)?k[n]:"var(--bs-info)")+'">')+a.escapeHtml(t)+"</span></br> ")})),i}},{targets:[6],data:"status",render:function(e){return'<span class="badge bg-info">'+e+"</span></br>"}},{targets:[7],data:"formal",render:function(e,t,n){let i="";return n.formal.length>0&&r(e).each((function(e,t){t.length>0&&(i+='<div class="white-space-pre">'+a.escapeHtml(t)+"</div>")})),i}}];r.get("api/table/colum_defs","",(function(t){const n=t.col_defs.length;for(let r=0;r<n;r++)e.push({targets:[parseInt(t.col_defs[r].target)],data:t.col_defs[r].csv_name,visible:!1,searchable:!0})})).done((function(){!function(e){let t=r("#requirements_table").DataTable({language:{emptyTable:"Loading data."},paging:!0,stateSave:!0,select:{style:"os",selector:"td:first-child"},order:[[1,"asc"]],pageLength:50,lengthMenu:[[10,50,100,500,-1],[10,50,100,500,"All"]],dom:'rt<"container"<"row"<"col-md-6"li><"col-md-6"p>>>',ajax:"api/req/gets",deferRender:!0,columnDefs:e,createdRow:function(e,t){"Heading"===t.type&&r(e).addClass("bg-primary"),"Information"===t.type&&r(e).addClass("table-info"),"Requirement"===t.type&&r(e).addClass("table-warning"),"not set"===t.type&&r(e).addClass("table-light")},infoCallback:function(e,t,n,i,o){let a=this.api().page.info();r("#clear-all-filters-text").html("Showing "+o+"/"+a.recordsTotal+". Clear all.");let s="Showing "+t+" to "+n+" of "+o+" entries";return s+=" (filtered from "+a.recordsTotal+" total entries).",s},initComplete:function(){r("#search_bar").val(T),r("#type-filter-input").val(N),r("#tag-filter-input").val(M),r("#status-filter-input").val(A);let e=this.api();!function(e){r("#requirements_table").find("tbody").on("click","a",(function(t){t.preventDefault(),R(e.row(r(this).closest("tr")).index())}))}(e),function(e){e.columns().every((function(t){t>0&&e.column(t).header().append(" ("+t+")")})),r("#save_requirement_modal").click((function(){!function(e){let t=r(".modal-content");t.LoadingOverlay("show");const n=r("#requirement_id").val(),i=r("#requirement_status").val(),a=r("#requirement_modal").data("updated_formalization"),s=parseInt(r("#modal_associated_row_index").val());let l={};r(".formalization_card").each((function(){let e={};e.id=r(this).attr("title"),r(this).find("select").each((function(){r(this).hasClass("scope_selector")&&(e.scope=r(this).val()),r(this).hasClass("pattern_selector")&&(e.pattern=r(this).val())})),e.expression_mapping={},r(this).find("textarea.reqirement-variable").each((function(){""!==r(this).attr("title")&&(e.expression_mapping[r(this).attr("title")]=r(this).val())})),l[e.id]=e}));let c=new Map;r("#tags_comments_table tr:gt(0)").each((function(){let e=r(this).find("td:eq(0)").text(),t=r(this).find("textarea:eq(0)").val();c.set(e,t)})),r.post("api/req/update",{id:n,row_idx:s,update_formalization:a,tags:JSON.stringify(Object.fromEntries(c)),status:i,formalizations:JSON.stringify(l)},(function(n){if(t.LoadingOverlay("hide",!0),!1===n.success)alert(n.errormsg);else{e.row(s).data(n),r("#requirement_modal").data("unsaved_changes",!1);const t=document.querySelector("#requirement_modal");o.getOrCreateInstance(t).hide()}})).done((function(){j()}))}(e)})),r("#search_bar").keypress((function(t){13===t.which&&(q(),e.draw())})),r("#type-filter-input").autocomplete({minLength:0,source:w,delay:100}),r("#status-filter-input").autocomplete({minLength:0,source:y,delay:100}),r("#tag-filter-input").autocomplete({minLength:0,source:_,delay:100}),r("#tag-filter-input, #status-filter-input, #type-filter-input").on("focus",(function(){r(this).keydown()})).on("keypress",(function(t){13===t.which&&(I(),e.draw())})),r("#table-filter-toggle").click((function(){r("#tag-filter-input").autocomplete({source:_}),r("#type-filter-input").autocomplete({source:w})})),r(".clear-all-filters").click((function(){r("#status-filter-input").val("").effect("highlight",{color:"green"},500),r("#tag-filter-input").val("").effect("highlight",{color:"green"},500),r("#type-filter-input").val("").effect("highlight",{color:"green"},500),r("#search_bar").val("").effect("highlight",{color:"green"},500),I(),q(),e.draw()})),r("#gen-req-from-selection").click((function(){let t=[];e.rows({search:"applied"}).every((function(){let e=this.data();t.push(e.id)})),r("#selected_requirement_ids").val(JSON.stringify(t)),r("#generate_req_form").submit()})),r("#gen-csv-from-selection").click((function(){let t=[];e.rows({search:"applied"}).every((function(){let e=this.data();t.push(e.id)})),r("#selected_csv_requirement_ids").val(JSON.stringify(t)),r("#generate_csv_form").submit()})),r("#gen-xls-from-selection").click((function(){let t=[];e.rows({search:"applied"}).every((function(){let e=this.data();t.push(e.id)})),r("#selected_xls_requirement_ids").val(JSON.stringify(t)),r("#generate_xls_form").submit()})),r(".column-toggle-button").on("click",(function(t){t.preventDefault();let n=e.column(r(this).attr("data-column"));n.visible(!n.visible()),D()})),r(".reset-column-toggle").on("click",(function(t){t.preventDefault(),e.columns(".default-col").visible(!0),e.columns(".extra-col").visible(!1),D()})),D(),r(".select-all-button").on("click",(function(){r(this).hasClass("btn-secondary")?e.rows({page:"current"}).select():e.rows({page:"current"}).deselect(),r(".select-all-button").toggleClass("btn-secondary btn-primary")})),e.on("user-select",(function(){let e=r(".select-all-button");e.removeClass("btn-primary"),e.addClass("btn-secondary ")})),r("#multi-add-tag-input, #multi-remove-tag-input").autocomplete({minLength:0,source:_,delay:100}).on("focus",(function(){r(this).keydown()})).val(""),r("#multi-set-status-input").autocomplete({minLength:0,source:y,delay:100}).on("focus",(function(){r(this).keydown()})).val(""),r(".apply-multi-edit").click((function(){!function(e){let t=r("body");t.LoadingOverlay("show");let n=r("#multi-add-tag-input").val().trim(),i=r("#multi-remove-tag-input").val().trim(),o=r("#multi-set-status-input").val().trim(),a=P(e);r.post("api/req/multi_update",{add_tag:n,remove_tag:i,set_status:o,selected_ids:JSON.stringify(a)},(function(e){t.LoadingOverlay("hide",!0),!1===e.success?alert(e.errormsg):location.reload()}))}(e)})),r(".add_top_guess_button").bootstrapConfirmButton({onConfirm:function(){!function(e){let t=r("body");t.LoadingOverlay("show");let n=P(e),i=r("#top_guess_append_mode").val();r.post("api/req/multi_add_top_guess",{selected_ids:JSON.stringify(n),insert_mode:i},(function(e){t.LoadingOverlay("hide",!0),!1===e.success?alert(e.errormsg):location.reload()}))}(e)}})}(e),d(e),a.process_url_query(S),q(),I(),r.fn.dataTable.ext.search.push((function(e,t){return function(e){return p.evaluate(e,C)&&m.evaluate(e,C)}(t)})),this.api().draw()}});new r.fn.dataTable.ColReorder(t,{})}(e)}))}(),function(){let e=r("#requirement_modal");r("#requirement_tag_field").tokenfield({autocomplete:{source:_,delay:100},showAutocompleteOnFocus:!0}).change((function(){e.data("unsaved_changes",!0)})),r("#requirement_status").change((function(){r("#requirement_modal").data("unsaved_changes",!0)})),e[0].addEventListener("hide.bs.modal",(function(e){!function(e){!0===r("#requirement_modal").data("unsaved_changes")&&!0!==confirm("You have unsaved changes, do you really want to close?")&&e.preventDefault()}(e)})),r(document).keyup((function(e){if(r(".modal:visible").length&&27===e.keyCode){let e=r("input[type=text], textarea, select").filter(":focus");0===e.length?r("#requirement_guess_modal:visible").length?o.getOrCreateInstance("#requirement_guess_modal").hide():o.getOrCreateInstance("#requirement_modal").hide():e.each((function(){r(this).blur()}))}})),e.on("hidden.bs.modal",(function(){r("#requirement_tag_field").val(""),r("#requirement_tag_field-tokenfield").val("")})),r("#add_formalization").click((function(){!function(){let e=r(".modal-content");e.LoadingOverlay("show");const t=r("#requirement_id").val();r.post("api/req/new_formalization",{id:t},(function(t){if(e.LoadingOverlay("hide",!0),!1===t.success)alert(t.errormsg);else{let e=r(t.html);e.find(".reqirement-variable").each((function(){F(this)})),e.appendTo("#formalization_accordion")}})).done((function(){H(),W(),j()}))}()})),r("#add_gussed_formalization").click((function(){!function(){let e=r("#requirement_guess_modal"),t=r("#available_guesses_cards"),n=r(".modal-content"),i=r("#requirement_id").val();function a(e){let n='<div class="card">                    <div class="pl-1 pr-1">                        <p>'+e.string+'                        </p>                    </div>                    <button type="button" class="btn btn-success btn-sm add_guess"                            title="Add formalization"                            data-scope="'+e.scope+'"                            data-pattern="'+e.pattern+"\"                            data-mapping='"+JSON.stringify(e.mapping)+"'>                        <strong>+ Add this formalization +</strong>                    </button>                </div>";t.append(n)}new o(e,{keyboard:!1}),o.getOrCreateInstance(e).show(),n.LoadingOverlay("show"),t.html(""),r.post("api/req/get_available_guesses",{requirement_id:i},(function(e){if(!1===e.success)alert(e.errormsg);else for(let t=0;t<e.available_guesses.length;t++)a(e.available_guesses[t])})).done((function(){r(".add_guess").click((function(){!function(e,t,n){let i=r(".modal-content");i.LoadingOverlay("show");let o=r("#requirement_id").val();r.post("api/req/add_formalization_from_guess",{requirement_id:o,scope:e,pattern:t,mapping:JSON.stringify(n)},(function(e){i.LoadingOverlay("hide",!0),!1===e.success?alert(e.errormsg):r("#formalization_accordion").append(e.html)})).done((function(){H(),W(),z(),j()}))}(r(this).data("scope"),r(this).data("pattern"),r(this).data("mapping"))})),n.LoadingOverlay("hide",!0)}))}()})),r(".modal").on("hidden.bs.modal",(function(){r(".modal:visible").length?r("body").addClass("modal-open"):r("textarea").each((function(){s.destroy(r(this))}))})),r("#formalization_accordion").on("shown.bs.collapse",".card",(function(){r(this).find("textarea").each((function(){s(r(this)),s.update(r(this))}))})),H()}(),j(),function(){r("#add-new-report").click((function(){B()})),r("#eval_report").click((function(){!function(){let e=r("body");e.LoadingOverlay("show");const t=r("#report_query_textarea").val().split("\n");let n=r("#requirements_table").DataTable(),i="";const o=/^(:NAME:)(`(\w+)`)(.*)/;try{r.each(t,(function(e,t){let r=o.exec(t);null!=r&&(t=r[4],e=r[3]),p=l.fromQuery(t),n.draw();let a=n.page.info();i+=`"${e}":\t${a.recordsDisplay}\n`})),r("#report_results_textarea").val(i).change(),q(),n.draw()}catch(e){alert(e)}e.LoadingOverlay("hide",!0)}()})),r("#save_report").click((function(){!function(){let e=r("body");e.LoadingOverlay("show"),r.post("api/report/set",{report_querys:r("#report_query_textarea").val(),report_results:r("#report_results_textarea").val(),report_name:r("#report_name").val(),report_id:r("#save_report").attr("data-id")},(function(t){e.LoadingOverlay("hide",!0),!1===t.success&&alert(t.errormsg),Q()}))}()}));let e=r("#available_reports");e.on("click",".open-report",(function(){B(r(this))})),e.on("click",".delete-report",(function(){!function(e){r.ajax({type:"DELETE",url:"api/report/delete",data:{report_id:e},success:function(e){!1===e.success&&alert(e.errormsg),Q()}})}(r(this).attr("data-id"))})),r("#report_name").change((function(){r("#report_modal_title").html(r(this).val())})),Q()}(),c(),u();let e=r("body");r("body").bootstrapConfirmButton({selector:".delete_formalization",onConfirm:function(){!function(e,t){let n=r(".modal-content");n.LoadingOverlay("show");const i=r("#requirement_id").val();r.post("api/req/del_formalization",{requirement_id:i,formalization_id:e},(function(e){n.LoadingOverlay("hide",!0),!1===e.success?alert(e.errormsg):t.remove()})).done((function(){H(),W(),j()}))}(r(this).attr("name"),r(this).closest(".accordion-item"))}}),e.on("click",".delete_formalization1",(function(){bootstrapConfirmation({yesCallBack:function(){console.log("yes")},noCallBack:function(){console.log("no")},config:{closeIcon:!0,message:"This is an example.",title:"Example",no:{class:"btn btn-danger",text:"No"},yes:{class:"btn btn-success",text:"Yes"}}})})),e.on("change",".formalization_selector, .reqirement-variable, .req_var_type",(function(){W()})),e.on("change",".formalization_selector",(function(){H()})),document.getElementById("requirement_modal").addEventListener("shown.bs.modal",(function(){r(this).find("textarea").each((function(){s(r(this)),s.update(r(this))}))})),e.on("change focus","textarea",(function(){s(r(this)),s.update(r(this))})),r("#requirement_tag_field").on("tokenfield:createtoken",(function(e){let t=r(this).tokenfield("getTokens");for(const n of t)if(e.attrs.value===n.value)return!1})).on("tokenfield:createdtoken",(function(e){var t;t="<tr><td>"+e.attrs.value+"</td><td><textarea rows='1' class='form-control w-100' type='text'></textarea></td>",r("#tags_comments_table tbody").append(t)})).on("tokenfield:removedtoken",(function(e){r("#tags_comments_table tr:gt(0)").each((function(){let t=r(this);r(this).find("td:eq(0)").text()===e.attrs.value&&t.remove()}))}))}))},6714:(e,t,n)=>{var r=n(9755);const{init_simulator_modal:i}=n(6107);function o(e,t,n=!1){if(id=t.simulator_id,name=t.simulator_name,n)return e.prepend(r("<option></option>").val(id).text(name+" ("+id+")")),void e.prop("selectedIndex",0);e.empty(),r.each(t.simulators,(function(t,n){e.prepend(r("<option></option>").val(t).text(n+" ("+t+")"))}))}function a(e){let t=[];return e.DataTable().rows({selected:!0}).every((function(){t.push(this.data().id)})),t}t.init_simulator_tab=function(){const e=r("#simulator-tab-name-input"),t=r("#simulator-tab-select"),n=r("#simulator-tab-create-btn"),s=r("#simulator-tab-delete-btn"),l=r("#simulator-tab-start-btn"),c=r("#requirements_table");r.ajax({type:"GET",url:"simulator",async:!1,data:{command:"get_simulators"},success:function(e){!1!==e.success?o(t,e.data):alert(e.errormsg)}}),n.click((function(){r.ajax({type:"POST",url:"simulator",async:!1,data:{command:"create_simulator",simulator_name:e.val()||"unnamed",requirement_ids:JSON.stringify(a(c))},success:function(e){!1!==e.success?o(t,e.data,!0):alert(e.errormsg)}})})),s.click((function(){r.ajax({type:"DELETE",url:"simulator",async:!1,data:{command:"delete_simulator",simulator_id:t.val()},success:function(e){!1!==e.success?o(t,e.data):alert(e.errormsg)}})})),l.click((function(){r.ajax({type:"GET",url:"simulator",async:!1,data:{command:"start_simulator",simulator_id:t.val()},success:function(e){!1!==e.success?i(e.data):alert(e.errormsg)}})}))}},2613:(e,t,n)=>{"use strict";Object.defineProperty(t,"__esModule",{value:!0}),t.Completer=void 0;const r=n(6729),i=n(9200);class o extends r.EventEmitter{constructor(e){super(),this.handleQueryResult=e=>{this.emit("hit",{searchResults:e})},this.strategies=e.map((e=>new i.Strategy(e)))}destroy(){return this.strategies.forEach((e=>e.destroy())),this}run(e){for(const t of this.strategies)if(t.execute(e,this.handleQueryResult))return;this.handleQueryResult([])}}t.Completer=o},8707:(e,t,n)=>{"use strict";Object.defineProperty(t,"__esModule",{value:!0}),t.Dropdown=t.DEFAULT_DROPDOWN_ITEM_ACTIVE_CLASS_NAME=t.DEFAULT_DROPDOWN_ITEM_CLASS_NAME=t.DEFAULT_DROPDOWN_CLASS_NAME=t.DEFAULT_DROPDOWN_PLACEMENT=t.DEFAULT_DROPDOWN_MAX_COUNT=void 0;const r=n(6729),i=n(5320);t.DEFAULT_DROPDOWN_MAX_COUNT=10,t.DEFAULT_DROPDOWN_PLACEMENT="auto",t.DEFAULT_DROPDOWN_CLASS_NAME="dropdown-menu textcomplete-dropdown",t.DEFAULT_DROPDOWN_ITEM_CLASS_NAME="textcomplete-item",t.DEFAULT_DROPDOWN_ITEM_ACTIVE_CLASS_NAME=`${t.DEFAULT_DROPDOWN_ITEM_CLASS_NAME} active`;class o extends r.EventEmitter{constructor(e,t){super(),this.el=e,this.option=t,this.shown=!1,this.items=[],this.activeIndex=null}static create(e){const n=document.createElement("ul");n.className=e.className||t.DEFAULT_DROPDOWN_CLASS_NAME,Object.assign(n.style,{display:"none",position:"absolute",zIndex:"1000"},e.style);const r=e.parent||document.body;return null==r||r.appendChild(n),new o(n,e)}render(e,n){const r=(0,i.createCustomEvent)("render",{cancelable:!0});return this.emit("render",r),r.defaultPrevented?this:(this.clear(),0===e.length?this.hide():(this.items=e.slice(0,this.option.maxCount||t.DEFAULT_DROPDOWN_MAX_COUNT).map(((e,t)=>{var n;return new a(this,t,e,(null===(n=this.option)||void 0===n?void 0:n.item)||{})})),this.setStrategyId(e[0]).renderEdge(e,"header").renderItems().renderEdge(e,"footer").show().setOffset(n).activate(0),this.emit("rendered",(0,i.createCustomEvent)("rendered")),this))}destroy(){var e;return this.clear(),null===(e=this.el.parentNode)||void 0===e||e.removeChild(this.el),this}select(e){const t={searchResult:e.searchResult},n=(0,i.createCustomEvent)("select",{cancelable:!0,detail:t});return this.emit("select",n),n.defaultPrevented||(this.hide(),this.emit("selected",(0,i.createCustomEvent)("selected",{detail:t}))),this}show(){if(!this.shown){const e=(0,i.createCustomEvent)("show",{cancelable:!0});if(this.emit("show",e),e.defaultPrevented)return this;this.el.style.display="block",this.shown=!0,this.emit("shown",(0,i.createCustomEvent)("shown"))}return this}hide(){if(this.shown){const e=(0,i.createCustomEvent)("hide",{cancelable:!0});if(this.emit("hide",e),e.defaultPrevented)return this;this.el.style.display="none",this.shown=!1,this.clear(),this.emit("hidden",(0,i.createCustomEvent)("hidden"))}return this}clear(){return this.items.forEach((e=>e.destroy())),this.items=[],this.el.innerHTML="",this.activeIndex=null,this}up(e){return this.shown?this.moveActiveItem("prev",e):this}down(e){return this.shown?this.moveActiveItem("next",e):this}moveActiveItem(e,t){if(null!=this.activeIndex){const n="next"===e?this.getNextActiveIndex():this.getPrevActiveIndex();null!=n&&(this.activate(n),t.preventDefault())}return this}activate(e){return this.activeIndex!==e&&(null!=this.activeIndex&&this.items[this.activeIndex].deactivate(),this.activeIndex=e,this.items[e].activate()),this}isShown(){return this.shown}getActiveItem(){return null!=this.activeIndex?this.items[this.activeIndex]:null}setOffset(e){const n=document.documentElement;if(n){const r=this.el.offsetWidth;if(e.left){const t=this.option.dynamicWidth?n.scrollWidth:n.clientWidth;e.left+r>t&&(e.left=t-r),this.el.style.left=`${e.left}px`}else e.right&&(e.right-r<0&&(e.right=0),this.el.style.right=`${e.right}px`);let i=!1;const o=this.option.placement||t.DEFAULT_DROPDOWN_PLACEMENT;if("auto"===o){const t=this.items.length*e.lineHeight;i=null!=e.clientTop&&e.clientTop+t>n.clientHeight}"top"===o||i?(this.el.style.bottom=`${n.clientHeight-e.top+e.lineHeight}px`,this.el.style.top="auto"):(this.el.style.top=`${e.top}px`,this.el.style.bottom="auto")}return this}getNextActiveIndex(){if(null==this.activeIndex)throw new Error;return this.activeIndex<this.items.length-1?this.activeIndex+1:this.option.rotate?0:null}getPrevActiveIndex(){if(null==this.activeIndex)throw new Error;return 0!==this.activeIndex?this.activeIndex-1:this.option.rotate?this.items.length-1:null}renderItems(){const e=document.createDocumentFragment();for(const t of this.items)e.appendChild(t.el);return this.el.appendChild(e),this}setStrategyId(e){const t=e.getStrategyId();return t&&(this.el.dataset.strategy=t),this}renderEdge(e,t){const n=this.option[t],r=document.createElement("li");return r.className=`textcomplete-${t}`,r.innerHTML="function"==typeof n?n(e.map((e=>e.data))):n||"",this.el.appendChild(r),this}}t.Dropdown=o;class a{constructor(e,n,r,i){this.dropdown=e,this.index=n,this.searchResult=r,this.props=i,this.active=!1,this.onClick=e=>{e.preventDefault(),this.dropdown.select(this)},this.className=this.props.className||t.DEFAULT_DROPDOWN_ITEM_CLASS_NAME,this.activeClassName=this.props.activeClassName||t.DEFAULT_DROPDOWN_ITEM_ACTIVE_CLASS_NAME;const o=document.createElement("li");o.className=this.active?this.activeClassName:this.className;const a=document.createElement("span");a.tabIndex=-1,a.innerHTML=this.searchResult.render(),o.appendChild(a),o.addEventListener("click",this.onClick),this.el=o}destroy(){var e;const t=this.el;return null===(e=t.parentNode)||void 0===e||e.removeChild(t),t.removeEventListener("click",this.onClick,!1),this}activate(){return this.active||(this.active=!0,this.el.className=this.activeClassName,this.dropdown.el.scrollTop=this.el.offsetTop),this}deactivate(){return this.active&&(this.active=!1,this.el.className=this.className),this}}},8685:(e,t,n)=>{"use strict";Object.defineProperty(t,"__esModule",{value:!0}),t.Editor=void 0;const r=n(6729),i=n(5320);class o extends r.EventEmitter{destroy(){return this}applySearchResult(e){throw new Error("Not implemented.")}getCursorOffset(){throw new Error("Not implemented.")}getBeforeCursor(){throw new Error("Not implemented.")}emitMoveEvent(e){const t=(0,i.createCustomEvent)("move",{cancelable:!0,detail:{code:e}});return this.emit("move",t),t}emitEnterEvent(){const e=(0,i.createCustomEvent)("enter",{cancelable:!0});return this.emit("enter",e),e}emitChangeEvent(){const e=(0,i.createCustomEvent)("change",{detail:{beforeCursor:this.getBeforeCursor()}});return this.emit("change",e),e}emitEscEvent(){const e=(0,i.createCustomEvent)("esc",{cancelable:!0});return this.emit("esc",e),e}getCode(e){return 9===e.keyCode||13===e.keyCode?"ENTER":27===e.keyCode?"ESC":38===e.keyCode?"UP":40===e.keyCode||78===e.keyCode&&e.ctrlKey?"DOWN":80===e.keyCode&&e.ctrlKey?"UP":"OTHER"}}t.Editor=o},6933:(e,t)=>{"use strict";Object.defineProperty(t,"__esModule",{value:!0}),t.SearchResult=void 0;const n=/\$&/g,r=/\$(\d)/g;t.SearchResult=class{constructor(e,t,n){this.data=e,this.term=t,this.strategy=n}getReplacementData(e){let t=this.strategy.replace(this.data);if(null==t)return null;let i="";Array.isArray(t)&&(i=t[1],t=t[0]);const o=this.strategy.match(e);if(null==o||null==o.index)return null;const a=t.replace(n,o[0]).replace(r,((e,t)=>o[parseInt(t)]));return{start:o.index,end:o.index+o[0].length,beforeCursor:a,afterCursor:i}}replace(e,t){const n=this.getReplacementData(e);if(null!==n)return t=n.afterCursor+t,[[e.slice(0,n.start),n.beforeCursor,e.slice(n.end)].join(""),t]}render(){return this.strategy.renderTemplate(this.data,this.term)}getStrategyId(){return this.strategy.getId()}}},9200:(e,t,n)=>{"use strict";Object.defineProperty(t,"__esModule",{value:!0}),t.Strategy=t.DEFAULT_INDEX=void 0;const r=n(6933);t.DEFAULT_INDEX=1,t.Strategy=class{constructor(e){this.props=e,this.cache={}}destroy(){return this.cache={},this}replace(e){return this.props.replace(e)}execute(e,n){var i;const o=this.matchWithContext(e);if(!o)return!1;const a=o[null!==(i=this.props.index)&&void 0!==i?i:t.DEFAULT_INDEX];return this.search(a,(e=>{n(e.map((e=>new r.SearchResult(e,a,this))))}),o),!0}renderTemplate(e,t){if(this.props.template)return this.props.template(e,t);if("string"==typeof e)return e;throw new Error(`Unexpected render data type: ${typeof e}. Please implement template parameter by yourself`)}getId(){return this.props.id||null}match(e){return"function"==typeof this.props.match?this.props.match(e):e.match(this.props.match)}search(e,t,n){this.props.cache?this.searchWithCach(e,t,n):this.props.search(e,t,n)}matchWithContext(e){const t=this.context(e);return!1===t?null:this.match(!0===t?e:t)}context(e){return!this.props.context||this.props.context(e)}searchWithCach(e,t,n){null!=this.cache[e]?t(this.cache[e]):this.props.search(e,(n=>{this.cache[e]=n,t(n)}),n)}}},409:(e,t,n)=>{"use strict";Object.defineProperty(t,"__esModule",{value:!0}),t.Textcomplete=void 0;const r=n(6729),i=n(8707),o=n(2613),a=["show","shown","render","rendered","selected","hidden","hide"];class s extends r.EventEmitter{constructor(e,t,n){super(),this.editor=e,this.isQueryInFlight=!1,this.nextPendingQuery=null,this.handleHit=({searchResults:e})=>{e.length?this.dropdown.render(e,this.editor.getCursorOffset()):this.dropdown.hide(),this.isQueryInFlight=!1,null!==this.nextPendingQuery&&this.trigger(this.nextPendingQuery)},this.handleMove=e=>{"UP"===e.detail.code?this.dropdown.up(e):this.dropdown.down(e)},this.handleEnter=e=>{const t=this.dropdown.getActiveItem();t?(this.dropdown.select(t),e.preventDefault()):this.dropdown.hide()},this.handleEsc=e=>{this.dropdown.isShown()&&(this.dropdown.hide(),e.preventDefault())},this.handleChange=e=>{null!=e.detail.beforeCursor?this.trigger(e.detail.beforeCursor):this.dropdown.hide()},this.handleSelect=e=>{this.emit("select",e),e.defaultPrevented||this.editor.applySearchResult(e.detail.searchResult)},this.handleResize=()=>{this.dropdown.isShown()&&this.dropdown.setOffset(this.editor.getCursorOffset())},this.completer=new o.Completer(t),this.dropdown=i.Dropdown.create((null==n?void 0:n.dropdown)||{}),this.startListening()}destroy(e=!0){return this.completer.destroy(),this.dropdown.destroy(),e&&this.editor.destroy(),this.stopListening(),this}isShown(){return this.dropdown.isShown()}hide(){return this.dropdown.hide(),this}trigger(e){return this.isQueryInFlight?this.nextPendingQuery=e:(this.isQueryInFlight=!0,this.nextPendingQuery=null,this.completer.run(e)),this}startListening(){var e;this.editor.on("move",this.handleMove).on("enter",this.handleEnter).on("esc",this.handleEsc).on("change",this.handleChange),this.dropdown.on("select",this.handleSelect);for(const e of a)this.dropdown.on(e,(t=>this.emit(e,t)));this.completer.on("hit",this.handleHit),null===(e=this.dropdown.el.ownerDocument.defaultView)||void 0===e||e.addEventListener("resize",this.handleResize)}stopListening(){var e;null===(e=this.dropdown.el.ownerDocument.defaultView)||void 0===e||e.removeEventListener("resize",this.handleResize),this.completer.removeAllListeners(),this.dropdown.removeAllListeners(),this.editor.removeListener("move",this.handleMove).removeListener("enter",this.handleEnter).removeListener("esc",this.handleEsc).removeListener("change",this.handleChange)}}t.Textcomplete=s},675:function(e,t,n){"use strict";var r=this&&this.__createBinding||(Object.create?function(e,t,n,r){void 0===r&&(r=n);var i=Object.getOwnPropertyDescriptor(t,n);i&&!("get"in i?!t.__esModule:i.writable||i.configurable)||(i={enumerable:!0,get:function(){return t[n]}}),Object.defineProperty(e,r,i)}:function(e,t,n,r){void 0===r&&(r=n),e[r]=t[n]}),i=this&&this.__exportStar||function(e,t){for(var n in e)"default"===n||Object.prototype.hasOwnProperty.call(t,n)||r(t,e,n)};Object.defineProperty(t,"__esModule",{value:!0}),i(n(2613),t),i(n(8707),t),i(n(8685),t),i(n(6933),t),i(n(9200),t),i(n(409),t),i(n(5320),t)},5320:(e,t)=>{"use strict";Object.defineProperty(t,"__esModule",{value:!0}),t.createCustomEvent=void 0;const n="undefined"!=typeof window&&!!window.CustomEvent;t.createCustomEvent=(e,t)=>{if(n)return new CustomEvent(e,t);const r=document.createEvent("CustomEvent");return r.initCustomEvent(e,!1,(null==t?void 0:t.cancelable)||!1,(null==t?void 0:t.detail)||void 0),r}},2828:function(e,t,n){"use strict";var r=this&&this.__importDefault||function(e){return e&&e.__esModule?e:{default:e}};Object.defineProperty(t,"__esModule",{value:!0}),t.TextareaEditor=void 0;const i=n(4366),o=r(n(6496)),a=n(675),s=n(4408);class l extends a.Editor{constructor(e){super(),this.el=e,this.onInput=()=>{this.emitChangeEvent()},this.onKeydown=e=>{const t=this.getCode(e);let n;"UP"===t||"DOWN"===t?n=this.emitMoveEvent(t):"ENTER"===t?n=this.emitEnterEvent():"ESC"===t&&(n=this.emitEscEvent()),n&&n.defaultPrevented&&e.preventDefault()},this.startListening()}destroy(){return super.destroy(),this.stopListening(),this}applySearchResult(e){const t=this.getBeforeCursor();if(null!=t){const n=e.replace(t,this.getAfterCursor());this.el.focus(),Array.isArray(n)&&((0,i.update)(this.el,n[0],n[1]),this.el&&this.el.dispatchEvent((0,a.createCustomEvent)("input")))}}getCursorOffset(){const e=(0,s.calculateElementOffset)(this.el),t=this.getElScroll(),n=this.getCursorPosition(),r=(0,s.getLineHeightPx)(this.el),i=e.top-t.top+n.top+r,o=e.left-t.left+n.left,a=this.el.getBoundingClientRect().top;return"rtl"!==this.el.dir?{top:i,left:o,lineHeight:r,clientTop:a}:{top:i,right:document.documentElement?document.documentElement.clientWidth-o:0,lineHeight:r,clientTop:a}}getBeforeCursor(){return this.el.selectionStart!==this.el.selectionEnd?null:this.el.value.substring(0,this.el.selectionEnd)}getAfterCursor(){return this.el.value.substring(this.el.selectionEnd)}getElScroll(){return{top:this.el.scrollTop,left:this.el.scrollLeft}}getCursorPosition(){return(0,o.default)(this.el,this.el.selectionEnd)}startListening(){this.el.addEventListener("input",this.onInput),this.el.addEventListener("keydown",this.onKeydown)}stopListening(){this.el.removeEventListener("input",this.onInput),this.el.removeEventListener("keydown",this.onKeydown)}}t.TextareaEditor=l},8207:(e,t,n)=>{"use strict";Object.defineProperty(t,"__esModule",{value:!0}),t.TextareaEditor=void 0;var r=n(2828);Object.defineProperty(t,"TextareaEditor",{enumerable:!0,get:function(){return r.TextareaEditor}})},3566:(e,t)=>{"use strict";Object.defineProperty(t,"__esModule",{value:!0}),t.calculateElementOffset=void 0,t.calculateElementOffset=e=>{const t=e.getBoundingClientRect(),n=e.ownerDocument;if(null==n)throw new Error("Given element does not belong to document");const{defaultView:r,documentElement:i}=n;if(null==r)throw new Error("Given element does not belong to window");const o={top:t.top+r.pageYOffset,left:t.left+r.pageXOffset};return i&&(o.top-=i.clientTop,o.left-=i.clientLeft),o}},1881:(e,t)=>{"use strict";Object.defineProperty(t,"__esModule",{value:!0}),t.getLineHeightPx=void 0;const n="0".charCodeAt(0),r="9".charCodeAt(0),i=e=>n<=e&&e<=r;t.getLineHeightPx=e=>{const t=getComputedStyle(e),n=t.lineHeight;if(i(n.charCodeAt(0))){const e=parseFloat(n);return i(n.charCodeAt(n.length-1))?e*parseFloat(t.fontSize):e}return o(e.nodeName,t)};const o=(e,t)=>{const n=document.body;if(!n)return 0;const r=document.createElement(e);r.innerHTML="&nbsp;",Object.assign(r.style,{fontSize:t.fontSize,fontFamily:t.fontFamily,padding:"0"}),n.appendChild(r),r instanceof HTMLTextAreaElement&&(r.rows=1);const i=r.offsetHeight;return n.removeChild(r),i}},4408:function(e,t,n){"use strict";var r=this&&this.__createBinding||(Object.create?function(e,t,n,r){void 0===r&&(r=n);var i=Object.getOwnPropertyDescriptor(t,n);i&&!("get"in i?!t.__esModule:i.writable||i.configurable)||(i={enumerable:!0,get:function(){return t[n]}}),Object.defineProperty(e,r,i)}:function(e,t,n,r){void 0===r&&(r=n),e[r]=t[n]}),i=this&&this.__exportStar||function(e,t){for(var n in e)"default"===n||Object.prototype.hasOwnProperty.call(t,n)||r(t,e,n)};Object.defineProperty(t,"__esModule",{value:!0}),i(n(3566),t),i(n(1881),t),i(n(7449),t)},7449:(e,t)=>{"use strict";Object.defineProperty(t,"__esModule",{value:!0}),t.isSafari=void 0,t.isSafari=()=>/^((?!chrome|android).)*safari/i.test(navigator.userAgent)},6729:e=>{"use strict";var t=Object.prototype.hasOwnProperty,n="~";function r(){}function i(e,t,n){this.fn=e,this.context=t,this.once=n||!1}function o(e,t,r,o,a){if("function"!=typeof r)throw new TypeError("The listener must be a function");var s=new i(r,o||e,a),l=n?n+t:t;return e._events[l]?e._events[l].fn?e._events[l]=[e._events[l],s]:e._events[l].push(s):(e._events[l]=s,e._eventsCount++),e}function a(e,t){0==--e._eventsCount?e._events=new r:delete e._events[t]}function s(){this._events=new r,this._eventsCount=0}Object.create&&(r.prototype=Object.create(null),(new r).__proto__||(n=!1)),s.prototype.eventNames=function(){var e,r,i=[];if(0===this._eventsCount)return i;for(r in e=this._events)t.call(e,r)&&i.push(n?r.slice(1):r);return Object.getOwnPropertySymbols?i.concat(Object.getOwnPropertySymbols(e)):i},s.prototype.listeners=function(e){var t=n?n+e:e,r=this._events[t];if(!r)return[];if(r.fn)return[r.fn];for(var i=0,o=r.length,a=new Array(o);i<o;i++)a[i]=r[i].fn;return a},s.prototype.listenerCount=function(e){var t=n?n+e:e,r=this._events[t];return r?r.fn?1:r.length:0},s.prototype.emit=function(e,t,r,i,o,a){var s=n?n+e:e;if(!this._events[s])return!1;var l,c,u=this._events[s],d=arguments.length;if(u.fn){switch(u.once&&this.removeListener(e,u.fn,void 0,!0),d){case 1:return u.fn.call(u.context),!0;case 2:return u.fn.call(u.context,t),!0;case 3:return u.fn.call(u.context,t,r),!0;case 4:return u.fn.call(u.context,t,r,i),!0;case 5:return u.fn.call(u.context,t,r,i,o),!0;case 6:return u.fn.call(u.context,t,r,i,o,a),!0}for(c=1,l=new Array(d-1);c<d;c++)l[c-1]=arguments[c];u.fn.apply(u.context,l)}else{var h,f=u.length;for(c=0;c<f;c++)switch(u[c].once&&this.removeListener(e,u[c].fn,void 0,!0),d){case 1:u[c].fn.call(u[c].context);break;case 2:u[c].fn.call(u[c].context,t);break;case 3:u[c].fn.call(u[c].context,t,r);break;case 4:u[c].fn.call(u[c].context,t,r,i);break;default:if(!l)for(h=1,l=new Array(d-1);h<d;h++)l[h-1]=arguments[h];u[c].fn.apply(u[c].context,l)}}return!0},s.prototype.on=function(e,t,n){return o(this,e,t,n,!1)},s.prototype.once=function(e,t,n){return o(this,e,t,n,!0)},s.prototype.removeListener=function(e,t,r,i){var o=n?n+e:e;if(!this._events[o])return this;if(!t)return a(this,o),this;var s=this._events[o];if(s.fn)s.fn!==t||i&&!s.once||r&&s.context!==r||a(this,o);else{for(var l=0,c=[],u=s.length;l<u;l++)(s[l].fn!==t||i&&!s[l].once||r&&s[l].context!==r)&&c.push(s[l]);c.length?this._events[o]=1===c.length?c[0]:c:a(this,o)}return this},s.prototype.removeAllListeners=function(e){var t;return e?(t=n?n+e:e,this._events[t]&&a(this,t)):(this._events=new r,this._eventsCount=0),this},s.prototype.off=s.prototype.removeListener,s.prototype.addListener=s.prototype.on,s.prefixed=n,s.EventEmitter=s,e.exports=s},4070:function(e){e.exports=function(e){var t={};function n(r){if(t[r])return t[r].exports;var i=t[r]={i:r,l:!1,exports:{}};return e[r].call(i.exports,i,i.exports,n),i.l=!0,i.exports}return n.m=e,n.c=t,n.d=function(e,t,r){n.o(e,t)||Object.defineProperty(e,t,{enumerable:!0,get:r})},n.r=function(e){"undefined"!=typeof Symbol&&Symbol.toStringTag&&Object.defineProperty(e,Symbol.toStringTag,{value:"Module"}),Object.defineProperty(e,"__esModule",{value:!0})},n.t=function(e,t){if(1&t&&(e=n(e)),8&t)return e;if(4&t&&"object"==typeof e&&e&&e.__esModule)return e;var r=Object.create(null);if(n.r(r),Object.defineProperty(r,"default",{enumerable:!0,value:e}),2&t&&"string"!=typeof e)for(var i in e)n.d(r,i,function(t){return e[t]}.bind(null,i));return r},n.n=function(e){var t=e&&e.__esModule?function(){return e.default}:function(){return e};return n.d(t,"a",t),t},n.o=function(e,t){return Object.prototype.hasOwnProperty.call(e,t)},n.p="",n(n.s=0)}([function(e,t,n){function r(e){return(r="function"==typeof Symbol&&"symbol"==typeof Symbol.iterator?function(e){return typeof e}:function(e){return e&&"function"==typeof Symbol&&e.constructor===Symbol&&e!==Symbol.prototype?"symbol":typeof e})(e)}function i(e,t){for(var n=0;n<t.length;n++){var r=t[n];r.enumerable=r.enumerable||!1,r.configurable=!0,"value"in r&&(r.writable=!0),Object.defineProperty(e,r.key,r)}}var o=n(1),a=n(7),s=a.get,l=(a.deepValue,a.isArray),c=function(){function e(t,n){var r=n.location,i=void 0===r?0:r,o=n.distance,a=void 0===o?100:o,l=n.threshold,c=void 0===l?.6:l,u=n.maxPatternLength,d=void 0===u?32:u,h=n.caseSensitive,f=void 0!==h&&h,p=n.tokenSeparator,m=void 0===p?/ +/g:p,v=n.findAllMatches,g=void 0!==v&&v,_=n.minMatchCharLength,y=void 0===_?1:_,b=n.id,w=void 0===b?null:b,x=n.keys,E=void 0===x?[]:x,C=n.shouldSort,O=void 0===C||C,S=n.getFn,k=void 0===S?s:S,L=n.sortFn,T=void 0===L?function(e,t){return e.score-t.score}:L,A=n.tokenize,M=void 0!==A&&A,N=n.matchAllTokens,q=void 0!==N&&N,I=n.includeMatches,D=void 0!==I&&I,P=n.includeScore,j=void 0!==P&&P,R=n.verbose,z=void 0!==R&&R;!function(e,t){if(!(e instanceof t))throw new TypeError("Cannot call a class as a function")}(this,e),this.options={location:i,distance:a,threshold:c,maxPatternLength:d,isCaseSensitive:f,tokenSeparator:m,findAllMatches:g,minMatchCharLength:y,id:w,keys:E,includeMatches:D,includeScore:j,shouldSort:O,getFn:k,sortFn:T,verbose:z,tokenize:M,matchAllTokens:q},this.setCollection(t),this._processKeys(E)}var t,n;return t=e,(n=[{key:"setCollection",value:function(e){return this.list=e,e}},{key:"_processKeys",value:function(e){if(this._keyWeights={},this._keyNames=[],e.length&&"string"==typeof e[0])for(var t=0,n=e.length;t<n;t+=1){var r=e[t];this._keyWeights[r]=1,this._keyNames.push(r)}else{for(var i=null,o=null,a=0,s=0,l=e.length;s<l;s+=1){var c=e[s];if(!c.hasOwnProperty("name"))throw new Error('Missing "name" property in key object');var u=c.name;if(this._keyNames.push(u),!c.hasOwnProperty("weight"))throw new Error('Missing "weight" property in key object');var d=c.weight;if(d<0||d>1)throw new Error('"weight" property in key must bein the range of [0, 1)');o=null==o?d:Math.max(o,d),i=null==i?d:Math.min(i,d),this._keyWeights[u]=d,a+=d}if(a>1)throw new Error("Total of weights cannot exceed 1")}}},{key:"search",value:function(e){var t=arguments.length>1&&void 0!==arguments[1]?arguments[1]:{limit:!1};this._log('---------\nSearch pattern: "'.concat(e,'"'));var n=this._prepareSearchers(e),r=n.tokenSearchers,i=n.fullSearcher,o=this._search(r,i);return this._computeScore(o),this.options.shouldSort&&this._sort(o),t.limit&&"number"==typeof t.limit&&(o=o.slice(0,t.limit)),this._format(o)}},{key:"_prepareSearchers",value:function(){var e=arguments.length>0&&void 0!==arguments[0]?arguments[0]:"",t=[];if(this.options.tokenize)for(var n=e.split(this.options.tokenSeparator),r=0,i=n.length;r<i;r+=1)t.push(new o(n[r],this.options));return{tokenSearchers:t,fullSearcher:new o(e,this.options)}}},{key:"_search",value:function(){var e=arguments.length>0&&void 0!==arguments[0]?arguments[0]:[],t=arguments.length>1?arguments[1]:void 0,n=this.list,r={},i=[];if("string"==typeof n[0]){for(var o=0,a=n.length;o<a;o+=1)this._analyze({key:"",value:n[o],record:o,index:o},{resultMap:r,results:i,tokenSearchers:e,fullSearcher:t});return i}for(var s=0,l=n.length;s<l;s+=1)for(var c=n[s],u=0,d=this._keyNames.length;u<d;u+=1){var h=this._keyNames[u];this._analyze({key:h,value:this.options.getFn(c,h),record:c,index:s},{resultMap:r,results:i,tokenSearchers:e,fullSearcher:t})}return i}},{key:"_analyze",value:function(e,t){var n=this,r=e.key,i=e.arrayIndex,o=void 0===i?-1:i,a=e.value,s=e.record,c=e.index,u=t.tokenSearchers,d=void 0===u?[]:u,h=t.fullSearcher,f=t.resultMap,p=void 0===f?{}:f,m=t.results,v=void 0===m?[]:m;!function e(t,i,o,a){if(null!=i)if("string"==typeof i){var s=!1,c=-1,u=0;n._log("\nKey: ".concat(""===r?"--":r));var f=h.search(i);if(n._log('Full text: "'.concat(i,'", score: ').concat(f.score)),n.options.tokenize){for(var m=i.split(n.options.tokenSeparator),g=m.length,_=[],y=0,b=d.length;y<b;y+=1){var w=d[y];n._log('\nPattern: "'.concat(w.pattern,'"'));for(var x=!1,E=0;E<g;E+=1){var C=m[E],O=w.search(C),S={};O.isMatch?(S[C]=O.score,s=!0,x=!0,_.push(O.score)):(S[C]=1,n.options.matchAllTokens||_.push(1)),n._log('Token: "'.concat(C,'", score: ').concat(S[C]))}x&&(u+=1)}c=_[0];for(var k=_.length,L=1;L<k;L+=1)c+=_[L];c/=k,n._log("Token score average:",c)}var T=f.score;c>-1&&(T=(T+c)/2),n._log("Score average:",T);var A=!n.options.tokenize||!n.options.matchAllTokens||u>=d.length;if(n._log("\nCheck Matches: ".concat(A)),(s||f.isMatch)&&A){var M={key:r,arrayIndex:t,value:i,score:T};n.options.includeMatches&&(M.matchedIndices=f.matchedIndices);var N=p[a];N?N.output.push(M):(p[a]={item:o,output:[M]},v.push(p[a]))}}else if(l(i))for(var q=0,I=i.length;q<I;q+=1)e(q,i[q],o,a)}(o,a,s,c)}},{key:"_computeScore",value:function(e){this._log("\n\nComputing score:\n");for(var t=this._keyWeights,n=!!Object.keys(t).length,r=0,i=e.length;r<i;r+=1){for(var o=e[r],a=o.output,s=a.length,l=1,c=0;c<s;c+=1){var u=a[c],d=u.key,h=n?t[d]:1,f=0===u.score&&t&&t[d]>0?Number.EPSILON:u.score;l*=Math.pow(f,h)}o.score=l,this._log(o)}}},{key:"_sort",value:function(e){this._log("\n\nSorting...."),e.sort(this.options.sortFn)}},{key:"_format",value:function(e){var t=[];if(this.options.verbose){var n=[];this._log("\n\nOutput:\n\n",JSON.stringify(e,(function(e,t){if("object"===r(t)&&null!==t){if(-1!==n.indexOf(t))return;n.push(t)}return t}),2)),n=null}var i=[];this.options.includeMatches&&i.push((function(e,t){var n=e.output;t.matches=[];for(var r=0,i=n.length;r<i;r+=1){var o=n[r];if(0!==o.matchedIndices.length){var a={indices:o.matchedIndices,value:o.value};o.key&&(a.key=o.key),o.hasOwnProperty("arrayIndex")&&o.arrayIndex>-1&&(a.arrayIndex=o.arrayIndex),t.matches.push(a)}}})),this.options.includeScore&&i.push((function(e,t){t.score=e.score}));for(var o=0,a=e.length;o<a;o+=1){var s=e[o];if(this.options.id&&(s.item=this.options.getFn(s.item,this.options.id)[0]),i.length){for(var l={item:s.item},c=0,u=i.length;c<u;c+=1)i[c](s,l);t.push(l)}else t.push(s.item)}return t}},{key:"_log",value:function(){var e;this.options.verbose&&(e=console).log.apply(e,arguments)}}])&&i(t.prototype,n),e}();e.exports=c},function(e,t,n){function r(e,t){for(var n=0;n<t.length;n++){var r=t[n];r.enumerable=r.enumerable||!1,r.configurable=!0,"value"in r&&(r.writable=!0),Object.defineProperty(e,r.key,r)}}var i=n(2),o=n(3),a=n(6),s=function(){function e(t,n){var r=n.location,i=void 0===r?0:r,o=n.distance,s=void 0===o?100:o,l=n.threshold,c=void 0===l?.6:l,u=n.maxPatternLength,d=void 0===u?32:u,h=n.isCaseSensitive,f=void 0!==h&&h,p=n.tokenSeparator,m=void 0===p?/ +/g:p,v=n.findAllMatches,g=void 0!==v&&v,_=n.minMatchCharLength,y=void 0===_?1:_,b=n.includeMatches,w=void 0!==b&&b;!function(e,t){if(!(e instanceof t))throw new TypeError("Cannot call a class as a function")}(this,e),this.options={location:i,distance:s,threshold:c,maxPatternLength:d,isCaseSensitive:f,tokenSeparator:m,findAllMatches:g,includeMatches:w,minMatchCharLength:y},this.pattern=f?t:t.toLowerCase(),this.pattern.length<=d&&(this.patternAlphabet=a(this.pattern))}var t,n;return t=e,(n=[{key:"search",value:function(e){var t=this.options,n=t.isCaseSensitive,r=t.includeMatches;if(n||(e=e.toLowerCase()),this.pattern===e){var a={isMatch:!0,score:0};return r&&(a.matchedIndices=[[0,e.length-1]]),a}var s=this.options,l=s.maxPatternLength,c=s.tokenSeparator;if(this.pattern.length>l)return i(e,this.pattern,c);var u=this.options,d=u.location,h=u.distance,f=u.threshold,p=u.findAllMatches,m=u.minMatchCharLength;return o(e,this.pattern,this.patternAlphabet,{location:d,distance:h,threshold:f,findAllMatches:p,minMatchCharLength:m,includeMatches:r})}}])&&r(t.prototype,n),e}();e.exports=s},function(e,t){var n=/[\-\[\]\/\{\}\(\)\*\+\?\.\\\^\$\|]/g;e.exports=function(e,t){var r=arguments.length>2&&void 0!==arguments[2]?arguments[2]:/ +/g,i=new RegExp(t.replace(n,"\\$&").replace(r,"|")),o=e.match(i),a=!!o,s=[];if(a)for(var l=0,c=o.length;l<c;l+=1){var u=o[l];s.push([e.indexOf(u),u.length-1])}return{score:a?.5:1,isMatch:a,matchedIndices:s}}},function(e,t,n){var r=n(4),i=n(5);e.exports=function(e,t,n,o){for(var a=o.location,s=void 0===a?0:a,l=o.distance,c=void 0===l?100:l,u=o.threshold,d=void 0===u?.6:u,h=o.findAllMatches,f=void 0!==h&&h,p=o.minMatchCharLength,m=void 0===p?1:p,v=o.includeMatches,g=void 0!==v&&v,_=s,y=e.length,b=d,w=e.indexOf(t,_),x=t.length,E=[],C=0;C<y;C+=1)E[C]=0;if(-1!==w){var O=r(t,{errors:0,currentLocation:w,expectedLocation:_,distance:c});if(b=Math.min(O,b),-1!==(w=e.lastIndexOf(t,_+x))){var S=r(t,{errors:0,currentLocation:w,expectedLocation:_,distance:c});b=Math.min(S,b)}}w=-1;for(var k=[],L=1,T=x+y,A=1<<(x<=31?x-1:30),M=0;M<x;M+=1){for(var N=0,q=T;N<q;)r(t,{errors:M,currentLocation:_+q,expectedLocation:_,distance:c})<=b?N=q:T=q,q=Math.floor((T-N)/2+N);T=q;var I=Math.max(1,_-q+1),D=f?y:Math.min(_+q,y)+x,P=Array(D+2);P[D+1]=(1<<M)-1;for(var j=D;j>=I;j-=1){var R=j-1,z=n[e.charAt(R)];if(z&&(E[R]=1),P[j]=(P[j+1]<<1|1)&z,0!==M&&(P[j]|=(k[j+1]|k[j])<<1|1|k[j+1]),P[j]&A&&(L=r(t,{errors:M,currentLocation:R,expectedLocation:_,distance:c}))<=b){if(b=L,(w=R)<=_)break;I=Math.max(1,2*_-w)}}if(r(t,{errors:M+1,currentLocation:_,expectedLocation:_,distance:c})>b)break;k=P}var F={isMatch:w>=0,score:0===L?.001:L};return g&&(F.matchedIndices=i(E,m)),F}},function(e,t){e.exports=function(e,t){var n=t.errors,r=void 0===n?0:n,i=t.currentLocation,o=void 0===i?0:i,a=t.expectedLocation,s=void 0===a?0:a,l=t.distance,c=void 0===l?100:l,u=r/e.length,d=Math.abs(s-o);return c?u+d/c:d?1:u}},function(e,t){e.exports=function(){for(var e=arguments.length>0&&void 0!==arguments[0]?arguments[0]:[],t=arguments.length>1&&void 0!==arguments[1]?arguments[1]:1,n=[],r=-1,i=-1,o=0,a=e.length;o<a;o+=1){var s=e[o];s&&-1===r?r=o:s||-1===r||((i=o-1)-r+1>=t&&n.push([r,i]),r=-1)}return e[o-1]&&o-r>=t&&n.push([r,o-1]),n}},function(e,t){e.exports=function(e){for(var t={},n=e.length,r=0;r<n;r+=1)t[e.charAt(r)]=0;for(var i=0;i<n;i+=1)t[e.charAt(i)]|=1<<n-i-1;return t}},function(e,t){var n=function(e){return Array.isArray?Array.isArray(e):"[object Array]"===Object.prototype.toString.call(e)},r=function(e){return null==e?"":function(e){if("string"==typeof e)return e;var t=e+"";return"0"==t&&1/e==-1/0?"-0":t}(e)},i=function(e){return"string"==typeof e},o=function(e){return"number"==typeof e};e.exports={get:function(e,t){var a=[];return function e(t,s){if(s){var l=s.indexOf("."),c=s,u=null;-1!==l&&(c=s.slice(0,l),u=s.slice(l+1));var d=t[c];if(null!=d)if(u||!i(d)&&!o(d))if(n(d))for(var h=0,f=d.length;h<f;h+=1)e(d[h],u);else u&&e(d,u);else a.push(r(d))}else a.push(t)}(e,t),a},isArray:n,isString:i,isNum:o,toString:r}}])},6496:e=>{!function(){var t=["direction","boxSizing","width","height","overflowX","overflowY","borderTopWidth","borderRightWidth","borderBottomWidth","borderLeftWidth","borderStyle","paddingTop","paddingRight","paddingBottom","paddingLeft","fontStyle","fontVariant","fontWeight","fontStretch","fontSize","fontSizeAdjust","lineHeight","fontFamily","textAlign","textTransform","textIndent","textDecoration","letterSpacing","wordSpacing","tabSize","MozTabSize"],n="undefined"!=typeof window,r=n&&null!=window.mozInnerScreenX;function i(e,i,o){if(!n)throw new Error("textarea-caret-position#getCaretCoordinates should only be called in a browser");var a=o&&o.debug||!1;if(a){var s=document.querySelector("#input-textarea-caret-position-mirror-div");s&&s.parentNode.removeChild(s)}var l=document.createElement("div");l.id="input-textarea-caret-position-mirror-div",document.body.appendChild(l);var c=l.style,u=window.getComputedStyle?window.getComputedStyle(e):e.currentStyle,d="INPUT"===e.nodeName;c.whiteSpace="pre-wrap",d||(c.wordWrap="break-word"),c.position="absolute",a||(c.visibility="hidden"),t.forEach((function(e){d&&"lineHeight"===e?c.lineHeight=u.height:c[e]=u[e]})),r?e.scrollHeight>parseInt(u.height)&&(c.overflowY="scroll"):c.overflow="hidden",l.textContent=e.value.substring(0,i),d&&(l.textContent=l.textContent.replace(/\s/g," "));var h=document.createElement("span");h.textContent=e.value.substring(i)||".",l.appendChild(h);var f={top:h.offsetTop+parseInt(u.borderTopWidth),left:h.offsetLeft+parseInt(u.borderLeftWidth),height:parseInt(u.lineHeight)};return a?h.style.backgroundColor="#aaa":document.body.removeChild(l),f}void 0!==e.exports?e.exports=i:n&&(window.getCaretCoordinates=i)}()},4523:(e,t,n)=>{var r=n(9755);function i(e,t){let n=e.text();e.text("Processing Request"),r.ajax({type:"POST",url:"../api/tools/req_file",data:{selected_requirement_ids:JSON.stringify(t)}}).done((function(i){let o=r("#ultimate-tab-configuration-select").val();r.ajax({type:"POST",url:"../api/ultimate/job",data:JSON.stringify({configuration:o,req_file:i,req_ids:t})}).done((function(t){console.log(t.requestId),e.text(n)})).fail((function(e,t,n){alert(n+"\n\n"+e.responseText)}))})).fail((function(e,t,n){alert(n+"\n\n"+e.responseText)}))}e.exports.init_ultimate_tab=function(){r.ajax({type:"GET",url:"../api/ultimate/version"}).done((function(e){if(""!==e.version){let t=r("#ultimate-tab-ultimate-status-img"),n=t.attr("src");t.attr("src",n.replace("/disconnected.svg","/connected.svg")),t.attr("title","Ultimate Api connected: "+e.version),r("#ultimate-tab-create-unfiltered-btn").prop("disabled",!1),r("#ultimate-tab-create-filtered-btn").prop("disabled",!1),r("#ultimate-tab-create-selected-btn").prop("disabled",!1)}else console.log("no ultimate connection found!")})).fail((function(e,t,n){alert(n+"\n\n"+e.responseText)})),r.ajax({type:"GET",url:"../api/ultimate/configurations"}).done((function(e){let t=r("#ultimate-tab-configuration-select");t.empty();let n=Object.keys(e);for(let i=0;i<n.length;i++){let o=n[i];o+=" (Toolchain: "+e[n[i]].toolchain,o+=", User Settings: "+e[n[i]].user_settings+")",t.append(r("<option></option>").val(n[i]).text(o))}})).fail((function(e,t,n){alert(n+"\n\n"+e.responseText)})),r("#ultimate-tab-create-unfiltered-btn").click((function(){i(r("#ultimate-tab-create-unfiltered-btn"),"all")}))},e.exports.init_ultimate_requirements_table_connection=function(e){r("#ultimate-tab-create-filtered-btn").click((function(){let t=[];e.rows({search:"applied"}).every((function(){let e=this.data();t.push(e.id)})),i(r("#ultimate-tab-create-filtered-btn"),t)})),r("#ultimate-tab-create-selected-btn").click((function(){let t=[];e.rows({selected:!0}).every((function(){let e=this.data();t.push(e.id)})),i(r("#ultimate-tab-create-selected-btn"),t)}))}},4148:(e,t,n)=>{"use strict";n.r(t),n.d(t,{default:()=>i}),n(9755);var r=n(5700);n(3142);const i=r.default},4366:(e,t,n)=>{"use strict";function r(e,t,n){const r=e.value,i=t+(n||""),o=document.activeElement;let a=0,s=0;for(;a<r.length&&a<i.length&&r[a]===i[a];)a++;for(;r.length-s-1>=0&&i.length-s-1>=0&&r[r.length-s-1]===i[i.length-s-1];)s++;a=Math.min(a,Math.min(r.length,i.length)-s),e.setSelectionRange(a,r.length-s);const l=i.substring(a,i.length-s);if(e.focus(),!document.execCommand("insertText",!1,l)){e.value=i;const t=document.createEvent("Event");t.initEvent("input",!0,!0),e.dispatchEvent(t)}return e.setSelectionRange(t.length,t.length),o.focus(),e}function i(e,t,n){const i=e.selectionEnd,o=e.value.substr(0,e.selectionStart)+t,a=e.value.substring(e.selectionStart,i)+(n||"")+e.value.substr(i);return r(e,o,a),e.selectionEnd=i+t.length,e}n.r(t),n.d(t,{update:()=>r,wrapCursor:()=>i})}},n={};function r(e){var i=n[e];if(void 0!==i)return i.exports;var o=n[e]={id:e,exports:{}};return t[e].call(o.exports,o,o.exports,r),o.exports}r.m=t,e=[],r.O=(t,n,i,o)=>{if(!n){var a=1/0;for(u=0;u<e.length;u++){for(var[n,i,o]=e[u],s=!0,l=0;l<n.length;l++)(!1&o||a>=o)&&Object.keys(r.O).every((e=>r.O[e](n[l])))?n.splice(l--,1):(s=!1,o<a&&(a=o));if(s){e.splice(u--,1);var c=i();void 0!==c&&(t=c)}}return t}o=o||0;for(var u=e.length;u>0&&e[u-1][2]>o;u--)e[u]=e[u-1];e[u]=[n,i,o]},r.n=e=>{var t=e&&e.__esModule?()=>e.default:()=>e;return r.d(t,{a:t}),t},r.d=(e,t)=>{for(var n in t)r.o(t,n)&&!r.o(e,n)&&Object.defineProperty(e,n,{enumerable:!0,get:t[n]})},r.o=(e,t)=>Object.prototype.hasOwnProperty.call(e,t),r.r=e=>{"undefined"!=typeof Symbol&&Symbol.toStringTag&&Object.defineProperty(e,Symbol.toStringTag,{value:"Module"}),Object.defineProperty(e,"__esModule",{value:!0})},r.j=441,(()=>{var e={441:0,660:0,396:0};r.O.j=t=>0===e[t];var t=(t,n)=>{var i,o,[a,s,l]=n,c=0;if(a.some((t=>0!==e[t]))){for(i in s)r.o(s,i)&&(r.m[i]=s[i]);if(l)var u=l(r)}for(t&&t(n);c<a.length;c++)o=a[c],r.o(e,o)&&e[o]&&e[o][0](),e[o]=0;return r.O(u)},n=self.webpackChunkhanfor=self.webpackChunkhanfor||[];n.forEach(t.bind(null,0)),n.push=t.bind(null,n.push.bind(n))})(),r.nc=void 0;var i=r.O(void 0,[351],(()=>r(9925)));i=r.O(i)})();
\ No newline at end of file
+(()=>{var e,t={9925:function(module,exports,__webpack_require__){
+var $=__webpack_require__(9755),jQuery=__webpack_require__(9755);
+__webpack_require__(1388);
+const {Collapse, Modal} = __webpack_require__(4712);
+__webpack_require__(5700);
+__webpack_require__(4148);
+__webpack_require__(2993);
+__webpack_require__(944);
+__webpack_require__(3889);
+__webpack_require__(7312);
+__webpack_require__(2106);
+//require('datatables.net-bs5-colreorderwithresize-npm');
+__webpack_require__(6824);
+__webpack_require__(7175);
+
+let utils = __webpack_require__(5759);
+const autosize = __webpack_require__(9367);
+
+// Globals
+const {SearchNode} = __webpack_require__(3024);
+const {init_simulator_tab} = __webpack_require__(6714);
+const {init_ultimate_tab} = __webpack_require__(4523);
+const {init_ultimate_requirements_table_connection} = __webpack_require__(4523);
+
+const {Textcomplete} = __webpack_require__(675)
+const {TextareaEditor} = __webpack_require__(8207)
+
+//const {Modal} = require("bootstrap");
+
+let Fuse = __webpack_require__(4070);
+let fuse = new Fuse([], {});
+
+let available_tags = ['', 'has_formalization'];
+let available_status = ['', 'Todo', 'Review', 'Done'];
+let search_autocomplete = [":AND:", ":OR:", ":NOT:", ":COL_INDEX_01:", ":COL_INDEX_02:", ":COL_INDEX_03:", ":COL_INDEX_04:", ":COL_INDEX_05:", ":COL_INDEX_06:", ":COL_INDEX_07:"];
+let available_types = [''];
+let available_vars = [''];
+let available_reports = [];
+let visible_columns = [true, true, true, true, true, true];
+let filter_search_array = [];
+let get_query = JSON.parse(search_query); // search_query is set in layout.html
+let tag_colors = {};
+let type_inference_errors = [];
+let req_search_string = sessionStorage.getItem('req_search_string');
+let filter_status_string = sessionStorage.getItem('filter_status_string');
+let filter_tag_string = sessionStorage.getItem('filter_tag_string');
+let filter_type_string = sessionStorage.getItem('filter_type_string');
+let search_tree = undefined;
+let filter_tree = undefined;
+
+
+/**
+ * INDEX
+ * =====================================================================================================================
+ */
+$(document).ready(function () {
+    load_tags();
+    initialise_search_bar();
+    load_datatable();
+    init_modal();
+    update_logs();
+    init_report_generation();
+    init_simulator_tab();
+    init_ultimate_tab();
+
+    let body = $('body');
+    // Bind formalization deletion.
+    // body.confirmation({
+    //     rootSelector: '.delete_formalization',
+    //     selector: '.delete_formalization',
+    //     onConfirm: function () {
+    //         delete_formalization($(this).attr('name'), $(this).closest('.card'));
+    //     }
+    // });
+
+    $('body').bootstrapConfirmButton({
+        selector: '.delete_formalization', onConfirm: function () {
+            delete_formalization($(this).attr('name'), $(this).closest('.accordion-item'))
+        }
+    })
+
+    body.on('click', '.delete_formalization1', function () {
+        bootstrapConfirmation({
+            yesCallBack: function () {
+                console.log('yes');
+            }, noCallBack: function () {
+                console.log('no');
+            }, config: {
+                closeIcon: true, message: 'This is an example.', title: 'Example', no: {
+                    class: 'btn btn-danger', text: 'No'
+                }, yes: {
+                    class: 'btn btn-success', text: 'Yes'
+                }
+            }
+        });
+    })
+
+    // Bind formalization update.
+    body.on('change', '.formalization_selector, .reqirement-variable, .req_var_type', function () {
+        update_formalization();
+    });
+    // Bind formalization variable update.
+    body.on('change', '.formalization_selector', function () {
+        update_vars();
+    });
+
+    /*
+    body.on('shown.bs.modal', '#requirement_modal', function () {
+        $(this).find('textarea').each(function () {
+            autosize($(this));
+            autosize.update($(this));
+        });
+    });
+    */
+
+    const requirement_modal = document.getElementById('requirement_modal')
+    requirement_modal.addEventListener('shown.bs.modal', function () {
+        $(this).find('textarea').each(function () {
+            autosize($(this));
+            autosize.update($(this));
+        });
+    })
+
+    body.on('change focus', 'textarea', function () {
+        autosize($(this));
+        autosize.update($(this));
+    });
+    bind_tag_field_events();
+});
+
+/**
+ * Fetch requirements from hanfor api and build the requirements table.
+ * Apply search queries to table
+ * Bind button/links to events.
+ * @param columnDefs predefined columDefs (https://datatables.net/reference/option/columnDefs)
+ */
+function init_datatable(columnDefs) {
+    let table = $('#requirements_table').DataTable({
+        "language": {
+            "emptyTable": "Loading data."
+        },
+        "paging": true,
+        "stateSave": true,
+        "select": {
+            style: 'os', selector: 'td:first-child'
+        },
+        "order": [[1, "asc"]],
+        "pageLength": 50,
+        "lengthMenu": [[10, 50, 100, 500, -1], [10, 50, 100, 500, "All"]],
+        "dom": 'rt<"container"<"row"<"col-md-6"li><"col-md-6"p>>>',
+        "serverSide": true,
+        "processing": true,
+        "ajax": {
+            "url": "api/req/gets",
+            "data": function (data) {
+                // Hanfor specific requirements table filtering, applied by the server.
+                data.search_query = req_search_string;
+                data.filter_query = JSON.stringify(filter_search_array);
+                data.visible_columns = JSON.stringify(visible_columns);
+            },
+            "dataSrc": function (json) {
+                $.each(json.types, function (index, type) {
+                    if (available_types.indexOf(type) <= -1) {
+                        available_types.push(type);
+                    }
+                });
+                return json.data;
+            }
+        },
+        "columnDefs": columnDefs,
+        "createdRow": function (row, data) {
+            if (data['type'] === 'Heading') {
+                $(row).addClass('bg-primary');
+            }
+            if (data['type'] === 'Information') {
+                $(row).addClass('table-info');
+            }
+            if (data['type'] === 'Requirement') {
+                $(row).addClass('table-warning');
+            }
+            if (data['type'] === 'not set') {
+                $(row).addClass('table-light');
+            }
+        },
+        "infoCallback": function (settings, start, end, max, total) {
+            let api = this.api();
+            let pageInfo = api.page.info();
+
+            $('#clear-all-filters-text').html("Showing " + total + "/" + pageInfo.recordsTotal + ". Clear all.");
+
+            let result = "Showing " + start + " to " + end + " of " + total + " entries";
+            result += " (filtered from " + pageInfo.recordsTotal + " total entries).";
+
+            return result;
+        },
+        "initComplete": function () {
+            $('#search_bar').val(req_search_string);
+            $('#type-filter-input').val(filter_type_string);
+            $('#tag-filter-input').val(filter_tag_string);
+            $('#status-filter-input').val(filter_status_string);
+
+            let requirements_table = this.api();
+            bind_requirement_id_to_modals(requirements_table);
+            init_datatable_manipulators(requirements_table);
+            init_ultimate_requirements_table_connection(requirements_table);
+
+            utils.process_url_query(get_query);
+            update_search();
+            update_filter();
+
+            this.api().draw();
+
+        }
+    });
+    new $.fn.dataTable.ColReorder(table, {});
+}
+
+/**
+ * Bind the requirements table manipulators to the table.
+ * Initialize manipulators behaviour.
+ * @param requirements_table The requirements table
+ */
+function init_datatable_manipulators(requirements_table) {
+    // Headers extension: Add index to address in search.
+    requirements_table.columns().every(function (index) {
+        if (index > 0) requirements_table.column(index).header().append(' (' + index + ')');
+    });
+
+    // Save button
+    $('#save_requirement_modal').click(function () {
+        store_requirement(requirements_table);
+    });
+
+    // Table Search related stuff.
+    // Bind big custom searchbar to search the table.
+    $('#search_bar').keypress(function (e) {
+        if (e.which === 13) { // Search on enter.
+            update_search();
+            requirements_table.draw();
+        }
+    });
+
+    // Table filters.
+    $('#type-filter-input').autocomplete({
+        minLength: 0, source: available_types, delay: 100
+    });
+
+    $('#status-filter-input').autocomplete({
+        minLength: 0, source: available_status, delay: 100
+    });
+
+    $('#tag-filter-input').autocomplete({
+        minLength: 0, source: available_tags, delay: 100
+    });
+
+    $('#tag-filter-input, #status-filter-input, #type-filter-input')
+        .on('focus', function () {
+            $(this).keydown();
+        })
+        .on('keypress', function (e) {
+            if (e.which === 13) { // Search on Enter.
+                update_filter();
+                requirements_table.draw();
+            }
+        });
+
+    $('#table-filter-toggle').click(function () {
+        $('#tag-filter-input').autocomplete({source: available_tags});
+        $('#type-filter-input').autocomplete({source: available_types});
+    });
+
+    // Clear all applied searches.
+    $('.clear-all-filters').click(function () {
+        clear_all_search_filter_inputs();
+        requirements_table.draw();
+    });
+
+    // Listen for tool section triggers.
+    $('#gen-req-from-selection').click(function () {
+        utils.fetch_filtered_requirement_ids(requirements_table, function (req_ids) {
+            $('#selected_requirement_ids').val(JSON.stringify(req_ids));
+            $('#generate_req_form').submit();
+        });
+    });
+
+    $('#gen-csv-from-selection').click(function () {
+        utils.fetch_filtered_requirement_ids(requirements_table, function (req_ids) {
+            $('#selected_csv_requirement_ids').val(JSON.stringify(req_ids));
+            $('#generate_csv_form').submit();
+        });
+    });
+
+    $('#gen-xls-from-selection').click(function () {
+        utils.fetch_filtered_requirement_ids(requirements_table, function (req_ids) {
+            $('#selected_xls_requirement_ids').val(JSON.stringify(req_ids));
+            $('#generate_xls_form').submit();
+        });
+    });
+
+    // Column toggling
+    $('.column-toggle-button').on('click', function (e) {
+        e.preventDefault();
+
+        // Get the column API object
+        let column = requirements_table.column($(this).attr('data-column'));
+
+        // Toggle the visibility
+        column.visible(!column.visible());
+        update_visible_columns_information();
+    });
+
+    $('.reset-column-toggle').on('click', function (e) {
+        e.preventDefault();
+        requirements_table.columns('.default-col').visible(true);
+        requirements_table.columns('.extra-col').visible(false);
+        update_visible_columns_information();
+    });
+    update_visible_columns_information();
+
+    // Select rows
+    $('.select-all-button').on('click', function () {
+        // Toggle selection on
+        if ($(this).hasClass('btn-secondary')) {
+            requirements_table.rows({page: 'current'}).select();
+        } else { // Toggle selection off
+            requirements_table.rows({page: 'current'}).deselect();
+        }
+        // Toggle button state.
+        $('.select-all-button').toggleClass('btn-secondary btn-primary');
+    });
+
+    // Toggle "Select all rows to `off` on user specific selection."
+    requirements_table.on('user-select', function () {
+        let select_buttons = $('.select-all-button');
+        select_buttons.removeClass('btn-primary');
+        select_buttons.addClass('btn-secondary ');
+    });
+
+    // Bind autocomplete for "edit-selected" inputs
+    $('#multi-add-tag-input, #multi-remove-tag-input').autocomplete({
+        minLength: 0, source: available_tags, delay: 100
+    }).on('focus', function () {
+        $(this).keydown();
+    }).val('');
+
+    $('#multi-set-status-input').autocomplete({
+        minLength: 0, source: available_status, delay: 100
+    }).on('focus', function () {
+        $(this).keydown();
+    }).val('');
+
+    $('.apply-multi-edit').click(function () {
+        apply_multi_edit(requirements_table);
+    });
+
+    // $('.add_top_guess_button').confirmation({
+    //     rootSelector: '.add_top_guess_button'
+    // }).click(function () {
+    //     add_top_guess_to_selected_requirements(requirements_table);
+    // });
+
+    $('.add_top_guess_button').bootstrapConfirmButton({
+        onConfirm: function () {
+            add_top_guess_to_selected_requirements(requirements_table)
+        }
+    })
+}
+
+/**
+ * Stores the active (in modal) requirement and updates the row in the requirements table.
+ * @param {DataTable} requirements_table
+ */
+function store_requirement(requirements_table) {
+    let requirement_modal_content = $('.modal-content');
+    requirement_modal_content.LoadingOverlay('show');
+
+    const req_id = $('#requirement_id').val();
+    const req_status = $('#requirement_status').val();
+    const updated_formalization = $('#requirement_modal').data('updated_formalization');
+    const associated_row_id = parseInt($('#modal_associated_row_index').val());
+
+    // Fetch the formalizations
+    let formalizations = {};
+    $('.formalization_card').each(function () {
+        // Scope and Pattern
+        let formalization = {};
+        formalization['id'] = $(this).attr('title');
+        $(this).find('select').each(function () {
+            if ($(this).hasClass('scope_selector')) {
+                formalization['scope'] = $(this).val();
+            }
+            if ($(this).hasClass('pattern_selector')) {
+                formalization['pattern'] = $(this).val();
+            }
+        });
+
+        // Expressions
+        formalization['expression_mapping'] = {};
+        $(this).find("textarea.reqirement-variable").each(function () {
+            if ($(this).attr('title') !== '') formalization['expression_mapping'][$(this).attr('title')] = $(this).val();
+        });
+
+        formalizations[formalization['id']] = formalization;
+    });
+
+    let tag_comments = new Map();
+    $("#tags_comments_table tr:gt(0)").each(function () {
+        let tag = $(this).find("td:eq(0)").text();
+        let comment = $(this).find("textarea:eq(0)").val();
+        tag_comments.set(tag, comment);
+    })
+
+    // Store the requirement.
+    $.post("api/req/update", {
+            id: req_id,
+            row_idx: associated_row_id,
+            update_formalization: updated_formalization,
+            tags: JSON.stringify(Object.fromEntries(tag_comments)),
+            status: req_status,
+            formalizations: JSON.stringify(formalizations)
+        }, // Update requirements table on success or show an error message.
+        function (data) {
+            requirement_modal_content.LoadingOverlay('hide', true);
+            if (data['success'] === false) {
+                alert(data['errormsg']);
+            } else {
+                requirements_table.row(associated_row_id).data(data);
+
+                //$('#requirement_modal').data('unsaved_changes', false).modal('hide');
+                $('#requirement_modal').data('unsaved_changes', false)
+
+                const requirement_modal = document.querySelector('#requirement_modal')
+                Modal.getOrCreateInstance(requirement_modal).hide()
+            }
+        }).done(function () {
+        update_logs();
+    });
+}
+
+/**
+ * Load requirements datatable definitions. Trigger build of a fresh requirement datatable.
+ */
+function load_datatable() {
+    // Initialize the Column defs.
+    // First set the static colum definitions.
+    let columnDefs = [{
+        "orderable": false, "className": 'select-checkbox', "targets": [0], "data": null, "defaultContent": ""
+    }, {
+        "targets": [1], "data": "pos"
+    }, {
+        "targets": [2], "data": "id", "render": function (data) {
+            return '<a href="#">' + utils.escapeHtml(data) + '</a>';
+        }
+    }, {
+        "targets": [3], "data": "desc", "render": function (data) {
+            return '<div class="white-space-pre">' + utils.escapeHtml(data) + '</div>';
+        }
+    }, {
+        "targets": [4], "data": "type", "render": function (data) {
+            if (available_types.indexOf(data) <= -1) {
+                available_types.push(data);
+            }
+            return utils.escapeHtml(data);
+        }
+    }, {
+        "targets": [5], "data": "tags", "render": function (data, type, row) {
+            let result = '';
+            $(data).each(function (id, tag) {
+                if (tag.length > 0) {
+                    result += '<span class="badge" style="background-color: ' + get_tag_color(tag) + '">' + utils.escapeHtml(tag) + '</span></br>' + " ";
+                }
+            });
+            return result;
+        }
+
+    }, {
+        "targets": [6], "data": "status", "render": function (data) {
+            return '<span class="badge bg-info">' + data + '</span></br>';
+        }
+    }, {
+        "targets": [7], "data": "formal", "render": function (data, type, row) {
+            let result = '';
+            if (row.formal.length > 0) {
+                $(data).each(function (id, formalization) {
+                    if (formalization.length > 0) {
+                        result += '<div class="white-space-pre">' + utils.escapeHtml(formalization) + '</div>';
+                    }
+                });
+            }
+            return result;
+        }
+    }];
+    // Load generic colums.
+    $.get("api/table/colum_defs", '', function (data) {
+        const dataLength = data['col_defs'].length;
+        for (let i = 0; i < dataLength; i++) {
+            columnDefs.push({
+                "targets": [parseInt(data['col_defs'][i]['target'])],
+                "data": data['col_defs'][i]['csv_name'],
+                "visible": false,
+                "searchable": true
+            });
+        }
+    }).done(function () {
+        init_datatable(columnDefs);
+    });
+}
+
+/**
+ * Bind the Links to open a requirement modal.
+ * Implement Behaviour:
+ *  * Load and show requirement data
+ * @param requirements_table
+ */
+function bind_requirement_id_to_modals(requirements_table) {
+    // Add listener for clicks on the Rows.
+    $('#requirements_table').find('tbody').on('click', 'a', function (event) {
+        // prevent body to be scrolled to the top.
+        event.preventDefault();
+        let row_idx = requirements_table.row($(this).closest('tr')).index();
+        load_requirement(row_idx);
+    });
+}
+
+/**
+ * Get the color for a tag
+ */
+function get_tag_color(tag_name) {
+    return tag_colors.hasOwnProperty(tag_name) ? tag_colors[tag_name] : 'var(--bs-info)';
+}
+
+/**
+ * SEARCH TAB
+ * =====================================================================================================================
+ */
+
+/**
+ * Load the hanfor frontend meta settings.
+ */
+function initialise_search_bar() {
+    let search_bar = $("#search_bar");
+    new Awesomplete(search_bar[0], {
+        filter: function (text, input) {
+            let result = false;
+            // If we have an uneven number of ":"
+            // We check if we have a match in the input tail starting from the last ":"
+            if ((input.split(":").length - 1) % 2 === 1) {
+                result = Awesomplete.FILTER_CONTAINS(text, input.match(/[^:]*$/)[0]);
+            }
+            return result;
+        }, item: function (text, input) {
+            // Match inside ":" enclosed item.
+            return Awesomplete.ITEM(text, input.match(/(:)([\S]*$)/)[2]);
+        }, replace: function (text) {
+            // Cut of the tail starting from the last ":" and replace by item text.
+            const before = this.input.value.match(/(.*)(:(?!.*:).*$)/)[1];
+            this.input.value = before + text;
+        }, list: search_autocomplete, minChars: 1, autoFirst: true
+    });
+}
+
+/**
+ * Update the search expression tree.
+ */
+function update_search() {
+    req_search_string = $('#search_bar').val().trim();
+    sessionStorage.setItem('req_search_string', req_search_string);
+    search_tree = SearchNode.fromQuery(req_search_string);
+}
+
+/**
+ * Clear all user input in filters and search bar. Reload the table.
+ */
+function clear_all_search_filter_inputs() {
+    $('#status-filter-input').val('').effect("highlight", {color: 'green'}, 500);
+    $('#tag-filter-input').val('').effect("highlight", {color: 'green'}, 500);
+    $('#type-filter-input').val('').effect("highlight", {color: 'green'}, 500);
+    $('#search_bar').val('').effect("highlight", {color: 'green'}, 500);
+    update_filter();
+    update_search();
+}
+
+/**
+ * FILTER TAB
+ * =====================================================================================================================
+ */
+
+/**
+ * Update the filter search tree used to filter the table by the values from the Filter tab.
+ */
+function update_filter() {
+    filter_search_array = [];
+
+    function pad_with_parantheses(array) {
+        return ["("].concat(array, [")"]);
+    }
+
+    function add_query(array, query, target) {
+        if (query.length > 0) {
+            if (array.length > 0) {
+                array = array.concat([":AND:"]);
+            }
+            array = array.concat(pad_with_parantheses(SearchNode.awesomeQuerySplitt0r(query, target)));
+        }
+        return array
+    }
+
+    filter_status_string = $('#status-filter-input').val();
+    filter_tag_string = $('#tag-filter-input').val();
+    filter_type_string = $('#type-filter-input').val();
+
+    sessionStorage.setItem('filter_status_string', filter_status_string);
+    sessionStorage.setItem('filter_tag_string', filter_tag_string);
+    sessionStorage.setItem('filter_type_string', filter_type_string);
+
+    filter_search_array = add_query(filter_search_array, filter_type_string, 4);
+    filter_search_array = add_query(filter_search_array, filter_tag_string, 5);
+    filter_search_array = add_query(filter_search_array, filter_status_string, 6);
+
+    filter_tree = SearchNode.searchArrayToTree(filter_search_array);
+}
+
+/**
+ * COLUMNS TAB
+ * =====================================================================================================================
+ */
+
+/**
+ * Update the color of the column toggle buttons.
+ * Column visible -> Button blue (btn-info).
+ * Column not visible -> Button grey (btn-secondary).
+ * Update visible_columns
+ */
+function update_visible_columns_information() {
+    let requirements_table = $('#requirements_table').DataTable();
+    let new_visible_columns = [];
+    $.each(requirements_table.columns().visible(), function (key, value) {
+        if (value === false) {
+            $('#col_toggle_button_' + key).removeClass('btn-info').addClass('btn-secondary');
+            new_visible_columns.push(false);
+        } else {
+            $('#col_toggle_button_' + key).removeClass('btn-secondary').addClass('btn-info');
+            new_visible_columns.push(true);
+        }
+    });
+    visible_columns = new_visible_columns;
+}
+
+/**
+ * EDIT SELECTED TAB
+ * =====================================================================================================================
+ */
+
+/**
+ * @param requirements_table
+ * @returns {Array} User selected requirement ids.
+ */
+function get_selected_requirement_ids(requirements_table) {
+    let selected_ids = [];
+    requirements_table.rows({selected: true}).every(function () {
+        let d = this.data();
+        selected_ids.push(d['id']);
+    });
+
+    return selected_ids
+}
+
+function apply_multi_edit(requirements_table) {
+    let page = $('body');
+    page.LoadingOverlay('show');
+    let add_tag = $('#multi-add-tag-input').val().trim();
+    let remove_tag = $('#multi-remove-tag-input').val().trim();
+    let set_status = $('#multi-set-status-input').val().trim();
+    let selected_ids = get_selected_requirement_ids(requirements_table);
+
+    $.post("api/req/multi_update", {
+            add_tag: add_tag, remove_tag: remove_tag, set_status: set_status, selected_ids: JSON.stringify(selected_ids)
+        }, // Update requirements table on success or show an error message.
+        function (data) {
+            page.LoadingOverlay('hide', true);
+            if (data['success'] === false) {
+                alert(data['errormsg']);
+            } else {
+                location.reload();
+            }
+        });
+}
+
+function add_top_guess_to_selected_requirements(requirements_table) {
+    let page = $('body');
+    page.LoadingOverlay('show');
+    let selected_ids = get_selected_requirement_ids(requirements_table);
+    let insert_mode = $('#top_guess_append_mode').val();
+
+    $.post("api/req/multi_add_top_guess", {
+            selected_ids: JSON.stringify(selected_ids), insert_mode: insert_mode
+        }, // Update requirements table on success or show an error message.
+        function (data) {
+            page.LoadingOverlay('hide', true);
+            if (data['success'] === false) {
+                alert(data['errormsg']);
+            } else {
+                location.reload();
+            }
+        });
+}
+
+/**
+ * LOG TAB
+ * =====================================================================================================================
+ */
+
+// Id of the newest activity log entry shown, entries after it are fetched on update.
+let log_cursor = null;
+
+/**
+ * Render one activity log entry: `[timestamp] action rid_1, rid_2`.
+ * @param {Object} entry activity log entry with timestamp, action and rids.
+ * @returns {jQuery} the entry paragraph.
+ */
+function render_log_entry(entry) {
+    let paragraph = $('<p></p>').text(`[${entry['timestamp']}] ${entry['action']}`);
+    entry['rids'].forEach(function (rid, index) {
+        paragraph.append(index > 0 ? ', ' : ' ');
+        $('<a class="req_direct_link" href="#"></a>').text(rid).attr('data-rid', rid).click(function () {
+            load_requirement(get_rowidx_by_reqid($(this).data('rid')));
+        }).appendTo(paragraph);
+    });
+    return paragraph;
+}
+
+/**
+ * Refresh the hanfor frontend logs. Only fetches the entries added since the last refresh.
+ */
+function update_logs() {
+    $.get('api/logs/get', log_cursor === null ? {} : {since: log_cursor}, function (data) {
+        let log_textarea = $('#log_textarea');
+        if (log_cursor === null || data['cursor'] < log_cursor) {
+            log_textarea.empty();
+        }
+        log_cursor = data['cursor'];
+        data['entries'].forEach(function (entry) {
+            log_textarea.append(render_log_entry(entry));
+        });
+        // Keep the retained entries only.
+        log_textarea.children().slice(0, -data['retention']).remove();
+        log_textarea.scrollTop(100000);
+    });
+}
+
+/**
+ * Find the datatable row index for a requirement by its requirement id.
+ * @param {number} rid the requirement id.
+ * @returns {number} row_index the datatables row index.
+ */
+function get_rowidx_by_reqid(rid) {
+    let requirement_table = $('#requirements_table').DataTable();
+    let result = -1;
+    requirement_table
+        .column(2)
+        .data()
+        .filter(function (value, index) {
+            if (String(value) === String(rid)) {
+                result = index;
+                return true;
+            }
+            return false;
+        });
+    return result;
+}
+
+/**
+ * REQUIREMENT MODAL
+ * =====================================================================================================================
+ */
+
+/**
+ * Initialize the requirement modal behaviour.
+ */
+function init_modal() {
+    let requirement_modal = $('#requirement_modal');
+    // Initialize tag autocomplete filed in the requirements modal.
+    $('#requirement_tag_field').tokenfield({
+        autocomplete: {
+            source: available_tags, delay: 100
+        }, showAutocompleteOnFocus: true
+    }).change(function () {
+        requirement_modal.data('unsaved_changes', true);
+    });
+
+    $('#requirement_status').change(function () {
+        $('#requirement_modal').data('unsaved_changes', true);
+    });
+
+    //requirement_modal.on('hide.bs.modal', function (event) {
+    requirement_modal[0].addEventListener('hide.bs.modal', function (event) {
+        modal_closing_routine(event);
+    });
+
+    // Handle ESC key
+    $(document).keyup(function (e) {
+        // If modal is open and ESC pressed (ESC maps to keyCode "27")
+        if ($('.modal:visible').length && e.keyCode === 27) {
+            let focused_input = $('input[type=text], textarea, select').filter(":focus");
+            // If no input elements in focus => Close modal.
+            if (focused_input.length === 0) {
+                // First hide the autoguess modal
+                if ($('#requirement_guess_modal:visible').length) {
+                    //$('#requirement_guess_modal').modal('hide');
+                    Modal.getOrCreateInstance('#requirement_guess_modal').hide()
+                } else {
+                    //$('#requirement_modal').modal('hide');
+                    Modal.getOrCreateInstance('#requirement_modal').hide()
+                }
+            } else {
+                // Defocus input elements.
+                focused_input.each(function () {
+                    $(this).blur();
+                });
+            }
+        }
+    });
+
+    // Clear the Modal after closing modal.
+    // In case of stacked modals and on modal closing:
+    // Prevent removal of modal-open class from body if a modal remains. This will keep the scrollbar intact.
+    requirement_modal.on('hidden.bs.modal', function () {
+        $('#requirement_tag_field').val('');
+        $('#requirement_tag_field-tokenfield').val('');
+    });
+
+    // Listener for adding new formalizations.
+    $('#add_formalization').click(function () {
+        add_formalization();
+    });
+
+    // Listener for adding new guessed formalizations.
+    $('#add_gussed_formalization').click(function () {
+        fetch_available_guesses();
+    });
+
+    $(".modal").on('hidden.bs.modal', function () {
+        if ($('.modal:visible').length) {
+            $('body').addClass('modal-open');
+        } else {
+            $('textarea').each(function () {
+                autosize.destroy($(this));
+            });
+        }
+    });
+
+    $('#formalization_accordion').on('shown.bs.collapse', '.card', function () {
+        $(this).find('textarea').each(function () {
+            autosize($(this));
+            autosize.update($(this));
+        });
+    });
+
+    // Initialize variables.
+    update_vars();
+}
+
+/**
+ * Handle requirement modal hiding event.
+ * Prevent hiding on unsaved changes by asking user feedback (discard, save, back to edit).
+ * @param event | the modal hiding event.
+ */
+function modal_closing_routine(event) {
+    const unsaved_changes = $('#requirement_modal').data('unsaved_changes');
+    if (unsaved_changes === true) {
+        const force_close = confirm("You have unsaved changes, do you really want to close?");
+        if (force_close !== true) {
+            event.preventDefault();
+        }
+    }
+}
+
+function load_requirement(row_idx) {
+    if (row_idx === -1) {
+        alert("Requirement not found.");
+        return
+    }
+
+    load_tags();
+
+    // Get row data
+    let data = $('#requirements_table').DataTable().row(row_idx).data();
+
+    // Prepare requirement Modal
+    let requirement_modal_content = $('.modal-content');
+
+    //$('#requirement_modal').modal('show');
+    Modal.getOrCreateInstance('#requirement_modal').show();
+
+    requirement_modal_content.LoadingOverlay('show');
+    $('#formalization_accordion').html('');
+
+    // Set available tags.
+    $('#requirement_tag_field').data('bs.tokenfield').$input.autocomplete({source: available_tags});
+
+    // Get the requirement data and set the modal.
+    $.get("api/req/get", {id: data['id'], row_idx: row_idx}, function (data) {
+        if (data.success === false) {
+            alert('Could Not load the Requirement: ' + data.errormsg);
+            return;
+        }
+        // Meta information
+        $('#requirement_id').val(data.id);
+        $('#modal_associated_row_index').val(row_idx);
+        available_vars = data.available_vars;
+        available_vars = available_vars.concat(data.additional_static_available_vars);
+        type_inference_errors = data.type_inference_errors;
+        update_fuse();
+
+        // Visible information
+        $('#requirement_modal_title').html(data.id + ': ' + data.type);
+        $('#description_textarea').text(data.desc).change();
+        $('#add_guess_description').text(data.desc).change();
+
+        // Parse the formalizations
+        $('#formalization_accordion').html(data.formalizations_html);
+
+        $('#requirement_scope').val(data.scope);
+        $('#requirement_pattern').val(data.pattern);
+
+        // remove all lines from the tag comment table
+        $('#tags_comments_table').find("tr:gt(0)").remove();
+        // set Tag field and comments in Table (table rows are created via event)
+        $('#requirement_tag_field').tokenfield('setTokens', data.tags)
+        $("#tags_comments_table tr:gt(0)").each(function () {
+            let tag = $(this).find("td:eq(0)").text();
+            $(this).find("textarea:eq(0)").val(data.tags_comments[tag]);
+        })
+
+        $('#requirement_status').val(data.status);
+        // Set csv_data
+        let csv_row_content = $('#csv_content_accordion');
+        csv_row_content.html('');
+
+        let csv_data = data.csv_data;
+        for (const key in csv_data) {
+            if (csv_data.hasOwnProperty(key)) {
+                const value = csv_data[key];
+                csv_row_content.append('<p><strong>' + key + ':</strong>' + value + '</p>');
+            }
+        }
+
+        // Set revision diff data.
+        let revision_diff_link = $('#show_revision_diff');
+        if ($.isEmptyObject(data.revision_diff)) {
+            revision_diff_link.hide();
+        } else {
+            revision_diff_link.show();
+        }
+
+        let revision_diff_content = $('#revision_diff_accordion');
+        revision_diff_content.html('');
+
+        let revision_diff = data.revision_diff;
+        for (const key in revision_diff) {
+            if (revision_diff.hasOwnProperty(key)) {
+                const value = revision_diff[key];
+                revision_diff_content.append('<p><strong>' + key + ':</strong><pre>' + value + '</pre></p>');
+            }
+        }
+
+        // Set used variables data.
+        let used_variables_accordion = $('#used_variables_accordion');
+        used_variables_accordion.html('');
+
+        data.vars.forEach(function (var_name) {
+            let query = '?command=search&col=1&q=%5C%22' + var_name + '%5C%22';
+            used_variables_accordion.append('<span class="badge bg-info">' + '<a href="./variables' + query + '" target="_blank">' + var_name + '</a>' + '</span>&numsp;');
+        });
+
+    }).done(function () {
+        update_vars();
+        bind_var_autocomplete();
+        update_formalization();
+        $('#requirement_modal').data({
+            'unsaved_changes': false, 'updated_formalization': false
+        });
+        requirement_modal_content.LoadingOverlay('hide', true);
+    });
+}
+
+/**
+ * Reload fuse the fuzzy search provider used for autocomplete.
+ * fuse will be reloaded with available_vars.
+ */
+function update_fuse() {
+    let options = {
+        shouldSort: true,
+        threshold: 0.6,
+        location: 0,
+        distance: 100,
+        maxPatternLength: 12,
+        minMatchCharLength: 1,
+        keys: undefined
+    };
+
+    fuse = new Fuse(available_vars, options);
+}
+
+/**
+ * Search term in the fuse fuzzy search provider.
+ * Fuse is initialized with the available_vars.
+ * @param term
+ */
+function fuzzy_search(term) {
+    return fuse.search(term);
+}
+
+/**
+ * Bind autocomplete trigger to all formalization input textareas.
+ *
+ */
+function bind_var_autocomplete() {
+    $(".reqirement-variable").each(function () {
+        add_var_autocomplete(this);
+    });
+}
+
+/**
+ * Adds the variable autocompletion to a textarea given by dom_obj.
+ * @param dom_obj
+ */
+function add_var_autocomplete(dom_obj) {
+    const textcomplete = new Textcomplete(new TextareaEditor(dom_obj), [{
+        match: /(|\s|[!=&\|>]+)(\w+)$/, index: 2, search: function (term, callback, match) {
+            let include_elems = fuzzy_search(term);
+            let result = [];
+            for (let i = 0; i < Math.min(10, include_elems.length); i++) {
+                result.push(available_vars[include_elems[i]]);
+            }
+            callback(result);
+        }, replace: function (result) {
+            return '$1' + result + ' ';
+        }
+    }], {
+        dropdown: {
+            className: 'dropdown-menu textcomplete-dropdown', maxCount: 10, style: {
+                display: 'none', position: 'absolute', zIndex: '9999'
+            }, // parent: dom_obj.parentNode, // Does not work in modal.
+            item: {
+                className: 'dropdown-item', activeClassName: 'dropdown-item active',
+            }
+        }
+    })
+
+    $(document).on('click', function (event) {
+        if (textcomplete !== event.target) {
+            textcomplete.hide()
+        }
+    })
+}
+
+function add_formalization() {
+    // Request a new Formalization. And add its edit elements to the modal.
+    let requirement_modal_content = $('.modal-content');
+    requirement_modal_content.LoadingOverlay('show');
+
+    const req_id = $('#requirement_id').val();
+    $.post("api/req/new_formalization", {
+        id: req_id
+    }, function (data) {
+        requirement_modal_content.LoadingOverlay('hide', true);
+        if (data['success'] === false) {
+            alert(data['errormsg']);
+        } else {
+            let formalization = $(data['html']);
+            formalization.find('.reqirement-variable').each(function () {
+                add_var_autocomplete(this);
+            });
+            formalization.appendTo('#formalization_accordion');
+        }
+    }).done(function () {
+        update_vars();
+        update_formalization();
+        update_logs();
+    });
+}
+
+function delete_formalization(formal_id, card) {
+    let requirement_modal_content = $('.modal-content');
+    requirement_modal_content.LoadingOverlay('show');
+    const req_id = $('#requirement_id').val();
+    $.post("api/req/del_formalization", {
+        requirement_id: req_id, formalization_id: formal_id
+    }, function (data) {
+        requirement_modal_content.LoadingOverlay('hide', true);
+        if (data['success'] === false) {
+            alert(data['errormsg']);
+        } else {
+            card.remove();
+        }
+    }).done(function () {
+        update_vars();
+        update_formalization();
+        update_logs();
+    });
+}
+
+/**
+ * Updates the formalization textarea based on the selected scope and expressions in P, Q, R, S, T, ... .
+ */
+function update_formalization() {
+    $('.formalization_card').each(function () {
+        // Fetch attributes
+        const formalization_id = $(this).attr('title');
+
+        let formalization = '';
+        let formalization_textarea = $('#current_formalization_textarea' + formalization_id);
+        const selected_scope = $('#requirement_scope' + formalization_id).find('option:selected').text().replace(/\s\s+/g, ' ');
+        const selected_pattern = $('#requirement_pattern' + formalization_id).find('option:selected').text().replace(/\s\s+/g, ' ');
+
+        if (selected_scope !== 'None' && selected_pattern !== 'None') {
+            formalization = selected_scope + ', ' + selected_pattern + '.';
+        }
+
+        // Update formalization with variables.
+        let var_p = $('#formalization_var_p' + formalization_id).val();
+        let var_q = $('#formalization_var_q' + formalization_id).val();
+        let var_r = $('#formalization_var_r' + formalization_id).val();
+        let var_s = $('#formalization_var_s' + formalization_id).val();
+        let var_t = $('#formalization_var_t' + formalization_id).val();
+        let var_u = $('#formalization_var_u' + formalization_id).val();
+        let var_v = $('#formalization_var_v' + formalization_id).val();
+
+        if (var_p.length > 0) {
+            formalization = formalization.replace(/{P}/g, parse_vars_to_link(var_p));
+        }
+        if (var_q.length > 0) {
+            formalization = formalization.replace(/{Q}/g, parse_vars_to_link(var_q));
+        }
+        if (var_r.length > 0) {
+            formalization = formalization.replace(/{R}/g, parse_vars_to_link(var_r));
+        }
+        if (var_s.length > 0) {
+            formalization = formalization.replace(/{S}/g, parse_vars_to_link(var_s));
+        }
+        if (var_t.length > 0) {
+            formalization = formalization.replace(/{T}/g, parse_vars_to_link(var_t));
+        }
+        if (var_u.length > 0) {
+            formalization = formalization.replace(/{U}/g, parse_vars_to_link(var_u));
+        }
+        if (var_v.length > 0) {
+            formalization = formalization.replace(/{V}/g, parse_vars_to_link(var_v));
+        }
+
+        formalization_textarea.html(formalization);
+        autosize.update(formalization_textarea);
+    });
+    $('#requirement_modal').data({
+        'unsaved_changes': true, 'updated_formalization': true
+    });
+}
+
+/**
+ * Replace variables in a formalization string by links to that variable.
+ * Only if variable is available in the global "available_vars" array.
+ * Example: foo || bar -> <a href ...>foo</a> || <a href ...>bar</a>
+ * @param formal_string
+ * @returns {string}
+ */
+function parse_vars_to_link(formal_string) {
+    let result = '';
+
+    // Split the formalization string on possible variable delimiters given by the boogie grammar.
+    // We enclose the regular expression by /()/g to yield the delimiters itself: We want to keep them in the result.
+    formal_string.split(/([\s&<>!()=:\[\]{}\-|+*,])/g).forEach(function (chunk) {
+        if (available_vars.includes(chunk)) {
+            let query = '?command=search&col=1&q=%5C%22' + chunk + '%5C%22';
+            result += '<a href="./variables' + query + '" target="_blank"' + '  title="Go to declaration of ' + chunk + '" class="alert-link">' + chunk + '</a>';
+        } else {
+            // We need to escape potential HTML special chars to prevent a broken display.
+            result += utils.escapeHtml(chunk);
+        }
+    });
+    return result;
+}
+
+/**
+ * Enable/disable the active variables (P, Q, R, ...) in the requirement modal based on scope and pattern.
+ */
+function update_vars() {
+    $('.requirement_var_group').each(function () {
+        $(this).hide();
+        $(this).removeClass('type-error');
+    });
+
+    $('.formalization_card').each(function () {
+        // Fetch attributes
+        const formalization_id = $(this).attr('title');
+        const selected_scope = $('#requirement_scope' + formalization_id).val();
+        const selected_pattern = $('#requirement_pattern' + formalization_id).val();
+        let header = $('#formalization_heading' + formalization_id);
+        let var_p = $('#requirement_var_group_p' + formalization_id);
+        let var_q = $('#requirement_var_group_q' + formalization_id);
+        let var_r = $('#requirement_var_group_r' + formalization_id);
+        let var_s = $('#requirement_var_group_s' + formalization_id);
+        let var_t = $('#requirement_var_group_t' + formalization_id);
+        let var_u = $('#requirement_var_group_u' + formalization_id);
+        let var_v = $('#requirement_var_group_v' + formalization_id);
+
+        // Set the red boxes for type inference failed expressions.
+        if (formalization_id in type_inference_errors) {
+            for (let i = 0; i < type_inference_errors[formalization_id].length; i++) {
+                $('#formalization_var_' + type_inference_errors[formalization_id][i] + formalization_id)
+                    .addClass('type-error');
+                header.addClass('type-error-head');
+            }
+        } else {
+            header.removeClass('type-error-head');
+        }
+
+        switch (selected_scope) {
+            case 'BEFORE':
+            case 'AFTER':
+                var_p.show();
+                break;
+            case 'BETWEEN':
+            case 'AFTER_UNTIL':
+                var_p.show();
+                var_q.show();
+                break;
+            default:
+                break;
+        }
+
+        Object.keys(_PATTERNS[selected_pattern]['env']).forEach(function (key) {
+            switch (key) {
+                case 'R':
+                    var_r.show();
+                    break;
+                case 'S':
+                    var_s.show();
+                    break;
+                case 'T':
+                    var_t.show();
+                    break;
+                case 'U':
+                    var_u.show();
+                    break;
+                case 'V':
+                    var_v.show();
+                    break;
+            }
+        });
+    });
+}
+
+function load_tags() {
+    $.ajax({
+        type: 'GET', url: 'api/tags/'
+    }).done(function (data) {
+        available_tags = []
+        for (let tag of data) {
+            available_tags.push(tag['name']);
+            tag_colors[tag['name']] = tag['color'];
+        }
+    }).fail(function (jqXHR, textStatus, errorThrown) {
+        alert(errorThrown + '\n\n' + jqXHR['responseText'])
+    })
+}
+
+function bind_tag_field_events() {
+    $("#requirement_tag_field")
+        .on('tokenfield:createtoken', function (e) {
+            let existingTokens = $(this).tokenfield('getTokens');
+            for (const token of existingTokens) {
+                if (e.attrs.value === token.value) return false;
+            }
+        })
+        .on('tokenfield:createdtoken', function (e) {
+            add_tag_table_row(e.attrs.value);
+        })
+        .on('tokenfield:removedtoken', function (e) {
+            $("#tags_comments_table tr:gt(0)").each(function () {
+                let row = $(this);
+                let tag = $(this).find("td:eq(0)").text();
+                if (tag === e.attrs.value) row.remove();
+            })
+        })
+}
+
+function add_tag_table_row(tag_name) {
+    //todo: we need to fill the fields with the actional comments (maybe name the fields and
+    // add comments later)
+    var table_row = "<tr>" + "<td>" + tag_name + "</td>" + "<td><textarea rows='1' class='form-control w-100' type='text'>" + "</textarea>" + "</td>";
+    $("#tags_comments_table tbody").append(table_row);
+}
+
+/**
+ * REPORT TAB / REPORT MODAL
+ * =====================================================================================================================
+ */
+function open_report_modal(source = false) {
+    let query_textarea = $('#report_query_textarea');
+    let results_textarea = $('#report_results_textarea');
+    let report_title = $('#report_modal_title');
+    let report_name = $('#report_name');
+    let queries = '';
+    let results = '';
+    let name = '';
+    let report_id = -1;
+    let report_modal = $('#report_modal');
+    if (source !== false) {
+        report_id = source.attr('data-id');
+        queries = available_reports[report_id].queries;
+        results = available_reports[report_id].results;
+        name = available_reports[report_id].name;
+    }
+    query_textarea.val(queries).change();
+    results_textarea.val(results).change();
+    report_name.val(name).change();
+    report_title.html(name);
+    $('#save_report').attr('data-id', report_id);
+
+    Modal.getOrCreateInstance(document.querySelector('#report_modal')).show()
+    //report_modal.modal('show');
+}
+
+function init_report_generation() {
+    $('#add-new-report').click(function () {
+        open_report_modal();
+    });
+    $('#eval_report').click(function () {
+        evaluate_report();
+    });
+    $('#save_report').click(function () {
+        save_report();
+    });
+    let av_reports = $('#available_reports');
+    av_reports.on('click', '.open-report', function () {
+        open_report_modal($(this));
+    });
+    av_reports.on('click', '.delete-report', function () {
+        delete_report($(this).attr('data-id'));
+    });
+    $('#report_name').change(function () {
+        $('#report_modal_title').html($(this).val());
+    });
+    load_reports();
+}
+
+function delete_report(id) {
+    $.ajax({
+        type: "DELETE", url: "api/report/delete", data: {report_id: id}, success: function (data) {
+            if (data['success'] === false) {
+                alert(data['errormsg']);
+            }
+            load_reports();
+        }
+    });
+}
+
+function save_report() {
+    let body = $('body');
+    body.LoadingOverlay('show');
+
+    $.post("api/report/set", {
+        report_querys: $('#report_query_textarea').val(),
+        report_results: $('#report_results_textarea').val(),
+        report_name: $('#report_name').val(),
+        report_id: $('#save_report').attr('data-id')
+    }, function (data) {
+        body.LoadingOverlay('hide', true);
+        if (data['success'] === false) {
+            alert(data['errormsg']);
+        }
+        load_reports();
+    });
+}
+
+function load_reports() {
+    $.get("api/report/get", {}, function (data) {
+        if (data['success'] === false) {
+            alert(data['errormsg']);
+        } else {
+            let result = '';
+            available_reports = data.data;
+            $.each(data.data, function (id, report) {
+                result += `<div class="card border-primary">
+                              <div class="card-body">
+                                <h5 class="card-title">${report.name}</h5>
+                                <h6 class="card-subtitle mb-2 text-muted">Query</h6>
+                                <p class="card-text report-results">${report.queries}</p>
+                                <h6 class="card-subtitle mb-2 text-muted">Matches for queries</h6>
+                                <p class="card-text report-results">${report.results}</p>
+                                <a href="#" class="card-link open-report" data-id="${id}">
+                                    Edit (reevaluate) Report.
+                                </a>
+                                <a href="#" class="card-link delete-report" data-id="${id}">Delete Report.</a>
+                              </div>
+                            </div>`;
+            });
+            $('#available_reports').html(result);
+        }
+    });
+}
+
+/**
+ * Evaluate the report queries given by the report_query_textarea.
+ * Paste the result into the report_results_textarea.
+ * The number of matching requirements of each query is counted by the server (with the filters of the table applied).
+ */
+function evaluate_report() {
+    let body = $('body');
+    body.LoadingOverlay('show');
+    const report_querys = $('#report_query_textarea').val().split('\n');
+    let reqTable = $('#requirements_table').DataTable();
+    const regex = /^(:NAME:)(`(\w+)`)(.*)/;
+    let names = [];
+    let requests = [];
+    $.each(report_querys, function (id, report_query) {
+        // Test if there is a named query.
+        let match = regex.exec(report_query);
+        if (match != null) {
+            report_query = match[4];
+            id = match[3];
+        }
+        names.push(id);
+        requests.push($.get('api/req/gets', Object.assign({}, reqTable.ajax.params(), {
+            search_query: report_query, start: 0, length: 0
+        })));
+    });
+    $.when.apply($, requests).done(function () {
+        // With a single request the arguments are the ones of that request, not one array per request.
+        let responses = requests.length === 1 ? [arguments] : arguments;
+        let results = '';
+        $.each(responses, function (index, response) {
+            results += `"${names[index]}":\t${response[0].recordsFiltered}\n`;
+        });
+        $('#report_results_textarea').val(results).change();
+    }).fail(function (jqXHR) {
+        alert(jqXHR.responseJSON ? jqXHR.responseJSON['errormsg'] : jqXHR.statusText);
+    }).always(function () {
+        body.LoadingOverlay('hide', true);
+    });
+}
+
+/**
+ * GUESS MODAL
+ * =====================================================================================================================
+ */
+
+/**
+ * Load available guesses into the modal.
+ */
+function fetch_available_guesses() {
+    let modal = $('#requirement_guess_modal');
+    let available_guesses_cards = $('#available_guesses_cards');
+    let modal_content = $('.modal-content');
+    let requirement_id = $('#requirement_id').val();
+
+    //modal.modal({
+    //    keyboard: false
+    //});
+    new Modal(modal, {keyboard: false});
+
+    //modal.modal('show');
+    Modal.getOrCreateInstance(modal).show();
+
+    modal_content.LoadingOverlay('show');
+    available_guesses_cards.html('');
+
+    function add_available_guess(guess) {
+        let template = '<div class="card">' + '                    <div class="pl-1 pr-1">' + '                        <p>' + guess['string'] + '                        </p>' + '                    </div>' + '                    <button type="button" class="btn btn-success btn-sm add_guess"' + '                            title="Add formalization"' + '                            data-scope="' + guess['scope'] + '"' + '                            data-pattern="' + guess['pattern'] + '"' + '                            data-mapping=\'' + JSON.stringify(guess['mapping']) + '\'>' + '                        <strong>+ Add this formalization +</strong>' + '                    </button>' + '                </div>';
+        available_guesses_cards.append(template);
+    }
+
+    $.post("api/req/get_available_guesses", {
+        requirement_id: requirement_id
+    }, function (data) {
+        if (data['success'] === false) {
+            alert(data['errormsg'])
+        } else {
+            for (let i = 0; i < data['available_guesses'].length; i++) {
+                add_available_guess(data['available_guesses'][i]);
+            }
+        }
+    }).done(function () {
+        $('.add_guess').click(function () {
+            add_formalization_from_guess($(this).data('scope'), $(this).data('pattern'), $(this).data('mapping'));
+        });
+        modal_content.LoadingOverlay('hide', true);
+    });
+}
+
+function add_formalization_from_guess(scope, pattern, mapping) {
+    // Request a new Formalization. And add its edit elements to the modal.
+    let requirement_modal_content = $('.modal-content');
+    requirement_modal_content.LoadingOverlay('show');
+
+    let requirement_id = $('#requirement_id').val();
+    $.post("api/req/add_formalization_from_guess", {
+        requirement_id: requirement_id, scope: scope, pattern: pattern, mapping: JSON.stringify(mapping)
+    }, function (data) {
+        requirement_modal_content.LoadingOverlay('hide', true);
+        if (data['success'] === false) {
+            alert(data['errormsg']);
+        } else {
+            $('#formalization_accordion').append(data['html']);
+        }
+    }).done(function () {
+        update_vars();
+        update_formalization();
+        bind_var_autocomplete();
+        update_logs();
+    });
+}
+
+
+},6714:function(module,exports,__webpack_require__){
+var $=__webpack_require__(9755);
+const {init_simulator_modal} = __webpack_require__(6107)
+
+function init_simulator_tab() {
+    const name_input = $('#simulator-tab-name-input')
+    const simulator_select = $('#simulator-tab-select')
+    const create_btn = $('#simulator-tab-create-btn')
+    const delete_btn = $('#simulator-tab-delete-btn')
+    const start_btn = $('#simulator-tab-start-btn')
+    const requirements_table = $('#requirements_table')
+
+    $.ajax({
+        type: 'GET', url: 'simulator', async: false, data: { // TODO: Allow async.
+            command: 'get_simulators'
+        }, success: function (response) {
+            if (response.success === false) {
+                alert(response.errormsg)
+                return
+            }
+
+            update_simulator_select(simulator_select, response.data)
+        }
+    })
+
+    create_btn.click(function () {
+        const progress_id = Date.now().toString(36) + Math.random().toString(36).substring(2)
+        const create_btn_text = create_btn.text()
+        create_btn.prop('disabled', true)
+
+        // Poll the progress of building the phase event automata while the simulator is created.
+        const progress_timer = setInterval(function () {
+            $.get('simulator', {command: 'get_progress', progress_id: progress_id}, function (response) {
+                if (response.success === true) {
+                    create_btn.text(`${create_btn_text} (${response.data.done}/${response.data.total})`)
+                }
+            })
+        }, 500)
+
+        $.ajax({
+            type: 'POST', url: 'simulator', data: {
+                command: 'create_simulator',
+                simulator_name: name_input.val() || 'unnamed',
+                requirement_ids: JSON.stringify(get_selected_requirement_ids(requirements_table)),
+                progress_id: progress_id
+            }, success: function (response) {
+                if (response.success === false) {
+                    alert(response.errormsg)
+                    return
+                }
+
+                update_simulator_select(simulator_select, response.data, true)
+            }, complete: function () {
+                clearInterval(progress_timer)
+                create_btn.text(create_btn_text)
+                create_btn.prop('disabled', false)
+            }
+        })
+    })
+
+    delete_btn.click(function () {
+        $.ajax({
+            type: 'DELETE', url: 'simulator', async: false, data: { // TODO: Allow async.
+                command: 'delete_simulator', simulator_id: simulator_select.val()
+            }, success: function (response) {
+                if (response.success === false) {
+                    alert(response.errormsg)
+                    return
+                }
+
+                update_simulator_select(simulator_select, response.data)
+            }
+        });
+    });
+
+    start_btn.click(function () {
+        $.ajax({
+            // TODO: Allow async.
+            type: 'GET', url: 'simulator', async: false, data: {
+                command: 'start_simulator', simulator_id: simulator_select.val()
+            }, success: function (response) {
+                if (response['success'] === false) {
+                    alert(response['errormsg'])
+                    return
+                }
+
+                init_simulator_modal(response.data)
+            }
+        })
+    })
+}
+
+function update_simulator_select(simulator_select, data, is_created = false) {
+    id = data.simulator_id
+    name = data.simulator_name
+
+    if (is_created) {
+        simulator_select.prepend($('<option></option>').val(id).text(name + ' (' + id + ')'))
+        simulator_select.prop('selectedIndex', 0)
+        return
+    }
+
+    simulator_select.empty()
+    $.each(data['simulators'], function (id, name) {
+        simulator_select.prepend($('<option></option>').val(id).text(name + ' (' + id + ')'))
+    })
+}
+
+// TODO: Use the function in requirements.js
+function get_selected_requirement_ids(requirements_table) {
+    let result = []
+
+    requirements_table.DataTable().rows({selected: true}).every(function () {
+        result.push(this.data()['id'])
+    })
+
+    return result
+}
+
+exports.init_simulator_tab = init_simulator_tab
+},2613:(e,t,n)=>{"use strict";Object.defineProperty(t,"__esModule",{value:!0}),t.Completer=void 0;const r=n(6729),i=n(9200);class o extends r.EventEmitter{constructor(e){super(),this.handleQueryResult=e=>{this.emit("hit",{searchResults:e})},this.strategies=e.map((e=>new i.Strategy(e)))}destroy(){return this.strategies.forEach((e=>e.destroy())),this}run(e){for(const t of this.strategies)if(t.execute(e,this.handleQueryResult))return;this.handleQueryResult([])}}t.Completer=o},8707:(e,t,n)=>{"use strict";Object.defineProperty(t,"__esModule",{value:!0}),t.Dropdown=t.DEFAULT_DROPDOWN_ITEM_ACTIVE_CLASS_NAME=t.DEFAULT_DROPDOWN_ITEM_CLASS_NAME=t.DEFAULT_DROPDOWN_CLASS_NAME=t.DEFAULT_DROPDOWN_PLACEMENT=t.DEFAULT_DROPDOWN_MAX_COUNT=void 0;const r=n(6729),i=n(5320);t.DEFAULT_DROPDOWN_MAX_COUNT=10,t.DEFAULT_DROPDOWN_PLACEMENT="auto",t.DEFAULT_DROPDOWN_CLASS_NAME="dropdown-menu textcomplete-dropdown",t.DEFAULT_DROPDOWN_ITEM_CLASS_NAME="textcomplete-item",t.DEFAULT_DROPDOWN_ITEM_ACTIVE_CLASS_NAME=`${t.DEFAULT_DROPDOWN_ITEM_CLASS_NAME} active`;class o extends r.EventEmitter{constructor(e,t){super(),this.el=e,this.option=t,this.shown=!1,this.items=[],this.activeIndex=null}static create(e){const n=document.createElement("ul");n.className=e.className||t.DEFAULT_DROPDOWN_CLASS_NAME,Object.assign(n.style,{display:"none",position:"absolute",zIndex:"1000"},e.style);const r=e.parent||document.body;return null==r||r.appendChild(n),new o(n,e)}render(e,n){const r=(0,i.createCustomEvent)("render",{cancelable:!0});return this.emit("render",r),r.defaultPrevented?this:(this.clear(),0===e.length?this.hide():(this.items=e.slice(0,this.option.maxCount||t.DEFAULT_DROPDOWN_MAX_COUNT).map(((e,t)=>{var n;return new a(this,t,e,(null===(n=this.option)||void 0===n?void 0:n.item)||{})})),this.setStrategyId(e[0]).renderEdge(e,"header").renderItems().renderEdge(e,"footer").show().setOffset(n).activate(0),this.emit("rendered",(0,i.createCustomEvent)("rendered")),this))}destroy(){var e;return this.clear(),null===(e=this.el.parentNode)||void 0===e||e.removeChild(this.el),this}select(e){const t={searchResult:e.searchResult},n=(0,i.createCustomEvent)("select",{cancelable:!0,detail:t});return this.emit("select",n),n.defaultPrevented||(this.hide(),this.emit("selected",(0,i.createCustomEvent)("selected",{detail:t}))),this}show(){if(!this.shown){const e=(0,i.createCustomEvent)("show",{cancelable:!0});if(this.emit("show",e),e.defaultPrevented)return this;this.el.style.display="block",this.shown=!0,this.emit("shown",(0,i.createCustomEvent)("shown"))}return this}hide(){if(this.shown){const e=(0,i.createCustomEvent)("hide",{cancelable:!0});if(this.emit("hide",e),e.defaultPrevented)return this;this.el.style.display="none",this.shown=!1,this.clear(),this.emit("hidden",(0,i.createCustomEvent)("hidden"))}return this}clear(){return this.items.forEach((e=>e.destroy())),this.items=[],this.el.innerHTML="",this.activeIndex=null,this}up(e){return this.shown?this.moveActiveItem("prev",e):this}down(e){return this.shown?this.moveActiveItem("next",e):this}moveActiveItem(e,t){if(null!=this.activeIndex){const n="next"===e?this.getNextActiveIndex():this.getPrevActiveIndex();null!=n&&(this.activate(n),t.preventDefault())}return this}activate(e){return this.activeIndex!==e&&(null!=this.activeIndex&&this.items[this.activeIndex].deactivate(),this.activeIndex=e,this.items[e].activate()),this}isShown(){return this.shown}getActiveItem(){return null!=this.activeIndex?this.items[this.activeIndex]:null}setOffset(e){const n=document.documentElement;if(n){const r=this.el.offsetWidth;if(e.left){const t=this.option.dynamicWidth?n.scrollWidth:n.clientWidth;e.left+r>t&&(e.left=t-r),this.el.style.left=`${e.left}px`}else e.right&&(e.right-r<0&&(e.right=0),this.el.style.right=`${e.right}px`);let i=!1;const o=this.option.placement||t.DEFAULT_DROPDOWN_PLACEMENT;if("auto"===o){const t=this.items.length*e.lineHeight;i=null!=e.clientTop&&e.clientTop+t>n.clientHeight}"top"===o||i?(this.el.style.bottom=`${n.clientHeight-e.top+e.lineHeight}px`,this.el.style.top="auto"):(this.el.style.top=`${e.top}px`,this.el.style.bottom="auto")}return this}getNextActiveIndex(){if(null==this.activeIndex)throw new Error;return this.activeIndex<this.items.length-1?this.activeIndex+1:this.option.rotate?0:null}getPrevActiveIndex(){if(null==this.activeIndex)throw new Error;return 0!==this.activeIndex?this.activeIndex-1:this.option.rotate?this.items.length-1:null}renderItems(){const e=document.createDocumentFragment();for(const t of this.items)e.appendChild(t.el);return this.el.appendChild(e),this}setStrategyId(e){const t=e.getStrategyId();return t&&(this.el.dataset.strategy=t),this}renderEdge(e,t){const n=this.option[t],r=document.createElement("li");return r.className=`textcomplete-${t}`,r.innerHTML="function"==typeof n?n(e.map((e=>e.data))):n||"",this.el.appendChild(r),this}}t.Dropdown=o;class a{constructor(e,n,r,i){this.dropdown=e,this.index=n,this.searchResult=r,this.props=i,this.active=!1,this.onClick=e=>{e.preventDefault(),this.dropdown.select(this)},this.className=this.props.className||t.DEFAULT_DROPDOWN_ITEM_CLASS_NAME,this.activeClassName=this.props.activeClassName||t.DEFAULT_DROPDOWN_ITEM_ACTIVE_CLASS_NAME;const o=document.createElement("li");o.className=this.active?this.activeClassName:this.className;const a=document.createElement("span");a.tabIndex=-1,a.innerHTML=this.searchResult.render(),o.appendChild(a),o.addEventListener("click",this.onClick),this.el=o}destroy(){var e;const t=this.el;return null===(e=t.parentNode)||void 0===e||e.removeChild(t),t.removeEventListener("click",this.onClick,!1),this}activate(){return this.active||(this.active=!0,this.el.className=this.activeClassName,this.dropdown.el.scrollTop=this.el.offsetTop),this}deactivate(){return this.active&&(this.active=!1,this.el.className=this.className),this}}},8685:(e,t,n)=>{"use strict";Object.defineProperty(t,"__esModule",{value:!0}),t.Editor=void 0;const r=n(6729),i=n(5320);class o extends r.EventEmitter{destroy(){return this}applySearchResult(e){throw new Error("Not implemented.")}getCursorOffset(){throw new Error("Not implemented.")}getBeforeCursor(){throw new Error("Not implemented.")}emitMoveEvent(e){const t=(0,i.createCustomEvent)("move",{cancelable:!0,detail:{code:e}});return this.emit("move",t),t}emitEnterEvent(){const e=(0,i.createCustomEvent)("enter",{cancelable:!0});return this.emit("enter",e),e}emitChangeEvent(){const e=(0,i.createCustomEvent)("change",{detail:{beforeCursor:this.getBeforeCursor()}});return this.emit("change",e),e}emitEscEvent(){const e=(0,i.createCustomEvent)("esc",{cancelable:!0});return this.emit("esc",e),e}getCode(e){return 9===e.keyCode||13===e.keyCode?"ENTER":27===e.keyCode?"ESC":38===e.keyCode?"UP":40===e.keyCode||78===e.keyCode&&e.ctrlKey?"DOWN":80===e.keyCode&&e.ctrlKey?"UP":"OTHER"}}t.Editor=o},6933:(e,t)=>{"use strict";Object.defineProperty(t,"__esModule",{value:!0}),t.SearchResult=void 0;const n=/\$&/g,r=/\$(\d)/g;t.SearchResult=class{constructor(e,t,n){this.data=e,this.term=t,this.strategy=n}getReplacementData(e){let t=this.strategy.replace(this.data);if(null==t)return null;let i="";Array.isArray(t)&&(i=t[1],t=t[0]);const o=this.strategy.match(e);if(null==o||null==o.index)return null;const a=t.replace(n,o[0]).replace(r,((e,t)=>o[parseInt(t)]));return{start:o.index,end:o.index+o[0].length,beforeCursor:a,afterCursor:i}}replace(e,t){const n=this.getReplacementData(e);if(null!==n)return t=n.afterCursor+t,[[e.slice(0,n.start),n.beforeCursor,e.slice(n.end)].join(""),t]}render(){return this.strategy.renderTemplate(this.data,this.term)}getStrategyId(){return this.strategy.getId()}}},9200:(e,t,n)=>{"use strict";Object.defineProperty(t,"__esModule",{value:!0}),t.Strategy=t.DEFAULT_INDEX=void 0;const r=n(6933);t.DEFAULT_INDEX=1,t.Strategy=class{constructor(e){this.props=e,this.cache={}}destroy(){return this.cache={},this}replace(e){return this.props.replace(e)}execute(e,n){var i;const o=this.matchWithContext(e);if(!o)return!1;const a=o[null!==(i=this.props.index)&&void 0!==i?i:t.DEFAULT_INDEX];return this.search(a,(e=>{n(e.map((e=>new r.SearchResult(e,a,this))))}),o),!0}renderTemplate(e,t){if(this.props.template)return this.props.template(e,t);if("string"==typeof e)return e;throw new Error(`Unexpected render data type: ${typeof e}. Please implement template parameter by yourself`)}getId(){return this.props.id||null}match(e){return"function"==typeof this.props.match?this.props.match(e):e.match(this.props.match)}search(e,t,n){this.props.cache?this.searchWithCach(e,t,n):this.props.search(e,t,n)}matchWithContext(e){const t=this.context(e);return!1===t?null:this.match(!0===t?e:t)}context(e){return!this.props.context||this.props.context(e)}searchWithCach(e,t,n){null!=this.cache[e]?t(this.cache[e]):this.props.search(e,(n=>{this.cache[e]=n,t(n)}),n)}}},409:(e,t,n)=>{"use strict";Object.defineProperty(t,"__esModule",{value:!0}),t.Textcomplete=void 0;const r=n(6729),i=n(8707),o=n(2613),a=["show","shown","render","rendered","selected","hidden","hide"];class s extends r.EventEmitter{constructor(e,t,n){super(),this.editor=e,this.isQueryInFlight=!1,this.nextPendingQuery=null,this.handleHit=({searchResults:e})=>{e.length?this.dropdown.render(e,this.editor.getCursorOffset()):this.dropdown.hide(),this.isQueryInFlight=!1,null!==this.nextPendingQuery&&this.trigger(this.nextPendingQuery)},this.handleMove=e=>{"UP"===e.detail.code?this.dropdown.up(e):this.dropdown.down(e)},this.handleEnter=e=>{const t=this.dropdown.getActiveItem();t?(this.dropdown.select(t),e.preventDefault()):this.dropdown.hide()},this.handleEsc=e=>{this.dropdown.isShown()&&(this.dropdown.hide(),e.preventDefault())},this.handleChange=e=>{null!=e.detail.beforeCursor?this.trigger(e.detail.beforeCursor):this.dropdown.hide()},this.handleSelect=e=>{this.emit("select",e),e.defaultPrevented||this.editor.applySearchResult(e.detail.searchResult)},this.handleResize=()=>{this.dropdown.isShown()&&this.dropdown.setOffset(this.editor.getCursorOffset())},this.completer=new o.Completer(t),this.dropdown=i.Dropdown.create((null==n?void 0:n.dropdown)||{}),this.startListening()}destroy(e=!0){return this.completer.destroy(),this.dropdown.destroy(),e&&this.editor.destroy(),this.stopListening(),this}isShown(){return this.dropdown.isShown()}hide(){return this.dropdown.hide(),this}trigger(e){return this.isQueryInFlight?this.nextPendingQuery=e:(this.isQueryInFlight=!0,this.nextPendingQuery=null,this.completer.run(e)),this}startListening(){var e;this.editor.on("move",this.handleMove).on("enter",this.handleEnter).on("esc",this.handleEsc).on("change",this.handleChange),this.dropdown.on("select",this.handleSelect);for(const e of a)this.dropdown.on(e,(t=>this.emit(e,t)));this.completer.on("hit",this.handleHit),null===(e=this.dropdown.el.ownerDocument.defaultView)||void 0===e||e.addEventListener("resize",this.handleResize)}stopListening(){var e;null===(e=this.dropdown.el.ownerDocument.defaultView)||void 0===e||e.removeEventListener("resize",this.handleResize),this.completer.removeAllListeners(),this.dropdown.removeAllListeners(),this.editor.removeListener("move",this.handleMove).removeListener("enter",this.handleEnter).removeListener("esc",this.handleEsc).removeListener("change",this.handleChange)}}t.Textcomplete=s},675:function(e,t,n){"use strict";var r=this&&this.__createBinding||(Object.create?function(e,t,n,r){void 0===r&&(r=n);var i=Object.getOwnPropertyDescriptor(t,n);i&&!("get"in i?!t.__esModule:i.writable||i.configurable)||(i={enumerable:!0,get:function(){return t[n]}}),Object.defineProperty(e,r,i)}:function(e,t,n,r){void 0===r&&(r=n),e[r]=t[n]}),i=this&&this.__exportStar||function(e,t){for(var n in e)"default"===n||Object.prototype.hasOwnProperty.call(t,n)||r(t,e,n)};Object.defineProperty(t,"__esModule",{value:!0}),i(n(2613),t),i(n(8707),t),i(n(8685),t),i(n(6933),t),i(n(9200),t),i(n(409),t),i(n(5320),t)},5320:(e,t)=>{"use strict";Object.defineProperty(t,"__esModule",{value:!0}),t.createCustomEvent=void 0;const n="undefined"!=typeof window&&!!window.CustomEvent;t.createCustomEvent=(e,t)=>{if(n)return new CustomEvent(e,t);const r=document.createEvent("CustomEvent");return r.initCustomEvent(e,!1,(null==t?void 0:t.cancelable)||!1,(null==t?void 0:t.detail)||void 0),r}},2828:function(e,t,n){"use strict";var r=this&&this.__importDefault||function(e){return e&&e.__esModule?e:{default:e}};Object.defineProperty(t,"__esModule",{value:!0}),t.TextareaEditor=void 0;const i=n(4366),o=r(n(6496)),a=n(675),s=n(4408);class l extends a.Editor{constructor(e){super(),this.el=e,this.onInput=()=>{this.emitChangeEvent()},this.onKeydown=e=>{const t=this.getCode(e);let n;"UP"===t||"DOWN"===t?n=this.emitMoveEvent(t):"ENTER"===t?n=this.emitEnterEvent():"ESC"===t&&(n=this.emitEscEvent()),n&&n.defaultPrevented&&e.preventDefault()},this.startListening()}destroy(){return super.destroy(),this.stopListening(),this}applySearchResult(e){const t=this.getBeforeCursor();if(null!=t){const n=e.replace(t,this.getAfterCursor());this.el.focus(),Array.isArray(n)&&((0,i.update)(this.el,n[0],n[1]),this.el&&this.el.dispatchEvent((0,a.createCustomEvent)("input")))}}getCursorOffset(){const e=(0,s.calculateElementOffset)(this.el),t=this.getElScroll(),n=this.getCursorPosition(),r=(0,s.getLineHeightPx)(this.el),i=e.top-t.top+n.top+r,o=e.left-t.left+n.left,a=this.el.getBoundingClientRect().top;return"rtl"!==this.el.dir?{top:i,left:o,lineHeight:r,clientTop:a}:{top:i,right:document.documentElement?document.documentElement.clientWidth-o:0,lineHeight:r,clientTop:a}}getBeforeCursor(){return this.el.selectionStart!==this.el.selectionEnd?null:this.el.value.substring(0,this.el.selectionEnd)}getAfterCursor(){return this.el.value.substring(this.el.selectionEnd)}getElScroll(){return{top:this.el.scrollTop,left:this.el.scrollLeft}}getCursorPosition(){return(0,o.default)(this.el,this.el.selectionEnd)}startListening(){this.el.addEventListener("input",this.onInput),this.el.addEventListener("keydown",this.onKeydown)}stopListening(){this.el.removeEventListener("input",this.onInput),this.el.removeEventListener("keydown",this.onKeydown)}}t.TextareaEditor=l},8207:(e,t,n)=>{"use strict";Object.defineProperty(t,"__esModule",{value:!0}),t.TextareaEditor=void 0;var r=n(2828);Object.defineProperty(t,"TextareaEditor",{enumerable:!0,get:function(){return r.TextareaEditor}})},3566:(e,t)=>{"use strict";Object.defineProperty(t,"__esModule",{value:!0}),t.calculateElementOffset=void 0,t.calculateElementOffset=e=>{const t=e.getBoundingClientRect(),n=e.ownerDocument;if(null==n)throw new Error("Given element does not belong to document");const{defaultView:r,documentElement:i}=n;if(null==r)throw new Error("Given element does not belong to window");const o={top:t.top+r.pageYOffset,left:t.left+r.pageXOffset};return i&&(o.top-=i.clientTop,o.left-=i.clientLeft),o}},1881:(e,t)=>{"use strict";Object.defineProperty(t,"__esModule",{value:!0}),t.getLineHeightPx=void 0;const n="0".charCodeAt(0),r="9".charCodeAt(0),i=e=>n<=e&&e<=r;t.getLineHeightPx=e=>{const t=getComputedStyle(e),n=t.lineHeight;if(i(n.charCodeAt(0))){const e=parseFloat(n);return i(n.charCodeAt(n.length-1))?e*parseFloat(t.fontSize):e}return o(e.nodeName,t)};const o=(e,t)=>{const n=document.body;if(!n)return 0;const r=document.createElement(e);r.innerHTML="&nbsp;",Object.assign(r.style,{fontSize:t.fontSize,fontFamily:t.fontFamily,padding:"0"}),n.appendChild(r),r instanceof HTMLTextAreaElement&&(r.rows=1);const i=r.offsetHeight;return n.removeChild(r),i}},4408:function(e,t,n){"use strict";var r=this&&this.__createBinding||(Object.create?function(e,t,n,r){void 0===r&&(r=n);var i=Object.getOwnPropertyDescriptor(t,n);i&&!("get"in i?!t.__esModule:i.writable||i.configurable)||(i={enumerable:!0,get:function(){return t[n]}}),Object.defineProperty(e,r,i)}:function(e,t,n,r){void 0===r&&(r=n),e[r]=t[n]}),i=this&&this.__exportStar||function(e,t){for(var n in e)"default"===n||Object.prototype.hasOwnProperty.call(t,n)||r(t,e,n)};Object.defineProperty(t,"__esModule",{value:!0}),i(n(3566),t),i(n(1881),t),i(n(7449),t)},7449:(e,t)=>{"use strict";Object.defineProperty(t,"__esModule",{value:!0}),t.isSafari=void 0,t.isSafari=()=>/^((?!chrome|android).)*safari/i.test(navigator.userAgent)},6729:e=>{"use strict";var t=Object.prototype.hasOwnProperty,n="~";function r(){}function i(e,t,n){this.fn=e,this.context=t,this.once=n||!1}function o(e,t,r,o,a){if("function"!=typeof r)throw new TypeError("The listener must be a function");var s=new i(r,o||e,a),l=n?n+t:t;return e._events[l]?e._events[l].fn?e._events[l]=[e._events[l],s]:e._events[l].push(s):(e._events[l]=s,e._eventsCount++),e}function a(e,t){0==--e._eventsCount?e._events=new r:delete e._events[t]}function s(){this._events=new r,this._eventsCount=0}Object.create&&(r.prototype=Object.create(null),(new r).__proto__||(n=!1)),s.prototype.eventNames=function(){var e,r,i=[];if(0===this._eventsCount)return i;for(r in e=this._events)t.call(e,r)&&i.push(n?r.slice(1):r);return Object.getOwnPropertySymbols?i.concat(Object.getOwnPropertySymbols(e)):i},s.prototype.listeners=function(e){var t=n?n+e:e,r=this._events[t];if(!r)return[];if(r.fn)return[r.fn];for(var i=0,o=r.length,a=new Array(o);i<o;i++)a[i]=r[i].fn;return a},s.prototype.listenerCount=function(e){var t=n?n+e:e,r=this._events[t];return r?r.fn?1:r.length:0},s.prototype.emit=function(e,t,r,i,o,a){var s=n?n+e:e;if(!this._events[s])return!1;var l,c,u=this._events[s],d=arguments.length;if(u.fn){switch(u.once&&this.removeListener(e,u.fn,void 0,!0),d){case 1:return u.fn.call(u.context),!0;case 2:return u.fn.call(u.context,t),!0;case 3:return u.fn.call(u.context,t,r),!0;case 4:return u.fn.call(u.context,t,r,i),!0;case 5:return u.fn.call(u.context,t,r,i,o),!0;case 6:return u.fn.call(u.context,t,r,i,o,a),!0}for(c=1,l=new Array(d-1);c<d;c++)l[c-1]=arguments[c];u.fn.apply(u.context,l)}else{var h,f=u.length;for(c=0;c<f;c++)switch(u[c].once&&this.removeListener(e,u[c].fn,void 0,!0),d){case 1:u[c].fn.call(u[c].context);break;case 2:u[c].fn.call(u[c].context,t);break;case 3:u[c].fn.call(u[c].context,t,r);break;case 4:u[c].fn.call(u[c].context,t,r,i);break;default:if(!l)for(h=1,l=new Array(d-1);h<d;h++)l[h-1]=arguments[h];u[c].fn.apply(u[c].context,l)}}return!0},s.prototype.on=function(e,t,n){return o(this,e,t,n,!1)},s.prototype.once=function(e,t,n){return o(this,e,t,n,!0)},s.prototype.removeListener=function(e,t,r,i){var o=n?n+e:e;if(!this._events[o])return this;if(!t)return a(this,o),this;var s=this._events[o];if(s.fn)s.fn!==t||i&&!s.once||r&&s.context!==r||a(this,o);else{for(var l=0,c=[],u=s.length;l<u;l++)(s[l].fn!==t||i&&!s[l].once||r&&s[l].context!==r)&&c.push(s[l]);c.length?this._events[o]=1===c.length?c[0]:c:a(this,o)}return this},s.prototype.removeAllListeners=function(e){var t;return e?(t=n?n+e:e,this._events[t]&&a(this,t)):(this._events=new r,this._eventsCount=0),this},s.prototype.off=s.prototype.removeListener,s.prototype.addListener=s.prototype.on,s.prefixed=n,s.EventEmitter=s,e.exports=s},4070:function(e){e.exports=function(e){var t={};function n(r){if(t[r])return t[r].exports;var i=t[r]={i:r,l:!1,exports:{}};return e[r].call(i.exports,i,i.exports,n),i.l=!0,i.exports}return n.m=e,n.c=t,n.d=function(e,t,r){n.o(e,t)||Object.defineProperty(e,t,{enumerable:!0,get:r})},n.r=function(e){"undefined"!=typeof Symbol&&Symbol.toStringTag&&Object.defineProperty(e,Symbol.toStringTag,{value:"Module"}),Object.defineProperty(e,"__esModule",{value:!0})},n.t=function(e,t){if(1&t&&(e=n(e)),8&t)return e;if(4&t&&"object"==typeof e&&e&&e.__esModule)return e;var r=Object.create(null);if(n.r(r),Object.defineProperty(r,"default",{enumerable:!0,value:e}),2&t&&"string"!=typeof e)for(var i in e)n.d(r,i,function(t){return e[t]}.bind(null,i));return r},n.n=function(e){var t=e&&e.__esModule?function(){return e.default}:function(){return e};return n.d(t,"a",t),t},n.o=function(e,t){return Object.prototype.hasOwnProperty.call(e,t)},n.p="",n(n.s=0)}([function(e,t,n){function r(e){return(r="function"==typeof Symbol&&"symbol"==typeof Symbol.iterator?function(e){return typeof e}:function(e){return e&&"function"==typeof Symbol&&e.constructor===Symbol&&e!==Symbol.prototype?"symbol":typeof e})(e)}function i(e,t){for(var n=0;n<t.length;n++){var r=t[n];r.enumerable=r.enumerable||!1,r.configurable=!0,"value"in r&&(r.writable=!0),Object.defineProperty(e,r.key,r)}}var o=n(1),a=n(7),s=a.get,l=(a.deepValue,a.isArray),c=function(){function e(t,n){var r=n.location,i=void 0===r?0:r,o=n.distance,a=void 0===o?100:o,l=n.threshold,c=void 0===l?.6:l,u=n.maxPatternLength,d=void 0===u?32:u,h=n.caseSensitive,f=void 0!==h&&h,p=n.tokenSeparator,m=void 0===p?/ +/g:p,v=n.findAllMatches,g=void 0!==v&&v,_=n.minMatchCharLength,y=void 0===_?1:_,b=n.id,w=void 0===b?null:b,x=n.keys,E=void 0===x?[]:x,C=n.shouldSort,O=void 0===C||C,S=n.getFn,k=void 0===S?s:S,L=n.sortFn,T=void 0===L?function(e,t){return e.score-t.score}:L,A=n.tokenize,M=void 0!==A&&A,N=n.matchAllTokens,q=void 0!==N&&N,I=n.includeMatches,D=void 0!==I&&I,P=n.includeScore,j=void 0!==P&&P,R=n.verbose,z=void 0!==R&&R;!function(e,t){if(!(e instanceof t))throw new TypeError("Cannot call a class as a function")}(this,e),this.options={location:i,distance:a,threshold:c,maxPatternLength:d,isCaseSensitive:f,tokenSeparator:m,findAllMatches:g,minMatchCharLength:y,id:w,keys:E,includeMatches:D,includeScore:j,shouldSort:O,getFn:k,sortFn:T,verbose:z,tokenize:M,matchAllTokens:q},this.setCollection(t),this._processKeys(E)}var t,n;return t=e,(n=[{key:"setCollection",value:function(e){return this.list=e,e}},{key:"_processKeys",value:function(e){if(this._keyWeights={},this._keyNames=[],e.length&&"string"==typeof e[0])for(var t=0,n=e.length;t<n;t+=1){var r=e[t];this._keyWeights[r]=1,this._keyNames.push(r)}else{for(var i=null,o=null,a=0,s=0,l=e.length;s<l;s+=1){var c=e[s];if(!c.hasOwnProperty("name"))throw new Error('Missing "name" property in key object');var u=c.name;if(this._keyNames.push(u),!c.hasOwnProperty("weight"))throw new Error('Missing "weight" property in key object');var d=c.weight;if(d<0||d>1)throw new Error('"weight" property in key must bein the range of [0, 1)');o=null==o?d:Math.max(o,d),i=null==i?d:Math.min(i,d),this._keyWeights[u]=d,a+=d}if(a>1)throw new Error("Total of weights cannot exceed 1")}}},{key:"search",value:function(e){var t=arguments.length>1&&void 0!==arguments[1]?arguments[1]:{limit:!1};this._log('---------\nSearch pattern: "'.concat(e,'"'));var n=this._prepareSearchers(e),r=n.tokenSearchers,i=n.fullSearcher,o=this._search(r,i);return this._computeScore(o),this.options.shouldSort&&this._sort(o),t.limit&&"number"==typeof t.limit&&(o=o.slice(0,t.limit)),this._format(o)}},{key:"_prepareSearchers",value:function(){var e=arguments.length>0&&void 0!==arguments[0]?arguments[0]:"",t=[];if(this.options.tokenize)for(var n=e.split(this.options.tokenSeparator),r=0,i=n.length;r<i;r+=1)t.push(new o(n[r],this.options));return{tokenSearchers:t,fullSearcher:new o(e,this.options)}}},{key:"_search",value:function(){var e=arguments.length>0&&void 0!==arguments[0]?arguments[0]:[],t=arguments.length>1?arguments[1]:void 0,n=this.list,r={},i=[];if("string"==typeof n[0]){for(var o=0,a=n.length;o<a;o+=1)this._analyze({key:"",value:n[o],record:o,index:o},{resultMap:r,results:i,tokenSearchers:e,fullSearcher:t});return i}for(var s=0,l=n.length;s<l;s+=1)for(var c=n[s],u=0,d=this._keyNames.length;u<d;u+=1){var h=this._keyNames[u];this._analyze({key:h,value:this.options.getFn(c,h),record:c,index:s},{resultMap:r,results:i,tokenSearchers:e,fullSearcher:t})}return i}},{key:"_analyze",value:function(e,t){var n=this,r=e.key,i=e.arrayIndex,o=void 0===i?-1:i,a=e.value,s=e.record,c=e.index,u=t.tokenSearchers,d=void 0===u?[]:u,h=t.fullSearcher,f=t.resultMap,p=void 0===f?{}:f,m=t.results,v=void 0===m?[]:m;!function e(t,i,o,a){if(null!=i)if("string"==typeof i){var s=!1,c=-1,u=0;n._log("\nKey: ".concat(""===r?"--":r));var f=h.search(i);if(n._log('Full text: "'.concat(i,'", score: ').concat(f.score)),n.options.tokenize){for(var m=i.split(n.options.tokenSeparator),g=m.length,_=[],y=0,b=d.length;y<b;y+=1){var w=d[y];n._log('\nPattern: "'.concat(w.pattern,'"'));for(var x=!1,E=0;E<g;E+=1){var C=m[E],O=w.search(C),S={};O.isMatch?(S[C]=O.score,s=!0,x=!0,_.push(O.score)):(S[C]=1,n.options.matchAllTokens||_.push(1)),n._log('Token: "'.concat(C,'", score: ').concat(S[C]))}x&&(u+=1)}c=_[0];for(var k=_.length,L=1;L<k;L+=1)c+=_[L];c/=k,n._log("Token score average:",c)}var T=f.score;c>-1&&(T=(T+c)/2),n._log("Score average:",T);var A=!n.options.tokenize||!n.options.matchAllTokens||u>=d.length;if(n._log("\nCheck Matches: ".concat(A)),(s||f.isMatch)&&A){var M={key:r,arrayIndex:t,value:i,score:T};n.options.includeMatches&&(M.matchedIndices=f.matchedIndices);var N=p[a];N?N.output.push(M):(p[a]={item:o,output:[M]},v.push(p[a]))}}else if(l(i))for(var q=0,I=i.length;q<I;q+=1)e(q,i[q],o,a)}(o,a,s,c)}},{key:"_computeScore",value:function(e){this._log("\n\nComputing score:\n");for(var t=this._keyWeights,n=!!Object.keys(t).length,r=0,i=e.length;r<i;r+=1){for(var o=e[r],a=o.output,s=a.length,l=1,c=0;c<s;c+=1){var u=a[c],d=u.key,h=n?t[d]:1,f=0===u.score&&t&&t[d]>0?Number.EPSILON:u.score;l*=Math.pow(f,h)}o.score=l,this._log(o)}}},{key:"_sort",value:function(e){this._log("\n\nSorting...."),e.sort(this.options.sortFn)}},{key:"_format",value:function(e){var t=[];if(this.options.verbose){var n=[];this._log("\n\nOutput:\n\n",JSON.stringify(e,(function(e,t){if("object"===r(t)&&null!==t){if(-1!==n.indexOf(t))return;n.push(t)}return t}),2)),n=null}var i=[];this.options.includeMatches&&i.push((function(e,t){var n=e.output;t.matches=[];for(var r=0,i=n.length;r<i;r+=1){var o=n[r];if(0!==o.matchedIndices.length){var a={indices:o.matchedIndices,value:o.value};o.key&&(a.key=o.key),o.hasOwnProperty("arrayIndex")&&o.arrayIndex>-1&&(a.arrayIndex=o.arrayIndex),t.matches.push(a)}}})),this.options.includeScore&&i.push((function(e,t){t.score=e.score}));for(var o=0,a=e.length;o<a;o+=1){var s=e[o];if(this.options.id&&(s.item=this.options.getFn(s.item,this.options.id)[0]),i.length){for(var l={item:s.item},c=0,u=i.length;c<u;c+=1)i[c](s,l);t.push(l)}else t.push(s.item)}return t}},{key:"_log",value:function(){var e;this.options.verbose&&(e=console).log.apply(e,arguments)}}])&&i(t.prototype,n),e}();e.exports=c},function(e,t,n){function r(e,t){for(var n=0;n<t.length;n++){var r=t[n];r.enumerable=r.enumerable||!1,r.configurable=!0,"value"in r&&(r.writable=!0),Object.defineProperty(e,r.key,r)}}var i=n(2),o=n(3),a=n(6),s=function(){function e(t,n){var r=n.location,i=void 0===r?0:r,o=n.distance,s=void 0===o?100:o,l=n.threshold,c=void 0===l?.6:l,u=n.maxPatternLength,d=void 0===u?32:u,h=n.isCaseSensitive,f=void 0!==h&&h,p=n.tokenSeparator,m=void 0===p?/ +/g:p,v=n.findAllMatches,g=void 0!==v&&v,_=n.minMatchCharLength,y=void 0===_?1:_,b=n.includeMatches,w=void 0!==b&&b;!function(e,t){if(!(e instanceof t))throw new TypeError("Cannot call a class as a function")}(this,e),this.options={location:i,distance:s,threshold:c,maxPatternLength:d,isCaseSensitive:f,tokenSeparator:m,findAllMatches:g,includeMatches:w,minMatchCharLength:y},this.pattern=f?t:t.toLowerCase(),this.pattern.length<=d&&(this.patternAlphabet=a(this.pattern))}var t,n;return t=e,(n=[{key:"search",value:function(e){var t=this.options,n=t.isCaseSensitive,r=t.includeMatches;if(n||(e=e.toLowerCase()),this.pattern===e){var a={isMatch:!0,score:0};return r&&(a.matchedIndices=[[0,e.length-1]]),a}var s=this.options,l=s.maxPatternLength,c=s.tokenSeparator;if(this.pattern.length>l)return i(e,this.pattern,c);var u=this.options,d=u.location,h=u.distance,f=u.threshold,p=u.findAllMatches,m=u.minMatchCharLength;return o(e,this.pattern,this.patternAlphabet,{location:d,distance:h,threshold:f,findAllMatches:p,minMatchCharLength:m,includeMatches:r})}}])&&r(t.prototype,n),e}();e.exports=s},function(e,t){var n=/[\-\[\]\/\{\}\(\)\*\+\?\.\\\^\$\|]/g;e.exports=function(e,t){var r=arguments.length>2&&void 0!==arguments[2]?arguments[2]:/ +/g,i=new RegExp(t.replace(n,"\\$&").replace(r,"|")),o=e.match(i),a=!!o,s=[];if(a)for(var l=0,c=o.length;l<c;l+=1){var u=o[l];s.push([e.indexOf(u),u.length-1])}return{score:a?.5:1,isMatch:a,matchedIndices:s}}},function(e,t,n){var r=n(4),i=n(5);e.exports=function(e,t,n,o){for(var a=o.location,s=void 0===a?0:a,l=o.distance,c=void 0===l?100:l,u=o.threshold,d=void 0===u?.6:u,h=o.findAllMatches,f=void 0!==h&&h,p=o.minMatchCharLength,m=void 0===p?1:p,v=o.includeMatches,g=void 0!==v&&v,_=s,y=e.length,b=d,w=e.indexOf(t,_),x=t.length,E=[],C=0;C<y;C+=1)E[C]=0;if(-1!==w){var O=r(t,{errors:0,currentLocation:w,expectedLocation:_,distance:c});if(b=Math.min(O,b),-1!==(w=e.lastIndexOf(t,_+x))){var S=r(t,{errors:0,currentLocation:w,expectedLocation:_,distance:c});b=Math.min(S,b)}}w=-1;for(var k=[],L=1,T=x+y,A=1<<(x<=31?x-1:30),M=0;M<x;M+=1){for(var N=0,q=T;N<q;)r(t,{errors:M,currentLocation:_+q,expectedLocation:_,distance:c})<=b?N=q:T=q,q=Math.floor((T-N)/2+N);T=q;var I=Math.max(1,_-q+1),D=f?y:Math.min(_+q,y)+x,P=Array(D+2);P[D+1]=(1<<M)-1;for(var j=D;j>=I;j-=1){var R=j-1,z=n[e.charAt(R)];if(z&&(E[R]=1),P[j]=(P[j+1]<<1|1)&z,0!==M&&(P[j]|=(k[j+1]|k[j])<<1|1|k[j+1]),P[j]&A&&(L=r(t,{errors:M,currentLocation:R,expectedLocation:_,distance:c}))<=b){if(b=L,(w=R)<=_)break;I=Math.max(1,2*_-w)}}if(r(t,{errors:M+1,currentLocation:_,expectedLocation:_,distance:c})>b)break;k=P}var F={isMatch:w>=0,score:0===L?.001:L};return g&&(F.matchedIndices=i(E,m)),F}},function(e,t){e.exports=function(e,t){var n=t.errors,r=void 0===n?0:n,i=t.currentLocation,o=void 0===i?0:i,a=t.expectedLocation,s=void 0===a?0:a,l=t.distance,c=void 0===l?100:l,u=r/e.length,d=Math.abs(s-o);return c?u+d/c:d?1:u}},function(e,t){e.exports=function(){for(var e=arguments.length>0&&void 0!==arguments[0]?arguments[0]:[],t=arguments.length>1&&void 0!==arguments[1]?arguments[1]:1,n=[],r=-1,i=-1,o=0,a=e.length;o<a;o+=1){var s=e[o];s&&-1===r?r=o:s||-1===r||((i=o-1)-r+1>=t&&n.push([r,i]),r=-1)}return e[o-1]&&o-r>=t&&n.push([r,o-1]),n}},function(e,t){e.exports=function(e){for(var t={},n=e.length,r=0;r<n;r+=1)t[e.charAt(r)]=0;for(var i=0;i<n;i+=1)t[e.charAt(i)]|=1<<n-i-1;return t}},function(e,t){var n=function(e){return Array.isArray?Array.isArray(e):"[object Array]"===Object.prototype.toString.call(e)},r=function(e){return null==e?"":function(e){if("string"==typeof e)return e;var t=e+"";return"0"==t&&1/e==-1/0?"-0":t}(e)},i=function(e){return"string"==typeof e},o=function(e){return"number"==typeof e};e.exports={get:function(e,t){var a=[];return function e(t,s){if(s){var l=s.indexOf("."),c=s,u=null;-1!==l&&(c=s.slice(0,l),u=s.slice(l+1));var d=t[c];if(null!=d)if(u||!i(d)&&!o(d))if(n(d))for(var h=0,f=d.length;h<f;h+=1)e(d[h],u);else u&&e(d,u);else a.push(r(d))}else a.push(t)}(e,t),a},isArray:n,isString:i,isNum:o,toString:r}}])},6496:e=>{!function(){var t=["direction","boxSizing","width","height","overflowX","overflowY","borderTopWidth","borderRightWidth","borderBottomWidth","borderLeftWidth","borderStyle","paddingTop","paddingRight","paddingBottom","paddingLeft","fontStyle","fontVariant","fontWeight","fontStretch","fontSize","fontSizeAdjust","lineHeight","fontFamily","textAlign","textTransform","textIndent","textDecoration","letterSpacing","wordSpacing","tabSize","MozTabSize"],n="undefined"!=typeof window,r=n&&null!=window.mozInnerScreenX;function i(e,i,o){if(!n)throw new Error("textarea-caret-position#getCaretCoordinates should only be called in a browser");var a=o&&o.debug||!1;if(a){var s=document.querySelector("#input-textarea-caret-position-mirror-div");s&&s.parentNode.removeChild(s)}var l=document.createElement("div");l.id="input-textarea-caret-position-mirror-div",document.body.appendChild(l);var c=l.style,u=window.getComputedStyle?window.getComputedStyle(e):e.currentStyle,d="INPUT"===e.nodeName;c.whiteSpace="pre-wrap",d||(c.wordWrap="break-word"),c.position="absolute",a||(c.visibility="hidden"),t.forEach((function(e){d&&"lineHeight"===e?c.lineHeight=u.height:c[e]=u[e]})),r?e.scrollHeight>parseInt(u.height)&&(c.overflowY="scroll"):c.overflow="hidden",l.textContent=e.value.substring(0,i),d&&(l.textContent=l.textContent.replace(/\s/g," "));var h=document.createElement("span");h.textContent=e.value.substring(i)||".",l.appendChild(h);var f={top:h.offsetTop+parseInt(u.borderTopWidth),left:h.offsetLeft+parseInt(u.borderLeftWidth),height:parseInt(u.lineHeight)};return a?h.style.backgroundColor="#aaa":document.body.removeChild(l),f}void 0!==e.exports?e.exports=i:n&&(window.getCaretCoordinates=i)}()},4523:function(module,exports,__webpack_require__){
+var $=__webpack_require__(9755);
+let utils = __webpack_require__(5759);
+
+function init_ultimate_tab() {
+    check_ultimate_version();
+    update_configurations();
+
+    $('#ultimate-tab-create-unfiltered-btn').click(function () {
+        let btn = $('#ultimate-tab-create-unfiltered-btn')
+        create_ultimate_analysis(btn, "all");
+    });
+
+
+}
+
+function init_ultimate_requirements_table_connection(requirements_table) {
+    $('#ultimate-tab-create-filtered-btn').click(function () {
+        utils.fetch_filtered_requirement_ids(requirements_table, function (req_ids) {
+            let btn = $('#ultimate-tab-create-filtered-btn')
+            create_ultimate_analysis(btn, req_ids);
+        });
+    });
+
+    $('#ultimate-tab-create-selected-btn').click(function () {
+        let req_ids = [];
+        requirements_table.rows({selected: true}).every(function () {
+            let d = this.data();
+            req_ids.push(d['id']);
+        });
+
+        let btn = $('#ultimate-tab-create-selected-btn')
+        create_ultimate_analysis(btn, req_ids);
+    });
+}
+
+function check_ultimate_version() {
+    $.ajax({
+        type: 'GET',
+        url: '../api/ultimate/version'
+    }).done(function (data) {
+        if (data['version'] !== '') {
+            let img = $('#ultimate-tab-ultimate-status-img')
+            let img_src = img.attr("src");
+            img.attr("src", img_src.replace('/disconnected.svg', '/connected.svg'));
+            img.attr('title', 'Ultimate Api connected: ' + data['version'])
+            $('#ultimate-tab-create-unfiltered-btn').prop("disabled",false);
+            $('#ultimate-tab-create-filtered-btn').prop("disabled",false);
+            $('#ultimate-tab-create-selected-btn').prop("disabled",false);
+        } else {
+            console.log('no ultimate connection found!');
+        }
+    }).fail(function (jqXHR, textStatus, errorThrown) {
+        alert(errorThrown + '\n\n' + jqXHR['responseText']);
+    });
+}
+
+function update_configurations() {
+    $.ajax({
+        type: 'GET',
+        url: '../api/ultimate/configurations'
+    }).done(function (data) {
+        let select = $('#ultimate-tab-configuration-select');
+        select.empty();
+        let configurations = Object.keys(data);
+        for (let i = 0; i < configurations.length; i++) {
+            let displayed_name = configurations[i];
+            displayed_name += ' (Toolchain: ' + data[configurations[i]]['toolchain'];
+            displayed_name += ', User Settings: ' + data[configurations[i]]['user_settings'] + ')';
+            select.append($('<option></option>').val(configurations[i]).text(displayed_name));
+        }
+    }).fail(function (jqXHR, textStatus, errorThrown) {
+        alert(errorThrown + '\n\n' + jqXHR['responseText']);
+    });
+}
+
+function create_ultimate_analysis(btn, req_ids) {
+    let old_text = btn.text()
+    btn.text("Processing Request")
+    $.ajax({
+        type: 'POST',
+        url: '../api/tools/req_file',
+        data: {'selected_requirement_ids': JSON.stringify(req_ids)}
+    }).done(function (data) {
+        let select = $('#ultimate-tab-configuration-select');
+        let configuration = select.val();
+        $.ajax({
+            type: 'POST',
+            url: '../api/ultimate/job',
+            data: JSON.stringify({"configuration": configuration,
+                   "req_file": data,
+                   "req_ids": req_ids})
+        }).done(function (data) {
+            console.log(data['requestId'])
+            // TODO inform user about new analysis
+            btn.text(old_text);
+        }).fail(function (jqXHR, textStatus, errorThrown) {
+            alert(errorThrown + '\n\n' + jqXHR['responseText']);
+        })
+    }).fail(function (jqXHR, textStatus, errorThrown) {
+        alert(errorThrown + '\n\n' + jqXHR['responseText']);
+    });
+}
+
+module.exports.init_ultimate_tab = init_ultimate_tab
+module.exports.init_ultimate_requirements_table_connection = init_ultimate_requirements_table_connection
+},4148:(e,t,n)=>{"use strict";n.r(t),n.d(t,{default:()=>i}),n(9755);var r=n(5700);n(3142);const i=r.default},4366:(e,t,n)=>{"use strict";function r(e,t,n){const r=e.value,i=t+(n||""),o=document.activeElement;let a=0,s=0;for(;a<r.length&&a<i.length&&r[a]===i[a];)a++;for(;r.length-s-1>=0&&i.length-s-1>=0&&r[r.length-s-1]===i[i.length-s-1];)s++;a=Math.min(a,Math.min(r.length,i.length)-s),e.setSelectionRange(a,r.length-s);const l=i.substring(a,i.length-s);if(e.focus(),!document.execCommand("insertText",!1,l)){e.value=i;const t=document.createEvent("Event");t.initEvent("input",!0,!0),e.dispatchEvent(t)}return e.setSelectionRange(t.length,t.length),o.focus(),e}function i(e,t,n){const i=e.selectionEnd,o=e.value.substr(0,e.selectionStart)+t,a=e.value.substring(e.selectionStart,i)+(n||"")+e.value.substr(i);return r(e,o,a),e.selectionEnd=i+t.length,e}n.r(t),n.d(t,{update:()=>r,wrapCursor:()=>i})}},n={};function r(e){var i=n[e];if(void 0!==i)return i.exports;var o=n[e]={id:e,exports:{}};return t[e].call(o.exports,o,o.exports,r),o.exports}r.m=t,e=[],r.O=(t,n,i,o)=>{if(!n){var a=1/0;for(u=0;u<e.length;u++){for(var[n,i,o]=e[u],s=!0,l=0;l<n.length;l++)(!1&o||a>=o)&&Object.keys(r.O).every((e=>r.O[e](n[l])))?n.splice(l--,1):(s=!1,o<a&&(a=o));if(s){e.splice(u--,1);var c=i();void 0!==c&&(t=c)}}return t}o=o||0;for(var u=e.length;u>0&&e[u-1][2]>o;u--)e[u]=e[u-1];e[u]=[n,i,o]},r.n=e=>{var t=e&&e.__esModule?()=>e.default:()=>e;return r.d(t,{a:t}),t},r.d=(e,t)=>{for(var n in t)r.o(t,n)&&!r.o(e,n)&&Object.defineProperty(e,n,{enumerable:!0,get:t[n]})},r.o=(e,t)=>Object.prototype.hasOwnProperty.call(e,t),r.r=e=>{"undefined"!=typeof Symbol&&Symbol.toStringTag&&Object.defineProperty(e,Symbol.toStringTag,{value:"Module"}),Object.defineProperty(e,"__esModule",{value:!0})},r.j=441,(()=>{var e={441:0,660:0,396:0};r.O.j=t=>0===e[t];var t=(t,n)=>{var i,o,[a,s,l]=n,c=0;if(a.some((t=>0!==e[t]))){for(i in s)r.o(s,i)&&(r.m[i]=s[i]);if(l)var u=l(r)}for(t&&t(n);c<a.length;c++)o=a[c],r.o(e,o)&&e[o]&&e[o][0](),e[o]=0;return r.O(u)},n=self.webpackChunkhanfor=self.webpackChunkhanfor||[];n.forEach(t.bind(null,0)),n.push=t.bind(null,n.push.bind(n))})(),r.nc=void 0;var i=r.O(void 0,[351],(()=>r(9925)));i=r.O(i)})();
\ No newline at end of file
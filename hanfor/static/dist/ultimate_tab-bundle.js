@@ -1 +1 @@
-(()=>{var e,r={4523:(e,r,o)=>{o(9755)}},o={};function n(e){var t=o[e];if(void 0!==t)return t.exports;var a=o[e]={id:e,exports:{}};return r[e].call(a.exports,a,a.exports,n),a.exports}n.m=r,e=[],n.O=(r,o,t,a)=>{if(!o){var l=1/0;for(u=0;u<e.length;u++){for(var[o,t,a]=e[u],i=!0,f=0;f<o.length;f++)(!1&a||l>=a)&&Object.keys(n.O).every((e=>n.O[e](o[f])))?o.splice(f--,1):(i=!1,a<l&&(l=a));if(i){e.splice(u--,1);var v=t();void 0!==v&&(r=v)}}return r}a=a||0;for(var u=e.length;u>0&&e[u-1][2]>a;u--)e[u]=e[u-1];e[u]=[o,t,a]},n.n=e=>{var r=e&&e.__esModule?()=>e.default:()=>e;return n.d(r,{a:r}),r},n.d=(e,r)=>{for(var o in r)n.o(r,o)&&!n.o(e,o)&&Object.defineProperty(e,o,{enumerable:!0,get:r[o]})},n.o=(e,r)=>Object.prototype.hasOwnProperty.call(e,r),n.r=e=>{"undefined"!=typeof Symbol&&Symbol.toStringTag&&Object.defineProperty(e,Symbol.toStringTag,{value:"Module"}),Object.defineProperty(e,"__esModule",{value:!0})},n.j=396,(()=>{var e={396:0};n.O.j=r=>0===e[r];var r=(r,o)=>{var t,a,[l,i,f]=o,v=0;if(l.some((r=>0!==e[r]))){for(t in i)n.o(i,t)&&(n.m[t]=i[t]);if(f)var u=f(n)}for(r&&r(o);v<l.length;v++)a=l[v],n.o(e,a)&&e[a]&&e[a][0](),e[a]=0;return n.O(u)},o=self.webpackChunkhanfor=self.webpackChunkhanfor||[];o.forEach(r.bind(null,0)),o.push=r.bind(null,o.push.bind(o))})(),n.nc=void 0;var t=n.O(void 0,[351],(()=>n(4523)));t=n.O(t)})();
\ No newline at end of file
+(()=>{var e,r={4523:(e,r,o)=>{o(9755),o(5759)}},o={};function n(e){var t=o[e];if(void 0!==t)return t.exports;var a=o[e]={id:e,exports:{}};return r[e].call(a.exports,a,a.exports,n),a.exports}n.m=r,e=[],n.O=(r,o,t,a)=>{if(!o){var l=1/0;for(u=0;u<e.length;u++){for(var[o,t,a]=e[u],i=!0,f=0;f<o.length;f++)(!1&a||l>=a)&&Object.keys(n.O).every((e=>n.O[e](o[f])))?o.splice(f--,1):(i=!1,a<l&&(l=a));if(i){e.splice(u--,1);var v=t();void 0!==v&&(r=v)}}return r}a=a||0;for(var u=e.length;u>0&&e[u-1][2]>a;u--)e[u]=e[u-1];e[u]=[o,t,a]},n.n=e=>{var r=e&&e.__esModule?()=>e.default:()=>e;return n.d(r,{a:r}),r},n.d=(e,r)=>{for(var o in r)n.o(r,o)&&!n.o(e,o)&&Object.defineProperty(e,o,{enumerable:!0,get:r[o]})},n.o=(e,r)=>Object.prototype.hasOwnProperty.call(e,r),n.r=e=>{"undefined"!=typeof Symbol&&Symbol.toStringTag&&Object.defineProperty(e,Symbol.toStringTag,{value:"Module"}),Object.defineProperty(e,"__esModule",{value:!0})},n.j=396,(()=>{var e={396:0};n.O.j=r=>0===e[r];var r=(r,o)=>{var t,a,[l,i,f]=o,v=0;if(l.some((r=>0!==e[r]))){for(t in i)n.o(i,t)&&(n.m[t]=i[t]);if(f)var u=f(n)}for(r&&r(o);v<l.length;v++)a=l[v],n.o(e,a)&&e[a]&&e[a][0](),e[a]=0;return n.O(u)},o=self.webpackChunkhanfor=self.webpackChunkhanfor||[];o.forEach(r.bind(null,0)),o.push=r.bind(null,o.push.bind(o))})(),n.nc=void 0;var t=n.O(void 0,[351],(()=>n(4523)));t=n.O(t)})();
\ No newline at end of file
@@ -1 +1,612 @@
-(()=>{var t,e={703:(t,e,a)=>{var n=a(9755);a(1388),a(4712),a(5700),a(3142),a(2993),a(944),a(3889),a(6824),a(7175);let o=["bool","int","real","unknown","CONST","ENUM","ENUMERATOR"],r=!1;const{SearchNode:s}=a(3024);let i,l=sessionStorage.getItem("var_import_search_string"),c=[!0,!0,!0,!0,!0,!0];function d(){l=n("#search_bar").val().trim(),sessionStorage.setItem("var_import_search_string",l),i=s.fromQuery(l)}function u(t,e,a=!0,n=!0){let o=t.data();for(var r in"source"===e&&"source"!==o.action?void 0!==o.source.name&&(o.result=o.source,o.action="source"):"target"===e&&"target"!==o.action?void 0!==o.target.name&&(o.result=o.target,o.action="target"):"skip"===e&&(o.result=o.target,o.action=void 0!==o.target.name?"target":"skipped"),o.available_constraints){let t=o.available_constraints[r];o.available_constraints[r].to_result=t.origin===e}a?t.data(o).draw("full-hold"):t.data(o),n&&p(o)}function p(t=!1){let e=n("body");e.LoadingOverlay("show");let a=Object();t?a[t.name]={action:t.action}:n("#var_import_table").DataTable().rows({selected:!0}).every((function(){let t=this.data();a[t.name]={action:t.action}})),a=JSON.stringify(a),n.post("api/"+session_id+"/store_table",{rows:a},(function(t){e.LoadingOverlay("hide",!0),!1===t.success&&alert(t.errormsg)}))}function b(t,e){"apply-import"===e&&function(t){let e=n("body");e.LoadingOverlay("show"),n.post("api/"+session_id+"/apply_import",{},(function(t){e.LoadingOverlay("hide",!0),!1===t.success?alert(t.errormsg):alert("Imported result variables.")}))}(),"delete-session"===e&&function(){let t=n("body");t.LoadingOverlay("show"),n.post("api/"+session_id+"/delete_me",{id:session_id},(function(e){t.LoadingOverlay("hide",!0),!1===e.success?alert(e.errormsg):window.location.href=base_url+"variables"}))}()}n(document).ready((function(){let t=n("#var_import_table").DataTable({paging:!0,stateSave:!0,select:{style:"os",selector:"td:first-child"},pageLength:200,responsive:!0,lengthMenu:[[10,50,100,500,-1],[10,50,100,500,"All"]],dom:'rt<"container"<"row"<"col-md-6"li><"col-md-6"p>>>',ajax:"api/"+session_id+"/get_table_data",deferRender:!0,rowId:"name",columns:[{orderable:!1,className:"select-checkbox",targets:[0],data:null,defaultContent:""},{data:function(t,e,a,n){return t},targets:[1],orderable:!1,render:function(t,e,a,n){return'<div class="btn-group" role="group" aria-label="Basic example"><button type="button" data-action="skip" class="skip-btn btn btn-secondary'+("skipped"===t.action?" active":"")+'">Skip</button><button type="button" data-action="source" class="source-btn btn btn-secondary'+("source"===t.action?" active":"")+'">Source</button><button type="button" data-action="target" class="target-btn btn btn-secondary'+("target"===t.action?" active":"")+'">Target</button><button type="button" data-action="custom" class="custom-btn btn btn-secondary'+("custom"===t.action?" active":"")+'">Custom</button></div>'}},{data:function(t,e,a,n){return t},targets:[1],render:function(t,e,a,n){let o="";const r=void 0!==t.source.name,s=void 0!==t.target.name;return r&&s?(o+='<span class="badge bg-info">match_in_source_and_target</span>',t.source.type!==t.target.type?o+='<span class="badge bg-info">unmatched_types</span>':o+='<span class="badge bg-info">same_types</span>'):(r||(o+='<span class="badge bg-info">no_match_in_source</span>'),s||(o+='<span class="badge bg-info">no_match_in_target</span>')),r&&t.source.constraints.length>0&&(o+='<span class="badge bg-info">source_has_constraints</span>'),s&&t.target.constraints.length>0&&(o+='<span class="badge bg-info">target_has_constraints</span>'),o}},{data:function(t,e,a,n){return t.source},targets:[3],render:function(t,e,a,n){let o="";return o=void 0!==t.name?'<p class="var_link" data-type="source" style="cursor: pointer"><code>'+t.name+'</code> <span class="badge bg-info">'+t.type+"</span></p>":"No match.",o}},{data:function(t,e,a,n){return t.target},targets:[4],order:"asc",render:function(t,e,a,n){let o="";return o=void 0!==t.name?'<p class="var_link" data-type="target" style="cursor: pointer"><code>'+t.name+'</code><span class="badge bg-info">'+t.type+"</span>":"No match.",o}},{data:function(t,e,a,n){return t.result},targets:[5],render:function(t,e,a,n){let o="";return o=void 0!==t.name?'<p class="var_link" data-type="result" style="cursor: pointer"><code>'+t.name+'</code><span class="badge bg-info">'+t.type+"</span>":"Skipped.",o}}],infoCallback:function(t,e,a,o,r,s){var i=this.api().page.info();n("#clear-all-filters-text").html("Showing "+r+"/"+i.recordsTotal+". Clear all.");let l="Showing "+e+" to "+a+" of "+r+" entries";return l+=" (filtered from "+i.recordsTotal+" total entries).",l},initComplete:function(){n("#search_bar").val(l),d(),n.fn.dataTable.ext.search.push((function(t,e,a){return function(t){return i.evaluate(t,c)}(e)})),this.api().draw()}});new n.fn.dataTable.ColReorder(t,{}),n("#search_bar").keypress((function(e){13===e.which&&(d(),t.draw())}));let e=n("#var_import_table tbody");e.on("click",".var_link",(function(e){e.preventDefault();let a=t.row(n(this).parents("tr")).data(),s=n(this).attr("data-type");!function(t,e,a){let s=n("#variable_modal"),i=n("#variable_value_form_group"),l=n(".enum-controls"),c=n("#constraints_container"),d=Object(),u=n("#variable_type"),p=n("#variable_value"),b=n("#save_variable_modal"),g="";u.prop("disabled",!0),p.prop("disabled",!0),b.hide(),r=!1,"source"===a?(d=t.source,g="Source Variable:"):"target"===a?(d=t.target,g="Target Variable:"):"result"===a&&(g="Resulting Variable:",d=t.result,u.prop("disabled",!1),p.prop("disabled",!1),b.show()),u.autocomplete({minLength:0,source:o}).on("focus",(function(){n(this).keydown()})),n("#variable_modal_title").html(g+" <code>"+t.name+"</code>"),b.attr("data-name",t.name),u.val(d.type),i.hide(),l.hide(),c.hide(),"CONST"===d.type||"ENUMERATOR"===d.type?(i.show(),p.val(d.const_val)):"ENUM"===d.type&&(l.show(),n("#enumerators").html(""),function(t,e){let a=n("#enumerators");a.html("");let o="";e.rows().every((function(){let e=this.data();t.length<e.name.length&&e.name.startsWith(t)&&void 0!==e.result.name&&(o+="<p><code>"+e.name+"</code> : <code>"+e.result.const_val+"</code></p>")})),a.html(o)}(d.name,e)),function(t,e,a,o){function r(t,e=!1,a="none"){let n="";for(var o in t){let r=t[o];if(r.origin===a)if(e){let t="",e="";r.to_result?(t="Included in result (click to toggle).",e="btn-success"):(t="Not Included in result (click to toggle).",e="btn-secondary"),n+='<div class="constraint-element">',n+='<button type="button" data-type="'+a+'" data-constrid="'+r.id+'" class="btn '+e+' btn-sm constraint-handle">'+t+"</button>",n+="<pre>"+r.constraint+"</pre>",n+="</div>"}else n+="<pre>"+r.constraint+"</pre>"}return n}let s=n("#constraints_list"),i="";"result"===o?(void 0!==t.target.constraints&&t.target.constraints.length>0&&(i+="<h6>From Target</h6>",i+=r(t.available_constraints,!0,"target")),void 0!==t.source.constraints&&t.source.constraints.length>0&&(i+="<h6>From Source</h6>",i+=r(t.available_constraints,!0,"source"))):i+=r(t.available_constraints,!1,o),s.html(i),a.show()}(t,0,c,a),n(".constraint-handle").click((function(){r=!0;let a=n(this).attr("data-constrid"),o=n(this).closest("div").find("pre"),s=e.row("#"+t.name),i=s.data();o.effect("highlight",{color:"green"},800),n(this).toggleClass("btn-success"),n(this).toggleClass("btn-secondary"),n(this).hasClass("btn-success")?(n(this).html("Included in result (click to toggle)."),i.available_constraints[a].to_result=!0):(n(this).html("Not Included in result (click to toggle)."),i.available_constraints[a].to_result=!1),s.data(i)})),s.modal("show")}(a,t,s)})),n("#save_variable_modal").click((function(){let e=n(this).attr("data-name");!function(t,e){let a=n("#variable_modal"),o=n("#variable_type").val(),s=n("#variable_value").val(),i=e.data(),l=!1;i.result.type!==o&&(l=!0,i.result.type=o),"CONST"!==i.result.type&&"ENUMERATOR"!==i.result.type||i.result.const_val===s||(l=!0,i.result.const_val=s),l||r?(i.action="custom",a.LoadingOverlay("show"),n.post("api/"+session_id+"/store_variable",{row:JSON.stringify(i)},(function(t){a.LoadingOverlay("hide",!0),!1===t.success?alert(t.errormsg):(e.data(i).draw("full-hold"),a.modal("hide"),n(e.node()).effect("highlight",{color:"green"},800))}))):a.modal("hide")}(0,t.row("#"+e))})),n("#variable_type").on("change, focusout, keyup",(function(){let t=n("#variable_value_form_group");["CONST","ENUMERATOR"].includes(n(this).val())?t.show():t.hide()})),e.on("click",".target-btn, .source-btn, .skip-btn",(function(e){e.preventDefault(),u(t.row(n(this).parents("tr")),n(this).attr("data-action"))})),n(".select-all-button").on("click",(function(e){n(this).hasClass("btn-secondary")?t.rows({page:"current"}).select():t.rows({page:"current"}).deselect(),n(".select-all-button").toggleClass("btn-secondary btn-primary")})),n(".action-btn").click((function(e){!function(t,e){t.rows({selected:!0}).every((function(){u(this,e,!1,!1)})),p()}(t,n(this).attr("data-action"))})),n("#delete_session_button").bootstrapConfirmButton({onConfirm:function(){b(0,n(this).attr("data-action"))}}),n("#apply_import_btn").click((function(){b(0,n(this).attr("data-action"))})),t.on("user-select",(function(){let t=n(".select-all-button");t.removeClass("btn-primary"),t.addClass("btn-secondary ")})),n(".clear-all-filters").click((function(){n("#search_bar").val("").effect("highlight",{color:"green"},500),d(),t.draw()}))}))}},a={};function n(t){var o=a[t];if(void 0!==o)return o.exports;var r=a[t]={id:t,exports:{}};return e[t].call(r.exports,r,r.exports,n),r.exports}n.m=e,t=[],n.O=(e,a,o,r)=>{if(!a){var s=1/0;for(d=0;d<t.length;d++){for(var[a,o,r]=t[d],i=!0,l=0;l<a.length;l++)(!1&r||s>=r)&&Object.keys(n.O).every((t=>n.O[t](a[l])))?a.splice(l--,1):(i=!1,r<s&&(s=r));if(i){t.splice(d--,1);var c=o();void 0!==c&&(e=c)}}return e}r=r||0;for(var d=t.length;d>0&&t[d-1][2]>r;d--)t[d]=t[d-1];t[d]=[a,o,r]},n.n=t=>{var e=t&&t.__esModule?()=>t.default:()=>t;return n.d(e,{a:e}),e},n.d=(t,e)=>{for(var a in e)n.o(e,a)&&!n.o(t,a)&&Object.defineProperty(t,a,{enumerable:!0,get:e[a]})},n.o=(t,e)=>Object.prototype.hasOwnProperty.call(t,e),n.r=t=>{"undefined"!=typeof Symbol&&Symbol.toStringTag&&Object.defineProperty(t,Symbol.toStringTag,{value:"Module"}),Object.defineProperty(t,"__esModule",{value:!0})},n.j=229,(()=>{var t={229:0};n.O.j=e=>0===t[e];var e=(e,a)=>{var o,r,[s,i,l]=a,c=0;if(s.some((e=>0!==t[e]))){for(o in i)n.o(i,o)&&(n.m[o]=i[o]);if(l)var d=l(n)}for(e&&e(a);c<s.length;c++)r=s[c],n.o(t,r)&&t[r]&&t[r][0](),t[r]=0;return n.O(d)},a=self.webpackChunkhanfor=self.webpackChunkhanfor||[];a.forEach(e.bind(null,0)),a.push=e.bind(null,a.push.bind(a))})(),n.nc=void 0;var o=n.O(void 0,[351],(()=>n(703)));o=n.O(o)})();
\ No newline at end of file
+(()=>{var t,e={703:function(module,exports,__webpack_require__){
+var $=__webpack_require__(9755);
+__webpack_require__(1388);
+__webpack_require__(4712);
+__webpack_require__(5700);
+__webpack_require__(3142);
+__webpack_require__(2993);
+__webpack_require__(944);
+__webpack_require__(3889);
+//require('datatables.net-colreorderwithresize-npm');
+__webpack_require__(6824);
+__webpack_require__(7175);
+
+
+// Globals
+let available_types = ['bool', 'int', 'real', 'unknown', 'CONST', 'ENUM', 'ENUMERATOR'];
+let global_changes = false;
+let var_import_search_string = sessionStorage.getItem('var_import_search_string');
+let visible_columns = [true, true, true, true, true, true];
+
+
+/**
+ * Update the search query sent with each table request (the search is applied by the backend).
+ */
+function update_search() {
+    var_import_search_string = $('#search_bar').val().trim();
+    sessionStorage.setItem('var_import_search_string', var_import_search_string);
+}
+
+function load_enumerators_to_modal(data) {
+    let enum_div = $('#enumerators');
+    enum_div.html('');
+    let enum_html = '';
+    // The enumerators of the result enum are listed by the backend.
+    for (const enumerator of (data.enumerators || [])) {
+        enum_html += '<p><code>' + enumerator.name + '</code> : <code>' + enumerator.const_val + '</code></p>';
+    }
+
+    enum_div.html(enum_html);
+}
+
+
+function load_constraints_to_container(data, var_object, constraints_container, type) {
+    function add_constraints(constraints, handles = false, type = 'none') {
+        let constraints_html = '';
+
+        for (var key in constraints) {
+            let constraint = constraints[key];
+            if (constraint.origin !== type) {
+                continue;
+            }
+            if (handles) {
+                let text = '';
+                let css_class = '';
+                if (constraint.to_result) {
+                    text = 'Included in result (click to toggle).';
+                    css_class = 'btn-success';
+                } else {
+                    text = 'Not Included in result (click to toggle).';
+                    css_class = 'btn-secondary'
+                }
+                constraints_html += '<div class="constraint-element">'
+                constraints_html += '<button type="button" ' +
+                    'data-type="' + type + '" ' +
+                    'data-constrid="' + constraint.id + '" ' +
+                    'class="btn ' + css_class + ' btn-sm constraint-handle">' +
+                    text +
+                    '</button>';
+                constraints_html += '<pre>' + constraint.constraint + '</pre>';
+                constraints_html += '</div>';
+            } else {
+                constraints_html += '<pre>' + constraint.constraint + '</pre>';
+            }
+        }
+        return constraints_html;
+    }
+
+    let constraints_list_dom = $('#constraints_list');
+    let constraints_html = '';
+    if (type === 'result') {
+        if ((typeof(data.target.constraints) !== 'undefined') && (data.target.constraints.length > 0)) {
+            constraints_html += '<h6>From Target</h6>';
+            constraints_html += add_constraints(data.available_constraints, true, 'target');
+        }
+        if ((typeof(data.source.constraints) !== 'undefined') && (data.source.constraints.length > 0)) {
+            constraints_html += '<h6>From Source</h6>';
+            constraints_html += add_constraints(data.available_constraints, true, 'source');
+        }
+    } else {
+        constraints_html += add_constraints(data.available_constraints, false, type);
+    }
+    constraints_list_dom.html(constraints_html);
+    constraints_container.show();
+}
+
+
+function load_modal(data, var_import_table, type) {
+    let var_view_modal = $('#variable_modal');
+    let var_value_form = $('#variable_value_form_group');
+    let enum_controls = $('.enum-controls');
+    let constraints_container = $('#constraints_container');
+    let var_object = Object();
+    let type_input = $('#variable_type');
+    let variable_value = $('#variable_value');
+    let save_variable_modal = $('#save_variable_modal');
+    let title = '';
+
+    type_input.prop('disabled', true);
+    variable_value.prop('disabled', true);
+    save_variable_modal.hide();
+    global_changes = false;
+
+    if (type === 'source') {
+        var_object = data.source;
+        title = 'Source Variable:';
+    } else if (type === 'target') {
+        var_object = data.target;
+        title = 'Target Variable:';
+    } else if (type === 'result') {
+        title = 'Resulting Variable:';
+        var_object = data.result;
+        type_input.prop('disabled', false);
+        variable_value.prop('disabled', false);
+        save_variable_modal.show();
+    }
+
+    type_input.autocomplete({
+        minLength: 0,
+        source: available_types
+    }).on('focus', function() { $(this).keydown(); });
+
+    // Prepare modal
+    $('#variable_modal_title').html(title + ' <code>' + data.name + '</code>');
+    save_variable_modal.attr('data-name', data.name);
+    type_input.val(var_object.type);
+    var_value_form.hide();
+    enum_controls.hide();
+    constraints_container.hide();
+
+
+    if (var_object.type === 'CONST' || var_object.type === 'ENUMERATOR') {
+        var_value_form.show();
+        variable_value.val(var_object.const_val);
+        //variable_value_old.val(var_object.const_val);
+    } else if (var_object.type === 'ENUM') {
+        enum_controls.show();
+        $('#enumerators').html('');
+        load_enumerators_to_modal(data);
+    }
+
+    load_constraints_to_container(data, var_object, constraints_container, type);
+
+    // Bind constraint handles
+    $('.constraint-handle').click(function () {
+        global_changes = true;
+        let constraint_id = $(this).attr('data-constrid');
+        let constraint = $(this).closest('div').find( "pre" );
+        let row = var_import_table.row('#' + data.name);
+        let row_data = row.data();
+
+        constraint.effect("highlight", {color: 'green'}, 800);
+        $(this).toggleClass("btn-success");
+        $(this).toggleClass("btn-secondary");
+
+        if ($(this).hasClass("btn-success")) {
+            $(this).html('Included in result (click to toggle).');
+            row_data.available_constraints[constraint_id].to_result = true;
+        } else {
+            $(this).html('Not Included in result (click to toggle).');
+            row_data.available_constraints[constraint_id].to_result = false;
+        }
+        row.data(row_data);
+    });
+
+    // $('#var_view_modal_body').html(body_html);
+    var_view_modal.modal('show');
+}
+
+
+function redraw_table(var_import_table) {
+    var_import_table.draw('full-hold');
+}
+
+
+function modify_row_by_action(row, action, store = true) {
+    let data = row.data();
+    if ((action === 'source') && (data.action !== 'source')) {
+        if (typeof(data.source.name) !== 'undefined') {
+            data.result = data.source;
+            data.action = 'source';
+        }
+    } else if ((action === 'target') && (data.action !== 'target')) {
+        if (typeof(data.target.name) !== 'undefined') {
+            data.result = data.target;
+            data.action = 'target';
+        }
+    } else if (action === 'skip') {
+        data.result = data.target;
+        data.action =  (typeof(data.target.name) !== 'undefined' ? 'target' : 'skipped');
+    }
+
+    for (var key in data.available_constraints) {
+        let constraint = data.available_constraints[key];
+        data.available_constraints[key].to_result = constraint.origin === action;
+    }
+
+    row.data(data);
+    if (store) {
+        store_changes(data);
+    }
+}
+
+
+function get_selected_vars(variables_table) {
+    let selected_vars = [];
+    variables_table.rows( {selected:true} ).every( function () {
+        let d = this.data();
+        selected_vars.push(d['name']);
+    });
+    return selected_vars;
+}
+
+
+function apply_multiselect_action(var_import_table, action) {
+    var_import_table.rows( {selected:true} ).every( function () {
+        modify_row_by_action(this, action, false);
+    });
+    store_changes();
+}
+
+
+function store_modal(var_table, target_row) {
+    let var_view_modal = $('#variable_modal');
+    let type_by_modal = $('#variable_type').val();
+    let value_by_modal = $('#variable_value').val();
+    let table_data = target_row.data();
+    // First check if we have changes.
+    let changes = false;
+    if (table_data.result.type !== type_by_modal) {
+        changes = true;
+        table_data.result.type = type_by_modal;
+    }
+    if ((table_data.result.type === 'CONST' || table_data.result.type === 'ENUMERATOR') &&
+        (table_data.result.const_val !== value_by_modal)) {
+        changes = true;
+        table_data.result.const_val = value_by_modal;
+    }
+    if (changes || global_changes) {
+        table_data.action = 'custom';
+        // Sync with backend.
+        var_view_modal.LoadingOverlay('show');
+        $.post( "api/" + session_id + "/store_variable",
+            {
+                row: JSON.stringify(table_data)
+            },
+            // Update var table on success or show an error message.
+            function( data ) {
+                var_view_modal.LoadingOverlay('hide', true);
+                if (data['success'] === false) {
+                    alert(data['errormsg']);
+                } else {
+                    target_row.data(table_data).draw('full-hold');
+                    var_view_modal.modal('hide');
+                    $(target_row.node()).effect("highlight", {color: 'green'}, 800);
+                }
+        });
+    } else {
+        var_view_modal.modal('hide');
+    }
+}
+
+
+function store_changes(data = false) {
+    let body = $('body');
+    body.LoadingOverlay('show');
+
+    // Fetch relevant changes
+    let rows = Object();
+    if (!data) {
+        $( '#var_import_table' ).DataTable().rows( {selected:true} ).every( function () {
+            let row = this.data();
+            rows[row.name] = {
+                action: row.action
+            };
+        });
+    } else {
+        rows[data.name] = {
+            action: data.action
+        }
+    }
+
+    rows = JSON.stringify(rows);
+
+    // Send changes to backend.
+    $.post( "api/" + session_id + "/store_table",
+        {
+            rows: rows
+        },
+        // Reload the table page on success or show an error message.
+        function( data ) {
+            body.LoadingOverlay('hide', true);
+            if (data['success'] === false) {
+                alert(data['errormsg']);
+            }
+            redraw_table($( '#var_import_table' ).DataTable());
+    });
+}
+
+
+function apply_import(var_import_table) {
+    let body = $('body');
+    body.LoadingOverlay('show');
+
+    // Send changes to backend.
+    $.post( "api/" + session_id + "/apply_import",
+        {},
+        // Update requirements table on success or show an error message.
+        function( data ) {
+            body.LoadingOverlay('hide', true);
+            if (data['success'] === false) {
+                alert(data['errormsg']);
+            } else {
+                alert('Imported result variables.');
+            }
+    });
+}
+
+
+function delete_this_session() {
+    let body = $('body');
+    body.LoadingOverlay('show');
+
+    $.post( "api/" + session_id + "/delete_me",
+        {
+            id: session_id
+        },
+        // Hop to Hanfor root after successful deletion.
+        function( data ) {
+            body.LoadingOverlay('hide', true);
+            if (data['success'] === false) {
+                alert(data['errormsg']);
+            } else {
+                window.location.href = base_url + "variables";
+            }
+    });
+}
+
+
+function apply_tools_action(var_import_table, action) {
+    if (action === 'apply-import') {
+        apply_import(var_import_table);
+    }
+    if (action === 'delete-session') {
+        delete_this_session();
+    }
+}
+
+
+$(document).ready(function() {
+    // Prepare and load the variables table.
+    let var_import_table = $('#var_import_table').DataTable({
+        "paging": true,
+        "stateSave": true,
+        "select": {
+            style:    'os',
+            selector: 'td:first-child'
+        },
+        "pageLength": 200,
+        "responsive": true,
+        "lengthMenu": [[10, 50, 100, 500, -1], [10, 50, 100, 500, "All"]],
+        "dom": 'rt<"container"<"row"<"col-md-6"li><"col-md-6"p>>>',
+        "serverSide": true,
+        "ajax": {
+            "url": "api/" + session_id + "/get_table_data",
+            "data": function ( d ) {
+                d.search_query = var_import_search_string || '';
+                d.visible_columns = JSON.stringify(visible_columns);
+            }
+        },
+        "rowId": 'name',
+        "columns": [
+            {
+                // The mass selection column.
+                "orderable": false,
+                "className": 'select-checkbox',
+                "targets": [0],
+                "data": null,
+                "defaultContent": ""
+            },
+            {
+                // The actions column.
+                "data": function ( row, type, val, meta ) {
+                    return row;
+                },
+                "targets": [1],
+                "orderable": false,
+                "render": function ( data, type, row, meta ) {
+                    let result = '<div class="btn-group" role="group" aria-label="Basic example">'
+                        + '<button type="button" data-action="skip" class="skip-btn btn btn-secondary'
+                        + (data.action === 'skipped' ? ' active' : '') + '">Skip</button>'
+                        + '<button type="button" data-action="source" class="source-btn btn btn-secondary'
+                        + (data.action === 'source' ? ' active' : '') + '">Source</button>'
+                        + '<button type="button" data-action="target" class="target-btn btn btn-secondary'
+                        + (data.action === 'target' ? ' active' : '') + '">Target</button>'
+                        + '<button type="button" data-action="custom" class="custom-btn btn btn-secondary'
+                        + (data.action === 'custom' ? ' active' : '') + '">Custom</button>'
+                        + '</div>';
+                    return result;
+                }
+            },
+            {
+                // The attributes column.
+                "data": function ( row, type, val, meta ) {
+                    return row;
+                },
+                "targets": [1],
+                "render": function ( data, type, row, meta ) {
+                    let result = ``;
+                    const has_source = typeof(data.source.name) !== 'undefined';
+                    const has_target = typeof(data.target.name) !== 'undefined';
+
+                    if (has_source && has_target) {
+                        result += '<span class="badge bg-info">match_in_source_and_target</span>'
+                        if (data.source.type !== data.target.type) {
+                            result += '<span class="badge bg-info">unmatched_types</span>'
+                        } else {
+                            result += '<span class="badge bg-info">same_types</span>'
+                        }
+                    } else {
+                        if (!has_source) {
+                            result += '<span class="badge bg-info">no_match_in_source</span>'
+                        }
+                        if (!has_target) {
+                            result += '<span class="badge bg-info">no_match_in_target</span>'
+                        }
+                    }
+                    if (has_source && data.source.constraints.length > 0) {
+                        result += '<span class="badge bg-info">source_has_constraints</span>'
+                    }
+                    if (has_target && data.target.constraints.length > 0) {
+                        result += '<span class="badge bg-info">target_has_constraints</span>'
+                    }
+                    return result;
+                }
+            },
+            {
+                // The source column.
+                "data": function ( row, type, val, meta ) {
+                    return row.source;
+                },
+                "targets": [3],
+                "render": function ( data, type, row, meta ) {
+                    let result = '';
+                    if (typeof(data.name) !== 'undefined') {
+                        result = '<p class="var_link" data-type="source" style="cursor: pointer"><code>' +
+                            data.name + '</code> <span class="badge bg-info">' + data.type + '</span></p>';
+                    } else {
+                        result = 'No match.'
+                    }
+                    return result;
+                }
+            },
+            {
+                // The target column.
+                "data": function ( row, type, val, meta ) {
+                    return row.target;
+                },
+                "targets": [4],
+                "order": 'asc',
+                "render": function ( data, type, row, meta ) {
+                    let result = '';
+                    if (typeof(data.name) !== 'undefined') {
+                        result = '<p class="var_link" data-type="target" style="cursor: pointer"><code>' +
+                            data.name + '</code><span class="badge bg-info">' + data.type + '</span>';
+                    } else {
+                        result = 'No match.'
+                    }
+                    return result;
+                }
+
+            },
+            {
+                // The result column.
+                "data": function ( row, type, val, meta ) {
+                    return row.result;
+                },
+                "targets": [5],
+                "render": function ( data, type, row, meta ) {
+                    let result = '';
+                    if (typeof(data.name) !== 'undefined') {
+                        result = '<p class="var_link" data-type="result" style="cursor: pointer"><code>' +
+                            data.name + '</code><span class="badge bg-info">' + data.type + '</span>';
+                    } else {
+                        result = 'Skipped.'
+                    }
+                    return result;
+                }
+            }
+        ],
+        infoCallback: function( settings, start, end, max, total, pre ) {
+            var api = this.api();
+            var pageInfo = api.page.info();
+
+            $('#clear-all-filters-text').html("Showing " + total +"/"+ pageInfo.recordsTotal + ". Clear all.");
+
+            let result = "Showing " + start + " to " + end + " of " + total + " entries";
+            result += " (filtered from " + pageInfo.recordsTotal + " total entries).";
+
+            return result;
+        },
+        initComplete : function() {
+            $('#search_bar').val(var_import_search_string);
+
+            update_search();
+            this.api().draw();
+
+        }
+    });
+    new $.fn.dataTable.ColReorder(var_import_table, {});
+
+    // Bind big custom searchbar to search the table.
+    $('#search_bar').keypress(function(e) {
+        if(e.which === 13) { // Search on enter.
+            update_search();
+            var_import_table.draw();
+        }
+    });
+
+    let var_import_table_body = $('#var_import_table tbody');
+
+    // Add listener for variable link to modal.
+    var_import_table_body.on('click', '.var_link', function (event) {
+        // prevent body to be scrolled to the top.
+        event.preventDefault();
+        let data = var_import_table.row( $(this).parents('tr') ).data();
+        let type = $(this).attr('data-type');
+        load_modal(data, var_import_table, type);
+    });
+    
+    $('#save_variable_modal').click(function () {
+        let name = $(this).attr('data-name');
+        let row = var_import_table.row('#' + name);
+        store_modal(var_import_table, row);
+    });
+
+    $('#variable_type').on('change, focusout, keyup', function () {
+        let var_value_form = $('#variable_value_form_group');
+        if (['CONST', 'ENUMERATOR'].includes($( this ).val())) {
+            var_value_form.show();
+        } else {
+            var_value_form.hide();
+        }
+    });
+
+    // Add listener for table row action buttons.
+    var_import_table_body.on('click', '.target-btn, .source-btn, .skip-btn', function (event) {
+        // prevent body to be scrolled to the top.
+        event.preventDefault();
+        let row = var_import_table.row( $(this).parents('tr') );
+        let action = $(this).attr('data-action');
+        modify_row_by_action(row, action);
+    });
+
+    // Multiselect. Select single rows.
+    $('.select-all-button').on('click', function (e) {
+        // Toggle selection on
+        if ($( this ).hasClass('btn-secondary')) {
+            var_import_table.rows( {page:'current'} ).select();
+        }
+        else { // Toggle selection off
+            var_import_table.rows( {page:'current'} ).deselect();
+        }
+        // Toggle button state.
+        $('.select-all-button').toggleClass('btn-secondary btn-primary');
+    });
+
+    // Multiselect action buttons
+    $('.action-btn').click(function (e) {
+        apply_multiselect_action(var_import_table, $(this).attr('data-action'));
+    });
+
+    // Buttons that must be confirmed
+    // $('#delete_session_button').confirmation({
+    //   rootSelector: '#delete_session_button'
+    // });
+
+    // Tools Buttons
+    $('#delete_session_button').bootstrapConfirmButton({
+        onConfirm: function () {
+            apply_tools_action(var_import_table, $(this).attr('data-action'))
+        }
+    })
+
+    $('#apply_import_btn').click(function () {
+        apply_tools_action(var_import_table, $(this).attr('data-action'));
+    });
+
+    // Toggle "Select all rows to `off` on user specific selection."
+    var_import_table.on( 'user-select', function ( ) {
+        let select_buttons = $('.select-all-button');
+        select_buttons.removeClass('btn-primary');
+        select_buttons.addClass('btn-secondary ');
+    });
+
+    // Clear all applied searches.
+    $('.clear-all-filters').click(function () {
+        $('#search_bar').val('').effect("highlight", {color: 'green'}, 500);
+        update_search();
+        var_import_table.draw();
+    });
+} );
+}},a={};function n(t){var o=a[t];if(void 0!==o)return o.exports;var r=a[t]={id:t,exports:{}};return e[t].call(r.exports,r,r.exports,n),r.exports}n.m=e,t=[],n.O=(e,a,o,r)=>{if(!a){var s=1/0;for(d=0;d<t.length;d++){for(var[a,o,r]=t[d],i=!0,l=0;l<a.length;l++)(!1&r||s>=r)&&Object.keys(n.O).every((t=>n.O[t](a[l])))?a.splice(l--,1):(i=!1,r<s&&(s=r));if(i){t.splice(d--,1);var c=o();void 0!==c&&(e=c)}}return e}r=r||0;for(var d=t.length;d>0&&t[d-1][2]>r;d--)t[d]=t[d-1];t[d]=[a,o,r]},n.n=t=>{var e=t&&t.__esModule?()=>t.default:()=>t;return n.d(e,{a:e}),e},n.d=(t,e)=>{for(var a in e)n.o(e,a)&&!n.o(t,a)&&Object.defineProperty(t,a,{enumerable:!0,get:e[a]})},n.o=(t,e)=>Object.prototype.hasOwnProperty.call(t,e),n.r=t=>{"undefined"!=typeof Symbol&&Symbol.toStringTag&&Object.defineProperty(t,Symbol.toStringTag,{value:"Module"}),Object.defineProperty(t,"__esModule",{value:!0})},n.j=229,(()=>{var t={229:0};n.O.j=e=>0===t[e];var e=(e,a)=>{var o,r,[s,i,l]=a,c=0;if(s.some((e=>0!==t[e]))){for(o in i)n.o(i,o)&&(n.m[o]=i[o]);if(l)var d=l(n)}for(e&&e(a);c<s.length;c++)r=s[c],n.o(t,r)&&t[r]&&t[r][0](),t[r]=0;return n.O(d)},a=self.webpackChunkhanfor=self.webpackChunkhanfor||[];a.forEach(e.bind(null,0)),a.push=e.bind(null,a.push.bind(a))})(),n.nc=void 0;var o=n.O(void 0,[351],(()=>n(703)));o=n.O(o)})();
\ No newline at end of file
@@ -1 +1,1082 @@
-(()=>{var e,t={6052:(e,t,a)=>{var n=a(9755);a(1388);const{Modal:r}=a(4712);a(5700),a(3142),a(2993),a(3889),a(944),a(7312),a(2106),a(6824),a(7175);let o=a(5759),l=["CONST","ENUM_INT","ENUM_REAL"],i=[":AND:",":OR:",":NOT:",":COL_INDEX_01:",":COL_INDEX_02:",":COL_INDEX_03:",":COL_INDEX_04:"],s=sessionStorage.getItem("var_search_string"),c=[];const{SearchNode:u}=a(3024);let _,v=[!0,!0,!0,!0,!0],m=JSON.parse(search_query);function d(){s=n("#search_bar").val().trim(),sessionStorage.setItem("var_search_string",s),_=u.fromQuery(s)}function p(e,t=!1){let a=n("body");a.LoadingOverlay("show");let r=n("#multi-change-type-input").val().trim(),o=[];e.rows({selected:!0}).every((function(){let e=this.data();o.push(e.name)})),n.post("api/var/multi_update",{change_type:r,selected_vars:JSON.stringify(o),del:t},(function(e){a.LoadingOverlay("hide",!0),!1===e.success?alert(e.errormsg):location.reload()}))}function f(){n(".requirement_var_group").each((function(){n(this).hide()})),n(".formalization_card").each((function(){const e=n(this).attr("title"),t=n("#requirement_scope"+e).val(),a=n("#requirement_pattern"+e).val();let r=n("#requirement_var_group_p"+e),o=n("#requirement_var_group_q"+e),l=n("#requirement_var_group_r"+e),i=n("#requirement_var_group_s"+e),s=n("#requirement_var_group_t"+e),c=n("#requirement_var_group_u"+e),u=n("#requirement_var_group_v"+e);switch(t){case"BEFORE":case"AFTER":r.show();break;case"BETWEEN":case"AFTER_UNTIL":r.show(),o.show()}Object.keys(_PATTERNS[a].env).forEach((function(e){switch(e){case"R":l.show();break;case"S":i.show();break;case"T":s.show();break;case"U":c.show();break;case"V":u.show()}}))}))}function h(){n(".formalization_card").each((function(){const e=n(this).attr("title");let t="";const a=n("#requirement_scope"+e).find("option:selected").text().replace(/\s\s+/g," "),r=n("#requirement_pattern"+e).find("option:selected").text().replace(/\s\s+/g," ");"None"!==a&&"None"!==r&&(t=a+", "+r+".");let o=n("#formalization_var_p"+e).val(),l=n("#formalization_var_q"+e).val(),i=n("#formalization_var_r"+e).val(),s=n("#formalization_var_s"+e).val(),u=n("#formalization_var_t"+e).val(),_=n("#formalization_var_u"+e).val(),v=n("#formalization_var_v"+e).val();o.length>0&&(t=t.replace(/{P}/g,o)),l.length>0&&(t=t.replace(/{Q}/g,l)),i.length>0&&(t=t.replace(/{R}/g,i)),s.length>0&&(t=t.replace(/{S}/g,s)),u.length>0&&(t=t.replace(/{T}/g,u)),_.length>0&&(t=t.replace(/{U}/g,_)),v.length>0&&(t=t.replace(/{V}/g,v)),n("#current_formalization_textarea"+e).val(t);let m=n("#formalization_heading"+e);if(e in c)for(let t=0;t<c[e].length;t++)n("#formalization_var_"+c[e][t]+e).addClass("type-error"),m.addClass("type-error-head");else m.removeClass("type-error-head")})),n("#variable_constraint_updated").val("true")}function g(){n(".formalization_selector").change((function(){f(),h()})),n(".reqirement-variable, .req_var_type").change((function(){h()})),n(".delete_formalization").bootstrapConfirmButton({onConfirm:function(){!function(e){let t=n(".modal-content");t.LoadingOverlay("show");const a=n("#variable_name").val();n.post("api/var/del_constraint",{name:a,constraint_id:e},(function(e){t.LoadingOverlay("hide",!0),!1===e.success?alert(e.errormsg):n("#formalization_accordion").html(e.html)})).done((function(){f(),h(),g()}))}(n(this).attr("name"))}})}function b(e){!0===e?n("#variable_value_form_group").hide():n("#variable_value_form_group").show()}function y(e=!1){!0===e?n("#variable_belongs_to_form_group").hide():n("#variable_belongs_to_form_group").show()}function w(e=!1){!0===e?n(".enum-controls").hide():n(".enum-controls").show()}function O(e){let t=n("#variables_table").DataTable().row(e).data(),a=n(".modal-content");b(!0),w(!0),y(!0),r.getOrCreateInstance(document.getElementById("variable_modal")).show(),n("#modal_associated_row_index").val(e),n("#variable_name_old").val(t.name),n("#variable_type_old").val(t.type),n("#occurences").val(t.used_by),n("#variable_modal_title").html("Variable: "+t.name),n("#variable_name").val(t.name);let o=n("#variable_type"),i=n("#variable_value"),s=n("#variable_value_old"),u=n("#belongs_to_enum"),_=n("#belongs_to_enum_old"),v=n("#enumerators");var m;o.val(t.type),i.val(""),s.val(""),u.val(""),_.val(""),v.html(""),"CONST"!==t.type&&"ENUMERATOR_INT"!==t.type&&"ENUMERATOR_REAL"!==t.type||(b(),i.val(t.const_val),s.val(t.const_val)),"ENUMERATOR_INT"!==t.type&&"ENUMERATOR_REAL"!==t.type||(y(),u.val(t.belongs_to_enum),_.val(t.belongs_to_enum)),"ENUM_REAL"!==t.type&&"ENUM_INT"!==t.type||(w(),m=t.name,n.post("api/var/get_enumerators",{name:m},(function(e){!1===e.success?alert(e.errormsg):n.each(e.enumerators,(function(e,t){N(t[0].substr(m.length+1),t[1])}))})).done((function(){f(),h(),g()}))),o.autocomplete({minLength:0,source:l}).on("focus",(function(){n(this).keydown()})),function(e){n.post("api/var/get_constraints_html",{name:e},(function(e){!1===e.success?alert(e.errormsg):(c=e.type_inference_errors,n("#formalization_accordion").html(e.html))})).done((function(){f(),h(),g()}))}(t.name),a.LoadingOverlay("hide")}function N(e,t){const a=`\n        <div class="input-group enumerator-input">\n            <span class="input-group-prepend input-group-text">Name</span>\n            <input class="form-control enum_name_input" type="text" value="${e}">\n            <span class="input-group-prepend input-group-text">Value</span>\n            <input class="form-control enum_value_input" type="number" step="any" value="${t}">\n            <buttton type="button" class="btn btn-danger input-group-append del_enum" data-name="${e}">Delete</buttton>\n        </div>`;n("#enumerators").append(a)}function E(){const e=n("#new_variable_type").val();let t=n("#new_variable_const_input");"CONST"===e?t.show():t.hide()}n(document).ready((function(){let e=n("#variables_table").DataTable({paging:!0,stateSave:!0,select:{style:"os",selector:"td:first-child"},pageLength:50,responsive:!0,lengthMenu:[[10,50,100,500,-1],[10,50,100,500,"All"]],dom:'rt<"container"<"row"<"col-md-6"li><"col-md-6"p>>>',ajax:"api/var/gets",deferRender:!0,columns:[{orderable:!1,className:"select-checkbox",targets:[0],data:null,defaultContent:""},{data:"name",targets:[1],render:function(e){return'<a class="modal-opener" href="#">'+e+"</span></br>"}},{data:"type",targets:[2],render:function(e,t,a){return null!==e&&l.indexOf(e)<=-1&&l.push(e),null!==e&&"CONST"===e&&(e=e+" ("+a.const_val+")"),e}},{data:"constraints",targets:[3],render:function(e){let t="";return n(e).each((function(e,a){a.length>0&&(t+=a)})),t}},{data:"tags",targets:[4],render:function(e){let t="";return n(e).each((function(e,a){a.length>0&&(t+='<span class="badge bg-danger">'+a+"</span>")})),t}},{data:"used_by",targets:[5],render:function(e,t,a){let r="",o="";return n(e).each((function(e,t){if(t.length>0&&!function(e){let t=null,a=/^(Constraint_)(.*)(_[0-9]+$)/gm.exec(e);return null!==a&&(t=a[2]),t}(t)){let e="?command=search&col=2&q=%5C%22"+t+"%5C%22";r+='<span class="badge bg-info"><a href="./'+e+'" target="_blank" class="link-light">'+t+"</a></span> ",o.length>0?o+="%3AOR%3A%3ACOL_INDEX_02%3A%5C%22"+t+"%5C%22":o+=e}})),r.length<1?r+='<span class="badge bg-warning">unused</span></br>':e.length>1&&(r+='<span class="badge bg-info"><a href="./'+o+'" target="_blank" class="link-light">Show all</a></span> '),r}},{data:"script_results",targets:[6],render:function(e){return e}},{data:"used_by",targets:[7],visible:!1,searchable:!1,render:function(e){let t="";return n(e).each((function(e,a){a.length>0&&(t.length>1&&(t+=", "),t+=a)})),t}}],infoCallback:function(e,t,a,r,o){let l=this.api().page.info();n("#clear-all-filters-text").html("Showing "+o+"/"+l.recordsTotal+". Clear all.");let i="Showing "+t+" to "+a+" of "+o+" entries";return i+=" (filtered from "+l.recordsTotal+" total entries).",i},initComplete:function(){n("#search_bar").val(s),n(".variable_link").click((function(e){e.preventDefault(),O(function(e){let t=n("#variables_table").DataTable(),a=-1;return t.row((function(t,n){n.name===e&&(a=t)})),a}(n(this).data("name")))})),o.process_url_query(m),d(),n.fn.dataTable.ext.search.push((function(e,t){return function(e){return _.evaluate(e,v)}(t)})),this.api().draw()}});e.column(6).visible(!1),e.column(7).visible(!1),new n.fn.dataTable.ColReorder(e,{});let t=n("#search_bar");new Awesomplete(t[0],{filter:function(e,t){let a=!1;return(t.split(":").length-1)%2==1&&(a=Awesomplete.FILTER_CONTAINS(e,t.match(/[^:]*$/)[0])),a},item:function(e,t){return Awesomplete.ITEM(e,t.match(/(:)([\S]*$)/)[2])},replace:function(e){const t=this.input.value.match(/(.*)(:(?!.*:).*$)/)[1];this.input.value=t+e},list:i,minChars:1,autoFirst:!0}),t.keypress((function(t){13===t.which&&(d(),e.draw())})),n("#variables_table  tbody").on("click","a.modal-opener",(function(t){t.preventDefault(),O(e.row(n(t.target).parent()).index())})),n("#save_variable_modal").click((function(){!function(e){let t=n(".modal-content");t.LoadingOverlay("show");const a=n("#variable_name").val(),r=n("#variable_name_old").val(),o=n("#variable_type").val(),i=n("#variable_type_old").val(),s=parseInt(n("#modal_associated_row_index").val()),c=n("#occurences").val(),u=n("#variable_value").val(),_=n("#variable_value_old").val(),v=n("#variable_constraint_updated").val(),m=n("#belongs_to_enum").val(),d=n("#belongs_to_enum_old").val();let p={};n(".formalization_card").each((function(){let e={};e.id=n(this).attr("title"),n(this).find("select").each((function(){n(this).hasClass("scope_selector")&&(e.scope=n(this).val()),n(this).hasClass("pattern_selector")&&(e.pattern=n(this).val())})),e.expression_mapping={},n(this).find("textarea.reqirement-variable").each((function(){""!==n(this).attr("title")&&(e.expression_mapping[n(this).attr("title")]=n(this).val())})),p[e.id]=e})),null!==o&&l.indexOf(o)<=-1&&l.push(o);let f=[];"ENUM_INT"!==o&&"ENUM_REAL"!==o||n(".enumerator-input").each((function(){let e=n(this).find(".enum_name_input").val(),t=n(this).find(".enum_value_input").val();f.push([e,t])})),n.post("api/var/update",{name:a,name_old:r,type:o,const_val:u,const_val_old:_,type_old:i,occurrences:c,constraints:JSON.stringify(p),updated_constraints:v,enumerators:JSON.stringify(f),belongs_to_enum:m,belongs_to_enum_old:d},(function(a){t.LoadingOverlay("hide",!0),!1===a.success?alert(a.errormsg):a.rebuild_table?location.reload():(e.row(s).data(a.data).draw(),n("#variable_modal").modal("hide"))}))}(e)})),n("#variable_type").on("keyup change autocompleteclose",(function(){"CONST"===n(this).val()?b():b(!0),"ENUMERATOR_INT"===n(this).val()||"ENUMERATOR_REAL"===n(this).val()?(y(),b()):y(!0),"ENUM_INT"===n(this).val()||"ENUM_REAL"===n(this).val()?w():w(!0)})),n(".import_link").on("click",(function(){!function(e,t){let a=n("#variable_import_modal");n("#variable_import_sess_name").val(e),n("#variable_import_sess_revision").val(t),n("#variable_import_modal_title").html("Import from Session: "+e+" at: "+t),r.getOrCreateInstance(a).show(),a.LoadingOverlay("show"),n.post("api/var/var_import_info",{sess_name:e,sess_revision:t},(function(e){a.LoadingOverlay("hide",!0),!1===e.success?alert(e.errormsg):(n("#import_tot_number").html("Total:\t"+e.tot_vars+" Variables."),n("#import_new_number").html("New:\t"+e.new_vars+" Variables."))}))}(n(this).attr("data-name"),n(this).attr("data-revision"))})),n("#start_variable_import_session").click((function(){!function(){let e=n("#variable_import_modal"),t=n("#variable_import_sess_name").val(),a=n("#variable_import_sess_revision").val();e.LoadingOverlay("show"),n.post("api/var/start_import_session",{sess_name:t,sess_revision:a},(function(t){e.LoadingOverlay("hide",!0),!1===t.success?alert(t.errormsg):window.location.href=base_url+"variable_import/"+t.session_id}))}()})),n(".select-all-button").on("click",(function(){n(this).hasClass("btn-secondary")?e.rows({page:"current"}).select():e.rows({page:"current"}).deselect(),n(".select-all-button").toggleClass("btn-secondary btn-primary")})),e.on("user-select",(function(){let e=n(".select-all-button");e.removeClass("btn-primary"),e.addClass("btn-secondary ")})),n("#multi-change-type-input").autocomplete({minLength:0,source:l,delay:100}).on("focus",(function(){n(this).keydown()})).val(""),n(".apply-multi-edit").click((function(){p(e)})),n("body").on("click",".delete_button",(function(){const t=n(this);void 0===t.data("html")?(t.outerWidth(t.outerWidth()).data("html",t.html()).html("Do it!"),setTimeout((function(){t.html(t.data("html")).removeData("html").outerWidth("")}),2e3)):(t.html(t.data("html")).removeData("html").outerWidth(""),p(e,!0))})),n("#add_constraint").click((function(){!function(){let e=n(".modal-content");e.LoadingOverlay("show");const t=n("#variable_name").val();n.post("api/var/new_constraint",{name:t},(function(t){e.LoadingOverlay("hide",!0);let a=n(t.html);!1===t.success?alert(t.errormsg):a.appendTo("#formalization_accordion")})).done((function(){f(),h(),g()}))}()})),n("#save_new_variable_modal").click((function(){!function(){const e=n("#new_variable_name").val(),t=n("#new_variable_type").val(),a=n("#new_variable_const_value").val();n.post("api/var/add_new_variable",{name:e,type:t,value:a},(function(e){!1===e.success?alert(e.errormsg):location.reload()}))}()})),n("#add_enumerator").click((function(){N("")})),n("#enumerators").on("click",".del_enum",(function(){const e=n(this).attr("data-name"),t=n("#variable_name_old").val();let a=n(this).parent(".enumerator-input");0===e.length?a.remove():function(e,t,a){let r=n("#variable_modal");r.LoadingOverlay("show"),n.post("api/var/del_var",{name:e+"_"+t},(function(e){r.LoadingOverlay("hide",!0),!1===e.success?alert(e.errormsg):a.remove()}))}(t,e,a)})).on("paste",".enum_name_input",(function(e){let t=e.originalEvent.clipboardData.getData("text");if(function(e){const t=e.match(/[^\r\n]+/g);if(t.length<=0)return!1;for(const e of t){const t=e.match(/[^\t]+/g);if(2!==t.length)return!1;if(isNaN(t[1]))return!1}return!0}(t)){console.log("has smart input form");const a=function(e){const t=e.match(/[^\r\n]+/g);let a=[];for(const e of t){const t=e.match(/[^\t]+/g);a.push([t[0],t[1]])}return a}(t);console.log(a);for(const e of a)N(e[0],e[1]);e.preventDefault()}})),n("#generate_req").click((function(){n("#generate_req_form").submit()})),n(".clear-all-filters").click((function(){n("#search_bar").val("").effect("highlight",{color:"green"},500),d(),e.draw()})),n("#variable_new_vaiable_modal")[0].addEventListener("show.bs.modal",(function(){E()})),n("#new_variable_type").on("change",(function(){E()})),n("#import-variables-from-csv-input").change((function(){const e=new FileReader;e.onload=function(){n.ajax({type:"POST",url:"api/var/import_csv",data:{variables_csv_str:e.result},success:function(e){!1!==e.success?location.reload():alert(e.errormsg)}})},e.readAsText(n("#import-variables-from-csv-input").prop("files")[0])}))}))}},a={};function n(e){var r=a[e];if(void 0!==r)return r.exports;var o=a[e]={id:e,exports:{}};return t[e].call(o.exports,o,o.exports,n),o.exports}n.m=t,e=[],n.O=(t,a,r,o)=>{if(!a){var l=1/0;for(u=0;u<e.length;u++){for(var[a,r,o]=e[u],i=!0,s=0;s<a.length;s++)(!1&o||l>=o)&&Object.keys(n.O).every((e=>n.O[e](a[s])))?a.splice(s--,1):(i=!1,o<l&&(l=o));if(i){e.splice(u--,1);var c=r();void 0!==c&&(t=c)}}return t}o=o||0;for(var u=e.length;u>0&&e[u-1][2]>o;u--)e[u]=e[u-1];e[u]=[a,r,o]},n.n=e=>{var t=e&&e.__esModule?()=>e.default:()=>e;return n.d(t,{a:t}),t},n.d=(e,t)=>{for(var a in t)n.o(t,a)&&!n.o(e,a)&&Object.defineProperty(e,a,{enumerable:!0,get:t[a]})},n.o=(e,t)=>Object.prototype.hasOwnProperty.call(e,t),n.r=e=>{"undefined"!=typeof Symbol&&Symbol.toStringTag&&Object.defineProperty(e,Symbol.toStringTag,{value:"Module"}),Object.defineProperty(e,"__esModule",{value:!0})},n.j=565,(()=>{var e={565:0};n.O.j=t=>0===e[t];var t=(t,a)=>{var r,o,[l,i,s]=a,c=0;if(l.some((t=>0!==e[t]))){for(r in i)n.o(i,r)&&(n.m[r]=i[r]);if(s)var u=s(n)}for(t&&t(a);c<l.length;c++)o=l[c],n.o(e,o)&&e[o]&&e[o][0](),e[o]=0;return n.O(u)},a=self.webpackChunkhanfor=self.webpackChunkhanfor||[];a.forEach(t.bind(null,0)),a.push=t.bind(null,a.push.bind(a))})(),n.nc=void 0;var r=n.O(void 0,[351],(()=>n(6052)));r=n.O(r)})();
\ No newline at end of file
+(()=>{var e,t={6052:function(module,exports,__webpack_require__){
+var $=__webpack_require__(9755);
+__webpack_require__(1388);
+const {Modal} = __webpack_require__(4712);
+__webpack_require__(5700);
+__webpack_require__(3142);
+__webpack_require__(2993);
+__webpack_require__(3889);
+__webpack_require__(944);
+__webpack_require__(7312);
+__webpack_require__(2106);
+//require('datatables.net-colreorderwithresize-npm');
+__webpack_require__(6824);
+__webpack_require__(7175);
+
+let utils = __webpack_require__(5759);
+
+// Globals
+let available_types = ['CONST', 'ENUM_INT', 'ENUM_REAL'];
+let search_autocomplete = [
+    ":AND:",
+    ":OR:",
+    ":NOT:",
+    ":COL_INDEX_01:",
+    ":COL_INDEX_02:",
+    ":COL_INDEX_03:",
+    ":COL_INDEX_04:"
+];
+let var_search_string = sessionStorage.getItem('var_search_string');
+let type_inference_errors = [];
+const {SearchNode} = __webpack_require__(3024);
+let search_tree = undefined;
+let visible_columns = [true, true, true, true, true];
+let get_query = JSON.parse(search_query); // search_query is set in layout.html
+
+/**
+ * Update the search expression tree.
+ */
+function update_search() {
+    var_search_string = $('#search_bar').val().trim();
+    sessionStorage.setItem('var_search_string', var_search_string);
+    search_tree = SearchNode.fromQuery(var_search_string);
+}
+
+/**
+ * Store the currently active (in the modal) variable.
+ * @param variables_table
+ */
+function store_variable(variables_table) {
+    let var_modal_content = $('.modal-content');
+    var_modal_content.LoadingOverlay('show');
+
+    // Get data.
+    const var_name = $('#variable_name').val();
+    const var_name_old = $('#variable_name_old').val();
+    const var_type = $('#variable_type').val();
+    const var_type_old = $('#variable_type_old').val();
+    const associated_row_id = parseInt($('#modal_associated_row_index').val());
+    const occurrences = $('#occurences').val();
+    const const_val = $('#variable_value').val();
+    const const_val_old = $('#variable_value_old').val();
+    const updated_constraints = $('#variable_constraint_updated').val();
+    const belongs_to_enum = $('#belongs_to_enum').val();
+    const belongs_to_enum_old = $('#belongs_to_enum_old').val();
+
+    // Fetch the constraints
+    let constraints = {};
+    $('.formalization_card').each(function () {
+        // Scope and Pattern
+        let constraint = {};
+        constraint['id'] = $(this).attr('title');
+        $(this).find('select').each(function () {
+            if ($(this).hasClass('scope_selector')) {
+                constraint['scope'] = $(this).val();
+            }
+            if ($(this).hasClass('pattern_selector')) {
+                constraint['pattern'] = $(this).val();
+            }
+        });
+
+        // Expressions
+        constraint['expression_mapping'] = {};
+        $(this).find("textarea.reqirement-variable").each(function () {
+            if ($(this).attr('title') !== '')
+                constraint['expression_mapping'][$(this).attr('title')] = $(this).val();
+        });
+
+        constraints[constraint['id']] = constraint;
+    });
+
+    // Update available types.
+    if (var_type !== null && available_types.indexOf(var_type) <= -1) {
+        available_types.push(var_type);
+    }
+
+    // Process enumerators in case we have an enum
+    let enumerators = [];
+    if ((var_type === 'ENUM_INT') || (var_type === 'ENUM_REAL')) {
+        // Fetch enumerators.
+        $('.enumerator-input').each(function () {
+            let enum_name = $(this).find('.enum_name_input').val();
+            let enum_value = $(this).find('.enum_value_input').val();
+            enumerators.push([enum_name, enum_value]);
+        });
+    }
+
+    // Store the variable.
+    $.post("api/var/update",
+        {
+            name: var_name,
+            name_old: var_name_old,
+            type: var_type,
+            const_val: const_val,
+            const_val_old: const_val_old,
+            type_old: var_type_old,
+            occurrences: occurrences,
+            constraints: JSON.stringify(constraints),
+            updated_constraints: updated_constraints,
+            enumerators: JSON.stringify(enumerators),
+            belongs_to_enum: belongs_to_enum,
+            belongs_to_enum_old: belongs_to_enum_old
+        },
+        // Update var table on success or show an error message.
+        function (data) {
+            var_modal_content.LoadingOverlay('hide', true);
+            if (data['success'] === false) {
+                alert(data['errormsg']);
+            } else {
+                if (data.rebuild_table) {
+                    location.reload();
+                } else {
+                    variables_table.row(associated_row_id).data(data.data).draw();
+                    $('#variable_modal').modal('hide');
+                }
+            }
+        });
+}
+
+/**
+ * Start a new import session (redirect to the session on success).
+ */
+function start_import_session() {
+    let variable_import_modal = $('#variable_import_modal');
+    let sess_name = $('#variable_import_sess_name').val();
+    let sess_revision = $('#variable_import_sess_revision').val();
+
+    variable_import_modal.LoadingOverlay('show');
+
+    $.post("api/var/start_import_session",
+        {
+            sess_name: sess_name,
+            sess_revision: sess_revision
+        },
+        function (data) {
+            variable_import_modal.LoadingOverlay('hide', true);
+            if (data['success'] === false) {
+                alert(data['errormsg']);
+            } else {
+                window.location.href = base_url + "variable_import/" + data['session_id'];
+            }
+        });
+}
+
+/**
+ * Open modal for the user to trigger variable import.
+ * @param sess_name
+ * @param sess_revision
+ */
+function open_import_modal(sess_name, sess_revision) {
+    // Prepare requirement Modal
+    let variable_import_modal = $('#variable_import_modal');
+    $('#variable_import_sess_name').val(sess_name);
+    $('#variable_import_sess_revision').val(sess_revision);
+    $('#variable_import_modal_title').html('Import from Session: ' + sess_name + ' at: ' + sess_revision);
+
+    //variable_import_modal.modal('show');
+    Modal.getOrCreateInstance(variable_import_modal).show();
+
+    // Load informations about selected var collection
+    variable_import_modal.LoadingOverlay('show');
+    $.post("api/var/var_import_info",
+        {
+            sess_name: sess_name,
+            sess_revision: sess_revision
+        },
+        function (data) {
+            variable_import_modal.LoadingOverlay('hide', true);
+            if (data['success'] === false) {
+                alert(data['errormsg']);
+            } else {
+                $('#import_tot_number').html('Total:\t' + data['tot_vars'] + ' Variables.');
+                $('#import_new_number').html('New:\t' + data['new_vars'] + ' Variables.');
+            }
+        });
+}
+
+/**
+ * Apply multi edit on selected variables.
+ * @param variables_table
+ * @param del
+ */
+function apply_multi_edit(variables_table, del = false) {
+    let page = $('body');
+    page.LoadingOverlay('show');
+    let change_type = $('#multi-change-type-input').val().trim();
+    let selected_vars = [];
+    variables_table.rows({selected: true}).every(function () {
+        let d = this.data();
+        selected_vars.push(d['name']);
+    });
+
+    // Update selected vars.
+    $.post("api/var/multi_update",
+        {
+            change_type: change_type,
+            selected_vars: JSON.stringify(selected_vars),
+            del: del
+        },
+        // Update requirements table on success or show an error message.
+        function (data) {
+            page.LoadingOverlay('hide', true);
+            if (data['success'] === false) {
+                alert(data['errormsg']);
+            } else {
+                location.reload();
+            }
+        });
+}
+
+/**
+ * Enable/disable the active variables (P, Q, R, ...) in the requirement modal based on scope and pattern.
+ */
+function update_displayed_constraint_inputs() {
+    $('.requirement_var_group').each(function () {
+        $(this).hide();
+    });
+
+    $('.formalization_card').each(function () {
+        // Fetch attributes
+        const formalization_id = $(this).attr('title');
+        const selected_scope = $('#requirement_scope' + formalization_id).val();
+        const selected_pattern = $('#requirement_pattern' + formalization_id).val();
+        let var_p = $('#requirement_var_group_p' + formalization_id);
+        let var_q = $('#requirement_var_group_q' + formalization_id);
+        let var_r = $('#requirement_var_group_r' + formalization_id);
+        let var_s = $('#requirement_var_group_s' + formalization_id);
+        let var_t = $('#requirement_var_group_t' + formalization_id);
+        let var_u = $('#requirement_var_group_u' + formalization_id);
+        let var_v = $('#requirement_var_group_v' + formalization_id);
+
+        switch (selected_scope) {
+            case 'BEFORE':
+            case 'AFTER':
+                var_p.show();
+                break;
+            case 'BETWEEN':
+            case 'AFTER_UNTIL':
+                var_p.show();
+                var_q.show();
+                break;
+            default:
+                break;
+        }
+
+        Object.keys(_PATTERNS[selected_pattern]['env']).forEach(function (key) {
+            switch (key) {
+                case 'R':
+                    var_r.show();
+                    break;
+                case 'S':
+                    var_s.show();
+                    break;
+                case 'T':
+                    var_t.show();
+                    break;
+                case 'U':
+                    var_u.show();
+                    break;
+                case 'V':
+                    var_v.show();
+                    break;
+            }
+        });
+    });
+}
+
+/**
+ * Updates the formalization textarea based on the selected scope and expressions in P, Q, R, S, T, U, V.
+ */
+function update_formalization() {
+    $('.formalization_card').each(function () {
+        // Fetch attributes
+        const formalization_id = $(this).attr('title');
+
+        let formalization = '';
+        const selected_scope = $('#requirement_scope' + formalization_id).find('option:selected').text().replace(/\s\s+/g, ' ');
+        const selected_pattern = $('#requirement_pattern' + formalization_id).find('option:selected').text().replace(/\s\s+/g, ' ');
+
+        if (selected_scope !== 'None' && selected_pattern !== 'None') {
+            formalization = selected_scope + ', ' + selected_pattern + '.';
+        }
+
+        // Update formalization with variables.
+        let var_p = $('#formalization_var_p' + formalization_id).val();
+        let var_q = $('#formalization_var_q' + formalization_id).val();
+        let var_r = $('#formalization_var_r' + formalization_id).val();
+        let var_s = $('#formalization_var_s' + formalization_id).val();
+        let var_t = $('#formalization_var_t' + formalization_id).val();
+        let var_u = $('#formalization_var_u' + formalization_id).val();
+        let var_v = $('#formalization_var_v' + formalization_id).val();
+
+        if (var_p.length > 0) {
+            formalization = formalization.replace(/{P}/g, var_p);
+        }
+        if (var_q.length > 0) {
+            formalization = formalization.replace(/{Q}/g, var_q);
+        }
+        if (var_r.length > 0) {
+            formalization = formalization.replace(/{R}/g, var_r);
+        }
+        if (var_s.length > 0) {
+            formalization = formalization.replace(/{S}/g, var_s);
+        }
+        if (var_t.length > 0) {
+            formalization = formalization.replace(/{T}/g, var_t);
+        }
+        if (var_u.length > 0) {
+            formalization = formalization.replace(/{U}/g, var_u);
+        }
+        if (var_v.length > 0) {
+            formalization = formalization.replace(/{V}/g, var_v);
+        }
+
+        $('#current_formalization_textarea' + formalization_id).val(formalization);
+
+        // Update visual representation of type inference errors.
+        let header = $('#formalization_heading' + formalization_id);
+        if (formalization_id in type_inference_errors) {
+            for (let i = 0; i < type_inference_errors[formalization_id].length; i++) {
+                $('#formalization_var_' + type_inference_errors[formalization_id][i] + formalization_id)
+                    .addClass('type-error');
+                header.addClass('type-error-head');
+            }
+        } else {
+            header.removeClass('type-error-head');
+        }
+    });
+    $('#variable_constraint_updated').val('true');
+}
+
+function delete_constraint(constraint_id) {
+    let requirement_modal_content = $('.modal-content');
+    requirement_modal_content.LoadingOverlay('show');
+    const var_name = $('#variable_name').val();
+    $.post("api/var/del_constraint",
+        {
+            name: var_name,
+            constraint_id: constraint_id
+        },
+        function (data) {
+            requirement_modal_content.LoadingOverlay('hide', true);
+            if (data['success'] === false) {
+                alert(data['errormsg']);
+            } else {
+                $('#formalization_accordion').html(data['html']);
+            }
+        }).done(function () {
+        update_displayed_constraint_inputs();
+        update_formalization();
+        bind_expression_buttons();
+    });
+}
+
+function bind_expression_buttons() {
+    $('.formalization_selector').change(function () {
+        update_displayed_constraint_inputs();
+        update_formalization();
+    });
+    $('.reqirement-variable, .req_var_type').change(function () {
+        update_formalization();
+    });
+
+    // $('.delete_formalization').confirmation({
+    //     rootSelector: '.delete_formalization'
+    // }).click(function () {
+    //     delete_constraint($(this).attr('name'));
+    // });
+
+    $('.delete_formalization').bootstrapConfirmButton({
+        onConfirm: function () {
+            delete_constraint($(this).attr('name'))
+        }
+    })
+}
+
+function add_constraint() {
+    // Request a new Constraint/Formalization. And add its edit elements to the modal.
+    let var_modal_content = $('.modal-content');
+    var_modal_content.LoadingOverlay('show');
+
+    // Get data.
+    const var_name = $('#variable_name').val();
+
+    // Store the variable.
+    $.post("api/var/new_constraint",
+        {
+            name: var_name
+        },
+        // Update var table on success or show an error message.
+        function (data) {
+            var_modal_content.LoadingOverlay('hide', true);
+            let constraint = $(data['html'])
+            if (data['success'] === false) {
+                alert(data['errormsg']);
+            } else {
+                constraint.appendTo('#formalization_accordion');
+            }
+        }).done(function () {
+        update_displayed_constraint_inputs();
+        update_formalization();
+        bind_expression_buttons();
+    });
+}
+
+function get_variable_constraints_html(var_name) {
+    $.post("api/var/get_constraints_html",
+        {
+            name: var_name
+        },
+        function (data) {
+            if (data['success'] === false) {
+                alert(data['errormsg']);
+            } else {
+                type_inference_errors = data.type_inference_errors;
+                $('#formalization_accordion').html(data['html']);
+            }
+        }).done(function () {
+        update_displayed_constraint_inputs();
+        update_formalization();
+        bind_expression_buttons();
+    });
+}
+
+function is_constraint_link(name) {
+    const regex = /^(Constraint_)(.*)(_[0-9]+$)/gm;
+    let result = null;
+    let match = regex.exec(name);
+
+    if (match !== null) {
+        result = match[2];
+    }
+
+    return result
+}
+
+/**
+ * Find the datatable row index for a variable by its name.
+ * @param {number} name the requirement id.
+ * @returns {number} row_index the datatables row index.
+ */
+function get_rowidx_by_var_name(name) {
+    let variables_table = $('#variables_table').DataTable();
+    let result = -1;
+    variables_table
+        .row(function (idx, data) {
+            if (data.name === name) {
+                result = idx;
+            }
+        });
+
+    return result;
+}
+
+/**
+ * Show / Hide Value CONST value input for variables.
+ * @param revert
+ */
+function show_variable_val_input(revert) {
+    if (revert === true) {
+        $('#variable_value_form_group').hide();
+    } else {
+        $('#variable_value_form_group').show();
+    }
+}
+
+function show_belongs_to_enum_input(revert = false) {
+    if (revert === true) {
+        $('#variable_belongs_to_form_group').hide();
+    } else {
+        $('#variable_belongs_to_form_group').show();
+    }
+}
+
+function show_enumerators_in_modal(revert = false) {
+    if (revert === true) {
+        $('.enum-controls').hide();
+    } else {
+        $('.enum-controls').show();
+    }
+}
+
+function load_enumerators_to_modal(var_name) {
+    $.post("api/var/get_enumerators",
+        {
+            name: var_name
+        },
+        function (data) {
+            if (data['success'] === false) {
+                alert(data['errormsg']);
+            } else {
+                // Remove prefix from Enumerators for display.
+                $.each(data['enumerators'], function (index, item) {
+                    const stripped_name = item[0].substr(var_name.length + 1);
+                    add_enumerator_template(stripped_name, item[1]);
+                })
+            }
+        }).done(function () {
+        update_displayed_constraint_inputs();
+        update_formalization();
+        bind_expression_buttons();
+    });
+}
+
+function load_variable(row_idx) {
+    // Get row data
+    let data = $('#variables_table').DataTable().row(row_idx).data();
+
+    // Prepare requirement Modal
+    let var_modal_content = $('.modal-content');
+    show_variable_val_input(true);
+    show_enumerators_in_modal(true);
+    show_belongs_to_enum_input(true);
+    // $('#variable_modal').modal('show');
+    Modal.getOrCreateInstance(document.getElementById('variable_modal')).show();
+
+    // Meta information
+    $('#modal_associated_row_index').val(row_idx);
+    $('#variable_name_old').val(data.name);
+    $('#variable_type_old').val(data.type);
+    $('#occurences').val(data.used_by);
+
+    // Visible information
+    $('#variable_modal_title').html('Variable: ' + data.name);
+    $('#variable_name').val(data.name);
+
+    let type_input = $('#variable_type');
+    let variable_value = $('#variable_value');
+    let variable_value_old = $('#variable_value_old');
+    let belongs_to_enum = $('#belongs_to_enum');
+    let belongs_to_enum_old = $('#belongs_to_enum_old');
+    let enumerators = $('#enumerators');
+
+    type_input.val(data.type);
+    variable_value.val('');
+    variable_value_old.val('');
+    belongs_to_enum.val('');
+    belongs_to_enum_old.val('');
+    enumerators.html('');
+
+    if (data.type === 'CONST' || data.type === 'ENUMERATOR_INT' || data.type === 'ENUMERATOR_REAL') {
+        show_variable_val_input();
+        variable_value.val(data.const_val);
+        variable_value_old.val(data.const_val);
+    }
+    if (data.type === 'ENUMERATOR_INT' || data.type === 'ENUMERATOR_REAL') {
+        show_belongs_to_enum_input();
+        belongs_to_enum.val(data.belongs_to_enum);
+        belongs_to_enum_old.val(data.belongs_to_enum);
+    }
+    if (data.type === 'ENUM_REAL' || data.type === 'ENUM_INT') {
+        show_enumerators_in_modal();
+        load_enumerators_to_modal(data.name);
+    }
+
+    type_input.autocomplete({
+        minLength: 0,
+        source: available_types
+    }).on('focus', function () {
+        $(this).keydown();
+    });
+
+    // Load constraints
+    get_variable_constraints_html(data.name);
+
+    var_modal_content.LoadingOverlay('hide');
+}
+
+function add_variable_via_modal() {
+    const new_variable_name = $('#new_variable_name').val();
+    const new_variable_type = $('#new_variable_type').val();
+    const new_variable_value = $('#new_variable_const_value').val();
+    $.post("api/var/add_new_variable",
+        {
+            name: new_variable_name,
+            type: new_variable_type,
+            value: new_variable_value
+        },
+        function (data) {
+            if (data['success'] === false) {
+                alert(data['errormsg']);
+            } else {
+                location.reload();
+            }
+        });
+}
+
+function add_enumerator_template(name, value) {
+    const enumerator_template = `
+        <div class="input-group enumerator-input">
+            <span class="input-group-prepend input-group-text">Name</span>
+            <input class="form-control enum_name_input" type="text" value="${name}">
+            <span class="input-group-prepend input-group-text">Value</span>
+            <input class="form-control enum_value_input" type="number" step="any" value="${value}">
+            <buttton type="button" class="btn btn-danger input-group-append del_enum" data-name="${name}">Delete</buttton>
+        </div>`;
+    $('#enumerators').append(enumerator_template);
+}
+
+function delete_enumerator(enum_name, enumerator_name, enum_dom) {
+    let var_modal = $('#variable_modal');
+    var_modal.LoadingOverlay('show');
+    $.post("api/var/del_var",
+        {
+            name: enum_name + '_' + enumerator_name
+        },
+        function (data) {
+            var_modal.LoadingOverlay('hide', true);
+            if (data['success'] === false) {
+                alert(data['errormsg']);
+            } else {
+                enum_dom.remove();
+            }
+        });
+}
+
+/**
+ * Test if pasted_text has the form:
+ * foo<TAB>12
+ * bar<TAB>42
+ *
+ * @param pasted_text
+ * @returns {boolean}
+ */
+function has_smart_input_form(pasted_text) {
+    const array_of_lines = pasted_text.match(/[^\r\n]+/g);
+    if (array_of_lines.length <= 0) {
+        return false;
+    }
+
+    for (const line of array_of_lines) {
+        const line_splits = line.match(/[^\t]+/g);
+        if (line_splits.length !== 2) {
+            return false;
+        }
+        if (isNaN(line_splits[1])) {
+            return false;
+        }
+    }
+    return true;
+}
+
+/**
+ * Create a 2D array from input like
+ *   foo<TAB>12
+ *   bar<TAB>42
+ *
+ *  -> [[foo, 12], [bar, 42]]
+ * @param pasted_text
+ * @returns {Array}
+ */
+function get_smart_input_array(pasted_text) {
+    const array_of_lines = pasted_text.match(/[^\r\n]+/g);
+    let result = [];
+    for (const line of array_of_lines) {
+        const line_splits = line.match(/[^\t]+/g);
+        result.push([line_splits[0], line_splits[1]]);
+    }
+    return result;
+}
+
+/**
+ * Show the value input for new consts if type CONST is selected.
+ */
+function update_new_var_const_value_input() {
+    const current_type = $('#new_variable_type').val();
+    let value_input = $('#new_variable_const_input');
+    current_type === 'CONST' ? value_input.show() : value_input.hide();
+}
+
+$(document).ready(function () {
+    // Prepare and load the variables table.
+    let variables_table = $('#variables_table').DataTable({
+        "paging": true,
+        "stateSave": true,
+        "select": {
+            style: 'os',
+            selector: 'td:first-child'
+        },
+        "pageLength": 50,
+        "responsive": true,
+        "lengthMenu": [[10, 50, 100, 500, -1], [10, 50, 100, 500, "All"]],
+        "dom": 'rt<"container"<"row"<"col-md-6"li><"col-md-6"p>>>',
+        "serverSide": true,
+        "processing": true,
+        "ajax": {
+            "url": "api/var/gets",
+            "data": function (data) {
+                // Hanfor specific table filtering, applied by the server.
+                data.search_query = var_search_string;
+                data.visible_columns = JSON.stringify(visible_columns);
+            },
+            "dataSrc": function (json) {
+                $.each(json.types, function (index, type) {
+                    if (available_types.indexOf(type) <= -1) {
+                        available_types.push(type);
+                    }
+                });
+                return json.data;
+            }
+        },
+        "columns": [
+            {
+                "orderable": false,
+                "className": 'select-checkbox',
+                "targets": [0],
+                "data": null,
+                "defaultContent": ""
+            },
+            {
+                "data": "name",
+                "targets": [1],
+                "render": function (data) {
+                    return '<a class="modal-opener" href="#">' + data + '</span></br>';
+                }
+            },
+            {
+                "data": "type",
+                "targets": [2],
+                "render": function (data, type, row) {
+                    if (data !== null && available_types.indexOf(data) <= -1) {
+                        available_types.push(data);
+                    }
+                    if (data !== null && data === 'CONST') {
+                        data = data + ' (' + row['const_val'] + ')';
+                    }
+                    return data;
+                }
+            },
+            {
+                "data": "constraints",
+                "targets": [3],
+                "render": function (data) {
+                    let result = '';
+
+                    $(data).each(function (id, name) {
+                        if (name.length > 0) {
+                            result += name;
+                        }
+                    });
+                    return result;
+                }
+            },
+            {
+                "data": "tags",
+                "targets": [4],
+                "render": function (data) {
+                    let result = '';
+
+                    $(data).each(function (id, name) {
+                        if (name.length > 0) {
+                            result += '<span class="badge bg-danger">' + name +
+                            '</span>';
+                        }
+                    });
+                    return result;
+                }
+            },
+            {
+                "data": "used_by",
+                "targets": [5],
+                "render": function (data, type, row) {
+                    let result = '';
+                    let search_all = '';
+                    $(data).each(function (id, name) {
+                        if (name.length > 0 && !is_constraint_link(name)) {
+                            let search_query = '?command=search&col=2&q=%5C%22' + name + '%5C%22';
+                            result += '<span class="badge bg-info">' +
+                                '<a href="./' + search_query + '" target="_blank" class="link-light">' + name + '</a>' +
+                                '</span> ';
+                            if (search_all.length > 0) {
+                                /* ToDo: Simplify search query */
+                                search_all += '%3AOR%3A' + '%3ACOL_INDEX_02%3A' + '%5C%22' + name + '%5C%22';
+                            } else {
+                                search_all += search_query;
+                            }
+                        }
+                    });
+                    if (result.length < 1) {
+                        result += '<span class="badge bg-warning">' +
+                            'unused' +
+                            '</span></br>';
+                    } else {
+                        if (data.length > 1) {
+                            result += '<span class="badge bg-info">' +
+                                '<a href="./' + search_all + '" target="_blank" class="link-light">Show all</a>' +
+                                '</span> ';
+                        }
+                    }
+                    return result;
+                }
+
+            },
+            {
+                "data": "script_results",
+                "targets": [6],
+                "render": function (data) {
+                    return data;
+                }
+            },
+            {
+                "data": "used_by",
+                "targets": [7],
+                "visible": false,
+                "searchable": false,
+                "render": function (data) {
+                    let result = '';
+                    $(data).each(function (id, name) {
+                        if (name.length > 0) {
+                            if (result.length > 1) {
+                                result += ', '
+                            }
+                            result += name;
+                        }
+                    });
+                    return result;
+                }
+            }
+        ],
+        infoCallback: function (settings, start, end, max, total) {
+            let api = this.api();
+            let pageInfo = api.page.info();
+
+            $('#clear-all-filters-text').html("Showing " + total + "/" + pageInfo.recordsTotal + ". Clear all.");
+
+            let result = "Showing " + start + " to " + end + " of " + total + " entries";
+            result += " (filtered from " + pageInfo.recordsTotal + " total entries).";
+
+            return result;
+        },
+        initComplete: function () {
+            $('#search_bar').val(var_search_string);
+            $('.variable_link').click(function (event) {
+                event.preventDefault();
+                load_variable(get_rowidx_by_var_name($(this).data('name')));
+            });
+
+            utils.process_url_query(get_query);
+            update_search();
+
+            this.api().draw();
+        }
+    });
+    variables_table.column(6).visible(false);
+    variables_table.column(7).visible(false);
+
+    new $.fn.dataTable.ColReorder(variables_table, {});
+
+    let search_bar = $('#search_bar');
+    // Init search Bar Autocomplete
+    new Awesomplete(search_bar[0], {
+        filter: function (text, input) {
+            let result = false;
+            // If we have an uneven number of ":"
+            // We check if we have a match in the input tail starting from the last ":"
+            if ((input.split(":").length - 1) % 2 === 1) {
+                result = Awesomplete.FILTER_CONTAINS(text, input.match(/[^:]*$/)[0]);
+            }
+            return result;
+        },
+        item: function (text, input) {
+            // Match inside ":" enclosed item.
+            return Awesomplete.ITEM(text, input.match(/(:)([\S]*$)/)[2]);
+        },
+        replace: function (text) {
+            // Cut of the tail starting from the last ":" and replace by item text.
+            const before = this.input.value.match(/(.*)(:(?!.*:).*$)/)[1];
+            this.input.value = before + text;
+        },
+        list: search_autocomplete,
+        minChars: 1,
+        autoFirst: true
+    });
+
+    // Bind big custom searchbar to search the table.
+    search_bar.keypress(function (e) {
+        if (e.which === 13) { // Search on enter.
+            update_search();
+            variables_table.draw();
+        }
+    });
+
+    // Add listener for variable link to modal.
+    $('#variables_table  tbody').on('click', 'a.modal-opener', function (event) {
+        // prevent body to be scrolled to the top.
+        event.preventDefault();
+        let row_idx = variables_table.row($(event.target).parent()).index();
+        load_variable(row_idx);
+    });
+
+    // Store changes on variable on save.
+    $('#save_variable_modal').click(function () {
+        store_variable(variables_table);
+    });
+
+    $('#variable_type').on('keyup change autocompleteclose', function () {
+        if ($(this).val() === 'CONST') {
+            show_variable_val_input();
+        } else {
+            show_variable_val_input(true);
+        }
+        if ($(this).val() === 'ENUMERATOR_INT' || $(this).val() === 'ENUMERATOR_REAL') {
+            show_belongs_to_enum_input();
+            show_variable_val_input();
+        } else {
+            show_belongs_to_enum_input(true)
+        }
+        if ($(this).val() === 'ENUM_INT' || $(this).val() === 'ENUM_REAL') {
+            show_enumerators_in_modal();
+        } else {
+            show_enumerators_in_modal(true);
+        }
+    });
+
+    // Add listener for importing variables from existing sessions/revisions
+    $('.import_link').on('click', function () {
+        const sess_name = $(this).attr('data-name');
+        const sess_revision = $(this).attr('data-revision');
+
+        open_import_modal(sess_name, sess_revision);
+    });
+
+    $('#start_variable_import_session').click(function () {
+        start_import_session();
+    });
+
+    // Multiselect.
+    // Select single rows
+    $('.select-all-button').on('click', function () {
+        // Toggle selection on
+        if ($(this).hasClass('btn-secondary')) {
+            variables_table.rows({page: 'current'}).select();
+        } else { // Toggle selection off
+            variables_table.rows({page: 'current'}).deselect();
+        }
+        // Toggle button state.
+        $('.select-all-button').toggleClass('btn-secondary btn-primary');
+    });
+
+    // Toggle "Select all rows to `off` on user specific selection."
+    variables_table.on('user-select', function () {
+        let select_buttons = $('.select-all-button');
+        select_buttons.removeClass('btn-primary');
+        select_buttons.addClass('btn-secondary ');
+    });
+
+    // Bind autocomplete for "edit-selected" types
+    $('#multi-change-type-input').autocomplete({
+        minLength: 0,
+        source: available_types,
+        delay: 100
+    }).on('focus', function () {
+        $(this).keydown();
+    }).val('');
+
+    $('.apply-multi-edit').click(function () {
+        apply_multi_edit(variables_table);
+    });
+
+    // Multi Delete variables.
+    // $('.delete_button').confirmation({
+    //     rootSelector: '.delete_button'
+    // }).click(function () {
+    //     apply_multi_edit(variables_table, true);
+    // });
+
+    $('body').on('click', '.delete_button', function () {
+        const element = $(this)
+
+        if (element.data('html') === undefined) {
+            element.outerWidth(element.outerWidth()).data('html', element.html()).html('Do it!')
+
+            setTimeout(function () {
+                element.html(element.data('html')).removeData('html').outerWidth('')
+            }, 2000)
+        } else {
+            element.html(element.data('html')).removeData('html').outerWidth('')
+            apply_multi_edit(variables_table, true)
+        }
+    })
+
+    // Add new Constraint
+    $('#add_constraint').click(function () {
+        add_constraint();
+    });
+
+    // Add new variable via modal.
+    $('#save_new_variable_modal').click(function () {
+        add_variable_via_modal();
+    });
+
+    // Add new enumerator from emum modal
+    $('#add_enumerator').click(function () {
+        add_enumerator_template('');
+    });
+
+    // Delete enumerator via the enum modal.
+    $('#enumerators').on('click', '.del_enum', function () {
+        const enumerator_name = $(this).attr('data-name');
+        const enum_name = $('#variable_name_old').val();
+        let enum_dom = $(this).parent('.enumerator-input');
+        if (enumerator_name.length === 0) {
+            enum_dom.remove();
+        } else {
+            delete_enumerator(enum_name, enumerator_name, enum_dom);
+        }
+    }).on('paste', '.enum_name_input', function (e) {
+        let pasted_text = e.originalEvent.clipboardData.getData('text');
+
+        if (has_smart_input_form(pasted_text)) {
+            console.log('has smart input form');
+            const smart_input_array = get_smart_input_array(pasted_text);
+            console.log(smart_input_array);
+            for (const line of smart_input_array) {
+                add_enumerator_template(line[0], line[1]);
+            }
+            e.preventDefault();
+        }
+    });
+
+    $('#generate_req').click(function () {
+        $('#generate_req_form').submit();
+    });
+
+    // Clear all applied searches.
+    $('.clear-all-filters').click(function () {
+        $('#search_bar').val('').effect("highlight", {color: 'green'}, 500);
+        update_search();
+        variables_table.draw();
+    });
+
+    //$('#variable_new_vaiable_modal').on('show.bs.modal change', function () {
+    //    update_new_var_const_value_input();
+    //})
+    $('#variable_new_vaiable_modal')[0].addEventListener('show.bs.modal', function () {
+        update_new_var_const_value_input();
+    });
+    $('#new_variable_type').on('change', function () {
+        update_new_var_const_value_input();
+    });
+
+    $('#import-variables-from-csv-input').change(function () {
+        const file_reader = new FileReader()
+        file_reader.onload = function () {
+            $.ajax({
+                type: 'POST', url: 'api/var/import_csv', data: {
+                    variables_csv_str: file_reader.result
+                }, success: function (response) {
+                    if (response['success'] === false) {
+                        alert(response['errormsg'])
+                        return
+                    }
+
+                    location.reload();
+                }
+            })
+        }
+
+        file_reader.readAsText($('#import-variables-from-csv-input').prop('files')[0]);
+    })
+});
+
+}},a={};function n(e){var r=a[e];if(void 0!==r)return r.exports;var o=a[e]={id:e,exports:{}};return t[e].call(o.exports,o,o.exports,n),o.exports}n.m=t,e=[],n.O=(t,a,r,o)=>{if(!a){var l=1/0;for(u=0;u<e.length;u++){for(var[a,r,o]=e[u],i=!0,s=0;s<a.length;s++)(!1&o||l>=o)&&Object.keys(n.O).every((e=>n.O[e](a[s])))?a.splice(s--,1):(i=!1,o<l&&(l=o));if(i){e.splice(u--,1);var c=r();void 0!==c&&(t=c)}}return t}o=o||0;for(var u=e.length;u>0&&e[u-1][2]>o;u--)e[u]=e[u-1];e[u]=[a,r,o]},n.n=e=>{var t=e&&e.__esModule?()=>e.default:()=>e;return n.d(t,{a:t}),t},n.d=(e,t)=>{for(var a in t)n.o(t,a)&&!n.o(e,a)&&Object.defineProperty(e,a,{enumerable:!0,get:t[a]})},n.o=(e,t)=>Object.prototype.hasOwnProperty.call(e,t),n.r=e=>{"undefined"!=typeof Symbol&&Symbol.toStringTag&&Object.defineProperty(e,Symbol.toStringTag,{value:"Module"}),Object.defineProperty(e,"__esModule",{value:!0})},n.j=565,(()=>{var e={565:0};n.O.j=t=>0===e[t];var t=(t,a)=>{var r,o,[l,i,s]=a,c=0;if(l.some((t=>0!==e[t]))){for(r in i)n.o(i,r)&&(n.m[r]=i[r]);if(s)var u=s(n)}for(t&&t(a);c<l.length;c++)o=l[c],n.o(e,o)&&e[o]&&e[o][0](),e[o]=0;return n.O(u)},a=self.webpackChunkhanfor=self.webpackChunkhanfor||[];a.forEach(t.bind(null,0)),a.push=t.bind(null,a.push.bind(a))})(),n.nc=void 0;var r=n.O(void 0,[351],(()=>n(6052)));r=n.O(r)})();
\ No newline at end of file
@@ -46,5 +46,18 @@ function process_url_query(get_query) {
     }
 }
 
+/**
+ * Fetch the ids of all requirements matching the current search and filters of the requirements table.
+ * The table is processed server side, so only the rows of the current page are loaded.
+ * @param requirements_table The requirements table.
+ * @param callback Called with the list of requirement ids.
+ */
+function fetch_filtered_requirement_ids(requirements_table, callback) {
+    $.get('api/req/gets', Object.assign({}, requirements_table.ajax.params(), {ids_only: true}), function (data) {
+        callback(data['ids']);
+    });
+}
+
 module.exports.escapeHtml = escapeHtml;
+module.exports.fetch_filtered_requirement_ids = fetch_filtered_requirement_ids;
 module.exports.process_url_query = process_url_query;
\ No newline at end of file
@@ -146,8 +146,25 @@ function init_datatable(columnDefs) {
         "pageLength": 50,
         "lengthMenu": [[10, 50, 100, 500, -1], [10, 50, 100, 500, "All"]],
         "dom": 'rt<"container"<"row"<"col-md-6"li><"col-md-6"p>>>',
-        "ajax": "api/req/gets",
-        "deferRender": true,
+        "serverSide": true,
+        "processing": true,
+        "ajax": {
+            "url": "api/req/gets",
+            "data": function (data) {
+                // Hanfor specific requirements table filtering, applied by the server.
+                data.search_query = req_search_string;
+                data.filter_query = JSON.stringify(filter_search_array);
+                data.visible_columns = JSON.stringify(visible_columns);
+            },
+            "dataSrc": function (json) {
+                $.each(json.types, function (index, type) {
+                    if (available_types.indexOf(type) <= -1) {
+                        available_types.push(type);
+                    }
+                });
+                return json.data;
+            }
+        },
         "columnDefs": columnDefs,
         "createdRow": function (row, data) {
             if (data['type'] === 'Heading') {
@@ -189,13 +206,6 @@ function init_datatable(columnDefs) {
             update_search();
             update_filter();
 
-            // Enable Hanfor specific requirements table filtering.
-            $.fn.dataTable.ext.search.push(function (settings, data) {
-                // data contains the row. data[0] is the content of the first column in the actual row.
-                // Return true to include the row into the data. false to exclude.
-                return evaluate_search(data);
-            });
-
             this.api().draw();
 
         }
@@ -203,10 +213,6 @@ function init_datatable(columnDefs) {
     new $.fn.dataTable.ColReorder(table, {});
 }
 
-function evaluate_search(data) {
-    return search_tree.evaluate(data, visible_columns) && filter_tree.evaluate(data, visible_columns);
-}
-
 /**
  * Bind the requirements table manipulators to the table.
  * Initialize manipulators behaviour.
@@ -269,33 +275,24 @@ function init_datatable_manipulators(requirements_table) {
 
     // Listen for tool section triggers.
     $('#gen-req-from-selection').click(function () {
-        let req_ids = [];
-        requirements_table.rows({search: 'applied'}).every(function () {
-            let d = this.data();
-            req_ids.push(d['id']);
+        utils.fetch_filtered_requirement_ids(requirements_table, function (req_ids) {
+            $('#selected_requirement_ids').val(JSON.stringify(req_ids));
+            $('#generate_req_form').submit();
         });
-        $('#selected_requirement_ids').val(JSON.stringify(req_ids));
-        $('#generate_req_form').submit();
     });
 
     $('#gen-csv-from-selection').click(function () {
-        let req_ids = [];
-        requirements_table.rows({search: 'applied'}).every(function () {
-            let d = this.data();
-            req_ids.push(d['id']);
+        utils.fetch_filtered_requirement_ids(requirements_table, function (req_ids) {
+            $('#selected_csv_requirement_ids').val(JSON.stringify(req_ids));
+            $('#generate_csv_form').submit();
         });
-        $('#selected_csv_requirement_ids').val(JSON.stringify(req_ids));
-        $('#generate_csv_form').submit();
     });
 
     $('#gen-xls-from-selection').click(function () {
-        let req_ids = [];
-        requirements_table.rows({search: 'applied'}).every(function () {
-            let d = this.data();
-            req_ids.push(d['id']);
+        utils.fetch_filtered_requirement_ids(requirements_table, function (req_ids) {
+            $('#selected_xls_requirement_ids').val(JSON.stringify(req_ids));
+            $('#generate_xls_form').submit();
         });
-        $('#selected_xls_requirement_ids').val(JSON.stringify(req_ids));
-        $('#generate_xls_form').submit();
     });
 
     // Column toggling
@@ -711,18 +708,41 @@ function add_top_guess_to_selected_requirements(requirements_table) {
  * =====================================================================================================================
  */
 
+// Id of the newest activity log entry shown, entries after it are fetched on update.
+let log_cursor = null;
+
 /**
- * Refresh the hanfor frontend logs.
+ * Render one activity log entry: `[timestamp] action rid_1, rid_2`.
+ * @param {Object} entry activity log entry with timestamp, action and rids.
+ * @returns {jQuery} the entry paragraph.
+ */
+function render_log_entry(entry) {
+    let paragraph = $('<p></p>').text(`[${entry['timestamp']}] ${entry['action']}`);
+    entry['rids'].forEach(function (rid, index) {
+        paragraph.append(index > 0 ? ', ' : ' ');
+        $('<a class="req_direct_link" href="#"></a>').text(rid).attr('data-rid', rid).click(function () {
+            load_requirement(get_rowidx_by_reqid($(this).data('rid')));
+        }).appendTo(paragraph);
+    });
+    return paragraph;
+}
+
+/**
+ * Refresh the hanfor frontend logs. Only fetches the entries added since the last refresh.
  */
 function update_logs() {
-    $.get("api/logs/get", '', function (data) {
-        $('#log_textarea').html(data);
-    }).done(function () {
-        // Bind direct requirement links to load the modal.
-        $('.req_direct_link').click(function () {
-            load_requirement(get_rowidx_by_reqid($(this).data("rid")));
+    $.get('api/logs/get', log_cursor === null ? {} : {since: log_cursor}, function (data) {
+        let log_textarea = $('#log_textarea');
+        if (log_cursor === null || data['cursor'] < log_cursor) {
+            log_textarea.empty();
+        }
+        log_cursor = data['cursor'];
+        data['entries'].forEach(function (entry) {
+            log_textarea.append(render_log_entry(entry));
         });
-        $('#log_textarea').scrollTop(100000);
+        // Keep the retained entries only.
+        log_textarea.children().slice(0, -data['retention']).remove();
+        log_textarea.scrollTop(100000);
     });
 }
 
@@ -1382,37 +1402,41 @@ function load_reports() {
 /**
  * Evaluate the report queries given by the report_query_textarea.
  * Paste the result into the report_results_textarea.
- * @TODO: the .draw() method is potentially overkill, since it will render the whole datatable.
- * So look into callstack and only apply necessary steps to evaluate the new search tree.
- * (.search() would not work since we use our own plugin to support the search expression parsing.)
+ * The number of matching requirements of each query is counted by the server (with the filters of the table applied).
  */
 function evaluate_report() {
     let body = $('body');
     body.LoadingOverlay('show');
     const report_querys = $('#report_query_textarea').val().split('\n');
     let reqTable = $('#requirements_table').DataTable();
-    let results = '';
     const regex = /^(:NAME:)(`(\w+)`)(.*)/;
-    try {
-        $.each(report_querys, function (id, report_query) {
-            // Test if there is a named query.
-            let match = regex.exec(report_query);
-            if (match != null) {
-                report_query = match[4];
-                id = match[3];
-            }
-            search_tree = SearchNode.fromQuery(report_query);
-            reqTable.draw();
-            let result = reqTable.page.info();
-            results += `"${id}":\t${result.recordsDisplay}\n`;
+    let names = [];
+    let requests = [];
+    $.each(report_querys, function (id, report_query) {
+        // Test if there is a named query.
+        let match = regex.exec(report_query);
+        if (match != null) {
+            report_query = match[4];
+            id = match[3];
+        }
+        names.push(id);
+        requests.push($.get('api/req/gets', Object.assign({}, reqTable.ajax.params(), {
+            search_query: report_query, start: 0, length: 0
+        })));
+    });
+    $.when.apply($, requests).done(function () {
+        // With a single request the arguments are the ones of that request, not one array per request.
+        let responses = requests.length === 1 ? [arguments] : arguments;
+        let results = '';
+        $.each(responses, function (index, response) {
+            results += `"${names[index]}":\t${response[0].recordsFiltered}\n`;
         });
         $('#report_results_textarea').val(results).change();
-        update_search();
-        reqTable.draw();
-    } catch (err) {
-        alert(err);
-    }
-    body.LoadingOverlay('hide', true);
+    }).fail(function (jqXHR) {
+        alert(jqXHR.responseJSON ? jqXHR.responseJSON['errormsg'] : jqXHR.statusText);
+    }).always(function () {
+        body.LoadingOverlay('hide', true);
+    });
 }
 
 /**
@@ -22,11 +22,25 @@ function init_simulator_tab() {
     })
 
     create_btn.click(function () {
+        const progress_id = Date.now().toString(36) + Math.random().toString(36).substring(2)
+        const create_btn_text = create_btn.text()
+        create_btn.prop('disabled', true)
+
+        // Poll the progress of building the phase event automata while the simulator is created.
+        const progress_timer = setInterval(function () {
+            $.get('simulator', {command: 'get_progress', progress_id: progress_id}, function (response) {
+                if (response.success === true) {
+                    create_btn.text(`${create_btn_text} (${response.data.done}/${response.data.total})`)
+                }
+            })
+        }, 500)
+
         $.ajax({
-            type: 'POST', url: 'simulator', async: false, data: { // TODO: Allow async.
+            type: 'POST', url: 'simulator', data: {
                 command: 'create_simulator',
                 simulator_name: name_input.val() || 'unnamed',
-                requirement_ids: JSON.stringify(get_selected_requirement_ids(requirements_table))
+                requirement_ids: JSON.stringify(get_selected_requirement_ids(requirements_table)),
+                progress_id: progress_id
             }, success: function (response) {
                 if (response.success === false) {
                     alert(response.errormsg)
@@ -34,6 +48,10 @@ function init_simulator_tab() {
                 }
 
                 update_simulator_select(simulator_select, response.data, true)
+            }, complete: function () {
+                clearInterval(progress_timer)
+                create_btn.text(create_btn_text)
+                create_btn.prop('disabled', false)
             }
         })
     })
@@ -13,42 +13,26 @@ require('./bootstrap-confirm-button');
 // Globals
 let available_types = ['bool', 'int', 'real', 'unknown', 'CONST', 'ENUM', 'ENUMERATOR'];
 let global_changes = false;
-const { SearchNode } = require('./datatables-advanced-search.js');
 let var_import_search_string = sessionStorage.getItem('var_import_search_string');
-let search_tree = undefined;
 let visible_columns = [true, true, true, true, true, true];
 
 
 /**
- * Apply search tree on datatables data.
- * @param data
- * @returns {bool|XPathResult}
- */
-function evaluate_search(data){
-    return search_tree.evaluate(data, visible_columns);
-}
-
-/**
- * Update the search expression tree.
+ * Update the search query sent with each table request (the search is applied by the backend).
  */
 function update_search() {
     var_import_search_string = $('#search_bar').val().trim();
     sessionStorage.setItem('var_import_search_string', var_import_search_string);
-    search_tree = SearchNode.fromQuery(var_import_search_string);
 }
 
-function load_enumerators_to_modal(var_name, var_import_table) {
+function load_enumerators_to_modal(data) {
     let enum_div = $('#enumerators');
     enum_div.html('');
     let enum_html = '';
-    var_import_table.rows( ).every( function () {
-        let data = this.data();
-        if ((var_name.length < data.name.length) && data.name.startsWith(var_name)) {
-            if (typeof(data.result.name) !== 'undefined') {
-                enum_html += '<p><code>' + data.name + '</code> : <code>' + data.result.const_val + '</code></p>';
-            }
-        }
-    });
+    // The enumerators of the result enum are listed by the backend.
+    for (const enumerator of (data.enumerators || [])) {
+        enum_html += '<p><code>' + enumerator.name + '</code> : <code>' + enumerator.const_val + '</code></p>';
+    }
 
     enum_div.html(enum_html);
 }
@@ -159,7 +143,7 @@ function load_modal(data, var_import_table, type) {
     } else if (var_object.type === 'ENUM') {
         enum_controls.show();
         $('#enumerators').html('');
-        load_enumerators_to_modal(var_object.name, var_import_table);
+        load_enumerators_to_modal(data);
     }
 
     load_constraints_to_container(data, var_object, constraints_container, type);
@@ -196,7 +180,7 @@ function redraw_table(var_import_table) {
 }
 
 
-function modify_row_by_action(row, action, redraw = true, store = true) {
+function modify_row_by_action(row, action, store = true) {
     let data = row.data();
     if ((action === 'source') && (data.action !== 'source')) {
         if (typeof(data.source.name) !== 'undefined') {
@@ -218,11 +202,7 @@ function modify_row_by_action(row, action, redraw = true, store = true) {
         data.available_constraints[key].to_result = constraint.origin === action;
     }
 
-    if (redraw) {
-        row.data(data).draw('full-hold');
-    } else {
-        row.data(data);
-    }
+    row.data(data);
     if (store) {
         store_changes(data);
     }
@@ -241,9 +221,8 @@ function get_selected_vars(variables_table) {
 
 function apply_multiselect_action(var_import_table, action) {
     var_import_table.rows( {selected:true} ).every( function () {
-        modify_row_by_action(this, action, false, false);
+        modify_row_by_action(this, action, false);
     });
-    // redraw_table(var_import_table);
     store_changes();
 }
 
@@ -315,12 +294,13 @@ function store_changes(data = false) {
         {
             rows: rows
         },
-        // Update requirements table on success or show an error message.
+        // Reload the table page on success or show an error message.
         function( data ) {
             body.LoadingOverlay('hide', true);
             if (data['success'] === false) {
                 alert(data['errormsg']);
             }
+            redraw_table($( '#var_import_table' ).DataTable());
     });
 }
 
@@ -387,8 +367,14 @@ $(document).ready(function() {
         "responsive": true,
         "lengthMenu": [[10, 50, 100, 500, -1], [10, 50, 100, 500, "All"]],
         "dom": 'rt<"container"<"row"<"col-md-6"li><"col-md-6"p>>>',
-        "ajax": "api/" + session_id + "/get_table_data",
-        "deferRender": true,
+        "serverSide": true,
+        "ajax": {
+            "url": "api/" + session_id + "/get_table_data",
+            "data": function ( d ) {
+                d.search_query = var_import_search_string || '';
+                d.visible_columns = JSON.stringify(visible_columns);
+            }
+        },
         "rowId": 'name',
         "columns": [
             {
@@ -524,16 +510,6 @@ $(document).ready(function() {
             $('#search_bar').val(var_import_search_string);
 
             update_search();
-
-            // Enable Hanfor specific table filtering.
-            $.fn.dataTable.ext.search.push(
-                function( settings, data, dataIndex ) {
-                    // data contains the row. data[0] is the content of the first column in the actual row.
-                    // Return true to include the row into the data. false to exclude.
-                    return evaluate_search(data);
-                }
-            );
-
             this.api().draw();
 
         }
@@ -31,15 +31,6 @@ let search_tree = undefined;
 let visible_columns = [true, true, true, true, true];
 let get_query = JSON.parse(search_query); // search_query is set in layout.html
 
-/**
- * Apply search tree on datatables data.
- * @param data
- * @returns {bool|XPathResult}
- */
-function evaluate_search(data) {
-    return search_tree.evaluate(data, visible_columns);
-}
-
 /**
  * Update the search expression tree.
  */
@@ -707,8 +698,24 @@ $(document).ready(function () {
         "responsive": true,
         "lengthMenu": [[10, 50, 100, 500, -1], [10, 50, 100, 500, "All"]],
         "dom": 'rt<"container"<"row"<"col-md-6"li><"col-md-6"p>>>',
-        "ajax": "api/var/gets",
-        "deferRender": true,
+        "serverSide": true,
+        "processing": true,
+        "ajax": {
+            "url": "api/var/gets",
+            "data": function (data) {
+                // Hanfor specific table filtering, applied by the server.
+                data.search_query = var_search_string;
+                data.visible_columns = JSON.stringify(visible_columns);
+            },
+            "dataSrc": function (json) {
+                $.each(json.types, function (index, type) {
+                    if (available_types.indexOf(type) <= -1) {
+                        available_types.push(type);
+                    }
+                });
+                return json.data;
+            }
+        },
         "columns": [
             {
                 "orderable": false,
@@ -848,15 +855,6 @@ $(document).ready(function () {
             utils.process_url_query(get_query);
             update_search();
 
-            // Enable Hanfor specific table filtering.
-            $.fn.dataTable.ext.search.push(
-                function (settings, data) {
-                    // data contains the row. data[0] is the content of the first column in the actual row.
-                    // Return true to include the row into the data. false to exclude.
-                    return evaluate_search(data);
-                }
-            );
-
             this.api().draw();
         }
     });
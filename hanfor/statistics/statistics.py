@@ -6,8 +6,9 @@ from typing import Type
 from flask import Blueprint, render_template, Response, current_app
 from flask.views import MethodView
 
-from reqtransformer import Requirement, VariableCollection
-from static_utils import get_filenames_from_dir
+import generations
+from reqtransformer import VariableCollection
+from requirement_store import get_requirement_store
 
 BUNDLE_JS = 'dist/statistics-bundle.js'
 blueprint = Blueprint('statistics', __name__, template_folder='templates', url_prefix='/statistics')
@@ -25,9 +26,14 @@ def register_api(bp: Blueprint, method_view: Type[MethodView]) -> None:
 
 
 class StatisticsApi(MethodView):
+    decorators = [generations.conditional_get(lambda: [
+        (generations.REQUIREMENTS, current_app.config['REVISION_FOLDER']),
+        (generations.VARIABLES, current_app.config['REVISION_FOLDER'])
+    ])]
+
     def __init__(self):
         self.app = current_app
-        self.filenames = get_filenames_from_dir(self.app.config['REVISION_FOLDER'])
+        self.requirement_store = get_requirement_store(self.app.config['REVISION_FOLDER'])
 
     def get(self) -> str | dict | tuple | Response:
         return self.fetch_statistics()
@@ -49,31 +55,23 @@ class StatisticsApi(MethodView):
             'tags_per_type': dict(),
             'status_per_type': dict()
         }
-        for requirement_filename in self.filenames:
-            try:
-                requirement = Requirement.load(requirement_filename)
-            except TypeError:
-                continue
-            if hasattr(requirement, 'type_in_csv'):
-                data['total'] += 1
-                if requirement.status == 'Todo':
-                    data['todo'] += 1
-                elif requirement.status == 'Review':
-                    data['review'] += 1
-                elif requirement.status == 'Done':
-                    data['done'] += 1
-                if requirement.type_in_csv in data['types']:
-                    data['types'][requirement.type_in_csv] += 1
-                else:
-                    data['types'][requirement.type_in_csv] = 1
-                    data['tags_per_type'][requirement.type_in_csv] = dict()
-                    data['status_per_type'][requirement.type_in_csv] = {'Todo': 0, 'Review': 0, 'Done': 0}
-                for tag in requirement.tags:
-                    if len(tag) > 0:
-                        if tag not in data['tags_per_type'][requirement.type_in_csv]:
-                            data['tags_per_type'][requirement.type_in_csv][tag] = 0
-                        data['tags_per_type'][requirement.type_in_csv][tag] += 1
-                data['status_per_type'][requirement.type_in_csv][requirement.status] += 1
+        for (type_in_csv, status), count in self.requirement_store.status_counts_by_type().items():
+            data['total'] += count
+            if status == 'Todo':
+                data['todo'] += count
+            elif status == 'Review':
+                data['review'] += count
+            elif status == 'Done':
+                data['done'] += count
+            if type_in_csv not in data['types']:
+                data['types'][type_in_csv] = 0
+                data['tags_per_type'][type_in_csv] = dict()
+                data['status_per_type'][type_in_csv] = {'Todo': 0, 'Review': 0, 'Done': 0}
+            data['types'][type_in_csv] += count
+            data['status_per_type'][type_in_csv][status] = data['status_per_type'][type_in_csv].get(status, 0) + count
+        for (type_in_csv, tag), count in self.requirement_store.tag_counts_by_type().items():
+            if len(tag) > 0:
+                data['tags_per_type'][type_in_csv][tag] = count
 
         for name, count in data['types'].items():
             data['type_names'].append(name)
@@ -81,7 +79,7 @@ class StatisticsApi(MethodView):
             data['type_colors'].append("#%06x" % random.randint(0, 0xFFFFFF))
 
         # Gather most used variables.
-        var_collection = VariableCollection.load(self.app.config['SESSION_VARIABLE_COLLECTION'])
+        var_collection = VariableCollection.load_session(self.app)
         var_usage = []
 
         var_nodes = dict()
@@ -1,4 +1,3 @@
-import os
 from dataclasses import dataclass, field
 from typing import Type
 
@@ -6,10 +5,11 @@ from flask import Blueprint, Response, current_app, jsonify, render_template, re
 from flask.views import MethodView
 from pydantic import BaseModel
 
+import generations
 from configuration.tags import STANDARD_TAGS
 from defaults import Color
 from reqtransformer import Requirement
-from static_utils import get_filenames_from_dir
+from requirement_store import get_requirement_store
 from utils import MetaSettings
 
 BUNDLE_JS = 'dist/tags-bundle.js'
@@ -39,6 +39,10 @@ def register_api(bp: Blueprint, method_view: Type[MethodView]) -> None:
 
 
 class TagsApi(MethodView):
+    decorators = [generations.conditional_get(lambda: [
+        (generations.REQUIREMENTS, current_app.config['REVISION_FOLDER']),
+        (generations.META_SETTINGS, current_app.config['META_SETTINGS_PATH'])
+    ])]
     INIT_TAGS = {
         'Type_inference_error': {'color': Color.BS_DANGER.value, 'internal': True, 'description': ''},
         'incomplete_formalization': {'color': Color.BS_WARNING.value, 'internal': True, 'description': ''},
@@ -49,7 +53,7 @@ class TagsApi(MethodView):
     def __init__(self):
         self.app = current_app
         self.meta_settings = MetaSettings(self.app.config['META_SETTINGS_PATH'])
-        self.filenames = get_filenames_from_dir(self.app.config['REVISION_FOLDER'])
+        self.requirement_store = get_requirement_store(self.app.config['REVISION_FOLDER'])
         self.__available_tags: dict[str, Tag] = {k: Tag(k, **v) for k, v in self.INIT_TAGS.items()}
         self.__load()
 
@@ -61,15 +65,9 @@ class TagsApi(MethodView):
                 description=self.meta_settings['tag_descriptions'][tag_name],
                 internal=self.meta_settings['tag_internal'][tag_name])
 
-        for filename in self.filenames:
-            try:
-                req = Requirement.load(filename)
-            except TypeError:
-                continue
-
-            for tag_name in req.tags:
-                self.add_if_new(tag_name)
-                self.__available_tags[tag_name].used_by.append(req.rid)
+        for tag_name, rids in self.requirement_store.tag_usage().items():
+            self.add_if_new(tag_name)
+            self.__available_tags[tag_name].used_by.extend(rids)
 
         for tag in self.__available_tags.values():
             tag.used_by.sort()
@@ -128,9 +126,8 @@ class TagsApi(MethodView):
         response_data = {}
 
         for rid in request_data.occurrences:
-            filepath = os.path.join(self.app.config['REVISION_FOLDER'], f'{rid}.pickle')
-            if os.path.exists(filepath) and os.path.isfile(filepath):
-                requirement = Requirement.load(filepath)
+            requirement = Requirement.load_requirement_by_id(rid, self.app)
+            if requirement is not None:
                 comment = requirement.tags.pop(name)
                 requirement.tags[request_data.name_new] = comment
                 requirement.store()
@@ -151,9 +148,8 @@ class TagsApi(MethodView):
         response_data = {}
 
         for rid in request_data.occurrences:
-            filepath = os.path.join(self.app.config['REVISION_FOLDER'], f'{rid}.pickle')
-            if os.path.exists(filepath) and os.path.isfile(filepath):
-                requirement = Requirement.load(filepath)
+            requirement = Requirement.load_requirement_by_id(rid, self.app)
+            if requirement is not None:
                 requirement.tags.pop(name)
                 requirement.store()
 
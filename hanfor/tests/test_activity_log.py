@@ -0,0 +1,94 @@
+"""
+Test the append only activity log of a session and polling it by cursor (api/logs/get?since=<cursor>).
+"""
+import os
+import tempfile
+from unittest import TestCase
+
+import activity_log
+from activity_log import ActivityLog, get_activity_log
+from app import app
+from tests.mock_hanfor import MockHanfor
+
+
+class TestActivityLog(TestCase):
+    def setUp(self) -> None:
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, activity_log.ACTIVITY_LOG_FILE)
+
+    def tearDown(self) -> None:
+        self.folder.cleanup()
+
+    def count_lines(self):
+        with open(self.path) as log_file:
+            return len(log_file.readlines())
+
+    def test_append_and_since(self):
+        log = ActivityLog(self.path, retention=5)
+        self.assertListEqual([], log.entries())
+        for i in range(3):
+            log.append(f'action {i}', [f'rid_{i}'])
+        self.assertEqual(3, log.last_id)
+        self.assertListEqual(['action 0', 'action 1', 'action 2'], [e['action'] for e in log.entries()])
+        self.assertListEqual(['rid_2'], log.entries(since=2)[0]['rids'])
+        self.assertListEqual([], log.entries(since=3))
+        # Unknown cursors get all retained entries.
+        self.assertEqual(3, len(log.entries(since=42)))
+
+        reopened = ActivityLog(self.path, retention=5)
+        self.assertEqual(3, reopened.last_id)
+        self.assertEqual(4, reopened.append('action 3')['id'])
+
+    def test_retention(self):
+        log = ActivityLog(self.path, retention=5)
+        for i in range(23):
+            log.append('x' * 1000, [str(i)])
+            self.assertLess(self.count_lines(), 10)
+        self.assertListEqual([str(i) for i in range(18, 23)], [e['rids'][0] for e in log.entries()])
+        self.assertListEqual([19, 20, 21, 22, 23], [e['id'] for e in log.entries(since=17)])
+        self.assertListEqual([22, 23], [e['id'] for e in log.entries(since=21)])
+
+    def test_migrate_frontend_logs(self):
+        log = ActivityLog(self.path)
+        activity_log.migrate_frontend_logs([
+            '[2019-03-26 16:26:00.190456] Added new Formalization to requirement '
+            '<a class="req_direct_link" href="#" data-rid="SysRS FooXY_42">SysRS FooXY_42</a>',
+            '[2019-03-26 16:27:00.000000] Added top guess to requirements '
+            '<a class="req_direct_link" href="#" data-rid="a">a</a>, <a class="req_direct_link" href="#" data-rid="b">b</a>',
+            'garbage'
+        ], log)
+        entries = log.entries()
+        self.assertEqual(2, len(entries))
+        self.assertDictEqual({'id': 1, 'timestamp': '2019-03-26 16:26:00', 'action': 'Added new Formalization to '
+                              'requirement', 'rids': ['SysRS FooXY_42']}, entries[0])
+        self.assertListEqual(['a', 'b'], entries[1]['rids'])
+
+
+class TestActivityLogApi(TestCase):
+    def setUp(self) -> None:
+        self.mock_hanfor = MockHanfor(
+            session_tags=['inference_tests'],
+            test_session_source='test_enums'
+        )
+        self.mock_hanfor.setUp()
+        self.mock_hanfor.startup_hanfor('simple.csv', 'inference_tests', [])
+
+    def tearDown(self) -> None:
+        self.mock_hanfor.tearDown()
+
+    def test_poll(self):
+        # The messages of the former frontend_logs.pickle are migrated.
+        response = self.mock_hanfor.app.get('api/logs/get').json
+        self.assertEqual(38, response['cursor'])
+        self.assertEqual(38, len(response['entries']))
+        self.assertEqual(app.config['ACTIVITY_LOG_RETENTION'], response['retention'])
+
+        self.mock_hanfor.app.post('api/req/new_formalization', data={'id': 'SysRS FooXY_42'})
+        response = self.mock_hanfor.app.get('api/logs/get?since=38').json
+        self.assertEqual(39, response['cursor'])
+        self.assertListEqual([39], [e['id'] for e in response['entries']])
+        self.assertEqual('Added new Formalization to requirement', response['entries'][0]['action'])
+        self.assertListEqual(['SysRS FooXY_42'], response['entries'][0]['rids'])
+        self.assertListEqual([], self.mock_hanfor.app.get('api/logs/get?since=39').json['entries'])
+        self.assertIs(get_activity_log(app.config['ACTIVITY_LOG_PATH']),
+                      get_activity_log(app.config['ACTIVITY_LOG_PATH']))
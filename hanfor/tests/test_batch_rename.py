@@ -0,0 +1,90 @@
+"""
+Test renaming many variables at once (api/var/rename) in requirements, constraints and the usage index.
+"""
+import json
+
+import utils
+from app import app
+from reqtransformer import VariableCollection, VariableCollectionUnitOfWork
+from tests.mock_hanfor import MockHanfor
+from unittest import TestCase
+
+
+class TestBatchRename(TestCase):
+    def setUp(self) -> None:
+        self.mock_hanfor = MockHanfor(
+            session_tags=['simple'],
+            test_session_source='test_formalization_process'
+        )
+        self.mock_hanfor.setUp()
+        self.mock_hanfor.startup_hanfor('simple.csv', 'simple', [])
+
+    def tearDown(self) -> None:
+        self.mock_hanfor.tearDown()
+
+    def rename(self, **data):
+        return self.mock_hanfor.app.post('api/var/rename', data=data).json
+
+    def var_names(self):
+        return [v['name'] for v in self.mock_hanfor.app.get('api/var/gets').json['data']]
+
+    def test_swap_variables(self):
+        result = self.rename(mapping=json.dumps({'foo': 'bar', 'bar': 'foo'}))
+        self.assertTrue(result['success'])
+        result = self.mock_hanfor.app.get('api/req/get?id=SysRS FooXY_42')
+        self.assertListEqual(result.json['formal'], ['Globally, it is never the case that "bar!=foo" holds'])
+        var_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+        self.assertTrue(var_collection.refresh_var_usage(app))
+
+    def test_prefix_rename(self):
+        result = self.rename(prefix_old='spam', prefix_new='eggs')
+        self.assertTrue(result['success'])
+        self.assertDictEqual({'spam': 'eggs', 'spam_ham': 'eggs_ham', 'spam_egg': 'eggs_egg'}, result['mapping'])
+        self.assertCountEqual(self.var_names(), ['bar', 'foo', 'eggs', 'eggs_ham', 'eggs_egg'])
+        var_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+        self.assertTrue(var_collection.refresh_var_usage(app))
+
+    def test_rename_in_constraints(self):
+        self.mock_hanfor.app.post('api/var/new_constraint', data={'name': 'spam'})
+        self.mock_hanfor.app.post('api/var/update', data={
+            'name': 'spam',
+            'name_old': 'spam',
+            'type': 'int',
+            'const_val': '',
+            'const_val_old': '',
+            'type_old': 'unknown',
+            'occurrences': '',
+            'constraints': json.dumps({
+                "0": {
+                    "id": "0",
+                    "scope": "GLOBALLY",
+                    "pattern": "Universality",
+                    "expression_mapping": {"P": "", "Q": "", "R": "spam > foo + spam_ham", "S": "", "T": "", "U": ""}
+                }
+            }),
+            'updated_constraints': 'true',
+            'enumerators': '[]',
+            'belongs_to_enum': '',
+            'belongs_to_enum_old': ''
+        })
+        result = self.rename(mapping=json.dumps({'foo': 'foo_new', 'spam': 'spam_new', 'spam_ham': 'ham'}))
+        self.assertTrue(result['success'])
+        var_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+        constraint = var_collection.collection['spam_new'].constraints[0]
+        self.assertEqual('spam_new>foo_new+ham', constraint.expressions_mapping['R'].raw_expression)
+        self.assertSetEqual({'spam_new', 'foo_new', 'ham'}, var_collection.req_var_mapping['Constraint_spam_new_0'])
+        self.assertTrue(var_collection.refresh_var_usage(app))
+
+    def test_invalid_rename(self):
+        self.assertFalse(self.rename(mapping=json.dumps({'foo': 'not valid'}))['success'])
+        self.assertFalse(self.rename(mapping=json.dumps({'does_not_exist': 'foo'}))['success'])
+        self.assertCountEqual(self.var_names(), ['bar', 'foo', 'spam', 'spam_ham', 'spam_egg'])
+
+    def test_failed_unit_renames_nothing(self):
+        with self.assertRaises(ValueError), \
+                VariableCollectionUnitOfWork(app.config['SESSION_VARIABLE_COLLECTION'], defer_requirements=True):
+            utils.rename_variables(app, VariableCollection.load_session(app), {'foo': 'foo_new'})
+            raise ValueError()
+        self.assertCountEqual(self.var_names(), ['bar', 'foo', 'spam', 'spam_ham', 'spam_egg'])
+        formal = self.mock_hanfor.app.get('api/req/get?id=SysRS FooXY_42').json['formal']
+        self.assertListEqual(['Globally, it is never the case that "foo != bar" holds'], formal)
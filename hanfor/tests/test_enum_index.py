@@ -0,0 +1,88 @@
+"""
+Test the maintained enum index (enum name -> enumerator names) of the variable collection.
+After each change the maintained index must equal a full rebuild from `belongs_to_enum` of all variables.
+"""
+import json
+from unittest import TestCase
+
+from app import app
+from reqtransformer import Variable, VariableCollection
+from tests.mock_hanfor import MockHanfor
+
+
+class TestEnumIndex(TestCase):
+    def setUp(self) -> None:
+        self.mock_hanfor = MockHanfor(
+            session_tags=['simple'],
+            test_session_source='test_query_api'
+        )
+        self.mock_hanfor.setUp()
+        self.mock_hanfor.startup_hanfor('simple.csv', 'simple', [])
+
+    def tearDown(self) -> None:
+        self.mock_hanfor.tearDown()
+
+    def assertIndexConsistent(self) -> VariableCollection:
+        var_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+        self.assertTrue(var_collection.refresh_enum_index())
+        return var_collection
+
+    def enumerators(self, enum_name: str) -> list:
+        response = self.mock_hanfor.app.post('api/var/get_enumerators', data={'name': enum_name})
+        return [name for name, value in response.json['enumerators']]
+
+    def test_startup_builds_index(self):
+        var_collection = self.assertIndexConsistent()
+        self.assertDictEqual({'spam': {'spam_ham', 'spam_egg'}}, var_collection.enum_index)
+        self.assertListEqual(['spam_egg', 'spam_ham'], self.enumerators('spam'))
+        self.assertListEqual(['spam_egg', 'spam_ham'], var_collection.collection['spam'].get_enumerators(var_collection))
+        self.assertEqual('spam', var_collection.collection['spam_ham'].get_parent_enum(var_collection))
+
+    def test_add_rename_delete(self):
+        response = self.mock_hanfor.app.post('api/var/update', data={
+            'name': 'spam',
+            'name_old': 'spam',
+            'type': 'ENUM_INT',
+            'type_old': 'ENUM_INT',
+            'const_val': '',
+            'const_val_old': '',
+            'occurrences': '',
+            'constraints': json.dumps({}),
+            'updated_constraints': False,
+            'enumerators': json.dumps([['ham', '2'], ['egg', '1'], ['bacon', '3']])
+        })
+        self.assertTrue(response.json['success'])
+        self.assertListEqual(['spam_egg', 'spam_ham', 'spam_bacon'], self.enumerators('spam'))
+        self.assertIndexConsistent()
+
+        response = self.mock_hanfor.app.post('api/var/rename', data={'mapping': json.dumps({'spam': 'eggs'})})
+        self.assertTrue(response.json['success'])
+        var_collection = self.assertIndexConsistent()
+        self.assertDictEqual({'eggs': {'eggs_ham', 'eggs_egg', 'eggs_bacon'}}, var_collection.enum_index)
+        self.assertListEqual([], self.enumerators('spam'))
+
+        response = self.mock_hanfor.app.post('api/var/multi_update', data={
+            'selected_vars': json.dumps(['eggs_bacon']),
+            'del': 'true'
+        })
+        self.assertTrue(response.json['success'])
+        var_collection = self.assertIndexConsistent()
+        self.assertSetEqual({'eggs_ham', 'eggs_egg'}, var_collection.enum_index['eggs'])
+
+    def test_import_and_drift(self):
+        var_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+        other = VariableCollection(path=None)
+        other.add_var('spam_bacon', Variable('spam_bacon', 'ENUMERATOR_INT', '3'))
+        other.collection['spam_bacon'].belongs_to_enum = 'spam'
+        var_collection.import_session(other)
+        self.assertSetEqual({'spam_ham', 'spam_egg', 'spam_bacon'}, var_collection.enum_index['spam'])
+        self.assertTrue(var_collection.refresh_enum_index())
+
+        # Changes bypassing `set_enum` are found (and repaired) by the consistency check.
+        var_collection.collection['foo'].belongs_to_enum = 'spam'
+        self.assertFalse(var_collection.refresh_enum_index())
+        self.assertIn('foo', var_collection.enum_index['spam'])
+
+        # Collections stored without the index build it on first use.
+        del var_collection._enum_index
+        self.assertSetEqual({'spam_ham', 'spam_egg', 'spam_bacon', 'foo'}, var_collection.enum_index['spam'])
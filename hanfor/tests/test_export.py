@@ -0,0 +1,67 @@
+"""
+Test the streamed exports of a session (api/tools/<req_file|csv_file|xls_file>).
+"""
+import csv
+import io
+import json
+
+from openpyxl import load_workbook
+
+import utils
+from app import app
+from tests.mock_hanfor import MockHanfor
+from unittest import TestCase
+
+
+class TestExport(TestCase):
+    def setUp(self) -> None:
+        self.mock_hanfor = MockHanfor(
+            session_tags=['simple'],
+            test_session_source='test_query_api'
+        )
+        self.mock_hanfor.setUp()
+        self.mock_hanfor.startup_hanfor('simple.csv', 'simple', [])
+
+    def tearDown(self) -> None:
+        self.mock_hanfor.tearDown()
+
+    def export(self, command, selected=None):
+        data = {'selected_requirement_ids': json.dumps(selected)} if selected else {}
+        return self.mock_hanfor.app.post(f'api/tools/{command}', data=data)
+
+    def test_csv_file(self):
+        response = self.export('csv_file')
+        self.assertTrue(response.is_streamed)
+        rows = list(csv.DictReader(io.StringIO(response.data.decode())))
+        # Ordered by the position in the input csv.
+        self.assertListEqual(['SysRS FooXY_91', 'SysRS FooXY_42'], [row['id_header'] for row in rows])
+        self.assertEqual('has_formalization', rows[1]['Hanfor_Tags'])
+        self.assertEqual('Absence', json.loads(rows[1]['formal_header'])['0']['pattern'])
+
+        rows = list(csv.DictReader(io.StringIO(self.export('csv_file', ['SysRS FooXY_42']).data.decode())))
+        self.assertListEqual(['SysRS FooXY_42'], [row['id_header'] for row in rows])
+
+    def test_req_file(self):
+        response = self.export('req_file')
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(
+            'CONST spam_egg IS 1\nCONST spam_ham IS 2\n\n'
+            'Input bar IS unknown\nInput foo IS unknown\nInput spam IS int\n\n'
+            'SysRS_FooXY_42_0: Globally, it is never the case that "foo != bar" holds\n\n',
+            response.data.decode()
+        )
+        with app.test_request_context():
+            self.assertEqual(response.data.decode(), utils.generate_req_file_content(app))
+
+    def test_xls_file(self):
+        work_book = load_workbook(io.BytesIO(self.export('xls_file').data))
+        self.assertListEqual(['Requirements', 'Findings', 'Variables'], work_book.sheetnames)
+        self.assertEqual('Findings', work_book.active.title)
+        requirements = [[c.value for c in row] for row in work_book['Requirements'].iter_rows(min_row=4)]
+        self.assertListEqual(['SysRS FooXY_91', 'SysRS FooXY_42'], [row[1] for row in requirements])
+        self.assertTrue(work_book['Requirements'].cell(4, 2).font.b)
+        self.assertEqual('A4', work_book['Findings'].freeze_panes)
+
+    def test_chunked(self):
+        self.assertListEqual(['abc', 'de'], list(utils.chunked(['a', 'bc', 'd', 'e'], size=2)))
+        self.assertListEqual([], list(utils.chunked([])))
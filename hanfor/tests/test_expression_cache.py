@@ -0,0 +1,59 @@
+"""
+Test the memo caches for parse trees and type inference results in boogie_parsing.
+"""
+from unittest import TestCase
+
+import boogie_parsing
+from boogie_parsing import BoogieType, run_typecheck_fixpoint, typecheck_expression, parse_cache, typecheck_cache
+
+
+class TestExpressionCache(TestCase):
+    def setUp(self):
+        parse_cache.clear()
+        typecheck_cache.clear()
+
+    def tearDown(self):
+        boogie_parsing.configure_expression_caches(boogie_parsing.DEFAULT_EXPRESSION_CACHE_SIZE)
+
+    def test_parse_cache_hits(self):
+        self.assertEqual({'a', 'b', 'x'}, boogie_parsing.get_expression_variables('a + b > 3 && x'))
+        boogie_parsing.parse_expression('a + b > 3 && x')
+        info = parse_cache.info()
+        self.assertEqual(1, info['misses'])
+        self.assertEqual(1, info['hits'])
+        self.assertEqual(0.5, info['hit_rate'])
+
+    def test_cached_typecheck_matches_fixpoint(self):
+        expressions = [
+            ("(((((b + a) + d) * 23) < 4) && x ==> y )", {'a': BoogieType.unknown}, None),
+            ("(b + a) + 23", {'a': BoogieType.real}, None),
+            ("b + a", {'a': BoogieType.unknown}, [BoogieType.bool]),
+            ("abs(x) > 5", {}, [BoogieType.bool]),
+        ]
+        for expression, env, expected_types in expressions:
+            ti = run_typecheck_fixpoint(boogie_parsing.get_parser_instance().parse(expression), dict(env),
+                                        expected_types)
+            for _ in range(2):
+                result = typecheck_expression(expression, dict(env), expected_types)
+                self.assertEqual(ti.type_root.t, result.t)
+                self.assertEqual(ti.type_errors, list(result.type_errors))
+                for name, t in result.type_env.items():
+                    self.assertEqual(ti.type_env[name], t)
+        self.assertEqual(len(expressions), typecheck_cache.info()['hits'])
+
+    def test_typecheck_keyed_by_env_slice(self):
+        env = {'a': BoogieType.int, 'unrelated': BoogieType.bool}
+        self.assertEqual(BoogieType.int, typecheck_expression('a + b', env).t)
+        # The derived types are written back to the given env.
+        self.assertEqual(BoogieType.int, env['b'])
+        # Types of variables not used in the expression do not change the key.
+        typecheck_expression('a + b', {'a': BoogieType.int, 'unrelated': BoogieType.real})
+        self.assertEqual(1, typecheck_cache.info()['hits'])
+        self.assertEqual(BoogieType.real, typecheck_expression('a + b', {'a': BoogieType.real}).t)
+        self.assertEqual(1, typecheck_cache.info()['hits'])
+
+    def test_bounded(self):
+        boogie_parsing.configure_expression_caches(2)
+        for expression in ['a', 'b', 'c']:
+            boogie_parsing.parse_expression(expression)
+        self.assertEqual(2, parse_cache.info()['size'])
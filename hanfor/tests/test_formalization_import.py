@@ -0,0 +1,107 @@
+"""
+Test the bulk import of formalizations from a csv column into one variable collection.
+"""
+import json
+from unittest import TestCase
+from unittest.mock import patch
+
+import boogie_parsing
+import reqtransformer
+from app import app
+from reqtransformer import Requirement, RequirementCollection, VariableCollection
+from tests.mock_hanfor import MockHanfor
+
+
+def formalization(scope, pattern, **expressions):
+    return {'scope': scope, 'pattern': pattern, 'expressions': expressions}
+
+
+ROWS = [
+    {'0': formalization('GLOBALLY', 'Universality', R='x_0 > 5'),
+     '1': formalization('AFTER', 'Absence', P='go', R='x_0 + y_0 == 2')},
+    {'0': formalization('GLOBALLY', 'Absence', R='y_0 > 2.5 && go')},
+    {'0': formalization('GLOBALLY', 'Universality', R='x_0 >'),
+     '1': formalization('GLOBALLY', 'Universality', R='x_0 > 7')},
+    {'0': formalization('NO_SUCH_SCOPE', 'Universality', R='go')},
+    'not json',
+    '',
+] + [{'0': formalization('GLOBALLY', 'Universality', R=f'x_{i} < {i}')} for i in range(1, 40)]
+
+
+class TestFormalizationImport(TestCase):
+    def setUp(self) -> None:
+        self.mock_hanfor = MockHanfor(
+            session_tags=['simple'],
+            test_session_source='test_formalization_process'
+        )
+        self.mock_hanfor.setUp()
+        self.mock_hanfor.startup_hanfor('simple.csv', 'simple', [])
+        self.path = app.config['SESSION_VARIABLE_COLLECTION']
+        self.initial = VariableCollection.load(self.path)
+
+    def tearDown(self) -> None:
+        self.initial.store(self.path)
+        self.mock_hanfor.tearDown()
+
+    def run_import(self, processes):
+        self.initial.store(self.path)
+        writes = []
+        store = reqtransformer.Pickleable.store
+
+        def counting_store(obj, path=None):
+            if isinstance(obj, VariableCollection):
+                writes.append(path)
+            return store(obj, path)
+
+        collection = RequirementCollection()
+        collection.csv_meta.id_header, collection.csv_meta.desc_header = 'id', 'desc'
+        collection.csv_meta.type_header, collection.csv_meta.formal_header = 'type', 'formal'
+        collection.csv_meta.import_formalizations = True
+        collection.csv_all_rows = [
+            {'id': f'req_{i}', 'desc': '', 'type': 'req', 'formal': row if isinstance(row, str) else json.dumps(row)}
+            for i, row in enumerate(ROWS)
+        ]
+        app.config['FORMALIZATION_IMPORT_PROCESSES'] = processes
+        with patch.object(reqtransformer.Pickleable, 'store', counting_store):
+            report = collection.parse_csv_rows_into_requirements(app)
+        app.config.pop('FORMALIZATION_IMPORT_PROCESSES')
+        self.assertEqual(1, len(writes))
+        return {r.rid: r for r in collection.requirements}, VariableCollection.load(self.path), report
+
+    def test_import(self):
+        boogie_parsing.parse_cache.clear()
+        boogie_parsing.typecheck_cache.clear()
+        requirements, var_collection, report = self.run_import(processes=2)
+        # Typechecked by the workers, but for the three expressions using variables derived by earlier rows.
+        self.assertEqual(3, boogie_parsing.typecheck_cache.misses)
+        self.assertEqual(len(ROWS), report.rows)
+        self.assertEqual(43, report.formalizations)
+        self.assertListEqual(['req_2', 'req_3', 'req_4'], sorted(rid for rid, _ in report.errors))
+
+        self.assertEqual('int', var_collection.collection['x_0'].type)
+        # Derived from `x_0 + y_0`, so `y_0 > 2.5` of the next row is a type error.
+        self.assertEqual('int', var_collection.collection['y_0'].type)
+        self.assertEqual('bool', var_collection.collection['go'].type)
+        self.assertSetEqual({'x_0', 'y_0', 'go'}, var_collection.req_var_mapping['req_0'])
+        self.assertSetEqual({'x_0'}, var_collection.req_var_mapping['req_2'])
+        self.assertNotIn('req_3', var_collection.req_var_mapping)
+        self.assertSetEqual({'req_0', 'req_1'}, var_collection.var_req_mapping['y_0'])
+        self.assertTrue(all(f'x_{i}' in var_collection for i in range(40)))
+
+        self.assertListEqual([1], list(requirements['req_2'].formalizations.keys()))
+        self.assertDictEqual({}, requirements['req_3'].formalizations)
+        self.assertDictEqual({}, requirements['req_5'].formalizations)
+        self.assertIn('has_formalization', requirements['req_0'].tags)
+        self.assertNotIn('Type_inference_error', requirements['req_0'].tags)
+        self.assertIn('Type_inference_error', requirements['req_1'].tags)
+
+    def test_parallel_matches_inline(self):
+        requirements, var_collection, _ = self.run_import(processes=2)
+        inline_requirements, inline_var_collection, _ = self.run_import(processes=1)
+        self.assertDictEqual(
+            {name: var.type for name, var in inline_var_collection.collection.items()},
+            {name: var.type for name, var in var_collection.collection.items()}
+        )
+        for rid, requirement in inline_requirements.items():
+            self.assertEqual(requirement.get_formalizations_json(), requirements[rid].get_formalizations_json())
+            self.assertDictEqual(requirement.tags, requirements[rid].tags)
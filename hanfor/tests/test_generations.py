@@ -0,0 +1,81 @@
+"""
+Test the ETags of the read heavy API endpoints derived from the generation counters of the stored data.
+"""
+import json
+from unittest import TestCase
+from unittest.mock import patch
+
+import generations
+import utils
+from app import app
+from reqtransformer import Requirement, VariableCollection
+from tests.mock_hanfor import MockHanfor
+
+ENDPOINTS = ['api/req/gets', 'api/var/gets', 'api/tags/', 'api/statistics/', 'api/logs/get', 'api/meta/get']
+
+
+class TestGenerations(TestCase):
+    def setUp(self) -> None:
+        self.mock_hanfor = MockHanfor(
+            session_tags=['simple'],
+            test_session_source='test_query_api'
+        )
+        self.mock_hanfor.setUp()
+        self.mock_hanfor.startup_hanfor('simple.csv', 'simple', [])
+
+    def tearDown(self) -> None:
+        self.mock_hanfor.tearDown()
+
+    def etags(self) -> dict:
+        etags = dict()
+        for endpoint in ENDPOINTS:
+            response = self.mock_hanfor.app.get(endpoint)
+            self.assertEqual(200, response.status_code, endpoint)
+            self.assertEqual('no-cache', response.headers['Cache-Control'], endpoint)
+            etags[endpoint] = response.get_etag()[0]
+            self.assertIsNotNone(etags[endpoint], endpoint)
+        return etags
+
+    def changed(self, before: dict) -> set:
+        after = self.etags()
+        return {endpoint for endpoint in ENDPOINTS if before[endpoint] != after[endpoint]}
+
+    def test_not_modified_without_loading(self):
+        etags = self.etags()
+        with patch.object(Requirement, 'requirements', side_effect=AssertionError('loaded')), \
+                patch.object(VariableCollection, 'load_session', side_effect=AssertionError('loaded')), \
+                patch.object(utils, 'get_session_activity_log', side_effect=AssertionError('loaded')), \
+                patch.object(utils, 'MetaSettings', side_effect=AssertionError('loaded')):
+            for endpoint in ENDPOINTS:
+                response = self.mock_hanfor.app.get(endpoint, headers={'If-None-Match': f'"{etags[endpoint]}"'})
+                self.assertEqual(304, response.status_code, endpoint)
+                self.assertEqual(b'', response.data)
+        self.assertEqual(200, self.mock_hanfor.app.get(
+            'api/logs/get', query_string={'since': 0}, headers={'If-None-Match': f'"{etags["api/logs/get"]}"'}
+        ).status_code)
+
+    def test_writes_change_etags(self):
+        etags = self.etags()
+        self.mock_hanfor.app.post('api/req/update', data={
+            'id': 'SysRS FooXY_42',
+            'row_idx': '0',
+            'update_formalization': 'false',
+            'tags': json.dumps({'generation_test': ''}),
+            'status': 'Done'
+        })
+        self.assertSetEqual({'api/req/gets', 'api/tags/', 'api/statistics/', 'api/logs/get', 'api/meta/get'},
+                            self.changed(etags))
+
+        etags = self.etags()
+        response = self.mock_hanfor.app.post('api/var/add_new_variable', data={'name': 'generation_test',
+                                                                                'type': 'INT'})
+        self.assertTrue(response.json['success'])
+        self.assertIn('api/var/gets', self.changed(etags))
+
+    def test_generations(self):
+        folder = app.config['REVISION_FOLDER']
+        generation = generations.get(generations.REQUIREMENTS, folder)
+        Requirement.load_requirement_by_id('SysRS FooXY_42', app).store()
+        self.assertEqual(generation + 1, generations.get(generations.REQUIREMENTS, folder))
+        self.assertNotEqual(generations.etag((generations.REQUIREMENTS, folder)),
+                            generations.etag((generations.REQUIREMENTS, folder), extra='start=0'))
@@ -87,6 +87,7 @@ class TestHanforApiSkeleton(TestCase):
             os.remove(path)
         except FileNotFoundError:
             pass
+        shutil.rmtree(os.path.join(TESTS_BASE_FOLDER, 'variable_import_sessions'), ignore_errors=True)
         for tag in TEST_TAGS.values():
             path = os.path.join(TESTS_BASE_FOLDER, tag)
             try:
@@ -9,6 +9,7 @@ from app import app, startup_hanfor
 import os
 import shutil
 import utils
+from requirement_store import get_requirement_store
 from unittest import TestCase
 from unittest.mock import patch
 
@@ -64,11 +65,15 @@ class TestInit(TestCase):
         )
 
         # Check contents.
-        for file in ['SysRS FooXY_42.pickle', 'SysRS FooXY_91.pickle', 'session_status.pickle']:
+        for file in ['requirements.sqlite', 'session_status.pickle']:
             self.assertTrue(
                 os.path.exists(os.path.join(TESTS_BASE_FOLDER, TEST_TAG, 'revision_0', file)),
                 msg='Missing file: {}'.format(file)
             )
+        self.assertListEqual(
+            ['SysRS FooXY_42', 'SysRS FooXY_91'],
+            sorted(get_requirement_store(os.path.join(TESTS_BASE_FOLDER, TEST_TAG, 'revision_0')).rids())
+        )
 
     def test_2_get_requirements(self):
         args = utils.HanforArgumentParser(app).parse_args([TEST_TAG, '-c', TEST_CSV])
@@ -0,0 +1,107 @@
+"""
+Test the process wide meta settings of a session, stored in one file per section.
+"""
+import os
+from unittest import TestCase
+from unittest.mock import patch
+
+import utils
+from app import app
+from static_utils import pickle_dump_obj_to_file
+from tests.mock_hanfor import MockHanfor
+
+
+class TestMetaSettings(TestCase):
+    def setUp(self) -> None:
+        self.mock_hanfor = MockHanfor(
+            session_tags=['simple'],
+            test_session_source='test_query_api'
+        )
+        self.mock_hanfor.setUp()
+        self.mock_hanfor.startup_hanfor('simple.csv', 'simple', [])
+        self.path = app.config['META_SETTINGS_PATH']
+
+    def tearDown(self) -> None:
+        self.mock_hanfor.tearDown()
+
+    def count_io(self):
+        """ Patch pickling of meta settings sections, counting the paths read and written. """
+        loads, dumps = [], []
+        load, dump = utils.pickle_load_from_dump, utils.pickle_dump_obj_to_file
+
+        def counting_load(path):
+            loads.append(path)
+            return load(path)
+
+        def counting_dump(obj, path):
+            dumps.append(path)
+            return dump(obj, path)
+
+        return loads, dumps, (patch.object(utils, 'pickle_load_from_dump', counting_load),
+                              patch.object(utils, 'pickle_dump_obj_to_file', counting_dump))
+
+    def test_sections(self):
+        self.assertTrue(os.path.exists(f'{self.path}.tag_colors.pickle'))
+        self.assertTrue(os.path.exists(f'{self.path}.tag_internal.pickle'))
+        meta = self.mock_hanfor.app.get('api/meta/get').json
+        self.assertIn('tag_colors', meta)
+        self.assertNotIn('path', meta)
+
+    def test_migrate_meta_settings_pickle(self):
+        legacy_path = os.path.join(app.config['SESSION_FOLDER'], 'legacy.pickle')
+        pickle_dump_obj_to_file({'tag_colors': {'a': '#000000'}, 'reports': []}, legacy_path)
+        path = os.path.join(app.config['SESSION_FOLDER'], 'migrated')
+        utils.migrate_meta_settings_pickle(legacy_path, path)
+        self.assertTrue(os.path.exists(f'{path}.reports.pickle'))
+        self.assertDictEqual({'tag_colors': {'a': '#000000'}, 'reports': []}, utils.MetaSettings(path).to_dict())
+
+    def test_sections_written_separately(self):
+        self.mock_hanfor.app.post('api/query', json={'name': 'q', 'query': 'foo'})
+        self.assertTrue(os.path.exists(f'{self.path}.queries.pickle'))
+        loads, dumps, (load_patch, dump_patch) = self.count_io()
+        with load_patch, dump_patch:
+            self.mock_hanfor.app.get('api/meta/get')
+            self.mock_hanfor.app.get('api/query')
+            self.assertListEqual([], loads)
+            self.assertListEqual([], dumps)
+
+            self.mock_hanfor.app.post('api/tags/add_standard')
+            self.assertNotIn(f'{self.path}.queries.pickle.tmp', dumps)
+            self.assertIn(f'{self.path}.tag_colors.pickle.tmp', dumps)
+            self.assertListEqual([], loads)
+
+    def test_external_change(self):
+        meta_settings = utils.MetaSettings(self.path)
+        pickle_dump_obj_to_file({'external': '#000000'}, f'{self.path}.tag_colors.pickle')
+        os.utime(f'{self.path}.tag_colors.pickle', ns=(0, 0))
+        self.assertDictEqual({'external': '#000000'}, self.mock_hanfor.app.get('api/meta/get').json['tag_colors'])
+        self.assertDictEqual({'external': '#000000'}, meta_settings['tag_colors'])
+
+        # Unstored changes are not overwritten.
+        meta_settings['tag_colors'] = {'local': '#ffffff'}
+        meta_settings.update_storage()
+        os.utime(f'{self.path}.tag_colors.pickle', ns=(1, 1))
+        self.assertDictEqual({'local': '#ffffff'}, utils.MetaSettings(self.path)['tag_colors'])
+        utils.flush_meta_settings()
+
+        os.remove(f'{self.path}.tag_colors.pickle')
+        self.assertNotIn('tag_colors', utils.MetaSettings(self.path))
+
+    def test_reads_do_not_store(self):
+        loads, dumps, (load_patch, dump_patch) = self.count_io()
+        with load_patch, dump_patch:
+            meta_settings = utils.MetaSettings(self.path)
+            self.assertNotIn('x', meta_settings['tag_colors'])
+            meta_settings.to_dict()['tag_colors']['x'] = '#000000'
+            meta_settings.update_storage()
+            utils.flush_meta_settings()
+            self.assertListEqual([], dumps)
+            self.assertNotIn('x', meta_settings['tag_colors'])
+
+            meta_settings['tag_colors']['x'] = '#000000'
+            meta_settings.mark('tag_colors')
+            meta_settings.update_storage()
+            utils.flush_meta_settings()
+            self.assertListEqual([f'{self.path}.tag_colors.pickle.tmp'], dumps)
+        os.utime(f'{self.path}.tag_colors.pickle', ns=(0, 0))
+        self.assertEqual('#000000', utils.MetaSettings(self.path)['tag_colors']['x'])
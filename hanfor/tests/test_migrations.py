@@ -7,14 +7,19 @@ This test will
 * Check if the description is successfully migrated.
 * Check if the correct migration tags are added to the requirement.
 * Check if the revision diff is correct.
+* Check if unchanged requirements share their stored content with the base revision.
 * Do the checks for ./test_init/simple_real_rev_0.csv -> /test_init/simple_real_rev_1.csv
   These csv are obfuscated versions of real world data.
 """
 
 from app import app, startup_hanfor
+from reqtransformer import RequirementCollection
+from requirement_store import SqliteRequirementStore, get_requirement_store
 import os
 import shutil
+import sqlite3
 import utils
+from contextlib import closing
 from unittest import TestCase
 from unittest.mock import patch
 
@@ -200,6 +205,57 @@ class TestMigrations(TestCase):
             new_revision_req_gets.json['data'][0]['tags']
         )
 
+    def test_unchanged_requirements_share_content(self):
+        args = utils.HanforArgumentParser(app).parse_args([TEST_TAGS['simple'], '-c', CSV_FILES['simple']])
+        self.startup_hanfor(args, user_mock_answers=[2, 0, 1, 3])
+        args = utils.HanforArgumentParser(app).parse_args(
+            [TEST_TAGS['simple'], '--revision', '-c', CSV_FILES['simple_changed_desc']]
+        )
+        with patch.object(SqliteRequirementStore, 'link_from', autospec=True,
+                          side_effect=SqliteRequirementStore.link_from) as link_from:
+            self.startup_hanfor(args, user_mock_answers=[0, 0])
+        # The unchanged requirement is taken over without loading it.
+        self.assertListEqual(['SysRS FooXY_42'], link_from.call_args.args[2])
+
+        session_folder = os.path.join(TESTS_BASE_FOLDER, TEST_TAGS['simple'])
+        hashes = dict()
+        for revision in ('revision_0', 'revision_1'):
+            with closing(sqlite3.connect(os.path.join(session_folder, revision, 'requirements.sqlite'))) as connection:
+                hashes[revision] = dict(connection.execute('SELECT rid, hash FROM requirements'))
+        changed = {rid for rid, h in hashes['revision_1'].items() if hashes['revision_0'].get(rid) != h}
+        self.assertSetEqual({'SysRS FooXY_91'}, changed)
+        self.assertEqual(2, len(hashes['revision_1']))
+        self.assertDictEqual(
+            {'base_revision': 'revision_0', 'revision': 'revision_1', 'new': 0, 'removed': 0, 'unchanged': 1,
+             'description_changed': 1, 'data_changed': 1},
+            utils.RevisionChanges.load(os.path.join(session_folder, 'revision_1')).to_dict()
+        )
+
+    def test_unchanged_requirements_keep_csv_formalizations(self):
+        args = utils.HanforArgumentParser(app).parse_args([TEST_TAGS['simple'], '-c', CSV_FILES['simple']])
+        self.startup_hanfor(args, user_mock_answers=[2, 0, 1, 3])
+        args = utils.HanforArgumentParser(app).parse_args(
+            [TEST_TAGS['simple'], '--revision', '-c', CSV_FILES['simple_changed_desc']]
+        )
+        parse_csv_rows = RequirementCollection.parse_csv_rows_into_requirements
+
+        def parse_csv_rows_with_formalization(requirement_collection, app_):
+            result = parse_csv_rows(requirement_collection, app_)
+            for requirement in requirement_collection.requirements:
+                if requirement.rid == 'SysRS FooXY_42':
+                    requirement.add_empty_formalization()
+            return result
+
+        with patch.object(RequirementCollection, 'parse_csv_rows_into_requirements',
+                          parse_csv_rows_with_formalization), \
+                patch.object(SqliteRequirementStore, 'link_from', autospec=True,
+                             side_effect=SqliteRequirementStore.link_from) as link_from:
+            self.startup_hanfor(args, user_mock_answers=[0, 0])
+        # The csv source is unchanged, but the imported formalization must not be replaced by the base revision.
+        link_from.assert_not_called()
+        requirement = get_requirement_store(app.config['REVISION_FOLDER']).load('SysRS FooXY_42')
+        self.assertEqual(1, len(requirement.formalizations))
+
     def tearDown(self):
         # Clean test dir.
         self.clean_folders()
@@ -211,6 +267,7 @@ class TestMigrations(TestCase):
             os.remove(path)
         except FileNotFoundError:
             pass
+        shutil.rmtree(os.path.join(TESTS_BASE_FOLDER, 'variable_import_sessions'), ignore_errors=True)
         for tag in TEST_TAGS.values():
             path = os.path.join(TESTS_BASE_FOLDER, tag)
             try:
@@ -0,0 +1,178 @@
+"""
+Test the content addressed cache of phase event automata used by the simulator and building them in parallel.
+"""
+import json
+import os
+import shutil
+import time
+from concurrent.futures import Future, wait
+from dataclasses import replace
+from unittest.mock import patch
+
+from pysmt.shortcuts import get_env
+
+from app import app
+from req_simulator import pea_builder
+from req_simulator.pea_builder import resolve_pea_tasks
+from req_simulator.pea_cache import PEA_CACHE_FOLDER, PeaCache, collect_garbage, pea_cache, pea_cache_key
+from reqtransformer import Requirement, VariableCollection
+from ressources.simulator_ressource import SimulatorRessource
+from tests.mock_hanfor import MockHanfor
+from unittest import TestCase
+
+RID = 'SysRS FooXY_42'
+
+
+class TestPeaCache(TestCase):
+    def setUp(self) -> None:
+        self.mock_hanfor = MockHanfor(
+            session_tags=['simple'],
+            test_session_source='test_formalization_process'
+        )
+        self.mock_hanfor.setUp()
+        self.mock_hanfor.startup_hanfor('simple.csv', 'simple', [])
+        self.folder = app.config['REVISION_FOLDER']
+        self.var_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+        self.set_type('int')
+        pea_cache.clear()
+
+    def tearDown(self) -> None:
+        pea_cache.clear()
+        self.mock_hanfor.tearDown()
+
+    def set_type(self, t):
+        for name in ('foo', 'bar'):
+            self.var_collection.collection[name].type = t
+
+    def build(self, requirement=None):
+        requirement = requirement or Requirement.load_requirement_by_id(RID, app)
+        return SimulatorRessource.build_phase_event_automata(requirement, self.var_collection, self.folder)
+
+    def cached_files(self):
+        return os.listdir(os.path.join(self.folder, PEA_CACHE_FOLDER))
+
+    def test_cache_hits(self):
+        peas = self.build()
+        self.assertEqual(1, len(peas))
+        self.assertEqual(1, len(self.cached_files()))
+        self.assertEqual({'size': 1, 'max_size': pea_cache.max_size, 'hits': 0, 'misses': 1}, pea_cache.info())
+
+        cached = self.build()
+        self.assertEqual(1, pea_cache.info()['hits'])
+        self.assertEqual(peas, cached)
+        self.assertEqual(RID, cached[0].requirement.rid)
+        self.assertEqual(0, cached[0].countertrace_id)
+
+        # Loaded from disk after a restart.
+        pea_cache.clear()
+        self.assertEqual(peas, self.build())
+        self.assertEqual({'size': 1, 'max_size': pea_cache.max_size, 'hits': 1, 'misses': 0}, pea_cache.info())
+
+    def test_key_follows_content(self):
+        self.build()
+        requirement = Requirement.load_requirement_by_id(RID, app)
+        expression = requirement.formalizations[0].expressions_mapping['R']
+        expression.raw_expression = ' ' + expression.raw_expression.replace('!=', ' != ') + ' '
+        self.build(requirement)
+        self.assertEqual(1, pea_cache.info()['hits'])
+
+        expression.raw_expression = 'bar != foo'
+        self.build(requirement)
+        self.assertEqual(2, pea_cache.info()['misses'])
+        self.assertEqual(2, len(self.cached_files()))
+
+        # pysmt does not allow to redefine the type of a symbol within a process, so only check the key here.
+        key = pea_cache_key('Absence', 'GLOBALLY', 0, 'ct', {'R': 'foo'}, {'foo': ('int', None)}, 'c')
+        self.assertNotEqual(
+            key, pea_cache_key('Absence', 'GLOBALLY', 0, 'ct', {'R': 'foo'}, {'foo': ('real', None)}, 'c'))
+        self.assertEqual(key, pea_cache_key('Absence', 'GLOBALLY', 0, 'ct', {'R': 'foo'}, {'foo': ('int', None)}, 'c'))
+
+    def test_prewarm(self):
+        self.var_collection.store()
+        requirement = Requirement.load_requirement_by_id(RID, app)
+        futures = SimulatorRessource.prewarm_in_background(requirement, app)
+        self.assertEqual(1, len(futures))
+        wait(futures, timeout=60)
+        self.assertIsNone(futures[0].exception())
+        pea_cache.clear()
+        self.build()
+        self.assertEqual(1, pea_cache.info()['hits'])
+        # Cached automata are not built again.
+        self.assertListEqual([], SimulatorRessource.prewarm_in_background(requirement, app))
+
+    def test_prewarm_replaces_pending_prewarm(self):
+        class PendingExecutor:
+            @staticmethod
+            def submit(fn, *args):
+                return Future()
+
+        self.var_collection.store()
+        requirement = Requirement.load_requirement_by_id(RID, app)
+        with patch.object(pea_builder, 'get_executor', lambda processes: PendingExecutor()):
+            first = SimulatorRessource.prewarm_in_background(requirement, app)
+            second = SimulatorRessource.prewarm_in_background(requirement, app)
+        self.assertTrue(all(future.cancelled() for future in first))
+        self.assertFalse(any(future.cancelled() for future in second))
+        self.assertIs(second, pea_builder._prewarms[(self.folder, RID)])
+        for future in second:
+            future.cancel()
+        self.assertNotIn((self.folder, RID), pea_builder._prewarms)
+
+    def test_parallel_build(self):
+        task = SimulatorRessource.pea_tasks(Requirement.load_requirement_by_id(RID, app), self.var_collection)[0]
+        tasks = [replace(task, expressions={'R': e}, clock_prefix=f'c_{i}_', key=f'test_{i}')
+                 for i, e in enumerate(['foo != bar', 'foo > bar', 'foo + 1 < bar', 'foo == bar'])]
+        progress = []
+        parallel = resolve_pea_tasks(tasks, self.folder, processes=2, on_progress=lambda *p: progress.append(p))
+        self.assertEqual([(0, 4), (1, 4), (2, 4), (3, 4), (4, 4)], progress)
+
+        # The automata built by the workers use the formula manager of this process.
+        formula_manager = get_env().formula_manager
+        for pea in parallel:
+            self.assertEqual(RID, pea.requirement.rid)
+            for dc_phase in pea.countertrace.dc_phases:
+                self.assertIn(dc_phase.invariant, formula_manager)
+            for phase in pea.phases.keys():
+                if phase is not None:
+                    self.assertIn(phase.state_invariant, formula_manager)
+
+        pea_cache.clear()
+        shutil.rmtree(os.path.join(self.folder, PEA_CACHE_FOLDER))
+        self.assertEqual(parallel, resolve_pea_tasks(tasks, self.folder, processes=1))
+
+    def test_create_simulator(self):
+        self.var_collection.store()
+        response = self.mock_hanfor.app.post('simulator', data={
+            'command': 'create_simulator',
+            'simulator_name': 'test',
+            'requirement_ids': json.dumps([RID]),
+            'progress_id': 'test'
+        }).json
+        self.assertTrue(response['success'])
+        self.assertFalse(SimulatorRessource.build_progress)
+        self.assertFalse(self.mock_hanfor.app.get('simulator?command=get_progress&progress_id=test').json['success'])
+
+    def test_prune(self):
+        self.build()
+        task = SimulatorRessource.pea_tasks(Requirement.load_requirement_by_id(RID, app), self.var_collection)[0]
+        resolve_pea_tasks([replace(task, expressions={'R': 'foo > bar'}, key='old'),
+                           replace(task, expressions={'R': 'foo < bar'}, key='older')], self.folder, processes=1)
+        cache_folder = os.path.join(self.folder, PEA_CACHE_FOLDER)
+        old = time.time() - 3 * 24 * 3600
+        os.utime(os.path.join(cache_folder, 'old.pickle'), (old, old))
+        os.utime(os.path.join(cache_folder, 'older.pickle'), (old - 1, old - 1))
+        with open(os.path.join(cache_folder, '.stale.tmp'), 'w'):
+            pass
+        os.utime(os.path.join(cache_folder, '.stale.tmp'), (old, old))
+        self.assertEqual(1, PeaCache.prune(self.folder, max_files=3, max_age_days=7))
+        self.assertEqual(3, len(self.cached_files()))
+
+        # A loaded automaton counts as recently used.
+        pea_cache.clear()
+        self.assertIsNotNone(pea_cache.get(self.folder, 'older'))
+        self.assertEqual(1, PeaCache.prune(self.folder, max_files=2, max_age_days=7))
+        self.assertNotIn('old.pickle', self.cached_files())
+        self.assertIn('older.pickle', self.cached_files())
+
+        self.assertEqual(1, collect_garbage(app.config['SESSION_FOLDER'], max_files=1, max_age_days=1))
+        self.assertListEqual(['older.pickle'], self.cached_files())
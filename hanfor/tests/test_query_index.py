@@ -0,0 +1,93 @@
+"""
+Test the compiled queries on the requirement search index against the plain evaluation of the query tree.
+"""
+import shutil
+import tempfile
+import threading
+from unittest import TestCase
+
+from requirement_store import get_requirement_store
+from ressources.queryapi import SearchNode, QueryAPI, compile_query, get_search_index
+from tests.test_requirement_store import make_requirement
+
+QUERIES = [
+    '',
+    'Todo',
+    'Done',
+    ':NOT:Done',
+    'of a',
+    'a',
+    ':DATA_TARGET:`Id`a',
+    ':DATA_TARGET:`Tags`has_formalization',
+    ':DATA_TARGET:`Status`""Todo""',
+    '""Todo""',
+    'req:AND::NOT:foo',
+    '(bar:OR:foo):AND:Description of',
+    ':DATA_TARGET:`Type`info:OR::DATA_TARGET:`Id`b',
+    'Description of a:OR:Description of c:AND::NOT:Done',
+    'nothing matches this',
+    'cDescription',
+]
+
+
+class TestQueryIndex(TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.store = get_requirement_store(self.folder)
+        self.store.store_many([
+            make_requirement('a', 0, tags=('foo', 'has_formalization')),
+            make_requirement('b', 1, status='Done', tags=('bar',)),
+            make_requirement('c', 2, type_in_csv='info'),
+            make_requirement('ab', 3, status='Done', tags=('foo',)),
+        ])
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def scan(self, query):
+        tree = SearchNode.from_query(query)
+        return sorted(
+            r.rid for r in self.store.snapshots()
+            if SearchNode.evaluate_tree(tree, QueryAPI.req_dict_to_search_dict(r.to_dict()))
+        )
+
+    def assertIndexMatchesScan(self):
+        index = get_search_index(self.folder)
+        for query in QUERIES:
+            self.assertListEqual(self.scan(query), sorted(compile_query(query).evaluate(index)), msg=query)
+
+    def test_index_matches_scan(self):
+        self.assertIndexMatchesScan()
+
+    def test_index_follows_stores(self):
+        get_search_index(self.folder)
+        requirement = self.store.load('c')
+        requirement.status = 'Done'
+        requirement.tags['bar'] = ''
+        self.store.store_many([requirement, make_requirement('d', 4, tags=('foo',))])
+        self.assertListEqual(['ab', 'b', 'c'], sorted(compile_query('Done').evaluate(get_search_index(self.folder))))
+        self.assertIndexMatchesScan()
+
+    def test_queries_during_sync(self):
+        index = get_search_index(self.folder)
+        stop = threading.Event()
+        errors = []
+
+        def query():
+            while not stop.is_set():
+                try:
+                    for query in QUERIES:
+                        compile_query(query).evaluate(index)
+                except Exception as e:
+                    errors.append(e)
+                    return
+
+        thread = threading.Thread(target=query)
+        thread.start()
+        for i in range(50):
+            self.store.store_many([make_requirement(f'x{i}', 10 + i, tags=('foo',))])
+            index.sync()
+        stop.set()
+        thread.join()
+        self.assertListEqual([], errors)
+        self.assertIndexMatchesScan()
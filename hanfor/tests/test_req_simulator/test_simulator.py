@@ -121,3 +121,23 @@ class TestSimulator(TestCase):
 
 
         self.assertEqual(True, actual, msg="Error while simulating scenario.")
+
+    @parameterized.expand(testcases)
+    def test_incremental_matches_one_shot(self, pattern_name: str, expressions: dict[str, FNode], yaml_str: str):
+        _, ct_str, _ = test_counter_trace.testcases[pattern_name]
+        ct = CountertraceTransformer(expressions).transform(get_countertrace_parser().parse(ct_str))
+        pea = build_automaton(ct)
+        pea.requirement = Requirement(id='0', description='', type_in_csv='', csv_row={}, pos_in_csv=0)
+        pea.formalization = Formalization(id=0)
+        pea.countertrace_id = 0
+
+        simulators = [Simulator([pea], Scenario.from_json_string(yaml_str), test=True, incremental=incremental)
+                      for incremental in (False, True)]
+        for i in range(len(simulators[0].scenario.times)):
+            sat = [simulator.check_sat() for simulator in simulators]
+            self.assertEqual(sat[0], sat[1])
+            self.assertEqual(*[[r.transitions for r in simulator.sat_results] for simulator in simulators])
+            if not sat[0] or i == len(simulators[0].scenario.times) - 1:
+                break
+            for simulator in simulators:
+                simulator.step_next(0)
@@ -0,0 +1,270 @@
+"""
+Test the requirement storage backends and the migration from the pickle layout to the requirements database.
+"""
+import os
+import pickle
+import shutil
+import sqlite3
+import tempfile
+from contextlib import closing
+from unittest import TestCase
+from unittest.mock import patch
+
+import requirement_store
+from reqtransformer import Requirement
+from requirement_store import get_requirement_store, migrate_pickle_folder, PickleRequirementStore, \
+    SqliteRequirementStore, requirement_cache, collect_garbage, content_hash, \
+    source_hash
+
+HERE = os.path.dirname(os.path.realpath(__file__))
+LEGACY_REVISION = os.path.join(HERE, 'test_sessions', 'test_query_api', 'simple', 'revision_0')
+
+
+def make_requirement(rid, pos, status='Todo', type_in_csv='req', tags=()) -> Requirement:
+    requirement = Requirement(rid, f'Description of {rid}', type_in_csv, {'id': rid}, pos)
+    requirement.status = status
+    for tag in tags:
+        requirement.tags[tag] = ''
+    return requirement
+
+
+class TestRequirementStore(TestCase):
+    def setUp(self):
+        self.session_folder = tempfile.mkdtemp()
+        self.folder = os.path.join(self.session_folder, 'revision_0')
+        os.mkdir(self.folder)
+
+    def tearDown(self):
+        shutil.rmtree(self.session_folder)
+        requirement_store.set_default_backend(requirement_store.SQLITE_BACKEND)
+
+    def fill(self, store):
+        store.store_many([
+            make_requirement('b', 1, status='Done', tags=('has_formalization',)),
+            make_requirement('a', 2, tags=('has_formalization', 'foo')),
+            make_requirement('c', 0, type_in_csv='info'),
+        ])
+
+    def check_queries(self, store):
+        self.assertListEqual(['a', 'b', 'c'], store.rids())
+        self.assertListEqual(['a', 'b', 'c'], [r.rid for r in store.requirements()])
+        self.assertEqual(3, len(store))
+        self.assertIn('a', store)
+        self.assertNotIn('d', store)
+        self.assertIsNone(store.load('d'))
+        self.assertEqual('Description of b', store.load('b').description)
+        self.assertListEqual(['b'], store.rids_with_status('Done'))
+        self.assertListEqual(['c'], store.rids_with_type('info'))
+        self.assertListEqual(['a', 'b'], store.rids_with_tag('has_formalization'))
+        self.assertDictEqual({'has_formalization': ['a', 'b'], 'foo': ['a']}, store.tag_usage())
+        self.assertDictEqual(
+            {('req', 'Todo'): 1, ('req', 'Done'): 1, ('info', 'Todo'): 1},
+            store.status_counts_by_type()
+        )
+        self.assertDictEqual({('req', 'has_formalization'): 2, ('req', 'foo'): 1}, store.tag_counts_by_type())
+        self.assertListEqual(['c', 'b', 'a'], store.rids_by_position())
+        self.assertListEqual(['c', 'a'], [r.rid for r in store.in_order(['c', 'd', 'a'], read_only=True)])
+        store.CHUNK_SIZE = 1
+        self.assertListEqual(['b', 'c', 'a'], [r.rid for r in store.in_order(['b', 'c', 'a'])])
+
+    def test_sqlite_store(self):
+        store = get_requirement_store(self.folder)
+        self.assertIsInstance(store, SqliteRequirementStore)
+        self.fill(store)
+        self.check_queries(store)
+        self.assertTrue(os.path.isfile(os.path.join(self.folder, 'requirements.sqlite')))
+
+    def test_pickle_store(self):
+        requirement_store.set_default_backend(requirement_store.PICKLE_BACKEND)
+        store = get_requirement_store(self.folder)
+        self.assertIsInstance(store, PickleRequirementStore)
+        self.fill(store)
+        self.check_queries(store)
+        self.assertTrue(os.path.isfile(os.path.join(self.folder, 'a.pickle')))
+
+    def test_store_updates_indexes(self):
+        store = get_requirement_store(self.folder)
+        self.fill(store)
+        requirement = Requirement.load(os.path.join(self.folder, 'a.pickle'))
+        requirement.tags.pop('foo')
+        requirement.status = 'Done'
+        requirement.store()
+        self.assertListEqual(['a', 'b'], store.rids_with_status('Done'))
+        self.assertListEqual([], store.rids_with_tag('foo'))
+
+    def test_migrate_pickle_folder(self):
+        shutil.rmtree(self.folder)
+        shutil.copytree(LEGACY_REVISION, self.folder)
+        self.assertIsInstance(get_requirement_store(self.folder), PickleRequirementStore)
+        legacy_rids = get_requirement_store(self.folder).rids()
+
+        self.assertEqual(len(legacy_rids), migrate_pickle_folder(self.folder))
+        store = get_requirement_store(self.folder)
+        self.assertIsInstance(store, SqliteRequirementStore)
+        self.assertListEqual(legacy_rids, store.rids())
+        remaining_files = sorted(os.listdir(self.folder))
+        self.assertListEqual(
+            ['requirements.sqlite', 'session_status.pickle', 'session_variable_collection.pickle'],
+            remaining_files
+        )
+        # Migrated requirements keep their content.
+        with open(os.path.join(LEGACY_REVISION, f'{legacy_rids[0]}.pickle'), 'rb') as f:
+            legacy_requirement = pickle.load(f)
+        self.assertEqual(legacy_requirement.description, store.load(legacy_rids[0]).description)
+        self.assertEqual(0, migrate_pickle_folder(self.folder))
+
+    def count_objects(self):
+        with closing(sqlite3.connect(os.path.join(self.session_folder, 'requirement_objects.sqlite'))) as connection:
+            return connection.execute('SELECT COUNT(*) FROM objects').fetchone()[0]
+
+    def test_revisions_share_objects(self):
+        self.fill(get_requirement_store(self.folder))
+        self.assertEqual(3, self.count_objects())
+        next_folder = os.path.join(self.session_folder, 'revision_1')
+        os.mkdir(next_folder)
+        next_store = get_requirement_store(next_folder)
+        next_store.store_many(get_requirement_store(self.folder).requirements())
+        self.assertEqual(3, self.count_objects())
+        self.check_queries(next_store)
+
+        changed = next_store.load('a')
+        changed.status = 'Done'
+        next_store.store(changed)
+        self.assertEqual(4, self.count_objects())
+        self.assertEqual('Todo', get_requirement_store(self.folder).load('a').status)
+        self.assertEqual(0, collect_garbage(self.session_folder))
+
+        shutil.rmtree(self.folder)
+        self.assertEqual(1, collect_garbage(self.session_folder))
+        self.assertEqual(3, self.count_objects())
+        self.assertEqual('Done', next_store.load('a').status)
+
+    def test_link_from(self):
+        self.fill(get_requirement_store(self.folder))
+        base_store = get_requirement_store(self.folder)
+        sources = list(base_store.sources())
+        self.assertListEqual(['a', 'b', 'c'], [rid for rid, _, _, _ in sources])
+        self.assertEqual(source_hash(make_requirement('a', 2)), sources[0][1])
+        self.assertListEqual([2, 1, 0], [pos for _, _, pos, _ in sources])
+        self.assertFalse(any(has_diff for _, _, _, has_diff in sources))
+
+        next_folder = os.path.join(self.session_folder, 'revision_1')
+        os.mkdir(next_folder)
+        next_store = get_requirement_store(next_folder)
+        next_store.link_from(base_store, ['a', 'b'])
+        next_store.store(make_requirement('c', 0, type_in_csv='info'))
+        self.check_queries(next_store)
+        self.assertEqual(3, self.count_objects())
+
+    def test_migrate_inline_data(self):
+        requirement = make_requirement('a', 0, tags=('foo',))
+        with closing(sqlite3.connect(os.path.join(self.folder, 'requirements.sqlite'))) as connection, connection:
+            connection.executescript("""
+                CREATE TABLE requirements (rid TEXT PRIMARY KEY, pos_in_csv INTEGER, status TEXT, type TEXT,
+                                           data BLOB NOT NULL);
+                CREATE INDEX requirements_status ON requirements (status);
+                CREATE TABLE requirement_tags (rid TEXT NOT NULL, tag TEXT NOT NULL, PRIMARY KEY (rid, tag));
+                CREATE TABLE store_meta (key TEXT PRIMARY KEY, value);
+                INSERT INTO store_meta (key, value) VALUES ('generation', 3), ('identity', 'legacy');
+                INSERT INTO requirement_tags (rid, tag) VALUES ('a', 'foo');
+            """)
+            connection.execute('INSERT INTO requirements VALUES (?, ?, ?, ?, ?)',
+                               ('a', 0, 'Todo', 'req', pickle.dumps(requirement)))
+        store = get_requirement_store(self.folder)
+        self.assertEqual(('legacy', 3), store.content_version())
+        self.assertEqual('Description of a', store.load('a').description)
+        self.assertListEqual(['a'], store.rids_with_status('Todo'))
+        self.assertListEqual(['a'], store.rids_with_tag('foo'))
+        self.assertEqual(1, self.count_objects())
+
+
+class TestRequirementCache(TestCase):
+    def setUp(self):
+        self.session_folder = tempfile.mkdtemp()
+        self.folder = os.path.join(self.session_folder, 'revision_0')
+        os.mkdir(self.folder)
+        requirement_cache.clear()
+        self.store = get_requirement_store(self.folder)
+        self.store.store_many([make_requirement(rid, pos) for pos, rid in enumerate(['a', 'b', 'c'])])
+
+    def tearDown(self):
+        shutil.rmtree(self.session_folder)
+        requirement_cache.resize(requirement_store.DEFAULT_CACHE_SIZE)
+
+    def test_write_through_and_counters(self):
+        hits = requirement_cache.hits
+        self.assertEqual('Description of a', self.store.load('a').description)
+        self.assertEqual(hits + 1, requirement_cache.hits)
+        misses = requirement_cache.misses
+        self.assertIsNone(self.store.load('d'))
+        self.assertEqual(misses + 1, requirement_cache.misses)
+
+    def test_loads_are_private_copies(self):
+        first = self.store.load('a')
+        first.status = 'Done'
+        self.assertEqual('Todo', self.store.load('a').status)
+        first.store()
+        self.assertEqual('Done', self.store.load('a').status)
+        self.assertEqual(['a'], self.store.rids_with_status('Done'))
+        self.assertEqual('Done', [r for r in self.store.snapshots(['a'])][0].status)
+
+    def test_own_writes_keep_cache(self):
+        self.store.load('a')
+        invalidations = requirement_cache.invalidations
+        self.store.store(make_requirement('b', 1))
+        hits = requirement_cache.hits
+        self.store.load('a')
+        self.assertEqual(hits + 1, requirement_cache.hits)
+        self.assertEqual(invalidations, requirement_cache.invalidations)
+
+    def test_external_write_invalidates(self):
+        self.store.load('a')
+        # Simulate another process writing to the database.
+        changed = make_requirement('a', 0)
+        changed.description = 'changed elsewhere'
+        data = pickle.dumps(changed)
+        with closing(sqlite3.connect(os.path.join(self.folder, 'requirements.sqlite'))) as connection, connection:
+            connection.execute('ATTACH DATABASE ? AS session', (self.store.objects_path,))
+            connection.execute('INSERT INTO session.objects (hash, data) VALUES (?, ?)', (content_hash(data), data))
+            connection.execute('UPDATE requirements SET hash = ? WHERE rid = ?', (content_hash(data), 'a'))
+            connection.execute("UPDATE store_meta SET value = value + 1 WHERE key = 'generation'")
+        self.assertEqual('changed elsewhere', self.store.load('a').description)
+
+    def test_lru_eviction(self):
+        requirement_cache.clear()
+        requirement_cache.resize(2)
+        list(self.store.snapshots())
+        self.assertEqual(2, requirement_cache.info()['size'])
+        misses = requirement_cache.misses
+        self.store.load('a')
+        self.assertEqual(misses + 1, requirement_cache.misses)
+
+    def test_write_during_load_is_not_shadowed(self):
+        requirement_cache.clear()
+        connect = self.store._connect
+        changed = make_requirement('a', 0, status='Done')
+
+        class WriteAfterRead:
+            """ Connection of the load, another thread stores `a` right after the load read the database. """
+            def __init__(self, connection):
+                self.connection = connection
+                self.read = False
+
+            def __getattr__(self, name):
+                return getattr(self.connection, name)
+
+            def execute(self, sql, *args):
+                self.read |= 'session.objects' in sql
+                return self.connection.execute(sql, *args)
+
+            def close(self):
+                self.connection.close()
+                if self.read:
+                    with patch.object(store, '_connect', connect):
+                        store.store(changed)
+
+        store = self.store
+        with patch.object(store, '_connect', lambda *args, **kwargs: WriteAfterRead(connect(*args, **kwargs))):
+            # The load itself returns what it read.
+            self.assertEqual('Todo', store.load('a').status)
+        self.assertEqual('Done', store.load('a').status)
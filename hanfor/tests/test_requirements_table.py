@@ -0,0 +1,91 @@
+"""
+Test the server side processing of the requirements table (paging, ordering, searching).
+"""
+import json
+from unittest import TestCase
+
+from ressources.queryapi import SearchNode
+from tests.mock_hanfor import MockHanfor
+
+
+class TestRequirementsTable(TestCase):
+    def setUp(self) -> None:
+        self.mock_hanfor = MockHanfor(
+            session_tags=['simple'],
+            test_session_source='test_query_api'
+        )
+        self.mock_hanfor.setUp()
+        self.mock_hanfor.startup_hanfor('simple.csv', 'simple', [])
+
+    def tearDown(self) -> None:
+        self.mock_hanfor.tearDown()
+
+    def query(self, **kwargs):
+        args = {'draw': 1, 'start': 0, 'length': 50, 'order[0][column]': 1, 'order[0][dir]': 'asc',
+                'columns[1][data]': 'pos', 'columns[2][data]': 'id'}
+        args.update(kwargs)
+        response = self.mock_hanfor.app.get('api/req/gets', query_string=args)
+        self.assertEqual(200, response.status_code)
+        return response.json
+
+    def ids(self, result):
+        return [r['id'] for r in result['data']]
+
+    def test_paging_and_order(self):
+        result = self.query()
+        self.assertEqual(1, result['draw'])
+        self.assertEqual(2, result['recordsTotal'])
+        self.assertEqual(2, result['recordsFiltered'])
+        self.assertListEqual(['SysRS FooXY_91', 'SysRS FooXY_42'], self.ids(result))
+
+        result = self.query(**{'order[0][column]': 2, 'order[0][dir]': 'desc', 'start': 0, 'length': 1})
+        self.assertListEqual(['SysRS FooXY_91'], self.ids(result))
+        self.assertEqual(2, result['recordsFiltered'])
+        result = self.query(**{'order[0][column]': 2, 'order[0][dir]': 'desc', 'start': 1, 'length': 1})
+        self.assertListEqual(['SysRS FooXY_42'], self.ids(result))
+        self.assertEqual(2, len(self.query(length=-1)['data']))
+
+    def test_search(self):
+        result = self.query(search_query='FooXY_91')
+        self.assertListEqual(['SysRS FooXY_91'], self.ids(result))
+        self.assertEqual(2, result['recordsTotal'])
+        self.assertEqual(1, result['recordsFiltered'])
+
+        self.assertListEqual(['SysRS FooXY_42'], self.ids(self.query(search_query=':COL_INDEX_02::NOT:_91')))
+        self.assertListEqual([], self.ids(self.query(search_query=':COL_INDEX_02:""FooXY_91""')))
+        self.assertListEqual(['SysRS FooXY_91', 'SysRS FooXY_42'],
+                             self.ids(self.query(search_query='_42:OR:_91')))
+        self.assertListEqual([], self.ids(self.query(
+            search_query='_42:OR:_91', filter_query=json.dumps(SearchNode.query_splitter('Done', 6)))))
+
+        ids = self.mock_hanfor.app.get('api/req/gets', query_string={'ids_only': 'true', 'search_query': '_42'}).json
+        self.assertListEqual(['SysRS FooXY_42'], ids['ids'])
+        self.assertEqual(400, self.mock_hanfor.app.get('api/req/gets', query_string={
+            'draw': 1, 'search_query': '(_42'}).status_code)
+        self.assertEqual(400, self.mock_hanfor.app.get('api/req/gets', query_string={
+            'draw': 1, 'search_query': '_42:AND:'}).status_code)
+
+    def test_index_follows_updates(self):
+        self.assertEqual(0, self.query(filter_query=json.dumps(SearchNode.query_splitter('Done', 6)))['recordsFiltered'])
+        self.mock_hanfor.app.post('api/req/update', data={
+            'id': 'SysRS FooXY_42',
+            'row_idx': '0',
+            'update_formalization': 'false',
+            'tags': json.dumps({'table_test': ''}),
+            'status': 'Done'
+        })
+        result = self.query(filter_query=json.dumps(SearchNode.query_splitter('Done', 6)))
+        self.assertListEqual(['SysRS FooXY_42'], self.ids(result))
+        self.assertEqual('Done', result['data'][0]['status'])
+        self.assertListEqual(['SysRS FooXY_42'], self.ids(self.query(search_query=':COL_INDEX_05:table_test')))
+
+    def test_search_node(self):
+        row = ['', '1', 'SysRS FooXY_42', 'The foo is "bar"', 'Requirement', 'has_formalization', 'Todo', '']
+        visible = [True] * len(row)
+        self.assertTrue(SearchNode.from_query('foo:AND:(xyz:OR:bar)').evaluate_row(row, visible))
+        self.assertFalse(SearchNode.from_query('foo:AND:xyz:OR:bar:AND:xyz').evaluate_row(row, visible))
+        self.assertTrue(SearchNode.from_query('"foo"').evaluate_row(row, visible))
+        self.assertFalse(SearchNode.from_query('"fo"').evaluate_row(row, visible))
+        self.assertTrue(SearchNode.from_query(':COL_INDEX_04:""requirement""').evaluate_row(row, visible))
+        self.assertFalse(SearchNode.from_query('Requirement').evaluate_row(row, visible[:4] + [False] * 4))
+        self.assertTrue(SearchNode.from_query('').evaluate_row(row, visible))
@@ -0,0 +1,81 @@
+"""
+Test the catalog records of the revisions used to list the stored sessions.
+"""
+import json
+import os
+from unittest import TestCase
+from unittest.mock import patch
+
+import revision_catalog
+import utils
+from app import app
+from requirement_store import PickleRequirementStore
+from tests.mock_hanfor import MockHanfor
+from tests.test_requirement_store import make_requirement
+
+
+class TestRevisionCatalog(TestCase):
+    def setUp(self) -> None:
+        self.mock_hanfor = MockHanfor(
+            session_tags=['simple'],
+            test_session_source='test_query_api'
+        )
+        self.mock_hanfor.setUp()
+        self.mock_hanfor.startup_hanfor('simple.csv', 'simple', [])
+        self.folder = app.config['REVISION_FOLDER']
+
+    def tearDown(self) -> None:
+        self.mock_hanfor.tearDown()
+
+    def test_record_written_on_startup(self):
+        record = revision_catalog.read_record(self.folder)
+        self.assertEqual(2, record['num_requirements'])
+        self.assertDictEqual({'Todo': 2}, record['status_counts'])
+        self.assertEqual(revision_catalog.build_record(self.folder)['num_vars'], record['num_vars'])
+
+    def test_listing_reads_records(self):
+        with patch.object(revision_catalog, 'pickle_load_from_dump', side_effect=AssertionError('loaded')):
+            stats = utils.get_revisions_with_stats(app.config['SESSION_FOLDER'])
+        self.assertListEqual(['revision_0'], list(stats.keys()))
+        self.assertEqual(2, stats['revision_0']['num_requirements'])
+        self.assertGreater(stats['revision_0']['num_vars'], 0)
+
+    def test_writes_update_record(self):
+        self.mock_hanfor.app.post('api/req/update', data={
+            'id': 'SysRS FooXY_42',
+            'row_idx': '0',
+            'update_formalization': 'false',
+            'tags': json.dumps({}),
+            'status': 'Done'
+        })
+        self.assertDictEqual({'Todo': 1, 'Done': 1}, revision_catalog.read_record(self.folder)['status_counts'])
+
+        num_vars = revision_catalog.read_record(self.folder)['num_vars']
+        response = self.mock_hanfor.app.post('api/var/add_new_variable', data={'name': 'catalog_test', 'type': 'INT'})
+        self.assertTrue(response.json['success'])
+        self.assertEqual(num_vars + 1, revision_catalog.read_record(self.folder)['num_vars'])
+
+    def test_legacy_folder_and_rebuild(self):
+        os.remove(os.path.join(self.folder, revision_catalog.CATALOG_FILE))
+        stats = utils.get_revisions_with_stats(app.config['SESSION_FOLDER'])
+        self.assertEqual(2, stats['revision_0']['num_requirements'])
+        self.assertTrue(os.path.isfile(os.path.join(self.folder, revision_catalog.CATALOG_FILE)))
+
+        revision_catalog.write_record(self.folder, {'num_vars': 0, 'num_requirements': 0, 'status_counts': {},
+                                                    'last_mod': 0})
+        self.assertEqual(1, revision_catalog.rebuild(app.config['SESSION_FOLDER']))
+        self.assertEqual(2, revision_catalog.read_record(self.folder)['num_requirements'])
+
+    def test_flush_counts_legacy_pickles(self):
+        folder = os.path.join(app.config['SESSION_FOLDER'], 'revision_legacy')
+        os.mkdir(folder)
+        store = PickleRequirementStore(folder)
+        store.store_many([make_requirement('a', 0), make_requirement('b', 1, status='Done')])
+        revision_catalog.flush()
+        self.assertDictEqual({'Todo': 1, 'Done': 1}, revision_catalog.read_record(folder)['status_counts'])
+
+        store.store(make_requirement('a', 0, status='Review'))
+        revision_catalog.flush()
+        record = revision_catalog.read_record(folder)
+        self.assertEqual(2, record['num_requirements'])
+        self.assertDictEqual({'Review': 1, 'Done': 1}, record['status_counts'])
@@ -0,0 +1,78 @@
+"""
+Test the scheduler of the variable script evaluations.
+"""
+import os
+from unittest import TestCase
+from unittest.mock import patch
+
+import script_evaluations
+from app import app
+from reqtransformer import ScriptEvals, VariableCollection
+from tests.mock_hanfor import MockHanfor
+
+
+class TestScriptEvaluations(TestCase):
+    def setUp(self) -> None:
+        self.mock_hanfor = MockHanfor(
+            session_tags=['simple'],
+            test_session_source='test_query_api'
+        )
+        self.mock_hanfor.setUp()
+        self.mock_hanfor.startup_hanfor('simple.csv', 'simple', [])
+        patcher = patch.object(script_evaluations, '_schedulers', dict())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.script_utils_path = os.path.join(self.mock_hanfor.test_session_base_folder, 'script_utils')
+        os.makedirs(self.script_utils_path)
+        self.write_script('echo "found $1"')
+        self.config = {key: app.config.get(key) for key in ('SCRIPT_EVALUATIONS', 'SCRIPT_UTILS_PATH')}
+        app.config['SCRIPT_EVALUATIONS'] = {'find.sh': ['', '$VAR_NAME']}
+        app.config['SCRIPT_UTILS_PATH'] = self.script_utils_path
+
+    def tearDown(self) -> None:
+        app.config.update(self.config)
+        self.mock_hanfor.tearDown()
+
+    def write_script(self, content: str):
+        with open(os.path.join(self.script_utils_path, 'find.sh'), mode='w') as script_file:
+            script_file.write(content)
+
+    def reload(self, **kwargs) -> dict:
+        var_collection = VariableCollection.load_session(app)
+        var_collection.reload_script_results(app, **kwargs)
+        scheduler = script_evaluations.get_session_scheduler(app)
+        self.assertTrue(scheduler.wait(timeout=30))
+        return scheduler.progress()
+
+    def test_evaluate_and_cache(self):
+        names = list(VariableCollection.load_session(app).collection.keys())
+        progress = self.reload()
+        self.assertEqual(len(names), progress['done'])
+        self.assertEqual(0, progress['pending'])
+        results = ScriptEvals.load(app.config['SCRIPT_EVAL_RESULTS_PATH']).get_concatenated_evals()
+        for name in names:
+            self.assertIn(f'found {name}', results[name])
+
+        response = self.mock_hanfor.app.get('api/var/script_evals')
+        self.assertTrue(response.json['success'])
+        self.assertEqual(len(names), response.json['done'])
+
+        # Unchanged script: Nothing is run again.
+        progress = self.reload()
+        self.assertEqual(len(names), progress['done'])
+        self.assertEqual(len(names), progress['cached'])
+        self.assertEqual(len(names), self.reload(var_names=names[:1], force=True)['done'] - 1)
+
+        # Changed script: Everything is run again.
+        self.write_script('echo "still found $1"')
+        self.assertEqual(2 * len(names) + 1, self.reload()['done'])
+        results = ScriptEvals.load(app.config['SCRIPT_EVAL_RESULTS_PATH']).get_concatenated_evals()
+        self.assertIn(f'still found {names[0]}', results[names[0]])
+
+    def test_single_writer_batches(self):
+        names = list(VariableCollection.load_session(app).collection.keys())
+        with patch.object(ScriptEvals, 'store', autospec=True, side_effect=ScriptEvals.store) as store:
+            self.reload()
+        self.assertGreaterEqual(len(names), store.call_count)
+        self.assertGreaterEqual(store.call_count, 1)
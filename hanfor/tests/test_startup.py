@@ -0,0 +1,70 @@
+"""
+Test skipping the requirement migrations on startup by the startup manifest of a revision and the one pass migration.
+"""
+from argparse import Namespace
+from unittest import TestCase
+from unittest.mock import patch
+
+import app as hanfor_app
+import startup
+from app import app
+from reqtransformer import Requirement
+from requirement_store import get_requirement_store
+from startup import StartupManifest, migrate_requirement, scan_requirements
+from tests.mock_hanfor import MockHanfor
+
+
+class TestStartup(TestCase):
+    def setUp(self) -> None:
+        self.mock_hanfor = MockHanfor(
+            session_tags=['simple'],
+            test_session_source='test_query_api'
+        )
+        self.mock_hanfor.setUp()
+        self.mock_hanfor.startup_hanfor('simple.csv', 'simple', [])
+        self.folder = app.config['REVISION_FOLDER']
+        self.args = Namespace(reload_type_inference=False)
+
+    def tearDown(self) -> None:
+        self.mock_hanfor.tearDown()
+
+    def migrate(self):
+        """ Run the requirements migration of a restart, returning whether it scanned the requirements. """
+        with patch.object(hanfor_app, 'scan_requirements', wraps=scan_requirements) as scan:
+            hanfor_app.requirements_version_migrations(app, self.args, StartupManifest.load(self.folder))
+        return scan.called
+
+    def test_restart_skips_migration(self):
+        self.assertTrue(StartupManifest.load(self.folder).requirements_migrated(
+            get_requirement_store(self.folder).content_version()))
+        self.assertFalse(self.migrate())
+        self.args.reload_type_inference = True
+        self.assertTrue(self.migrate())
+
+    def test_own_writes_keep_manifest(self):
+        self.mock_hanfor.app.post('api/req/new_formalization', data={'id': 'SysRS FooXY_42'})
+        self.assertFalse(self.migrate())
+
+    def test_external_write_triggers_migration(self):
+        requirement = Requirement.load_requirement_by_id('SysRS FooXY_42', app)
+        with patch.object(startup, '_tracked_manifests', dict()):
+            requirement.store()
+        self.assertTrue(self.migrate())
+        self.assertFalse(self.migrate())
+
+    def test_parallel_scan_matches_inline(self):
+        inline = scan_requirements(self.folder)
+        parallel = scan_requirements(self.folder, processes=2, chunk_size=1)
+        self.assertEqual(2, parallel.requirements)
+        self.assertEqual(0, parallel.migrated)
+        self.assertDictEqual(inline.tag_usage, parallel.tag_usage)
+        self.assertDictEqual(inline.var_usage, parallel.var_usage)
+
+    def test_migrate_requirement_idempotent(self):
+        requirement = Requirement.load_requirement_by_id('SysRS FooXY_42', app)
+        requirement.add_empty_formalization()
+        migrate_requirement(requirement)
+        tags = dict(requirement.tags)
+        self.assertIn('incomplete_formalization', tags)
+        self.assertFalse(migrate_requirement(requirement))
+        self.assertDictEqual(tags, requirement.tags)
@@ -0,0 +1,226 @@
+"""
+Differential test of the type inference by unification (`type_unification`) against `TypeInference`.
+Both must derive the same expression types, variable types and type errors: for single expressions as by
+`run_typecheck_fixpoint` and for sessions as by typechecking all expressions in turn until the types are stable.
+"""
+import glob
+import os
+import random
+import shutil
+import tempfile
+from typing import Dict, Hashable, List, Optional, Tuple
+from unittest import TestCase
+
+import boogie_parsing
+from boogie_parsing import BoogieType, run_typecheck_fixpoint, typecheck_expression
+from reqtransformer import Requirement, VariableCollection
+from type_unification import TypeClasses, infer_session_types, infer_types, session_expressions
+
+HERE = os.path.dirname(os.path.realpath(__file__))
+TEST_SESSIONS = os.path.join(HERE, 'test_sessions')
+
+B, I, R, U = BoogieType.bool, BoogieType.int, BoogieType.real, BoogieType.unknown
+
+# (expression, type environment, expected types) of the TypeInference tests.
+UNIT_EXPRESSIONS = [
+    ("(((((b + a) + d) * 23) < 4) && x ==> y )", {'a': U}, None),
+    ("(b + a) + 23", {'a': R}, None),
+    ("(b + a) + 23 < 47", {'a': U}, None),
+    ("23 + a < 2", {}, None),
+    ("x", {}, [B]),
+    ("true", {}, None),
+    ("!y", {'y': U}, None),
+    ("-y", {'y': I}, [I]),
+    ("-y", {'y': R}, [R]),
+    ("x == y", {}, None),
+    ("x == y", {'x': B, 'y': B}, [B]),
+    ("x != y", {'x': I, 'y': I}, [B]),
+    ("x == y", {'y': R}, None),
+    ("x == y", {'x': I}, None),
+    ("(x + a) + (-y - z)", {'x': I}, None),
+    ("(x + a) + (-y - z)", {'x': B}, None),
+    ("x", {'x': I}, None),
+    ("(23.1 + 47.2 + x) < 44 && (b && a)", {'a': B, 'x': R}, None),
+    ('MAX > 2.2', {'MAX': I}, None),
+    ('MAX_TIME + OFFSET', {'MAX_TIME': R, 'OFFSET': I}, [I, R]),
+    ('MAX_TIME / OFFSET', {'MAX_TIME': I}, [I, R]),
+    ('a < b && b < c && c < d && d < e && e < f && f == 0.2', {}, None),
+    ('a < b && b < c && c < d && d < e && e < f && f == 23', {}, None),
+    ('abs(-10)', {}, None),
+    ('abs(42 - foo)', {}, None),
+    ('abs(42 > foo)', {}, None),
+    ('abs(bar + foo) == spam', {'spam': R}, [B]),
+    ('abs(bar + foo) + baz == spam', {}, [B]),
+    ('abs(bar + foo) + spam', {'spam': B}, [B]),
+    ('abs(- bar - foo * 5) > spam', {'foo': R}, [B]),
+    ('abs(foo)', {'foo': R}, [B]),
+    ('min(a, b) + max(c, 2.5)', {}, [I, R]),
+    ('a % b == c / 2', {'c': R}, [B]),
+]
+
+
+def random_expression(rnd: random.Random, depth: int, variables: List[str]) -> str:
+    """ A random expression, mostly ill-typed. """
+    if depth == 0 or rnd.random() < 0.25:
+        return rnd.choice(variables * 2 + ['1', '2.0', 'true', 'false'])
+    k = rnd.random()
+    if k < 0.1:
+        return f"!{random_expression(rnd, depth - 1, variables)}"
+    if k < 0.15:
+        return f"-{random_expression(rnd, depth - 1, variables)}"
+    if k < 0.2:
+        return f"abs({random_expression(rnd, depth - 1, variables)})"
+    if k < 0.25:
+        return (f"{rnd.choice(['min', 'max'])}({random_expression(rnd, depth - 1, variables)}, "
+                f"{random_expression(rnd, depth - 1, variables)})")
+    op = rnd.choice(['+', '-', '*', '/', '%', '<', '>', '<=', '>=', '==', '!=', '&&', '||', '==>'])
+    return f"({random_expression(rnd, depth - 1, variables)} {op} {random_expression(rnd, depth - 1, variables)})"
+
+
+def typed_expression(rnd: random.Random, t: BoogieType, depth: int, var_types: Dict[str, BoogieType]) -> str:
+    """ A random well-typed expression of type `t`, using variables of the given types. """
+    def sub(t_):
+        return typed_expression(rnd, t_, depth - 1, var_types)
+
+    names = [name for name, var_type in var_types.items() if var_type == t]
+    if depth == 0 or rnd.random() < 0.3:
+        if names and rnd.random() < 0.7:
+            return rnd.choice(names)
+        return {B: rnd.choice(['true', 'false']), I: str(rnd.randint(0, 9)), R: f"{rnd.randint(0, 9)}.5"}[t]
+    k = rnd.random()
+    if t == B:
+        if k < 0.1:
+            return f"!{sub(B)}"
+        if k < 0.5:
+            return f"({sub(B)} {rnd.choice(['&&', '||', '==>'])} {sub(B)})"
+        operand_type = rnd.choice([I, R, B]) if k < 0.7 else rnd.choice([I, R])
+        op = rnd.choice(['==', '!='] if operand_type == B else ['<', '>', '<=', '>=', '==', '!='])
+        return f"({sub(operand_type)} {op} {sub(operand_type)})"
+    if t == I and k < 0.15:
+        return rnd.choice([f"abs({sub(I)})", f"{rnd.choice(['min', 'max'])}({sub(I)}, {sub(I)})",
+                           f"({sub(I)} % {sub(I)})"])
+    if k < 0.25:
+        return f"-{sub(t)}"
+    return f"({sub(t)} {rnd.choice(['+', '-', '*', '/'])} {sub(t)})"
+
+
+def random_session(rnd: random.Random, size: int = 15) \
+        -> Tuple[List[Tuple[Hashable, str, Optional[List[BoogieType]]]], Dict[str, BoogieType]]:
+    """ Random well-typed expressions over 10 variables and a partial type environment of them.
+    The types of the real variables are given, as variables not typed otherwise get the first expected type (int). """
+    var_types = {f'v{i}': rnd.choice([B, I, R]) for i in range(10)}
+    expressions = []
+    for i in range(size):
+        if rnd.random() < 0.7:
+            expressions.append((i, typed_expression(rnd, B, 3, var_types), [B]))
+        else:
+            expressions.append((i, typed_expression(rnd, rnd.choice([I, R]), 3, var_types), [I, R]))
+    type_env = {name: t if rnd.random() < 0.3 else U for name, t in var_types.items() if rnd.random() < 0.5}
+    type_env.update({name: t for name, t in var_types.items() if t == R})
+    return expressions, type_env
+
+
+def typecheck_session_fixpoint(expressions: List[Tuple[Hashable, str, Optional[List[BoogieType]]]],
+                               type_env: Dict[str, BoogieType]):
+    """ Typecheck the expressions of a session by `TypeInference` in turn until the types are stable. """
+    type_env = dict(type_env)
+    used_variables = set()
+    while True:
+        previous_type_env = dict(type_env)
+        results = dict()
+        for key, expression, expected_types in expressions:
+            results[key] = typecheck_expression(expression, type_env, expected_types)
+            used_variables.update(results[key].type_env)
+        if type_env == previous_type_env:
+            return {name: type_env[name] for name in used_variables}, results
+
+
+def load_test_sessions(folder: str):
+    """ Copy the test sessions to `folder` and yield (revision folder, expressions, type env) of each. """
+    shutil.copytree(TEST_SESSIONS, folder, dirs_exist_ok=True, ignore=shutil.ignore_patterns('tmp'))
+    for path in sorted(glob.glob(os.path.join(folder, '**', 'session_variable_collection.pickle'), recursive=True)):
+        revision_folder = os.path.dirname(path)
+        var_collection = VariableCollection.load(path)
+        if var_collection.outdated:
+            var_collection.run_version_migrations()
+        requirements = list(Requirement.requirements(revision_folder))
+        yield revision_folder, list(session_expressions(requirements, var_collection)), \
+            var_collection.get_boogie_type_env()
+
+
+class TestTypeUnification(TestCase):
+
+    def assertSameInference(self, expression: str, type_env: dict, expected_types: list = None):
+        tree = boogie_parsing.get_parser_instance().parse(expression)
+        ti = run_typecheck_fixpoint(tree, dict(type_env), expected_types)
+        derived_type_env = dict(type_env)
+        result = infer_types(tree, derived_type_env, expected_types)
+        msg = f'{expression} in {type_env} expecting {expected_types}'
+        self.assertEqual(ti.type_root.t, result.t, msg=msg)
+        self.assertDictEqual(ti.type_env, derived_type_env, msg=msg)
+        self.assertEqual(tuple(ti.type_errors), result.type_errors, msg=msg)
+
+    def assertSameSessionInference(self, expressions: list, type_env: dict):
+        expected_type_env, expected_results = typecheck_session_fixpoint(expressions, type_env)
+        derived_type_env, results = infer_session_types(expressions, type_env)
+        self.assertDictEqual(expected_type_env, derived_type_env)
+        self.assertDictEqual(expected_results, results)
+
+    def test_type_classes(self):
+        classes = TypeClasses()
+        a, b, c = classes.new(), classes.new(), classes.new(I)
+        self.assertTrue(classes.union(a, b))
+        self.assertTrue(classes.union(c, b))
+        self.assertEqual(I, classes.type(a))
+        d = classes.new(R)
+        self.assertFalse(classes.union(a, d))
+        self.assertFalse(classes.bind(a, R))
+        self.assertEqual(R, classes.type(d))
+        self.assertEqual(classes.find(a), classes.find(c))
+
+    def test_unit_expressions(self):
+        for expression, type_env, expected_types in UNIT_EXPRESSIONS:
+            self.assertSameInference(expression, type_env, expected_types)
+
+    def test_random_expressions(self):
+        rnd = random.Random(0)
+        variables = ['a', 'b', 'c', 'd']
+        for _ in range(1000):
+            type_env = {name: rnd.choice([U, U, U, I, R, B]) for name in variables if rnd.random() < 0.6}
+            expected_types = rnd.choice([None, [B], [I, R]])
+            self.assertSameInference(random_expression(rnd, 4, variables), type_env, expected_types)
+
+    def test_test_sessions(self):
+        with tempfile.TemporaryDirectory() as folder:
+            sessions = list(load_test_sessions(folder))
+            self.assertTrue(any(expressions for _, expressions, _ in sessions))
+            for revision_folder, expressions, type_env in sessions:
+                for _, expression, expected_types in expressions:
+                    self.assertSameInference(expression, type_env, expected_types)
+                self.assertSameSessionInference(expressions, type_env)
+
+    def test_random_sessions(self):
+        rnd = random.Random(0)
+        for _ in range(100):
+            self.assertSameSessionInference(*random_session(rnd))
+
+    def test_ill_typed_session(self):
+        # The type of `x` derived from the well-typed expressions is used to check the ill-typed one.
+        expressions = [
+            ('a', 'x + 1 > y', [B]),
+            ('b', '(x && true) || y + 2.5 < 1', [B]),
+            ('c', 'z == y', [B]),
+        ]
+        expected_type_env, expected_results = typecheck_session_fixpoint(expressions, {})
+        derived_type_env, results = infer_session_types(expressions, {})
+        self.assertDictEqual({'x': I, 'y': I, 'z': I}, derived_type_env)
+        self.assertDictEqual(expected_type_env, derived_type_env)
+        self.assertDictEqual(expected_results, results)
+        self.assertEqual((), results['a'].type_errors)
+        self.assertEqual('Wrong argument type in x && true: expected {<BoogieType.bool: 1>} but got BoogieType.int.',
+                         results['b'].type_errors[0])
+
+    def test_unparsable_expressions_are_skipped(self):
+        derived_type_env, results = infer_session_types([('a', 'x &&', [B]), ('b', 'x', [B])], {})
+        self.assertListEqual(['b'], list(results))
+        self.assertDictEqual({'x': B}, derived_type_env)
@@ -0,0 +1,187 @@
+"""
+Test the unit of work sharing one session VariableCollection per request and storing it once.
+"""
+import json
+import threading
+from unittest import TestCase
+from unittest.mock import patch
+
+import reqtransformer
+from app import app
+from reqtransformer import Requirement, VariableCollection, VariableCollectionConflict, VariableCollectionUnitOfWork, \
+    run_in_unit_of_work
+from requirement_store import get_requirement_store
+from tests.mock_hanfor import MockHanfor
+
+
+class TestUnitOfWork(TestCase):
+    def setUp(self) -> None:
+        self.mock_hanfor = MockHanfor(
+            session_tags=['simple'],
+            test_session_source='test_formalization_process'
+        )
+        self.mock_hanfor.setUp()
+        self.mock_hanfor.startup_hanfor('simple.csv', 'simple', [])
+        self.path = app.config['SESSION_VARIABLE_COLLECTION']
+
+    def tearDown(self) -> None:
+        self.mock_hanfor.tearDown()
+
+    def count_var_collection_writes(self):
+        writes = []
+        store = reqtransformer.Pickleable.store
+
+        def counting_store(obj, path=None):
+            if isinstance(obj, VariableCollection):
+                writes.append(path)
+            return store(obj, path)
+
+        return writes, patch.object(reqtransformer.Pickleable, 'store', counting_store)
+
+    def test_update_stores_once(self):
+        formalizations = {
+            str(i): {
+                "id": str(i),
+                "scope": "GLOBALLY",
+                "pattern": "Absence",
+                "expression_mapping": {"P": "", "Q": "", "R": f"foo != spam_{i}", "S": "", "T": "", "U": ""}
+            } for i in range(5)
+        }
+        writes, counting = self.count_var_collection_writes()
+        with counting:
+            for _ in range(4):
+                self.mock_hanfor.app.post('api/req/new_formalization', data={'id': 'SysRS FooXY_42'})
+            writes.clear()
+            self.mock_hanfor.app.post('api/req/update', data={
+                'id': 'SysRS FooXY_42',
+                'row_idx': '0',
+                'update_formalization': 'true',
+                'tags': json.dumps({}),
+                'status': 'Todo',
+                'formalizations': json.dumps(formalizations)
+            })
+        self.assertEqual(1, len(writes))
+        var_collection = VariableCollection.load(self.path)
+        self.assertTrue({f'spam_{i}' for i in range(5)} <= var_collection.req_var_mapping['SysRS FooXY_42'])
+
+    def test_shared_within_unit(self):
+        self.assertIsNot(VariableCollection.load_session(app), VariableCollection.load_session(app))
+        writes, counting = self.count_var_collection_writes()
+        with counting, VariableCollectionUnitOfWork(self.path) as unit:
+            var_collection = VariableCollection.load_session(app)
+            self.assertIs(var_collection, VariableCollection.load_session(app))
+            var_collection.add_var('new_var')
+            var_collection.store()
+            var_collection.store(self.path)
+            self.assertTrue(unit.dirty)
+            self.assertEqual(0, len(writes))
+        self.assertEqual(1, len(writes))
+        self.assertIn('new_var', VariableCollection.load(self.path))
+
+    def test_rollback_on_exception(self):
+        with self.assertRaises(ValueError), VariableCollectionUnitOfWork(self.path):
+            var_collection = VariableCollection.load_session(app)
+            var_collection.add_var('new_var')
+            var_collection.store()
+            raise ValueError()
+        self.assertIsNone(VariableCollectionUnitOfWork.current())
+        self.assertNotIn('new_var', VariableCollection.load(self.path))
+
+    def test_deferred_requirement_stores(self):
+        rid = 'SysRS FooXY_42'
+        with self.assertRaises(ValueError), VariableCollectionUnitOfWork(self.path, defer_requirements=True):
+            requirement = Requirement.load_requirement_by_id(rid, app)
+            requirement.status = 'Done'
+            requirement.store()
+            self.assertIs(requirement, Requirement.load_requirement_by_id(rid, app))
+            self.assertEqual('Todo', get_requirement_store(app.config['REVISION_FOLDER']).load(rid).status)
+            raise ValueError()
+        self.assertEqual('Todo', Requirement.load_requirement_by_id(rid, app).status)
+
+        with VariableCollectionUnitOfWork(self.path, defer_requirements=True):
+            requirement = Requirement.load_requirement_by_id(rid, app)
+            requirement.status = 'Done'
+            requirement.store()
+            folder = app.config['REVISION_FOLDER']
+            self.assertEqual(['Done'], [r.status for r in Requirement.requirements(folder, rids=[rid])])
+        self.assertEqual('Done', Requirement.load_requirement_by_id(rid, app).status)
+
+    def test_concurrent_units_do_not_lose_updates(self):
+        def add_vars(prefix):
+            for i in range(5):
+                run_in_unit_of_work(self.path, add_var, f'{prefix}_{i}')
+
+        def add_var(name):
+            var_collection = VariableCollection.load_session(app)
+            var_collection.add_var(name)
+            var_collection.store()
+
+        threads = [threading.Thread(target=add_vars, args=(prefix,)) for prefix in ('a', 'b', 'c')]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        var_collection = VariableCollection.load(self.path)
+        self.assertTrue(all(f'{prefix}_{i}' in var_collection for prefix in ('a', 'b', 'c') for i in range(5)))
+
+    def test_conflicting_unit_writes_nothing(self):
+        with self.assertRaises(VariableCollectionConflict), VariableCollectionUnitOfWork(self.path):
+            var_collection = VariableCollection.load_session(app)
+            # Stored directly, as by another process.
+            other = VariableCollection.load(self.path)
+            other.add_var('other_var')
+            other.store()
+            var_collection.add_var('new_var')
+            var_collection.store()
+        var_collection = VariableCollection.load(self.path)
+        self.assertIn('other_var', var_collection)
+        self.assertNotIn('new_var', var_collection)
+
+    def test_reads_are_not_blocked_by_long_running_unit(self):
+        written, release = threading.Event(), threading.Event()
+
+        def long_running_write():
+            with VariableCollectionUnitOfWork(self.path, defer_requirements=True):
+                var_collection = VariableCollection.load_session(app)
+                var_collection.add_var('slow_var')
+                var_collection.store()
+                written.set()
+                release.wait(10)
+
+        writer = threading.Thread(target=long_running_write)
+        writer.start()
+        try:
+            self.assertTrue(written.wait(10))
+            # Run in another thread, so a blocked read fails the test instead of hanging it.
+            reads = []
+            reader = threading.Thread(target=lambda: reads.append(self.mock_hanfor.app.get('api/var/gets')))
+            reader.start()
+            reader.join(5)
+            self.assertFalse(reader.is_alive())
+            self.assertEqual(200, reads[0].status_code)
+        finally:
+            release.set()
+            writer.join()
+        self.assertIn('slow_var', VariableCollection.load(self.path))
+
+    def test_long_running_read_does_not_block_writes(self):
+        loaded, release = threading.Event(), threading.Event()
+
+        def long_running_read():
+            with VariableCollectionUnitOfWork(self.path):
+                VariableCollection.load_session(app)
+                loaded.set()
+                release.wait(10)
+
+        reader = threading.Thread(target=long_running_read)
+        reader.start()
+        try:
+            self.assertTrue(loaded.wait(10))
+            with VariableCollectionUnitOfWork(self.path):
+                var_collection = VariableCollection.load_session(app)
+                var_collection.add_var('new_var')
+                var_collection.store()
+        finally:
+            release.set()
+            reader.join()
+        self.assertIn('new_var', VariableCollection.load(self.path))
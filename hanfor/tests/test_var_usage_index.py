@@ -0,0 +1,129 @@
+"""
+Test the incremental maintenance of the variable usage index (req_var_mapping / var_req_mapping).
+After each change the maintained index must equal a full rebuild from requirements and constraints.
+"""
+import json
+
+from app import app
+from reqtransformer import VariableCollection
+from tests.mock_hanfor import MockHanfor
+from unittest import TestCase
+
+
+class TestVarUsageIndex(TestCase):
+    def setUp(self) -> None:
+        self.mock_hanfor = MockHanfor(
+            session_tags=['simple'],
+            test_session_source='test_formalization_process'
+        )
+        self.mock_hanfor.setUp()
+        self.mock_hanfor.startup_hanfor('simple.csv', 'simple', [])
+
+    def tearDown(self) -> None:
+        self.mock_hanfor.tearDown()
+
+    def assertIndexConsistent(self) -> VariableCollection:
+        var_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+        self.assertTrue(var_collection.usage_index_verified)
+        self.assertTrue(var_collection.refresh_var_usage(app))
+        return var_collection
+
+    def update_formalizations(self, rid, formalizations):
+        self.mock_hanfor.app.post(
+            'api/req/update',
+            data={
+                'id': rid,
+                'row_idx': '0',
+                'update_formalization': 'true',
+                'tags': json.dumps({}),
+                'status': 'Todo',
+                'formalizations': json.dumps(formalizations)
+            }
+        )
+
+    def test_startup_verifies_index(self):
+        var_collection = self.assertIndexConsistent()
+        self.assertSetEqual({'foo', 'bar'}, var_collection.req_var_mapping['SysRS FooXY_42'])
+        self.assertSetEqual({'SysRS FooXY_42'}, var_collection.var_req_mapping['foo'])
+
+    def test_formalization_changes(self):
+        self.update_formalizations('SysRS FooXY_42', {
+            "0": {
+                "id": "0",
+                "scope": "GLOBALLY",
+                "pattern": "Absence",
+                "expression_mapping": {"P": "", "Q": "", "R": "foo != spam", "S": "", "T": "", "U": ""}
+            }
+        })
+        var_collection = self.assertIndexConsistent()
+        self.assertSetEqual({'foo', 'spam'}, var_collection.req_var_mapping['SysRS FooXY_42'])
+        self.assertNotIn('SysRS FooXY_42', var_collection.var_req_mapping.get('bar', set()))
+
+        self.mock_hanfor.app.post(
+            'api/req/del_formalization',
+            data={'requirement_id': 'SysRS FooXY_42', 'formalization_id': '0'}
+        )
+        var_collection = self.assertIndexConsistent()
+        self.assertNotIn('SysRS FooXY_42', var_collection.req_var_mapping)
+
+    def test_constraints_and_rename(self):
+        self.mock_hanfor.app.post('api/var/new_constraint', data={'name': 'spam'})
+        self.mock_hanfor.app.post(
+            'api/var/update',
+            data={
+                'name': 'spam',
+                'name_old': 'spam',
+                'type': 'int',
+                'const_val': '',
+                'const_val_old': '',
+                'type_old': 'unknown',
+                'occurrences': '',
+                'constraints': json.dumps({
+                    "0": {
+                        "id": "0",
+                        "scope": "GLOBALLY",
+                        "pattern": "Universality",
+                        "expression_mapping": {"P": "", "Q": "", "R": "spam > foo", "S": "", "T": "", "U": ""}
+                    }
+                }),
+                'updated_constraints': 'true',
+                'enumerators': json.dumps([]),
+                'belongs_to_enum': '',
+                'belongs_to_enum_old': ''
+            }
+        )
+        var_collection = self.assertIndexConsistent()
+        self.assertSetEqual({'spam', 'foo'}, var_collection.req_var_mapping['Constraint_spam_0'])
+
+        # Rename foo, used by a requirement and the constraint of spam.
+        self.mock_hanfor.app.post(
+            'api/var/update',
+            data={
+                'name': 'bas',
+                'name_old': 'foo',
+                'type': 'unknown',
+                'const_val': '',
+                'const_val_old': '',
+                'type_old': 'unknown',
+                'occurrences': 'SysRS FooXY_42',
+                'constraints': '{}',
+                'updated_constraints': 'true',
+                'enumerators': '[]',
+                'belongs_to_enum': '',
+                'belongs_to_enum_old': ''
+            }
+        )
+        var_collection = self.assertIndexConsistent()
+        self.assertNotIn('foo', var_collection.var_req_mapping)
+        self.assertSetEqual({'SysRS FooXY_42', 'Constraint_spam_0'}, var_collection.var_req_mapping['bas'])
+
+        self.mock_hanfor.app.post('api/var/del_constraint', data={'name': 'spam', 'constraint_id': 0})
+        var_collection = self.assertIndexConsistent()
+        self.assertNotIn('Constraint_spam_0', var_collection.req_var_mapping)
+
+    def test_rebuild_repairs_index(self):
+        var_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+        var_collection.set_usage('SysRS FooXY_42', {'spam'})
+        self.assertFalse(var_collection.refresh_var_usage(app))
+        self.assertSetEqual({'foo', 'bar'}, var_collection.req_var_mapping['SysRS FooXY_42'])
+        self.assertNotIn('SysRS FooXY_42', var_collection.var_req_mapping.get('spam', set()))
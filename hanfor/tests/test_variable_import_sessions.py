@@ -0,0 +1,156 @@
+"""
+Test the variable import sessions: per session files, decisions only for changed variables and paged table rows.
+"""
+import json
+import os
+import pickle
+from unittest import TestCase
+from unittest.mock import patch
+
+from app import app
+from reqtransformer import VarImportSession, VarImportSessions, Variable, VariableCollection
+from tests.mock_hanfor import MockHanfor
+
+
+class TestVariableImportSessions(TestCase):
+    def setUp(self) -> None:
+        self.mock_hanfor = MockHanfor(
+            session_tags=['simple'],
+            test_session_source='test_query_api'
+        )
+        self.mock_hanfor.setUp()
+        self.mock_hanfor.startup_hanfor('simple.csv', 'simple', [])
+
+        # A source session with one new variable and a changed type.
+        source_folder = os.path.join(app.config['SESSION_BASE_FOLDER'], 'import_source', 'revision_0')
+        os.makedirs(source_folder)
+        source = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+        source.collection['ham'] = Variable('ham', 'int', None)
+        source.collection['foo'].type = 'real'
+        source.store(os.path.join(source_folder, 'session_variable_collection.pickle'))
+
+    def tearDown(self) -> None:
+        self.mock_hanfor.tearDown()
+
+    def start_session(self) -> int:
+        response = self.mock_hanfor.app.post('api/var/start_import_session', data={
+            'sess_name': 'import_source',
+            'sess_revision': 'revision_0'
+        })
+        self.assertTrue(response.json['success'])
+        return response.json['session_id']
+
+    def table(self, session_id: int, **kwargs) -> dict:
+        args = {'draw': 1, 'start': 0, 'length': 50}
+        args.update(kwargs)
+        response = self.mock_hanfor.app.get(f'variable_import/api/{session_id}/get_table_data', query_string=args)
+        self.assertEqual(200, response.status_code)
+        return response.json
+
+    def rows(self, session_id: int, **kwargs) -> dict:
+        return {row['name']: row for row in self.table(session_id, **kwargs)['data']}
+
+    def test_session_files(self):
+        self.assertEqual(0, self.start_session())
+        self.assertEqual(1, self.start_session())
+        sessions = VarImportSessions.load_for_app(app.config['SESSION_BASE_FOLDER'])
+        self.assertListEqual([0, 1], sessions.session_ids)
+        self.assertTrue(os.path.exists(sessions.session_path(1)))
+        self.assertDictEqual(dict(), sessions.get(1).decisions)
+        self.assertEqual(('session_variable_collection.pickle', 'revision_0', 'import_source'),
+                         sessions.info()[1]['source'])
+
+        response = self.mock_hanfor.app.post('variable_import/api/0/delete_me')
+        self.assertTrue(response.json['success'])
+        sessions = VarImportSessions.load_for_app(app.config['SESSION_BASE_FOLDER'])
+        self.assertListEqual([1], sessions.session_ids)
+        self.assertFalse(os.path.exists(sessions.session_path(0)))
+        self.assertEqual(2, self.start_session())
+
+    def test_paged_rows(self):
+        session_id = self.start_session()
+        with patch.object(Variable, 'to_dict', autospec=True, side_effect=Variable.to_dict) as to_dict:
+            result = self.table(session_id, start=1, length=2)
+        self.assertEqual(6, result['recordsTotal'])
+        self.assertListEqual(['foo', 'ham'], [row['name'] for row in result['data']])
+        # Source and target of foo, source of ham and the result of foo.
+        self.assertEqual(4, to_dict.call_count)
+
+        rows = self.rows(session_id)
+        self.assertEqual('skipped', rows['ham']['action'])
+        self.assertDictEqual({}, rows['ham']['result'])
+        self.assertEqual('unknown', rows['foo']['target']['type'])
+        self.assertEqual('real', rows['foo']['source']['type'])
+        self.assertEqual('target', rows['foo']['action'])
+        self.assertListEqual(['spam_egg', 'spam_ham'], [e['name'] for e in rows['spam']['enumerators']])
+
+        self.assertListEqual(['ham'], list(self.rows(session_id, search_query=':COL_INDEX_02:no_match_in_target')))
+        self.assertListEqual(['foo'], list(self.rows(session_id, search_query='unmatched_types')))
+        result = self.table(session_id, **{'order[0][column]': 2, 'order[0][dir]': 'desc', 'length': 1})
+        self.assertListEqual(['ham'], [row['name'] for row in result['data']])
+        self.assertEqual(400, self.mock_hanfor.app.get(f'variable_import/api/{session_id}/get_table_data',
+                                                       query_string={'draw': 1, 'search_query': '(foo'}).status_code)
+        # Without draw, all rows.
+        self.assertEqual(6, len(self.mock_hanfor.app.post(f'variable_import/api/{session_id}/get_table_data')
+                                .json['data']))
+
+    def test_decisions_and_import(self):
+        session_id = self.start_session()
+        response = self.mock_hanfor.app.post(f'variable_import/api/{session_id}/store_table', data={
+            'rows': json.dumps({'ham': {'action': 'source'}, 'foo': {'action': 'source'}, 'bar': {'action': 'target'}})
+        })
+        self.assertTrue(response.json['success'])
+        rows = self.rows(session_id)
+        self.assertEqual('real', rows['foo']['result']['type'])
+        self.assertEqual('ham', rows['ham']['result']['name'])
+
+        row = rows['ham']
+        row['action'] = 'custom'
+        row['result']['type'] = 'real'
+        response = self.mock_hanfor.app.post(f'variable_import/api/{session_id}/store_variable',
+                                             data={'row': json.dumps(row)})
+        self.assertTrue(response.json['success'])
+        self.assertEqual('real', self.mock_hanfor.app.post(f'variable_import/api/{session_id}/get_var', data={
+            'name': 'ham', 'which_collection': 'result_link'}).json['type'])
+        self.assertEqual('int', self.mock_hanfor.app.post(f'variable_import/api/{session_id}/get_var', data={
+            'name': 'ham', 'which_collection': 'source_link'}).json['type'])
+
+        # Only changed decisions are kept, bar keeps its default.
+        session = VarImportSessions.load_for_app(app.config['SESSION_BASE_FOLDER']).get(session_id)
+        self.assertSetEqual({'ham', 'foo'}, set(session.decisions))
+        # The source collection is not changed by the custom type.
+        self.assertEqual('int', session.source_var_collection.collection['ham'].type)
+
+        response = self.mock_hanfor.app.post(f'variable_import/api/{session_id}/apply_import')
+        self.assertTrue(response.json['success'])
+        var_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+        self.assertEqual('real', var_collection.collection['ham'].type)
+        # Existing variables are not replaced by an import.
+        self.assertEqual('unknown', var_collection.collection['foo'].type)
+
+    def test_legacy_sessions(self):
+        target = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+        source = VariableCollection.load(os.path.join(app.config['SESSION_BASE_FOLDER'], 'import_source',
+                                                      'revision_0', 'session_variable_collection.pickle'))
+        legacy = VarImportSession.__new__(VarImportSession)
+        legacy.__dict__.update({
+            'source_var_collection': source,
+            'target_var_collection': target,
+            'result_var_collection': target,
+            'actions': {'ham': 'source', 'foo': 'target'},
+            'available_constraints': {'ham': dict(), 'foo': dict()}
+        })
+        path = os.path.join(app.config['SESSION_BASE_FOLDER'], 'variable_import_sessions.pickle')
+        legacy_sessions = VarImportSessions(path)
+        del legacy_sessions.session_ids, legacy_sessions.next_id
+        legacy_sessions.import_sessions = [legacy]
+        with open(path, mode='wb') as out_file:
+            pickle.dump(legacy_sessions, out_file)
+
+        sessions = VarImportSessions.load_for_app(app.config['SESSION_BASE_FOLDER'])
+        self.assertListEqual([0], sessions.session_ids)
+        self.assertNotIn('import_sessions', sessions.__dict__)
+        rows = self.rows(0)
+        self.assertEqual('source', rows['ham']['action'])
+        self.assertEqual('ham', rows['ham']['result']['name'])
+        self.assertEqual('unknown', rows['foo']['result']['type'])
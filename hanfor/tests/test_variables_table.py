@@ -0,0 +1,82 @@
+"""
+Test the materialized variables table answering api/var/gets.
+"""
+from unittest import TestCase
+from unittest.mock import patch
+
+import variables_table
+from app import app
+from reqtransformer import ScriptEvals, Variable, VariableCollection
+from tests.mock_hanfor import MockHanfor
+
+
+class TestVariablesTable(TestCase):
+    def setUp(self) -> None:
+        self.mock_hanfor = MockHanfor(
+            session_tags=['simple'],
+            test_session_source='test_query_api'
+        )
+        self.mock_hanfor.setUp()
+        self.mock_hanfor.startup_hanfor('simple.csv', 'simple', [])
+
+    def tearDown(self) -> None:
+        self.mock_hanfor.tearDown()
+
+    def query(self, **kwargs):
+        args = {'draw': 1, 'start': 0, 'length': 50, 'order[0][column]': 1, 'order[0][dir]': 'asc',
+                'columns[1][data]': 'name'}
+        args.update(kwargs)
+        response = self.mock_hanfor.app.get('api/var/gets', query_string=args)
+        self.assertEqual(200, response.status_code)
+        return response.json
+
+    def names(self, result):
+        return [row['name'] for row in result['data']]
+
+    def test_paging_and_search(self):
+        result = self.query()
+        self.assertEqual(5, result['recordsTotal'])
+        self.assertListEqual(['bar', 'foo', 'spam', 'spam_egg', 'spam_ham'], self.names(result))
+        self.assertIn('ENUM_INT', result['types'])
+
+        result = self.query(**{'order[0][dir]': 'desc', 'start': 1, 'length': 2})
+        self.assertListEqual(['spam_egg', 'spam'], self.names(result))
+        self.assertEqual(5, result['recordsFiltered'])
+
+        result = self.query(search_query='spam_')
+        self.assertListEqual(['spam_egg', 'spam_ham'], self.names(result))
+        self.assertEqual(2, result['recordsFiltered'])
+        self.assertListEqual(['bar', 'foo'], self.names(self.query(search_query=':COL_INDEX_05:FooXY_42')))
+        self.assertListEqual(['spam', 'spam_egg', 'spam_ham'],
+                             self.names(self.query(search_query=':COL_INDEX_05:""unused""')))
+        self.assertListEqual(['spam_egg', 'spam_ham'],
+                             self.names(self.query(search_query=':COL_INDEX_02:""ENUMERATOR_INT""')))
+
+    def test_script_results_for_page_rows(self):
+        script_results = ScriptEvals.load(app.config['SCRIPT_EVAL_RESULTS_PATH'])
+        script_results.update_evals({'foo': 'found foo', 'spam': 'found spam'}, 'find.sh')
+        script_results.store()
+
+        result = self.query(length=1)
+        self.assertListEqual(['bar'], self.names(result))
+        self.assertEqual('', result['data'][0]['script_results'])
+        result = self.query(search_query=':COL_INDEX_06:found')
+        self.assertListEqual(['foo', 'spam'], self.names(result))
+        self.assertEqual('found foo', result['data'][0]['script_results'])
+        self.assertEqual('found foo', {row['name']: row for row in self.mock_hanfor.app.get(
+            'api/var/gets').json['data']}['foo']['script_results'])
+
+    def test_incremental_update(self):
+        self.query()
+        with patch.object(Variable, 'to_dict', autospec=True, side_effect=Variable.to_dict) as to_dict:
+            response = self.mock_hanfor.app.post('api/var/add_new_variable', data={'name': 'ham', 'type': 'INT'})
+            self.assertTrue(response.json['success'])
+            self.assertEqual(6, self.query()['recordsTotal'])
+        self.assertEqual(1, to_dict.call_count)
+
+        # Changes by someone else are picked up from disk.
+        var_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+        var_collection.collection['ham'].type = 'REAL'
+        with patch.object(variables_table, 'stored'):
+            var_collection.store()
+        self.assertListEqual(['ham'], self.names(self.query(search_query=':COL_INDEX_02:REAL')))
@@ -0,0 +1,476 @@
+"""
+Type inference by unification over all expressions of a session.
+
+Every variable, literal and sub-expression gets a type variable. The type variables are unified in a union-find
+structure in one pass over the parse trees: the operands of an operator are unified with each other (and with the
+operator for arithmetic operators), all occurrences of a variable share one type variable, across all expressions.
+This replaces re-running `TypeInference` until the type environment is stable.
+
+The errors are reported by one more pass over the recorded nodes, applying the rules of `TypeInference` on the
+inferred types, so the same types and errors are reported as by `run_typecheck_fixpoint`. Expressions with type
+errors are rechecked by `TypeInference`, the types it derives from them depend on the order of its steps.
+See `type_unification_benchmark.py` for a comparison of both.
+"""
+import logging
+from itertools import chain
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from lark import Transformer, Tree
+from lark.exceptions import LarkError
+from lark.lexer import Token
+from lark.visitors import v_args
+
+from boogie_parsing import BoogieType, TypeCheckResult, parse_expression, run_typecheck_fixpoint
+
+# Allowed argument types of the operators, in the order `TypeInference` reports them.
+ARITHMETIC_TYPES = (BoogieType.int, BoogieType.real)
+BOOL_TYPES = (BoogieType.bool,)
+INT_TYPES = (BoogieType.int,)
+EQUALITY_TYPES = (BoogieType.bool, BoogieType.int, BoogieType.real)
+
+
+class TypeClasses:
+    """ Union-find over type variables. Each class carries the type of its members (unknown if not inferred yet). """
+
+    def __init__(self):
+        self._parent: List[int] = []
+        self._size: List[int] = []
+        self._types: List[BoogieType] = []
+
+    def __len__(self):
+        return len(self._parent)
+
+    def new(self, t: BoogieType = BoogieType.unknown) -> int:
+        """ Returns a new type variable of type `t`. """
+        self._parent.append(len(self._parent))
+        self._size.append(1)
+        self._types.append(t)
+        return len(self._parent) - 1
+
+    def find(self, i: int) -> int:
+        parent = self._parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def type(self, i: int) -> BoogieType:
+        return self._types[self.find(i)]
+
+    def bind(self, i: int, t: BoogieType) -> bool:
+        """ Set the type of the class of `i` to `t`.
+
+        :return: False (and nothing changed) if the class has another known type already.
+        """
+        root = self.find(i)
+        if self._types[root] == BoogieType.unknown:
+            self._types[root] = t
+        return self._types[root] == t
+
+    def union(self, i: int, j: int) -> bool:
+        """ Unify the classes of `i` and `j`.
+
+        :return: False (and nothing changed) if the classes have different known types.
+        """
+        i, j = self.find(i), self.find(j)
+        if i == j:
+            return True
+        ti, tj = self._types[i], self._types[j]
+        if ti != tj and ti != BoogieType.unknown and tj != BoogieType.unknown:
+            return False
+        if self._size[i] < self._size[j]:
+            i, j = j, i
+        self._parent[j] = i
+        self._size[i] += self._size[j]
+        if self._types[i] == BoogieType.unknown:
+            self._types[i] = self._types[j]
+        return True
+
+
+class _Node:
+    """ A (sub-)expression: its type variable and, once reported, its type as `TypeInference` would derive it. """
+    __slots__ = ('value', 'op', 'children', 'cls', 't', 'arg_types', 'return_type', 'identity')
+
+    def __init__(self, cls: int, t: BoogieType, value: str = None, op: Token = None, children: tuple = (),
+                 arg_types: tuple = None, return_type: BoogieType = None):
+        self.cls = cls
+        self.t = t
+        self.value = value
+        self.op = op
+        self.children = children
+        self.arg_types = arg_types
+        self.return_type = return_type
+        # Operators without return type have the type of their operands (like `type_leaf` in `TypeInference`).
+        self.identity = op is not None and return_type is None
+
+    @property
+    def expr(self) -> str:
+        if self.op is None:
+            return self.value
+        if len(self.children) == 1:
+            return f"{self.op} {self.children[0].expr}"
+        return f"{self.children[0].expr} {self.op} {self.children[1].expr}"
+
+    def __str__(self):
+        return self.expr
+
+    def group(self) -> Iterator['_Node']:
+        """ The nodes typed equal to this one, in the order of `type_leaf` + [node] in `TypeInference`. """
+        return chain(self._leaf(), (self,))
+
+    def _leaf(self) -> Iterator['_Node']:
+        if self.identity:
+            yield from self.children
+            for child in self.children:
+                yield from child._leaf()
+
+
+@v_args(inline=True)
+class _Unification(Transformer):
+    """ Assigns type variables to the nodes of a parse tree and unifies them. Records the nodes in post order. """
+
+    def __init__(self, classes: TypeClasses, var_classes: Dict[str, int], type_env: Dict[str, BoogieType]):
+        super().__init__()
+        self.classes = classes
+        self.var_classes = var_classes
+        self.type_env = type_env
+        self.nodes: List[_Node] = []
+        self.variables: Dict[str, None] = dict()
+
+    def _node(self, node: _Node) -> _Node:
+        self.nodes.append(node)
+        return node
+
+    def _args_ok(self, children, arg_types: tuple) -> bool:
+        for child in children:
+            t = self.classes.type(child.cls)
+            if t != BoogieType.unknown and t != BoogieType.error and t not in arg_types:
+                return False
+        return True
+
+    def _unary(self, op: Token, c: _Node, arg_types: tuple, return_type: BoogieType = None) -> _Node:
+        ok = self._args_ok((c,), arg_types)
+        if return_type is not None:
+            if ok and len(arg_types) == 1:
+                self.classes.bind(c.cls, arg_types[0])
+            cls = self.classes.new(return_type)
+        else:
+            cls = c.cls if ok else self.classes.new()
+        return self._node(_Node(cls, BoogieType.unknown, op=op, children=(c,), arg_types=arg_types,
+                                return_type=return_type))
+
+    def _binary(self, c1: _Node, op: Token, c2: _Node, arg_types: tuple,
+                return_type: BoogieType = None) -> _Node:
+        unified = self._args_ok((c1, c2), arg_types) and self.classes.union(c1.cls, c2.cls)
+        if return_type is not None:
+            cls = self.classes.new(return_type)
+        else:
+            cls = c1.cls if unified else self.classes.new()
+        return self._node(_Node(cls, BoogieType.unknown, op=op, children=(c1, c2), arg_types=arg_types,
+                                return_type=return_type))
+
+    def _literal(self, c: Token, t: BoogieType) -> _Node:
+        return self._node(_Node(self.classes.new(t), t, value=c.value))
+
+    def true(self, c: Token) -> _Node:
+        return self._literal(c, BoogieType.bool)
+
+    def false(self, c: Token) -> _Node:
+        return self._literal(c, BoogieType.bool)
+
+    def realnumber(self, c: Token) -> _Node:
+        return self._literal(c, BoogieType.real)
+
+    def number(self, c: Token) -> _Node:
+        return self._literal(c, BoogieType.int)
+
+    def id(self, c: Token) -> _Node:
+        name = c.value
+        if name not in self.var_classes:
+            self.var_classes[name] = self.classes.new(self.type_env.get(name, BoogieType.unknown))
+        self.variables[name] = None
+        return self._node(_Node(self.var_classes[name], BoogieType.unknown, value=name))
+
+    def minus_unary(self, o: Token, c: _Node) -> _Node:
+        return self._unary(o, c, (BoogieType.real, BoogieType.int))
+
+    def negation(self, o: Token, c: _Node) -> _Node:
+        return self._unary(o, c, BOOL_TYPES, return_type=BoogieType.bool)
+
+    def abs(self, o: Token, c: _Node) -> _Node:
+        return self._unary(o, c, INT_TYPES, return_type=BoogieType.int)
+
+    def neq(self, c1: _Node, op: Token, c2: _Node) -> _Node:
+        return self._binary(c1, op, c2, EQUALITY_TYPES,
+                            return_type=BoogieType.bool)
+
+    def eq(self, c1: _Node, op: Token, c2: _Node) -> _Node:
+        return self._binary(c1, op, c2, EQUALITY_TYPES,
+                            return_type=BoogieType.bool)
+
+    def conjunction(self, c1: _Node, op: Token, c2: _Node) -> _Node:
+        return self._binary(c1, op, c2, BOOL_TYPES, return_type=BoogieType.bool)
+
+    def disjunction(self, c1: _Node, op: Token, c2: _Node) -> _Node:
+        return self._binary(c1, op, c2, BOOL_TYPES, return_type=BoogieType.bool)
+
+    def implies(self, c1: _Node, op: Token, c2: _Node) -> _Node:
+        return self._binary(c1, op, c2, BOOL_TYPES, return_type=BoogieType.bool)
+
+    def gt(self, c1: _Node, op: Token, c2: _Node) -> _Node:
+        return self._binary(c1, op, c2, ARITHMETIC_TYPES, return_type=BoogieType.bool)
+
+    def gteq(self, c1: _Node, op: Token, c2: _Node) -> _Node:
+        return self._binary(c1, op, c2, ARITHMETIC_TYPES, return_type=BoogieType.bool)
+
+    def lt(self, c1: _Node, op: Token, c2: _Node) -> _Node:
+        return self._binary(c1, op, c2, ARITHMETIC_TYPES, return_type=BoogieType.bool)
+
+    def lteq(self, c1: _Node, op: Token, c2: _Node) -> _Node:
+        return self._binary(c1, op, c2, ARITHMETIC_TYPES, return_type=BoogieType.bool)
+
+    def plus(self, c1: _Node, op: Token, c2: _Node) -> _Node:
+        return self._binary(c1, op, c2, ARITHMETIC_TYPES)
+
+    def minus(self, c1: _Node, op: Token, c2: _Node) -> _Node:
+        return self._binary(c1, op, c2, ARITHMETIC_TYPES)
+
+    def times(self, c1: _Node, op: Token, c2: _Node) -> _Node:
+        return self._binary(c1, op, c2, ARITHMETIC_TYPES)
+
+    def divide(self, c1: _Node, op: Token, c2: _Node) -> _Node:
+        return self._binary(c1, op, c2, ARITHMETIC_TYPES)
+
+    def mod(self, c1: _Node, op: Token, c2: _Node) -> _Node:
+        return self._binary(c1, op, c2, INT_TYPES, return_type=BoogieType.int)
+
+    def min(self, op: Token, c1: _Node, c2: _Node) -> _Node:
+        return self._binary(c1, op, c2, INT_TYPES, return_type=BoogieType.int)
+
+    def max(self, op: Token, c1: _Node, c2: _Node) -> _Node:
+        return self._binary(c1, op, c2, INT_TYPES, return_type=BoogieType.int)
+
+    def old(self, op: Token, c1: _Node):
+        raise NotImplementedError
+
+    @v_args(meta=True)
+    def __default__(self, data, children, meta):
+        if len(children) == 1:
+            return children[0]
+        return self._node(_Node(self.classes.new(BoogieType.error), BoogieType.error, value=data, children=()))
+
+
+class _Expression:
+    """ The recorded nodes of an expression added to a `TypeUnification`. """
+    __slots__ = ('tree', 'root', 'nodes', 'variables', 'expected_types')
+
+    def __init__(self, tree: Tree, root: _Node, nodes: List[_Node], variables: Iterable[str],
+                 expected_types: List[BoogieType]):
+        self.tree = tree
+        self.root = root
+        self.nodes = nodes
+        self.variables = tuple(variables)
+        self.expected_types = expected_types
+
+
+class TypeUnification:
+    """ Infers the types of many expressions at once, sharing the type variables of their variables.
+    Add the expressions by `add`, the types and errors are reported by `solve`. """
+
+    def __init__(self, type_env: Dict[str, BoogieType]):
+        """
+        :param type_env: The known variable types, not changed. Variables not in it have type unknown.
+        """
+        self.type_env = type_env
+        self.classes = TypeClasses()
+        self._var_classes: Dict[str, int] = dict()
+        self._expressions: Dict[Hashable, _Expression] = dict()
+        self._derived_type_env: Optional[Dict[str, BoogieType]] = None
+
+    def add(self, key: Hashable, tree: Tree, expected_types: List[BoogieType] = None):
+        """ Unify the type variables of an expression.
+
+        :param key: Identifies the expression in the result of `solve`.
+        :param tree: The parse tree of the expression, not changed.
+        :param expected_types: The types allowed for the whole expression, the first one fitting is applied.
+        """
+        unification = _Unification(self.classes, self._var_classes, self.type_env)
+        root = unification.transform(tree)
+        if expected_types and self.classes.type(root.cls) == BoogieType.unknown:
+            self.classes.bind(root.cls, expected_types[0])
+        self._expressions[key] = _Expression(tree, root, unification.nodes, unification.variables, expected_types)
+
+    def derived_type_env(self) -> Dict[str, BoogieType]:
+        """ The types of all variables used in the added expressions (once solved, as derived by `solve`). """
+        if self._derived_type_env is not None:
+            return dict(self._derived_type_env)
+        return {name: self.classes.type(cls) for name, cls in self._var_classes.items()}
+
+    def solve(self) -> Dict[Hashable, TypeCheckResult]:
+        """ Report the type, the types of the used variables and the type errors of each added expression. """
+        results = {key: self._report(expression) for key, expression in self._expressions.items()}
+        ill_typed = [key for key, result in results.items() if result.type_errors]
+        if ill_typed:
+            results.update(self._recheck(ill_typed))
+        return results
+
+    def _report(self, expression: _Expression) -> TypeCheckResult:
+        type_errors = []
+        for node in expression.nodes:
+            if node.op is None:
+                if node.t != BoogieType.error:
+                    node.t = self.classes.type(node.cls)
+                else:
+                    type_errors.append("Syntax Error: input is not a valid expression.")
+            elif len(node.children) == 1:
+                self._report_unary(node, type_errors)
+            else:
+                self._report_binary(node, type_errors)
+        root = expression.root
+        if expression.expected_types:
+            errors = []
+            for possible_type in expression.expected_types:
+                errors = _propagate(root, possible_type, apply=False)
+                if not errors:
+                    _propagate(root, possible_type)
+                    break
+            type_errors += errors
+        return TypeCheckResult(root.t, {name: self.classes.type(self._var_classes[name])
+                                        for name in expression.variables}, tuple(type_errors))
+
+    def _recheck(self, ill_typed: List[Hashable]) -> Dict[Hashable, TypeCheckResult]:
+        """ Typecheck the expressions with type errors by `TypeInference`. Which types it derives from an ill-typed
+        expression depends on the order of its propagation steps (and the errors on these types), so they can not
+        be unified. The well-typed expressions are unified again with the types derived from the ill-typed ones,
+        until the types are stable.
+        """
+        ill_typed = {key: self._expressions[key] for key in ill_typed}
+        type_env = dict(self.type_env)
+        while True:
+            previous_type_env = dict(type_env)
+            unification = TypeUnification(type_env)
+            for key, expression in self._expressions.items():
+                if key not in ill_typed:
+                    unification.add(key, expression.tree, expression.expected_types)
+            results = {key: unification._report(expression) for key, expression in unification._expressions.items()}
+            type_env.update(unification.derived_type_env())
+            for key, expression in ill_typed.items():
+                ti = run_typecheck_fixpoint(expression.tree, {name: type_env[name] for name in expression.variables
+                                                              if name in type_env}, expression.expected_types)
+                results[key] = TypeCheckResult(ti.type_root.t, {name: ti.type_env[name]
+                                                                for name in expression.variables},
+                                               tuple(ti.type_errors))
+                type_env.update(results[key].type_env)
+            if type_env == previous_type_env:
+                break
+        self._derived_type_env = {name: type_env[name] for name in self._var_classes}
+        return results
+
+    @staticmethod
+    def _report_unary(node: _Node, type_errors: list):
+        c = node.children[0]
+        arg_errors = _typecheck_arg(node.expr, c, node.arg_types)
+        type_errors += arg_errors
+        if arg_errors:
+            node.t = node.return_type or BoogieType.unknown
+            return
+        node.t = node.return_type or c.t
+        if len(node.arg_types) == 1:
+            _propagate(c, node.arg_types[0])
+
+    @staticmethod
+    def _report_binary(node: _Node, type_errors: list):
+        c1, c2 = node.children
+        expr = node.expr
+        arg_errors = _typecheck_arg(expr, c1, node.arg_types) + _typecheck_arg(expr, c2, node.arg_types)
+        type_errors += arg_errors
+        failed = node.return_type or BoogieType.unknown
+        if arg_errors or (c1.t == BoogieType.unknown and c2.t == BoogieType.unknown):
+            node.t = failed
+        elif c1.t == c2.t:
+            node.t = node.return_type or c1.t
+        else:
+            known, other = (c1, c2) if c1.t != BoogieType.unknown else (c2, c1)
+            errors = _propagate(other, known.t)
+            type_errors += errors
+            node.t = failed if errors else node.return_type or known.t
+
+
+def _typecheck_arg(expr: str, arg: _Node, expected_arg_types: tuple) -> List[str]:
+    if arg.t == BoogieType.unknown or arg.t == BoogieType.error or arg.t in expected_arg_types:
+        return []
+    return [f"Wrong argument type in {expr}: expected {set(expected_arg_types)} but got {arg.t}."]
+
+
+def _propagate(node: _Node, t: BoogieType, apply: bool = True) -> List[str]:
+    """ Type the group of `node` with `t` like `TypeInference` does, the variable types are inferred already. """
+    for member in node.group():
+        if member.t != t and member.t != BoogieType.unknown:
+            if member.t != BoogieType.error:
+                return [f"Types inconsistent: {member} had Type {node.t} inferred as {t}"]
+            return []
+        if apply:
+            member.t = t
+    return []
+
+
+def infer_types(tree: Tree, type_env: Dict[str, BoogieType],
+                expected_types: List[BoogieType] = None) -> TypeCheckResult:
+    """ Infer the types of one expression, the result of `run_typecheck_fixpoint` without iterating.
+
+    :param tree: The parse tree of the expression.
+    :param type_env: The variable types. Like `run_typecheck_fixpoint`, derived types are written to it.
+    :param expected_types: The types allowed for the whole expression.
+    :return: The expression type, the derived types of the used variables and the type errors.
+    """
+    unification = TypeUnification(type_env)
+    unification.add(None, tree, expected_types)
+    result = unification.solve()[None]
+    type_env.update(result.type_env)
+    return result
+
+
+def infer_session_types(expressions: Iterable[Tuple[Hashable, str, Optional[List[BoogieType]]]],
+                        type_env: Dict[str, BoogieType]) \
+        -> Tuple[Dict[str, BoogieType], Dict[Hashable, TypeCheckResult]]:
+    """ Infer the types of all expressions of a session at once. Expressions that can not be parsed are skipped.
+
+    :param expressions: (key, expression, expected types) e.g. by `session_expressions`.
+    :param type_env: The known variable types, e.g. by `VariableCollection.get_boogie_type_env`.
+    :return: The derived types of all used variables and the typecheck result by key.
+    """
+    unification = TypeUnification(type_env)
+    for key, expression, expected_types in expressions:
+        try:
+            tree = parse_expression(expression)
+        except LarkError as e:
+            logging.debug(f'Skipping type inference of `{expression}`: {e}')
+            continue
+        unification.add(key, tree, expected_types)
+    results = unification.solve()
+    return unification.derived_type_env(), results
+
+
+def session_expressions(requirements: Iterable, var_collection) \
+        -> Iterator[Tuple[Tuple[str, int, str], str, List[BoogieType]]]:
+    """ The typechecked expressions of the formalizations of requirements and the constraints of variables.
+
+    :param requirements: Requirements, e.g. by `Requirement.requirements`.
+    :param var_collection: The session VariableCollection.
+    :return: ((rid or constraint name, formalization id, pattern key), expression, allowed types).
+    """
+    def formalization_expressions(owner, formalizations):
+        for formalization_id, formalization in formalizations.items():
+            try:
+                allowed_types = formalization.scoped_pattern.get_allowed_types()
+            except AttributeError:
+                continue  # No pattern set.
+            for key, expression in (formalization.expressions_mapping or {}).items():
+                if key in allowed_types and expression.raw_expression:
+                    yield (owner, formalization_id, key), expression.raw_expression, allowed_types[key]
+
+    for requirement in requirements:
+        if requirement.formalizations:
+            yield from formalization_expressions(requirement.rid, requirement.formalizations)
+    for var in var_collection.collection.values():
+        yield from formalization_expressions(f'Constraint_{var.name}', var.get_constraints())
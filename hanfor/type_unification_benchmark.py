@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import random
+import tempfile
+import time
+
+import boogie_parsing
+from type_unification import infer_session_types
+from tests.test_type_unification import load_test_sessions, random_session, typecheck_session_fixpoint
+
+ROUNDS = 5
+SESSION_SIZES = (10, 100, 1000)
+
+
+def measure(expressions: list, type_env: dict) -> dict:
+    """ Time typechecking a session by `TypeInference` (with a cold typecheck cache) and by unification. """
+    for _, expression, _ in expressions:
+        boogie_parsing.parse_expression(expression)
+    fixpoint_s, unification_s = [], []
+    fixpoint_result = unification_result = None
+    for _ in range(ROUNDS):
+        boogie_parsing.typecheck_cache.clear()
+        duration = time.perf_counter()
+        fixpoint_result = typecheck_session_fixpoint(expressions, type_env)
+        fixpoint_s.append(time.perf_counter() - duration)
+        duration = time.perf_counter()
+        unification_result = infer_session_types(expressions, type_env)
+        unification_s.append(time.perf_counter() - duration)
+    return {
+        'expressions': len(expressions),
+        'same': fixpoint_result == unification_result,
+        'fixpoint_ms': min(fixpoint_s) * 1000,
+        'unification_ms': min(unification_s) * 1000
+    }
+
+
+def main():
+    stats = {}
+    with tempfile.TemporaryDirectory() as folder:
+        for revision_folder, expressions, type_env in load_test_sessions(folder):
+            if expressions:
+                stats[revision_folder[len(folder) + 1:]] = measure(expressions, type_env)
+    rnd = random.Random(0)
+    for size in SESSION_SIZES:
+        stats[f'random session ({size})'] = measure(*random_session(rnd, size))
+
+    print(f'{"session":<72} {"exprs":>6} {"fixpoint ms":>12} {"unification ms":>15} {"speedup":>8} {"same":>5}')
+    for name, s in stats.items():
+        print(f'{name:<72} {s["expressions"]:>6} {s["fixpoint_ms"]:>12.2f} {s["unification_ms"]:>15.2f} '
+              f'{s["fixpoint_ms"] / s["unification_ms"]:>7.1f}x {str(s["same"]):>5}')
+
+    total_a = sum(s['fixpoint_ms'] for s in stats.values())
+    total_b = sum(s['unification_ms'] for s in stats.values())
+    print(f'\ntotal: fixpoint {total_a:.1f} ms, unification {total_b:.1f} ms ({total_a / total_b:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
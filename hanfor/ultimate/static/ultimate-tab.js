@@ -1,3 +1,4 @@
+let utils = require('../../static/js/hanfor-utils');
 
 function init_ultimate_tab() {
     check_ultimate_version();
@@ -13,14 +14,10 @@ function init_ultimate_tab() {
 
 function init_ultimate_requirements_table_connection(requirements_table) {
     $('#ultimate-tab-create-filtered-btn').click(function () {
-        let req_ids = [];
-        requirements_table.rows({search: 'applied'}).every(function () {
-            let d = this.data();
-            req_ids.push(d['id']);
+        utils.fetch_filtered_requirement_ids(requirements_table, function (req_ids) {
+            let btn = $('#ultimate-tab-create-filtered-btn')
+            create_ultimate_analysis(btn, req_ids);
         });
-
-        let btn = $('#ultimate-tab-create-filtered-btn')
-        create_ultimate_analysis(btn, req_ids);
     });
 
     $('#ultimate-tab-create-selected-btn').click(function () {
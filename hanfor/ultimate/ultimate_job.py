@@ -3,7 +3,7 @@ import json
 from datetime import datetime
 from os import path
 from flask import current_app
-from utils import get_requirements
+from requirement_store import get_requirement_store
 from pydantic import parse_obj_as
 
 from defaults import Color
@@ -159,8 +159,7 @@ def get_all_requirement_ids() -> list[str]:
     """"
     returns a list of (requirementID, requirementID without -)
     """
-    requirements = get_requirements(current_app.config['REVISION_FOLDER'])
-    return [requirement.rid for requirement in requirements]
+    return get_requirement_store(current_app.config['REVISION_FOLDER']).rids()
 
 
 def add_ultimate_result_to_requirement(requirement_id: str,
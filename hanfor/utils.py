@@ -4,10 +4,11 @@
 @licence: GPLv3
 """
 import argparse
-import io
 import shutil
+import tempfile
 from collections import defaultdict
-from io import StringIO
+from copy import deepcopy
+from dataclasses import dataclass, asdict
 
 import csv
 import datetime
@@ -15,7 +16,9 @@ import html
 import logging
 import os
 import re
+import threading
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.worksheet.datavalidation import DataValidation
 from openpyxl.styles import PatternFill, Alignment, Font
 
@@ -23,7 +26,11 @@ from flask import json, Response
 from flask_assets import Environment
 from patterns import PATTERNS
 
+import activity_log
 import boogie_parsing
+import generations
+import revision_catalog
+from activity_log import ActivityLog, get_activity_log
 
 # Here is the first time we use config. Check existence and raise a meaningful exception if not found.
 try:
@@ -33,13 +40,18 @@ except ModuleNotFoundError:
     logging.error(msg)
     raise FileNotFoundError(msg)
 
-from reqtransformer import VarImportSessions, VariableCollection, Requirement, ScriptEvals, RequirementCollection
-from static_utils import pickle_dump_obj_to_file, pickle_load_from_dump, replace_prefix, get_filenames_from_dir, \
-    hash_file_sha1
-from typing import Union, Set, List
+from reqtransformer import VarImportSessions, VariableCollection, Requirement, ScriptEvals, RequirementCollection, \
+    Variable, VariableCollectionUnitOfWork, rename_vars_in_expressions
+from requirement_store import get_requirement_store, source_hash, SqliteRequirementStore
+from static_utils import pickle_dump_obj_to_file, pickle_load_from_dump, replace_prefix, hash_file_sha1
+from typing import BinaryIO, Dict, Iterable, Iterator, Set, List, Optional
 from terminaltables import DoubleTable
 
 here = os.path.dirname(os.path.realpath(__file__))
+# Min. number of characters per chunk of streamed exports.
+EXPORT_CHUNK_SIZE = 1 << 16
+# Summary of the changes to the base revision, stored in the folder of a revision.
+REVISION_CHANGES_FILE = 'revision_changes.json'
 default_scope_options = '''
     <option value="NONE">None</option>
     <option value="GLOBALLY">Globally</option>
@@ -169,7 +181,7 @@ def formalizations_to_html(app, formalizations):
 
 
 def get_available_vars(app, full=True, fetch_evals=False):
-    var_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+    var_collection = VariableCollection.load_session(app)
     result = var_collection.get_available_vars_list(used_only=not full)
 
     if fetch_evals:
@@ -191,7 +203,7 @@ def varcollection_diff_info(app, request):
     :return: {'tot_vars': int, 'new_vars': int}
     :rtype: dict
     """
-    current_var_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+    current_var_collection = VariableCollection.load_session(app)
     req_path = os.path.join(
         app.config['SESSION_BASE_FOLDER'],
         request.form.get('sess_name').strip(),
@@ -220,7 +232,7 @@ def varcollection_create_new_import_session(app, source_session_name, source_rev
     :param source_session_name:
     :param source_revision_name:
     """
-    current_var_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+    current_var_collection = VariableCollection.load_session(app)
     source_var_collection_path = os.path.join(
         app.config['SESSION_BASE_FOLDER'],
         source_session_name,
@@ -245,21 +257,6 @@ def varcollection_create_new_import_session(app, source_session_name, source_rev
     return session_id
 
 
-def get_requirements_using_var(requirements: list, var_name: str):
-    """ Return a list of requirement ids where var_name is used in at least one formalization.
-
-    :param requirements: list of Requirement.
-    :param var_name: Variable name to search for.
-    :return: List of affected Requirement ids.
-    """
-    result_rids = []
-    for requirement in requirements:  # type: Requirement
-        if requirement.uses_var(var_name):
-            result_rids.append(requirement.rid)
-
-    return result_rids
-
-
 def update_variable_in_collection(app, request):
     """ Update a single variable. The request should contain a form:
         name -> the new name of the var.
@@ -288,7 +285,7 @@ def update_variable_in_collection(app, request):
     occurrences = request.form.get('occurrences', '').strip().split(',')
     enumerators = json.loads(request.form.get('enumerators', ''))
 
-    var_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+    var_collection = VariableCollection.load_session(app)
     result = {
         'success': True,
         'has_changes': False,
@@ -319,7 +316,7 @@ def update_variable_in_collection(app, request):
         if var_type_old != var_type:
             logging.info('Change type from `{}` to `{}`.'.format(var_type_old, var_type))
             try:
-                var_collection.collection[var_name_old].belongs_to_enum = belongs_to_enum
+                var_collection.set_enum(var_name_old, belongs_to_enum)
                 var_collection.set_type(var_name_old, var_type)
             except TypeError as e:
                 result = {
@@ -371,15 +368,14 @@ def update_variable_in_collection(app, request):
 
         # update name.
         if var_name_old != var_name:
-            affected_enumerators = []
             logging.debug('Change name of var `{}` to `{}`'.format(var_name_old, var_name))
             #  Case: New name which does not exist -> remove the old var and replace in reqs occurring.
             if var_name not in var_collection:
                 logging.debug('`{}` is a new var name. Rename the var, replace occurrences.'.format(
                     var_name
                 ))
-                # Rename the var (Copy to new name and remove the old item. Rename it)
-                affected_enumerators = var_collection.rename(var_name_old, var_name, app)
+                # Rename the var and its enumerators in the collection and all requirements using them.
+                rename_variables(app, var_collection, {var_name_old: var_name})
 
             else:  # Case: New name exists. -> Merge the two vars into one. -> Complete rebuild.
                 if var_collection.collection[var_name_old].type != var_collection.collection[var_name].type:
@@ -390,27 +386,10 @@ def update_variable_in_collection(app, request):
                     )
                     return result
                 logging.debug('`{}` is an existing var name. Merging the two vars. '.format(var_name))
-                # var_collection.merge_vars(var_name_old, var_name, app)
-                affected_enumerators = var_collection.rename(var_name_old, var_name, app)
+                rename_variables(app, var_collection, {var_name_old: var_name})
                 result['rebuild_table'] = True
                 reload_type_inference = True
 
-            # Update the requirements using this var.
-            if len(occurrences) > 0:
-                rename_variable_in_expressions(app, occurrences, var_name_old, var_name)
-
-            for (old_enumerator_name, new_enumerator_name) in affected_enumerators:
-                # Todo: Implement this more eff.
-                # Todo: Refactor Formalizations to use hashes as vars and fetch them in __str__ from the var collection.
-                requirements = get_requirements(app.config['REVISION_FOLDER'])
-                affected_requirements = get_requirements_using_var(requirements, old_enumerator_name)
-                rename_variable_in_expressions(
-                    app,
-                    affected_requirements,
-                    old_enumerator_name,
-                    new_enumerator_name
-                )
-
             result['name_changed'] = True
 
         # Change ENUM parent.
@@ -441,11 +420,10 @@ def update_variable_in_collection(app, request):
                 )
                 return result
 
-            var_collection.collection[var_name].belongs_to_enum = belongs_to_enum
-            var_collection.rename(var_name, new_enumerator_name, app)
+            var_collection.set_enum(var_name, belongs_to_enum)
+            rename_variables(app, var_collection, {var_name: new_enumerator_name})
 
         logging.info('Store updated variables.')
-        var_collection.refresh_var_constraint_mapping()
         var_collection.store(app.config['SESSION_VARIABLE_COLLECTION'])
         logging.info('Update derived types by parsing affected formalizations.')
         if reload_type_inference and var_name in var_collection.var_req_mapping:
@@ -487,7 +465,7 @@ def update_variable_in_collection(app, request):
 
             var_collection.collection[enumerator_name].set_type(f'ENUMERATOR_{var_type[5:]}')
             var_collection.collection[enumerator_name].value = enumerator_value
-            var_collection.collection[enumerator_name].belongs_to_enum = var_name
+            var_collection.set_enum(enumerator_name, var_name)
 
         var_collection.store(app.config['SESSION_VARIABLE_COLLECTION'])
 
@@ -497,41 +475,68 @@ def update_variable_in_collection(app, request):
     return result
 
 
-def rename_variable_in_expressions(app, occurrences, var_name_old, var_name):
-    """ Updates (replace) the variables in the requirement expressions.
+def rename_variables(app, var_collection: VariableCollection, mapping: dict) -> dict:
+    """ Rename variables in the variable collection and in all requirements using them.
+    Enumerators of renamed enums are renamed along. Every affected requirement is rewritten once, all of them are
+    stored in one batch after every expression was rewritten successfully, followed by the variable collection.
+    Within a unit of work on the collection, both are stored when the unit is committed.
 
     :param app: Flask app (used for session).
-    :type app: Flask
-    :param occurrences: Requirement ids to be taken into account.
-    :type occurrences: list (of str)
-    :param var_name_old: The current name in the expressions.
-    :type var_name_old: str
-    :param var_name: The new name.
-    :type var_name: str
+    :param var_collection: The current variable collection.
+    :param mapping: Old variable name -> new variable name.
+    :return: The applied mapping including the enumerators.
     """
-    logging.debug('Update requirements using old var `{}` to `{}`'.format(var_name_old, var_name))
-    for rid in occurrences:
-        filepath = os.path.join(app.config['REVISION_FOLDER'], '{}.pickle'.format(rid))
-        if os.path.exists(filepath) and os.path.isfile(filepath):
-            requirement = Requirement.load(filepath)
-            # replace in every formalization
-            for index, formalization in requirement.formalizations.items():
-                for key, expression in formalization.expressions_mapping.items():
-                    if var_name_old not in expression.raw_expression:
-                        continue
-                    new_expression = boogie_parsing.replace_var_in_expression(
-                        expression=expression.raw_expression,
-                        old_var=var_name_old,
-                        new_var=var_name
-                    )
-                    requirement.formalizations[index].expressions_mapping[key].raw_expression = new_expression
-                    requirement.formalizations[index].expressions_mapping[key].used_variables.discard(var_name_old)
-                    requirement.formalizations[index].expressions_mapping[key].used_variables.add(var_name)
-            logging.debug('Updated variables in requirement id: `{}`.'.format(requirement.rid))
-            requirement.store(filepath)
+    mapping = var_collection.expand_rename_mapping(mapping)
+    affected_rids = set()
+    for old_name in mapping.keys():
+        for user in var_collection.var_req_mapping.get(old_name, set()):
+            if re.match(Variable.CONSTRAINT_REGEX, user) is None:
+                affected_rids.add(user)
+
+    logging.debug(f'Update {len(affected_rids)} requirements using renamed vars.')
+    changed_requirements = []
+    for rid in sorted(affected_rids):
+        requirement = Requirement.load_requirement_by_id(rid, app)
+        if requirement is None:
+            continue
+        changed = False
+        for formalization in requirement.formalizations.values():
+            changed |= rename_vars_in_expressions(formalization, mapping)
+        if changed:
+            changed_requirements.append(requirement)
+
+    mapping = var_collection.rename_vars(mapping, app)
+    unit = VariableCollectionUnitOfWork.current()
+    if unit is not None and unit.owns(var_collection) and unit.defers(app.config['REVISION_FOLDER']):
+        for requirement in changed_requirements:
+            unit.defer_store(requirement)
+    else:
+        get_requirement_store(app.config['REVISION_FOLDER']).store_many(changed_requirements)
+    var_collection.store(app.config['SESSION_VARIABLE_COLLECTION'])
+    return mapping
+
 
+def iter_requirements(input_dir, filter_list=None, invert_filter=False, read_only=False) -> Iterator[Requirement]:
+    """ Iterate the requirements of a session folder ordered by their position in the CSV used to create the session
+    (pos_in_csv). Only a chunk of the requirements is loaded at a time.
 
-def get_requirements(input_dir, filter_list=None, invert_filter=False):
+    :param input_dir: The revision folder.
+    :type input_dir: str
+    :param filter_list: A list of requirement IDs to be included in the result. All if not set.
+    :type filter_list: list (of strings)
+    :param invert_filter: Exclude filter
+    :type invert_filter: bool
+    :param read_only: Yield the shared cached requirements. Set only if the requirements are not modified.
+    :type read_only: bool
+    """
+    rids = get_requirement_store(input_dir).rids_by_position()
+    if filter_list is not None:
+        filter_set = set(filter_list)
+        rids = [rid for rid in rids if (rid in filter_set) != invert_filter]
+    return Requirement.requirements(input_dir, read_only=read_only, rids=rids)
+
+
+def get_requirements(input_dir, filter_list=None, invert_filter=False, read_only=False):
     """ Load all requirements from session folder and return in a list.
     Orders the requirements based on their position in the CSV used to create the session (pos_in_csv).
 
@@ -541,36 +546,36 @@ def get_requirements(input_dir, filter_list=None, invert_filter=False):
     :type filter_list: list (of strings)
     :param invert_filter: Exclude filter
     :type invert_filter: bool
+    :param read_only: Return the shared cached requirements. Set only if the result is not modified.
+    :type read_only: bool
     """
-    filenames = [
-        os.path.join(input_dir, f) for f in os.listdir(input_dir)
-        if os.path.isfile(os.path.join(input_dir, f))
-    ]
+    return list(iter_requirements(input_dir, filter_list=filter_list, invert_filter=invert_filter,
+                                  read_only=read_only))
 
-    def should_be_in_result(req) -> bool:
-        if filter_list is None:
-            return True
-        return (req.rid in filter_list) != invert_filter
 
-    requirements = list()
-    for filename in filenames:
-        try:
-            req = Requirement.load(filename)
-        except TypeError:
-            continue
-        if hasattr(req, 'rid'):
-            if should_be_in_result(req):
-                logging.debug('Adding {} to results.'.format(req.rid))
-                requirements.append(req)
+def chunked(lines: Iterable[str], size: int = EXPORT_CHUNK_SIZE) -> Iterator[str]:
+    """ Join consecutive lines to chunks of at least `size` characters, so streamed responses are not sent line by
+    line. """
+    chunk, length = [], 0
+    for line in lines:
+        chunk.append(line)
+        length += len(line)
+        if length >= size:
+            yield ''.join(chunk)
+            chunk, length = [], 0
+    if len(chunk) > 0:
+        yield ''.join(chunk)
 
-    # We want to preserve the order of the generated CSV relative to the origin CSV.
-    requirements.sort(key=lambda x: x.pos_in_csv)
 
-    return requirements
+class _LineEcho:
+    """ File like object returning the written lines instead of buffering them. Lets csv writers produce lines. """
+    @staticmethod
+    def write(line: str) -> str:
+        return line
 
 
-def generate_csv_file_content(app, filter_list=None, invert_filter=False):
-    """ Generates the csv file content for a session.
+def iter_csv_file_content(app, filter_list=None, invert_filter=False) -> Iterator[str]:
+    """ Generates the csv file content for a session line by line.
 
     :param app: Current hanfor app for context.
     :type app: Flaskapp
@@ -578,12 +583,9 @@ def generate_csv_file_content(app, filter_list=None, invert_filter=False):
     :type filter_list: list (of strings)
     :param invert_filter: Exclude filter
     :type invert_filter: bool
-    :return: CSV content
-    :rtype: str
+    :return: Lines of the CSV content
+    :rtype: Iterator[str]
     """
-    # Get requirements
-    requirements = get_requirements(app.config['REVISION_FOLDER'], filter_list=filter_list, invert_filter=invert_filter)
-
     # get session status
     session_dict = pickle_load_from_dump(app.config['SESSION_STATUS_PATH'])  # type: dict
 
@@ -600,28 +602,38 @@ def generate_csv_file_content(app, filter_list=None, invert_filter=False):
         if col_name not in session_dict['csv_fieldnames']:
             session_dict['csv_fieldnames'].append(col_name)
 
-    # Update csv row of requirements to use their latest formalization and tags.
-    for requirement in requirements:
-        requirement.csv_row[session_dict['csv_formal_header']] = requirement.get_formalizations_json()
-        requirement.csv_row[tag_col_name] = ', '.join(requirement.tags)
-        requirement.csv_row[status_col_name] = requirement.status
-
-    # Write data to file.
-    rows = [r.csv_row for r in requirements]
-    with StringIO() as out_csv:
-        csv.register_dialect('ultimate', delimiter=',')
-        writer = csv.DictWriter(out_csv, session_dict['csv_fieldnames'])
-        writer.writeheader()
-        writer.writerows(rows)
-        result = out_csv.getvalue()
+    writer = csv.DictWriter(_LineEcho(), session_dict['csv_fieldnames'])
+    yield writer.writeheader()
 
-    return result
+    # Use the csv row of requirements with their latest formalization and tags.
+    for requirement in iter_requirements(app.config['REVISION_FOLDER'], filter_list=filter_list,
+                                         invert_filter=invert_filter, read_only=True):
+        row = dict(requirement.csv_row)
+        row[session_dict['csv_formal_header']] = requirement.get_formalizations_json()
+        row[tag_col_name] = ', '.join(requirement.tags)
+        row[status_col_name] = requirement.status
+        yield writer.writerow(row)
+
+
+def generate_csv_file_content(app, filter_list=None, invert_filter=False):
+    """ Generates the csv file content for a session.
+
+    :param app: Current hanfor app for context.
+    :type app: Flaskapp
+    :param filter_list: (Optional) A list of requirement IDs to be included in the result. All if not set.
+    :type filter_list: list (of strings)
+    :param invert_filter: Exclude filter
+    :type invert_filter: bool
+    :return: CSV content
+    :rtype: str
+    """
+    return ''.join(iter_csv_file_content(app, filter_list=filter_list, invert_filter=invert_filter))
 
 
-def generate_xls_file_content(app, filter_list: List[str] = None, invert_filter: bool = False) -> io.BytesIO:
-    """ Generates the xlsx file content for a session."""
-    requirements = get_requirements(app.config['REVISION_FOLDER'], filter_list=filter_list, invert_filter=invert_filter)
-    var_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+def generate_xls_file_content(app, filter_list: List[str] = None, invert_filter: bool = False) -> BinaryIO:
+    """ Generates the xlsx file content for a session.
+    The sheets are written in write only mode and saved to a temporary file, which is removed when closed."""
+    var_collection = VariableCollection.load_session(app)
     session_dict = pickle_load_from_dump(app.config['SESSION_STATUS_PATH'])
     meta_settings = MetaSettings(app.config['META_SETTINGS_PATH'])
 
@@ -632,126 +644,107 @@ def generate_xls_file_content(app, filter_list: List[str] = None, invert_filter:
     FILLED = PatternFill(fill_type="solid", start_color="2a6ebb", end_color="2a6ebb")
     META = PatternFill(fill_type="solid", start_color="004a99", end_color="004a99")
     # create excel template
-    work_book = Workbook()
-    work_sheet = work_book.active
-    work_sheet.title = "Requirements"
+    work_book = Workbook(write_only=True)
 
     HEADER_OFFSET = 4
 
-    def make_header(work_sheet):
+    def cell(work_sheet, value=None, **styles) -> WriteOnlyCell:
+        result = WriteOnlyCell(work_sheet, value)
+        for name, style in styles.items():
+            setattr(result, name, style)
+        return result
+
+    def make_sheet(title, widths: Dict[str, int], headings: Dict[int, str]):
+        # Write only sheets need their layout before the first row is appended.
+        work_sheet = work_book.create_sheet(title)
         work_sheet.freeze_panes = "A4"
-        for c in range(1, 10):
-            for r in range(1, 3):
-                work_sheet.cell(r, c).fill = META
-        work_sheet.cell(1, 2, value="HANFOR Report")
-        work_sheet.cell(1, 2).font = WHITE
-        work_sheet.cell(1, 3, value=session_dict['csv_input_file'])
-        work_sheet.cell(1, 3).font = Font(color="FFFFFF")
-        for c in range(1, 10):
-            work_sheet.cell(HEADER_OFFSET - 1, c).fill = FILLED
-            work_sheet.cell(HEADER_OFFSET - 1, c).font = WHITE
-    make_header(work_sheet)
+        for column, width in widths.items():
+            work_sheet.column_dimensions[column].width = width
+        title_row = [cell(work_sheet, fill=META) for _ in range(1, 10)]
+        title_row[1] = cell(work_sheet, "HANFOR Report", fill=META, font=WHITE)
+        title_row[2] = cell(work_sheet, session_dict['csv_input_file'], fill=META, font=Font(color="FFFFFF"))
+        work_sheet.append(title_row)
+        for _ in range(2, HEADER_OFFSET - 1):
+            work_sheet.append([cell(work_sheet, fill=META) for _ in range(1, 10)])
+        work_sheet.append([cell(work_sheet, headings.get(c), fill=FILLED, font=WHITE) for c in range(1, 10)])
+        return work_sheet
+
+    def append_row(work_sheet, values: list, bold_column: int):
+        # Note: setting styles is ordering-sensitive so set styles FIRST
+        work_sheet.append([
+            cell(work_sheet, value, alignment=MULTILINE, font=BOLD) if c == bold_column else
+            cell(work_sheet, value, alignment=MULTILINE)
+            for c, value in enumerate(values, start=1)
+        ])
 
     # Set column widths and headings
-    work_sheet.column_dimensions['A'].width = 5
-    work_sheet.cell(HEADER_OFFSET - 1, 1, value="Index")
-    work_sheet.column_dimensions['B'].width = 20
-    work_sheet.cell(HEADER_OFFSET - 1, 2, value="ID")
-    work_sheet.column_dimensions['C'].width = 80
-    work_sheet.cell(HEADER_OFFSET - 1, 3, value="Description")
-    work_sheet.cell(HEADER_OFFSET - 1, 4, value="Type")
-    work_sheet.column_dimensions['E'].width = 40
-    work_sheet.cell(HEADER_OFFSET - 1, 5, value="Tags")
-    work_sheet.cell(HEADER_OFFSET - 1, 6, value="Status")
-    work_sheet.column_dimensions['G'].width = 160
-    work_sheet.cell(HEADER_OFFSET - 1, 7, value="Formalisation")
-
-    for i, requirement in enumerate(requirements):
-        for c in range(1, 8):
-            # Note: setting styles is ordering-sensitive so set styles FIRST
-            work_sheet.cell(HEADER_OFFSET + i, c).alignment = MULTILINE
-        work_sheet.cell(HEADER_OFFSET + i, 1, requirement.pos_in_csv)
-        work_sheet.cell(HEADER_OFFSET + i, 2).font = BOLD
-        work_sheet.cell(HEADER_OFFSET + i, 2, requirement.rid)
-        work_sheet.cell(HEADER_OFFSET + i, 3, requirement.description)
-        work_sheet.cell(HEADER_OFFSET + i, 4, requirement.type_in_csv)
-        work_sheet.cell(HEADER_OFFSET + i, 5, ""
-                        .join([f"{t}: {c} \n" if c else f"{t}\n" for t, c in requirement.tags.items()]))
-        work_sheet.cell(HEADER_OFFSET + i, 6, requirement.status)
-        work_sheet.cell(HEADER_OFFSET + i, 7, "\n".join([f.get_string() for f in requirement.formalizations.values()]))
+    work_sheet = make_sheet(
+        "Requirements",
+        {'A': 5, 'B': 20, 'C': 80, 'E': 40, 'G': 160},
+        {1: "Index", 2: "ID", 3: "Description", 4: "Type", 5: "Tags", 6: "Status", 7: "Formalisation"}
+    )
 
     # make severity sheet
-    tag_sheet = work_book.create_sheet("Findings")
-    make_header(tag_sheet)
-    tag_sheet.column_dimensions['A'].width = 5
-    tag_sheet.cell(HEADER_OFFSET - 1, 1, value="Index")
-    tag_sheet.column_dimensions['B'].width = 20
-    tag_sheet.cell(HEADER_OFFSET - 1, 2, value="ID")
-    tag_sheet.cell(HEADER_OFFSET - 1, 3, value="Description")
-    tag_sheet.column_dimensions['C'].width = 80
-    tag_sheet.column_dimensions['D'].width = 20
-    tag_sheet.cell(HEADER_OFFSET - 1, 4, value="Tag")
-    tag_sheet.column_dimensions['E'].width = 60
-    tag_sheet.cell(HEADER_OFFSET - 1, 5, value="Comment (Analysis)")
-    tag_sheet.column_dimensions['F'].width = 10
-    tag_sheet.cell(HEADER_OFFSET - 1, 6, value="Accept")
-    tag_sheet.column_dimensions['G'].width = 15
-    tag_sheet.cell(HEADER_OFFSET - 1, 7, value="Value")
-    tag_sheet.column_dimensions['H'].width = 80
-    tag_sheet.cell(HEADER_OFFSET - 1, 8, value="Comment (Review)")
+    tag_sheet = make_sheet(
+        "Findings",
+        {'A': 5, 'B': 20, 'C': 80, 'D': 20, 'E': 60, 'F': 10, 'G': 15, 'H': 80},
+        {1: "Index", 2: "ID", 3: "Description", 4: "Tag", 5: "Comment (Analysis)", 6: "Accept", 7: "Value",
+         8: "Comment (Review)"}
+    )
 
     accept_state_validator = DataValidation(type="list", formula1='"TODO ,Accept,Decline,Inquery"', allow_blank=False)
-    tag_sheet.add_data_validation(accept_state_validator)
+    tag_sheet.data_validations.append(accept_state_validator)
     accept_state_validator.add("F4:F1048576")
     issue_value_validator = DataValidation(type="list",
                                            formula1='"TODO, 0 (no value),1 (nice to have),2 (useful),3 (possible desaster)"',
                                            allow_blank=True)
-    tag_sheet.add_data_validation(issue_value_validator)
+    tag_sheet.data_validations.append(issue_value_validator)
     issue_value_validator.add("G4:G1048576")
 
-    issue_tags_reqs = []
-    for req in requirements:
-        for tag in req.tags:
+    # Fill the requirements and findings sheet in one pass over the requirements.
+    for requirement in iter_requirements(app.config['REVISION_FOLDER'], filter_list=filter_list,
+                                         invert_filter=invert_filter, read_only=True):
+        append_row(work_sheet, [
+            requirement.pos_in_csv,
+            requirement.rid,
+            requirement.description,
+            requirement.type_in_csv,
+            "".join([f"{t}: {c} \n" if c else f"{t}\n" for t, c in requirement.tags.items()]),
+            requirement.status,
+            "\n".join([f.get_string() for f in requirement.formalizations.values()])
+        ], bold_column=2)
+
+        for tag in requirement.tags:
             if tag in meta_settings['tag_internal'] and meta_settings['tag_internal'][tag]:
                 continue
-            issue_tags_reqs.append((req, tag))
-
-    for i, (req, tag) in enumerate(issue_tags_reqs):
-        for c in range(1, 8):
-            tag_sheet.cell(HEADER_OFFSET + i, c).alignment = MULTILINE
-        tag_sheet.cell(HEADER_OFFSET + i, 1, req.pos_in_csv)
-        tag_sheet.cell(HEADER_OFFSET + i, 2).font = BOLD
-        tag_sheet.cell(HEADER_OFFSET + i, 2, req.rid)
-        tag_sheet.cell(HEADER_OFFSET + i, 3, req.description)
-        tag_sheet.cell(HEADER_OFFSET + i, 4, tag)
-        tag_sheet.cell(HEADER_OFFSET + i, 5, req.tags[tag])  # Tags do currently not have comments
-        tag_sheet.cell(HEADER_OFFSET + i, 6, "TODO")
-        tag_sheet.cell(HEADER_OFFSET + i, 7, "TODO")
+            append_row(tag_sheet, [
+                requirement.pos_in_csv,
+                requirement.rid,
+                requirement.description,
+                tag,
+                requirement.tags[tag],  # Tags do currently not have comments
+                "TODO",
+                "TODO"
+            ], bold_column=2)
 
     # make sheet with variables
-    var_sheet = work_book.create_sheet("Variables")
-    make_header(var_sheet)
-    var_sheet.column_dimensions['A'].width = 40
-    var_sheet.cell(HEADER_OFFSET - 1, 1, value="Name")
-    var_sheet.column_dimensions['B'].width = 80
-    var_sheet.column_dimensions['C'].width = 5
-    var_sheet.cell(HEADER_OFFSET - 1, 2, value="Type")
-    var_sheet.column_dimensions['D'].width = 180
-    var_sheet.cell(HEADER_OFFSET - 1, 4, value="Invarianten")
-
-    for i, var in enumerate(var_collection.collection.values()):
-        for c in range(1, 8):
-            var_sheet.cell(HEADER_OFFSET + i, c).alignment = MULTILINE
-        var_sheet.cell(HEADER_OFFSET + i, 1, var.name)
-        var_sheet.cell(HEADER_OFFSET + i, 1).font = BOLD
-        var_sheet.cell(HEADER_OFFSET + i, 2, var.type)
-        var_sheet.cell(HEADER_OFFSET + i, 3, "E" if var.belongs_to_enum else "")
-        var_sheet.cell(HEADER_OFFSET + i, 4, "\n".join([c.get_string() for c in var.get_constraints().values()]))
+    var_sheet = make_sheet("Variables", {'A': 40, 'B': 80, 'C': 5, 'D': 180}, {1: "Name", 2: "Type", 4: "Invarianten"})
+
+    for var in var_collection.collection.values():
+        append_row(var_sheet, [
+            var.name,
+            var.type,
+            "E" if var.belongs_to_enum else "",
+            "\n".join([c.get_string() for c in var.get_constraints().values()]),
+            None,
+            None,
+            None
+        ], bold_column=1)
 
     work_book.active = tag_sheet
-    buffer = io.BytesIO()
-    work_book.save(buffer)
-    return buffer
+    out_file = tempfile.TemporaryFile()
+    work_book.save(out_file)
+    return out_file
 
 
 def clean_identifier_for_ultimate_parser(slug: str, used_slugs: Set[str]) -> (str, Set[str]):
@@ -781,8 +774,8 @@ def clean_identifier_for_ultimate_parser(slug: str, used_slugs: Set[str]) -> (st
     return slug, used_slugs
 
 
-def generate_req_file_content(app, filter_list=None, invert_filter=False, variables_only=False):
-    """ Generate the content (string) for the ultimate requirements file.
+def iter_req_file_content(app, filter_list=None, invert_filter=False, variables_only=False) -> Iterator[str]:
+    """ Generate the content for the ultimate requirements file. Yields the variables part, then line by line.
         :param app: Current app.
         :type app: FlaskApp
         :param filter_list: A list of requirement IDs to be included in the result. All if not set.
@@ -792,13 +785,10 @@ def generate_req_file_content(app, filter_list=None, invert_filter=False, variab
         :type invert_filter: bool
         :param variables_only: If true, only variables and no requirements will be included.
         :return: Content for the req file.
-        :rtype: str
+        :rtype: Iterator[str]
         """
     logging.info('Generating .req file content for session {}'.format(app.config['SESSION_TAG']))
-    # Get requirements
-    requirements = get_requirements(app.config['REVISION_FOLDER'], filter_list=filter_list, invert_filter=invert_filter)
-
-    var_collection = VariableCollection.load(app.config['SESSION_VARIABLE_COLLECTION'])
+    var_collection = VariableCollection.load_session(app)
     available_vars = []
     if filter_list is not None:
         # Filter the available vars to only include the ones actually used by a requirement.
@@ -862,11 +852,13 @@ def generate_req_file_content(app, filter_list=None, invert_filter=False, variab
     if len(constraints) > 0:
         content = '\n\n'.join([content, constraints])
     content += '\n\n'
+    yield content
 
     # parse requirement formalizations.
     if not variables_only:
         used_slugs = set()
-        for requirement in requirements:  # type: Requirement
+        for requirement in iter_requirements(app.config['REVISION_FOLDER'], filter_list=filter_list,
+                                             invert_filter=invert_filter, read_only=True):  # type: Requirement
             try:
                 for index, formalization in requirement.formalizations.items():
                     slug, used_slugs = clean_identifier_for_ultimate_parser(requirement.rid, used_slugs)
@@ -879,16 +871,23 @@ def generate_req_file_content(app, filter_list=None, invert_filter=False, variab
                     if len(formalization.get_string()) == 0:
                         # Formalization string is empty if expressions are missing or none set. Ignore in output
                         continue
-                    content += '{}_{}: {}\n'.format(
+                    yield '{}_{}: {}\n'.format(
                         slug,
                         index,
                         formalization.get_string()
                     )
             except AttributeError:
                 continue
-    content += '\n'
+    yield '\n'
 
-    return content
+
+def generate_req_file_content(app, filter_list=None, invert_filter=False, variables_only=False):
+    """ Generate the content (string) for the ultimate requirements file. See `iter_req_file_content`.
+
+    :rtype: str
+    """
+    return ''.join(iter_req_file_content(app, filter_list=filter_list, invert_filter=invert_filter,
+                                         variables_only=variables_only))
 
 
 def get_stored_session_names(session_folder, only_names=False, with_revisions=False) -> tuple:
@@ -960,8 +959,11 @@ def get_revisions_with_stats(session_path):
         {
             name: 'revision_1',
             last_mod: %A %d. %B %Y at %X formatted mtime,
-            num_vars: 9001
+            num_vars: 9001,
+            num_requirements: 42,
+            status_counts: {'Todo': 40, 'Done': 2}
         }
+    read from the catalog record of the revision (see `revision_catalog`).
 
 
     :param session_path: { revision_1: { name: 'revision_1', last_mod: %A %d. %B %Y at %X, num_vars: 9001} ... }
@@ -969,20 +971,13 @@ def get_revisions_with_stats(session_path):
     revisions = get_available_revisions(None, session_path)
     revisions_stats = dict()
     for revision in revisions:
-        revision_path = os.path.join(session_path, revision)
-        revision_var_collection_path = os.path.join(
-            revision_path,
-            'session_variable_collection.pickle'
-        )
-        try:
-            num_vars = len(VariableCollection.load(revision_var_collection_path).collection)
-        except Exception:
-            num_vars = -1
-
+        record = revision_catalog.get_record(os.path.join(session_path, revision))
         revisions_stats[revision] = {
             'name': revision,
-            'last_mod': get_last_edit_from_path(revision_path),
-            'num_vars': num_vars
+            'last_mod': datetime.datetime.fromtimestamp(record['last_mod']).strftime("%A %d. %B %Y at %X"),
+            'num_vars': record['num_vars'],
+            'num_requirements': record['num_requirements'],
+            'status_counts': record['status_counts']
         }
     return revisions_stats
 
@@ -1087,59 +1082,25 @@ def get_datatable_additional_cols(app):
     return {'col_defs': result}
 
 
-def add_msg_to_flask_session_log(app, msg, rid=None, rid_list=None, clear=False, max_msg=50) -> None:
-    """ Add a log message for the frontend_logs.
+def add_msg_to_flask_session_log(app, msg, rid=None, rid_list=None) -> None:
+    """ Add an entry to the activity log of the session shown in the frontend.
+    The number of entries kept is set by `ACTIVITY_LOG_RETENTION`.
 
-    :param max_msg: Max number of messages to keep in the log.
     :param rid_list: A list of affected requirement IDs
     :param rid: Affected requirement id
     :param app: The flask app
     :param msg: Log message string
-    :param clear: Truncate the logs if set to true (false on default).
     """
-    session = pickle_load_from_dump(app.config['FRONTEND_LOGS_PATH'])  # type: dict
-    template = '[{timestamp}] {message}'
-
-    if rid is not None:
-        template += ' <a class="req_direct_link" href="#" data-rid="{rid}">{rid}</a>'
-
+    rids = [rid] if rid is not None else []
     if rid_list is not None:
-        template += ','.join([
-            ' <a class="req_direct_link" href="#" data-rid="{rid}">{rid}</a>'.format(rid=rid) for rid in rid_list
-        ])
-
-    session['hanfor_log'].append(template.format(
-        timestamp=datetime.datetime.now(),
-        message=msg,
-        rid=rid)
-    )
+        rids += rid_list
+    get_session_activity_log(app).append(msg, rids)
 
-    # Remove oldest logs until threshold
-    while len(session['hanfor_log']) > max_msg:
-        session['hanfor_log'].pop(0)
 
-    pickle_dump_obj_to_file(session, app.config['FRONTEND_LOGS_PATH'])
-
-
-def get_flask_session_log(app, html=False) -> Union[list, str]:
-    """ Get the frontend log messages from frontend_logs.
-
-    :param app: The flask app
-    :param html: Return formatted html version.
-    :return: list of messages or html string in case `html == True`
-    """
-    session = pickle_load_from_dump(app.config['FRONTEND_LOGS_PATH'])  # type: dict
-    result = list()
-    if 'hanfor_log' in session:
-        result = session['hanfor_log']
-
-    if html:
-        tmp = ''
-        for msg in result:
-            tmp += '<p>{}</p>'.format(msg)
-        result = tmp
-
-    return result
+def get_session_activity_log(app) -> ActivityLog:
+    """ The activity log of the current session. """
+    return get_activity_log(app.config['ACTIVITY_LOG_PATH'],
+                            app.config.get('ACTIVITY_LOG_RETENTION', activity_log.DEFAULT_RETENTION))
 
 
 def slugify(s):
@@ -1163,22 +1124,6 @@ def generate_file_response(content, name, mimetype='text/plain'):
     return response
 
 
-def get_requirements_in_folder(folder_path):
-    result = dict()
-    for filename in get_filenames_from_dir(folder_path):
-        try:
-            r = Requirement.load(filename)
-            result[r.rid] = {
-                'req': r,
-                'path': filename
-            }
-        except TypeError:
-            continue
-        except Exception as e:
-            raise e
-    return result
-
-
 def init_var_collection(app):
     """ Creates a new empty VariableCollection if non is existent for current session.
 
@@ -1235,6 +1180,22 @@ class ListStoredSessions(argparse.Action):
         exit(0)
 
 
+class RebuildRevisionCatalog(argparse.Action):
+    """ Rebuild the catalog records of all revisions of all stored sessions. """
+
+    def __init__(self, option_strings, app, dest, *args, **kwargs):
+        self.app = app
+        super(RebuildRevisionCatalog, self).__init__(
+            option_strings=option_strings, dest=dest, *args, **kwargs)
+
+    def __call__(self, *args, **kwargs):
+        count = 0
+        for _, name in get_stored_session_names(self.app.config['SESSION_BASE_FOLDER']):
+            count += revision_catalog.rebuild(os.path.join(self.app.config['SESSION_BASE_FOLDER'], name))
+        print(f'Rebuilt the catalog records of {count} revisions.')
+        exit(0)
+
+
 class GenerateScopedPatternTrainingData(argparse.Action):
     """ Generate training data consisting of requirement descriptions with assigned scoped pattern."""
 
@@ -1302,6 +1263,11 @@ class HanforArgumentParser(argparse.ArgumentParser):
             action="store_true",
             help="Reload the type inference results."
         )
+        self.add_argument(
+            "--verify-index",
+            action="store_true",
+            help="Rebuild the variable usage index from all requirements and report inconsistencies."
+        )
         self.add_argument(
             '-L', '--list_stored_sessions',
             nargs=0,
@@ -1309,6 +1275,13 @@ class HanforArgumentParser(argparse.ArgumentParser):
             action=ListStoredSessions,
             app=self.app
         )
+        self.add_argument(
+            '--rebuild-catalog',
+            nargs=0,
+            help="Rebuild the catalog records (number of requirements, variables, ...) of all stored revisions.",
+            action=RebuildRevisionCatalog,
+            app=self.app
+        )
         self.add_argument(
             '-G', '--generate_scoped_pattern_training_data',
             nargs=0,
@@ -1324,24 +1297,168 @@ class HanforArgumentParser(argparse.ArgumentParser):
         )
 
 
+# Section names are used as file names.
+META_SETTINGS_SECTION_PATTERN = re.compile(r'^\w+$')
+
+
+class MetaSettingsStore:
+    """ Process wide in memory copy of the meta settings of a session (tag colors, stored queries, reports, ...).
+
+    Each top level key is a section stored in its own `<path>.<section>.pickle`. Writes only mark sections dirty,
+    `flush` stores the dirty sections, e.g. at the end of a request. Sections changed on disk by another process are
+    reloaded on `refresh` unless they have unstored changes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.folder, self.prefix = os.path.split(path)
+        self.sections = dict()
+        self._mtimes = dict()
+        self._dirty = set()
+        self._lock = threading.RLock()
+        self.refresh()
+
+    def path_for(self, section: str) -> str:
+        return f'{self.path}.{section}.pickle'
+
+    def refresh(self):
+        """ Load sections which are new or changed on disk, drop stored sections removed from disk. """
+        with self._lock:
+            filenames = os.listdir(self.folder) if os.path.isdir(self.folder) else []
+            on_disk = set()
+            for filename in filenames:
+                match = re.match(rf'^{re.escape(self.prefix)}\.(\w+)\.pickle$', filename)
+                if match is None:
+                    continue
+                section = match.group(1)
+                on_disk.add(section)
+                if section in self._dirty:
+                    continue
+                mtime = os.stat(self.path_for(section)).st_mtime_ns
+                if self._mtimes.get(section) != mtime:
+                    logging.debug(f'Loading meta settings `{section}` from `{self.path_for(section)}`.')
+                    self.sections[section] = pickle_load_from_dump(self.path_for(section))
+                    self._mtimes[section] = mtime
+                    generations.bump(generations.META_SETTINGS, self.path)
+            for section in set(self._mtimes) - on_disk - self._dirty:
+                self.sections.pop(section, None)
+                self._mtimes.pop(section)
+                generations.bump(generations.META_SETTINGS, self.path)
+
+    def mark_dirty(self, sections: Iterable[str]):
+        with self._lock:
+            for section in sections:
+                if not META_SETTINGS_SECTION_PATTERN.match(section):
+                    raise ValueError(f'Invalid meta settings section `{section}`.')
+                self._dirty.add(section)
+            generations.bump(generations.META_SETTINGS, self.path)
+
+    def flush(self):
+        """ Store the dirty sections. """
+        with self._lock:
+            if not self._dirty:
+                return
+            for section in sorted(self._dirty):
+                path = self.path_for(section)
+                if section not in self.sections:
+                    if os.path.exists(path):
+                        os.remove(path)
+                    self._mtimes.pop(section, None)
+                    continue
+                tmp_path = f'{path}.tmp'
+                pickle_dump_obj_to_file(self.sections[section], tmp_path)
+                os.replace(tmp_path, path)
+                self._mtimes[section] = os.stat(path).st_mtime_ns
+            self._dirty.clear()
+
+
+_meta_settings_stores: Dict[str, MetaSettingsStore] = dict()
+_meta_settings_stores_lock = threading.Lock()
+
+
+def get_meta_settings_store(path: str) -> MetaSettingsStore:
+    with _meta_settings_stores_lock:
+        if path not in _meta_settings_stores:
+            _meta_settings_stores[path] = MetaSettingsStore(path)
+        return _meta_settings_stores[path]
+
+
+def flush_meta_settings():
+    """ Store the dirty sections of all meta settings. """
+    with _meta_settings_stores_lock:
+        stores = list(_meta_settings_stores.values())
+    for store in stores:
+        store.flush()
+
+
+def migrate_meta_settings_pickle(pickle_path: str, path: str):
+    """ Split a former `meta_settings.pickle` into sections stored at `path`. """
+    store = get_meta_settings_store(path)
+    store.sections.update(pickle_load_from_dump(pickle_path))
+    store.mark_dirty(store.sections.keys())
+    store.flush()
+
+
 class MetaSettings:
-    """ Just an auto saving minimal dict. """
+    """ Just an auto saving minimal dict. A view on the shared `MetaSettingsStore` of the session, `update_storage`
+    marks the sections set through this view for storing. Callers changing a section in place (e.g. adding a tag
+    to `tag_colors`) `mark` it. """
 
     def __init__(self, path):
-        self.__dict__ = pickle_load_from_dump(path)  # type: dict
         self.path = path
+        self._store = get_meta_settings_store(path)
+        self._store.refresh()
+        self._touched = set()
+
+    def mark(self, *sections: str):
+        """ Mark sections changed in place for storing on the next `update_storage`. """
+        self._touched.update(sections)
 
     def update_storage(self):
-        pickle_dump_obj_to_file(self.__dict__, self.path)
+        self._store.mark_dirty(self._touched)
+
+    def to_dict(self) -> dict:
+        """ A copy of all sections, changing it does not change the meta settings. """
+        return deepcopy(self._store.sections)
 
     def __contains__(self, item):
-        return self.__dict__.__contains__(item)
+        return self._store.sections.__contains__(item)
 
     def __setitem__(self, key, value):
-        self.__dict__.__setitem__(key, value)
+        self._touched.add(key)
+        self._store.sections.__setitem__(key, value)
 
     def __getitem__(self, item):
-        return self.__dict__.__getitem__(item)
+        return self._store.sections.__getitem__(item)
+
+
+@dataclass
+class RevisionChanges:
+    """ Summary of the changes from a base revision to a new revision, stored as `revision_changes.json` in the
+    new revision folder. """
+    base_revision: str
+    revision: str
+    new: int = 0
+    removed: int = 0
+    unchanged: int = 0
+    description_changed: int = 0
+    data_changed: int = 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def store(self, revision_folder: str):
+        with open(os.path.join(revision_folder, REVISION_CHANGES_FILE), mode='w') as changes_file:
+            json.dump(self.to_dict(), changes_file)
+
+    @classmethod
+    def load(cls, revision_folder: str) -> Optional['RevisionChanges']:
+        """ The changes of a revision, None for initial revisions and revisions created by older versions. """
+        try:
+            with open(os.path.join(revision_folder, REVISION_CHANGES_FILE), mode='r') as changes_file:
+                return cls(**json.load(changes_file))
+        except FileNotFoundError:
+            return None
 
 
 class Revision:
@@ -1375,9 +1492,11 @@ class Revision:
                 self._revert_and_cleanup()
                 raise e
         self._try_save(self._load_from_csv, 'Could not read CSV')
-        self._try_save(self._store_requirements, 'Could not store requirements')
+        if self.is_initial_revision:
+            self._try_save(self._store_requirements, 'Could not store requirements')
         self._try_save(self._generate_session_dict, 'Could not generate session')
         if not self.is_initial_revision:
+            # Stores the merged requirements, unchanged ones share their stored content with the base revision.
             self._try_save(self._merge_with_base_revision, ' Could not merge with base session')
 
     def _try_save(self, what, error_msg):
@@ -1493,9 +1612,7 @@ class Revision:
             shutil.rmtree(self.app.config['REVISION_FOLDER'])
 
     def _store_requirements(self):
-        for index, req in enumerate(self.requirement_collection.requirements):  # type: Requirement
-            filename = os.path.join(self.app.config['REVISION_FOLDER'], '{}.pickle'.format(req.rid))
-            req.store(filename)
+        get_requirement_store(self.app.config['REVISION_FOLDER']).store_many(self.requirement_collection.requirements)
 
     def _generate_session_dict(self):
         # Generate the session dict: Store some meta information.
@@ -1509,59 +1626,101 @@ class Revision:
         session['csv_hash'] = hash_file_sha1(self.args.input_csv)
         pickle_dump_obj_to_file(session, self.app.config['SESSION_STATUS_PATH'])
 
+    def _merge_requirement(self, new_req: Requirement, old_req: Requirement, summary: 'RevisionChanges'):
+        """ Take over tags, status and formalizations of `old_req` into `new_req` of the new revision. """
+        rid = new_req.rid
+        # Migrate tags and status.
+        new_req.tags = old_req.tags
+        new_req.status = old_req.status
+        new_req.revision_diff = old_req
+        changed = False
+
+        if len(new_req.revision_diff) > 0:
+            logging.info(f'CSV entry changed. Add `revision_data_changed` tag to `{rid}`.')
+            new_req.tags[f'{self.base_revision_name}_to_{self.revision_name}_data_changed'] = ""
+            summary.data_changed += 1
+            changed = True
+
+        if new_req.description != old_req.description:
+            logging.info(f'Description changed. Add `description_changed` tag to `{rid}`.')
+            new_req.tags[f'{self.base_revision_name}_to_{self.revision_name}_description_changed'] = ""
+            new_req.status = 'Todo'
+            summary.description_changed += 1
+            changed = True
+
+        if not changed:
+            summary.unchanged += 1
+
+        # If the new formalization is empty: just migrate the formalization.
+        #  - Tag with `migrated_formalization` if the description changed.
+        if len(new_req.formalizations) == 0 and len(old_req.formalizations) == 0:
+            pass
+        elif len(new_req.formalizations) == 0 and len(old_req.formalizations) > 0:
+            logging.info('Migrate formalization for `{}`'.format(rid))
+            new_req.formalizations = old_req.formalizations
+            if new_req.description != old_req.description:
+                logging.info(
+                    'Add `migrated_formalization` tag to `{}`, status to `Todo` since description changed'.format(
+                        rid))
+                new_req.tags[f'{self.base_revision_name}_to_{self.revision_name}_migrated_formalization'] = ""
+                new_req.status = 'Todo'
+
     def _merge_with_base_revision(self):
         # Merge the old revision into the new revision
         logging.info(f'Merging `{self.base_revision_name}` into `{self.revision_name}`.')
-        old_reqs = get_requirements_in_folder(self.base_revision_folder)
-        new_reqs = get_requirements_in_folder(self.app.config['REVISION_FOLDER'])
-
-        # Diff the new requirements against the old ones.
-        for rid in new_reqs.keys():
-            # Tag newly introduced requirements.
-            if rid not in old_reqs.keys():
-                logging.info('Add newly introduced requirement `{}`'.format(rid))
-                new_reqs[rid]['req'].tags[f'{self.base_revision_name}_to_{self.revision_name}_new_requirement'] = ""
+        new_reqs = {r.rid: r for r in self.requirement_collection.requirements}
+        base_store = get_requirement_store(self.base_revision_folder)
+        store = get_requirement_store(self.app.config['REVISION_FOLDER'])
+        summary = RevisionChanges(self.base_revision_name, self.revision_name)
+        can_link = isinstance(base_store, SqliteRequirementStore) and isinstance(store, SqliteRequirementStore)
+
+        # Merge join both revisions on the sorted rids. Requirements with an unchanged csv source are taken over
+        # without loading them, only the others are loaded from the base revision. Formalizations imported from the
+        # csv are not part of the source, requirements having them are merged to keep them.
+        unchanged, to_merge, introduced = list(), list(), list()
+        new_rids = iter(sorted(new_reqs.keys()))
+        new_rid = next(new_rids, None)
+        for old_rid, old_source_hash, old_pos, old_has_diff in base_store.sources():
+            while new_rid is not None and new_rid < old_rid:
+                introduced.append(new_rid)
+                new_rid = next(new_rids, None)
+            if new_rid != old_rid:
+                summary.removed += 1
                 continue
-
-            # Migrate tags and status.
-            new_reqs[rid]['req'].tags = old_reqs[rid]['req'].tags
-            new_reqs[rid]['req'].status = old_reqs[rid]['req'].status
-            new_reqs[rid]['req'].revision_diff = old_reqs[rid]['req']
-
-            if len(new_reqs[rid]['req'].revision_diff) > 0:
-                logging.info(f'CSV entry changed. Add `revision_data_changed` tag to `{rid}`.')
-                new_reqs[rid]['req'].tags[f'{self.base_revision_name}_to_{self.revision_name}_data_changed'] = ""
-
-            if new_reqs[rid]['req'].description != old_reqs[rid]['req'].description:
-                logging.info(f'Description changed. Add `description_changed` tag to `{rid}`.')
-                new_reqs[rid]['req'].tags[f'{self.base_revision_name}_to_{self.revision_name}_description_changed'] = ""
-                new_reqs[rid]['req'].status = 'Todo'
-
-            # If the new formalization is empty: just migrate the formalization.
-            #  - Tag with `migrated_formalization` if the description changed.
-            if len(new_reqs[rid]['req'].formalizations) == 0 and len(old_reqs[rid]['req'].formalizations) == 0:
-                pass
-            elif len(new_reqs[rid]['req'].formalizations) == 0 and len(old_reqs[rid]['req'].formalizations) > 0:
-                logging.info('Migrate formalization for `{}`'.format(rid))
-                new_reqs[rid]['req'].formalizations = old_reqs[rid]['req'].formalizations
-                if new_reqs[rid]['req'].description != old_reqs[rid]['req'].description:
-                    logging.info(
-                        'Add `migrated_formalization` tag to `{}`, status to `Todo` since description changed'.format(
-                            rid))
-                    new_reqs[rid]['req'].tags.add(
-                        '{}_to_{}_migrated_formalization'.format(self.base_revision_name, self.revision_name)
-                    )
-                    new_reqs[rid]['req'].status = 'Todo'
-            elif len(new_reqs[rid]['req'].formalizations) == 0 and len(old_reqs[rid]['req'].formalizations) > 0:
-                logging.error('Parsing of the requirement not supported.')
-                raise NotImplementedError
+            new_req = new_reqs[new_rid]
+            if (can_link and old_source_hash is not None and not old_has_diff and old_pos == new_req.pos_in_csv
+                    and len(new_req.formalizations) == 0 and old_source_hash == source_hash(new_req)):
+                unchanged.append(new_rid)
+                del new_reqs[new_rid]
+            else:
+                to_merge.append(new_rid)
+            new_rid = next(new_rids, None)
+        while new_rid is not None:
+            introduced.append(new_rid)
+            new_rid = next(new_rids, None)
+
+        # Diff the changed requirements against the old ones.
+        for old_req in base_store.requirements(to_merge):
+            self._merge_requirement(new_reqs[old_req.rid], old_req, summary)
+
+        # Tag newly introduced requirements.
+        for rid in introduced:
+            logging.info('Add newly introduced requirement `{}`'.format(rid))
+            new_reqs[rid].tags[f'{self.base_revision_name}_to_{self.revision_name}_new_requirement'] = ""
+        summary.new = len(introduced)
+        summary.unchanged += len(unchanged)
 
         # Store the updated requirements for the new revision.
         logging.info('Store merge changes to revision `{}`'.format(self.revision_name))
-        for r in new_reqs.values():
-            r['req'].store(r['path'])
+        if len(unchanged) > 0:
+            store.link_from(base_store, unchanged)
+        store.store_many(new_reqs.values())
+        summary.store(self.app.config['REVISION_FOLDER'])
+        logging.info(f'Merged `{self.base_revision_name}` into `{self.revision_name}`: {summary.to_dict()}')
 
         # Store the variables collection in the new revision.
         logging.info('Migrate variables from `{}` to `{}`'.format(self.base_revision_name, self.revision_name))
         base_var_collection = VariableCollection.load(self.base_revision_var_collection_path)
+        # The usage index refers to the base revision requirements; rebuild it on the next start.
+        base_var_collection.usage_index_verified = False
         base_var_collection.store(self.app.config['SESSION_VARIABLE_COLLECTION'])
@@ -0,0 +1,259 @@
+""" Materialized rows of the variables table answering `api/var/gets`.
+
+The view of a revision holds the table row (`Variable.to_dict` without script results) and the searchable text of each
+table column per variable. It is updated with every store of the variable collection by this process: Only rows of
+variables whose content or usage changed are computed again. A collection changed on disk by someone else is loaded
+and diffed on the next request.
+
+Script results are not part of the rows. They are added to the rows of the requested page only, and loaded for all
+variables just for searches targeting the script results column.
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import generations
+import reqtransformer
+from requirements_table import table_order, table_page
+
+VARIABLE_COLLECTION_FILE = 'session_variable_collection.pickle'
+# Columns of the table in `static/js/variables.js`.
+COLUMNS = ('', 'name', 'type', 'constraints', 'tags', 'used_by', 'script_results', 'used_by_all')
+SCRIPT_RESULTS_COLUMN = COLUMNS.index('script_results')
+# Columns searched by terms without a column target.
+DEFAULT_VISIBLE_COLUMNS = [True] * 5
+
+
+def _fingerprint(variable, used_by: Tuple[str, ...]) -> str:
+    return hashlib.sha1(pickle.dumps((variable, used_by))).hexdigest()
+
+
+def _is_constraint(name: str) -> bool:
+    return re.match(reqtransformer.Variable.CONSTRAINT_REGEX, name) is not None
+
+
+def _text(row: dict) -> List[str]:
+    """ The searchable text of the table columns of a row (script results are added on demand). """
+    type_text = str(row['type'])
+    if row['type'] == 'CONST':
+        type_text += f' ({row["const_val"]})'
+    used_by = [name for name in row['used_by'] if not _is_constraint(name)]
+    return [
+        '',
+        row['name'],
+        type_text,
+        ''.join(row['constraints']),
+        ' '.join(row['tags']),
+        ' '.join(used_by) if len(used_by) > 0 else 'unused',
+        '',
+        ', '.join(row['used_by'])
+    ]
+
+
+class VariableTableView:
+    def __init__(self, folder: str):
+        self.folder = folder
+        self.path = os.path.join(folder, VARIABLE_COLLECTION_FILE)
+        self.rows: Dict[str, dict] = dict()
+        self.text: Dict[str, List[str]] = dict()
+        self._fingerprints: Dict[str, str] = dict()
+        self.version = None
+        self._script_results: Optional[Dict[str, str]] = None
+        self._script_results_version = None
+        self._lock = threading.RLock()
+
+    def _current_version(self) -> tuple:
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            mtime = None
+        return generations.get(generations.VARIABLES, self.folder), mtime
+
+    def update(self, var_collection):
+        """ Update the rows of the variables changed in `var_collection`, which was just stored. """
+        with self._lock:
+            changed = 0
+            names = set(var_collection.collection.keys())
+            for name in set(self.rows) - names:
+                del self.rows[name], self.text[name], self._fingerprints[name]
+            for name, variable in var_collection.collection.items():
+                used_by = tuple(sorted(var_collection.var_req_mapping.get(name, ())))
+                fingerprint = _fingerprint(variable, used_by)
+                if self._fingerprints.get(name) == fingerprint:
+                    continue
+                row = variable.to_dict(var_collection.var_req_mapping)
+                row.pop('script_results', None)
+                self.rows[name] = row
+                self.text[name] = _text(row)
+                self._fingerprints[name] = fingerprint
+                changed += 1
+            self.version = self._current_version()
+            logging.debug(f'Updated {changed} of {len(names)} rows of the variables table of `{self.folder}`.')
+
+    def refresh(self):
+        """ Load the collection again if it was changed by someone else. """
+        with self._lock:
+            if self.version != self._current_version():
+                self.update(reqtransformer.VariableCollection.load(self.path))
+
+    def script_results(self, results_path: str, names: List[str] = None) -> Dict[str, str]:
+        """ The concatenated script results of the variables `names` (all if None). """
+        with self._lock:
+            version = (generations.get(generations.SCRIPT_EVALS, results_path),
+                       os.stat(results_path).st_mtime_ns if os.path.exists(results_path) else None)
+            if self._script_results is None or self._script_results_version != version:
+                evals = reqtransformer.ScriptEvals.load(results_path).evals if version[1] is not None else dict()
+                self._script_results = {name: ' '.join(sorted(evals[name].values())) for name in evals}
+                self._script_results_version = version
+            if names is None:
+                return dict(self._script_results)
+            return {name: self._script_results[name] for name in names if name in self._script_results}
+
+    def query(self, search, visible_columns: List[bool], order: List[Tuple[int, bool]],
+              results_path: str) -> List[str]:
+        """ The names of all variables matching the `SearchNode` `search`, ordered by `order`
+        [(column index, descending), ...]. """
+        with self._lock:
+            text = self.text
+            if _targets(search, SCRIPT_RESULTS_COLUMN):
+                script_results = self.script_results(results_path)
+                text = {name: columns[:SCRIPT_RESULTS_COLUMN] + [script_results.get(name, '')]
+                        + columns[SCRIPT_RESULTS_COLUMN + 1:] for name, columns in text.items()}
+            names = sorted(name for name, columns in text.items() if search.evaluate_row(columns, visible_columns))
+            for column, descending in reversed(order):
+                names.sort(key=lambda name: text[name][column].casefold() if column < len(COLUMNS) else '',
+                           reverse=descending)
+            return names
+
+
+def _targets(search, column: int) -> bool:
+    if not search:
+        return False
+    return search.col_target == column or _targets(search.left, column) or _targets(search.right, column)
+
+
+_views: Dict[str, VariableTableView] = dict()
+_views_lock = threading.Lock()
+
+
+def get_view(folder: str) -> VariableTableView:
+    """ The view of the revision in `folder`, shared by all requests. """
+    folder = os.path.abspath(folder)
+    with _views_lock:
+        if folder not in _views:
+            _views[folder] = VariableTableView(folder)
+        view = _views[folder]
+    view.refresh()
+    return view
+
+
+def stored(folder: str, var_collection):
+    """ The variable collection of the revision in `folder` was stored by this process. """
+    view = _views.get(os.path.abspath(folder))
+    if view is not None:
+        view.update(var_collection)
+
+
+def query_table(folder: str, results_path: str, args) -> dict:
+    """ Answer a request of the variables table. Without `draw`, all rows are returned.
+
+    :param folder: The revision folder.
+    :param results_path: The script results of the session.
+    :param args: Request arguments: The DataTables parameters `draw`, `start`, `length`, `order[i][column|dir]` and
+                 `columns[i][data]`, the Hanfor search `search_query` and `visible_columns` (json list of booleans).
+    """
+    # Imported here, the ressources import the session utils which import this module.
+    from ressources.queryapi import SearchNode
+
+    view = get_view(folder)
+    with view._lock:
+        if 'draw' not in args:
+            names = sorted(view.rows)
+            result = dict()
+        else:
+            search = SearchNode.from_query(args.get('search_query', ''))
+            visible_columns = json.loads(args.get('visible_columns') or 'null') or \
+                DEFAULT_VISIBLE_COLUMNS
+            order = table_order(args, lambda data: COLUMNS.index(data) if data in COLUMNS else None)
+            matching = view.query(search, visible_columns, order, results_path)
+            names = table_page(args, matching)
+            result = {
+                'draw': int(args.get('draw', 0)),
+                'recordsTotal': len(view.rows),
+                'recordsFiltered': len(matching),
+                'types': sorted({str(row['type']) for row in view.rows.values() if row['type'] is not None})
+            }
+        script_results = view.script_results(results_path, names)
+        result['data'] = [dict(view.rows[name], script_results=script_results.get(name, '')) for name in names]
+    return result
+
+
+# Columns of the table in `static/js/variable-import.js`.
+IMPORT_COLUMNS = ('', 'action', 'attributes', 'source', 'target', 'result')
+
+
+def _import_text(session, name: str, source, target) -> List[str]:
+    """ The searchable text of the import table columns of a variable, as rendered by the table. """
+    source_variable, target_variable = source.collection.get(name), target.collection.get(name)
+    attributes = list()
+    if source_variable is not None and target_variable is not None:
+        attributes.append('match_in_source_and_target')
+        attributes.append('unmatched_types' if source_variable.type != target_variable.type else 'same_types')
+    else:
+        if source_variable is None:
+            attributes.append('no_match_in_source')
+        if target_variable is None:
+            attributes.append('no_match_in_target')
+    if source_variable is not None and len(source_variable.get_constraints()) > 0:
+        attributes.append('source_has_constraints')
+    if target_variable is not None and len(target_variable.get_constraints()) > 0:
+        attributes.append('target_has_constraints')
+    result_variable = session.result_variable(name)
+    return [
+        '',
+        session.decision(name).action,
+        ' '.join(attributes),
+        f'{name} {source_variable.type}' if source_variable is not None else 'No match.',
+        f'{name} {target_variable.type}' if target_variable is not None else 'No match.',
+        f'{name} {result_variable.type}' if result_variable is not None else 'Skipped.'
+    ]
+
+
+def query_import_table(session, args) -> dict:
+    """ Answer a request of the table of a variable import session. Rows are only computed for the requested page,
+    without `draw` all rows are returned.
+
+    :param session: The `reqtransformer.VarImportSession`.
+    :param args: Request arguments: The DataTables parameters `draw`, `start`, `length` and `order[i][column|dir]`,
+                 the Hanfor search `search_query` and `visible_columns` (json list of booleans).
+    """
+    from ressources.queryapi import SearchNode
+
+    names = session.names()
+    if 'draw' not in args:
+        return {'data': session.rows(names, names)}
+
+    search_query = args.get('search_query', '').strip()
+    order = table_order(args, lambda data: None)
+    matching = list(names)
+    if len(search_query) > 0 or len(order) > 0:
+        source, target = session.source_var_collection, session.target_var_collection
+        text = {name: _import_text(session, name, source, target) for name in names}
+        if len(search_query) > 0:
+            search = SearchNode.from_query(search_query)
+            visible_columns = json.loads(args.get('visible_columns') or 'null') or [True] * len(IMPORT_COLUMNS)
+            matching = [name for name in names if search.evaluate_row(text[name], visible_columns)]
+        for column, descending in reversed(order):
+            matching.sort(key=lambda name: text[name][column].casefold() if column < len(IMPORT_COLUMNS) else '',
+                          reverse=descending)
+    return {
+        'draw': int(args.get('draw', 0)),
+        'recordsTotal': len(names),
+        'recordsFiltered': len(matching),
+        'data': session.rows(table_page(args, matching), names)
+    }